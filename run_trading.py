@@ -4,8 +4,10 @@ TradingAgents 运行脚本
 用法: python run_trading.py [股票代码] [日期] [选项]
 示例: python run_trading.py LMND 2026-02-20
       python run_trading.py AAPL --llm-provider anthropic --deep-think claude-sonnet-4-20250514
+      python run_trading.py --symbols-file watchlist.txt --workers 4   # 批量分析
 
 日志输出: logs/{symbol}-{date}-h.log
+批量汇总: {results_dir}/batch/{date}-{时间戳}.json
 """
 
 import sys
@@ -28,6 +30,10 @@ if os.path.exists(VENV_PYTHON):
 
 from dotenv import load_dotenv
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.batch_runner import BatchRunner, load_symbols
+from tradingagents.constants import BATCH_WORKERS
+from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.interface import get_compute_service, get_data_manager
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.utils.validators import InputValidator
 from tradingagents.exceptions import ValidationError
@@ -40,10 +46,8 @@ AVAILABLE_ANALYSTS = ["market", "social", "news", "fundamentals", "candlestick"]
 # 可用 LLM 提供商
 AVAILABLE_PROVIDERS = ["openai", "anthropic", "google", "xai", "openrouter", "ollama"]
 
-def run_trading_analysis(
-    symbol: str,
-    date: str,
-    debug: bool = True,  # 默认开启 debug
+def build_config(
+    debug: bool = True,
     llm_provider: str = None,
     deep_think_llm: str = None,
     quick_think_llm: str = None,
@@ -51,35 +55,14 @@ def run_trading_analysis(
     max_debate_rounds: int = 2,
     analysts: list = None,
     output_lang: str = None,
+    compute_workers: int = None,
 ):
     """
-    运行交易分析
+    校验参数并构建运行配置（单只和批量分析共用）
 
-    Args:
-        symbol: 股票代码
-        date: 分析日期
-        debug: 是否开启 debug 模式 (默认 True)
-        llm_provider: LLM 提供商 (从 .env 读取或指定)
-        deep_think_llm: 深度思考模型
-        quick_think_llm: 快速思考模型
-        backend_url: API 端点
-        max_debate_rounds: 辩论轮数
-        analysts: 分析师列表
-        output_lang: 输出语言
+    Returns:
+        (config, selected_analysts)，参数无效时返回 (None, None)
     """
-    # ---- 输入验证 ----
-    try:
-        symbol = InputValidator.validate_symbol(symbol)
-    except ValidationError as e:
-        print(f"\n❌ 股票代码无效: {e}")
-        return None, None
-
-    try:
-        date = InputValidator.validate_date(date)
-    except ValidationError as e:
-        print(f"\n❌ 日期无效: {e}")
-        return None, None
-
     if analysts:
         invalid = [a for a in analysts if a not in AVAILABLE_ANALYSTS]
         if invalid:
@@ -92,13 +75,6 @@ def run_trading_analysis(
         print(f"   可选: {', '.join(AVAILABLE_PROVIDERS)}")
         return None, None
 
-    print(f"\n{'='*50}")
-    print(f"TradingAgents 分析")
-    print(f"股票: {symbol}")
-    print(f"日期: {date}")
-    print(f"Debug: {'开启' if debug else '关闭'}")
-    print(f"{'='*50}\n")
-
     # 创建配置（默认关闭 debug）
     config = DEFAULT_CONFIG.copy()
 
@@ -142,6 +118,10 @@ def run_trading_analysis(
     else:
         print(f"🌐 输出语言: {config.get('output_language', 'zh')} (默认)")
 
+    if compute_workers is not None:
+        config["compute_pool"] = {**config["compute_pool"], "workers": compute_workers}
+        print(f"🧮 计算进程: {compute_workers}")
+
     # 分析师选择
     if analysts:
         selected_analysts = analysts
@@ -150,6 +130,71 @@ def run_trading_analysis(
     print(f"📊 分析师: {', '.join(selected_analysts)}")
 
     print()
+    return config, selected_analysts
+
+
+def run_trading_analysis(
+    symbol: str,
+    date: str,
+    debug: bool = True,  # 默认开启 debug
+    llm_provider: str = None,
+    deep_think_llm: str = None,
+    quick_think_llm: str = None,
+    backend_url: str = None,
+    max_debate_rounds: int = 2,
+    analysts: list = None,
+    output_lang: str = None,
+    compute_workers: int = None,
+):
+    """
+    运行交易分析
+
+    Args:
+        symbol: 股票代码
+        date: 分析日期
+        debug: 是否开启 debug 模式 (默认 True)
+        llm_provider: LLM 提供商 (从 .env 读取或指定)
+        deep_think_llm: 深度思考模型
+        quick_think_llm: 快速思考模型
+        backend_url: API 端点
+        max_debate_rounds: 辩论轮数
+        analysts: 分析师列表
+        output_lang: 输出语言
+        compute_workers: 指标/形态计算进程数 (0 为在当前进程计算)
+    """
+    # ---- 输入验证 ----
+    try:
+        symbol = InputValidator.validate_symbol(symbol)
+    except ValidationError as e:
+        print(f"\n❌ 股票代码无效: {e}")
+        return None, None
+
+    try:
+        date = InputValidator.validate_date(date)
+    except ValidationError as e:
+        print(f"\n❌ 日期无效: {e}")
+        return None, None
+
+    print(f"\n{'='*50}")
+    print(f"TradingAgents 分析")
+    print(f"股票: {symbol}")
+    print(f"日期: {date}")
+    print(f"Debug: {'开启' if debug else '关闭'}")
+    print(f"{'='*50}\n")
+
+    config, selected_analysts = build_config(
+        debug=debug,
+        llm_provider=llm_provider,
+        deep_think_llm=deep_think_llm,
+        quick_think_llm=quick_think_llm,
+        backend_url=backend_url,
+        max_debate_rounds=max_debate_rounds,
+        analysts=analysts,
+        output_lang=output_lang,
+        compute_workers=compute_workers,
+    )
+    if config is None:
+        return None, None
 
     # 初始化图
     print("正在初始化 TradingAgents...")
@@ -178,6 +223,73 @@ def run_trading_analysis(
         return None, None
 
 
+def run_batch_analysis(
+    symbols_file: str,
+    date: str,
+    workers: int = BATCH_WORKERS,
+    debug: bool = True,
+    **options,
+):
+    """
+    批量分析股票列表文件中的所有股票
+
+    一个进程内 workers 个工作线程，每个线程创建一次 TradingAgentsGraph 后跨股票复用；
+    数据缓存、LLM 并发限制和调用预算由所有线程共享。完成后打印并保存每只股票的耗时汇总。
+
+    Args:
+        symbols_file: 股票列表文件（每行一个代码，# 为注释）
+        date: 分析日期
+        workers: 工作线程数
+        debug: 是否开启 debug 模式
+        **options: 其余配置参数，见 build_config
+    """
+    try:
+        date = InputValidator.validate_date(date)
+    except ValidationError as e:
+        print(f"\n❌ 日期无效: {e}")
+        return None
+
+    symbols = load_symbols(symbols_file)
+    if not symbols:
+        print(f"\n❌ 股票列表为空: {symbols_file}")
+        return None
+
+    print(f"\n{'='*50}")
+    print(f"TradingAgents 批量分析")
+    print(f"股票: {len(symbols)} 只 ({symbols_file})")
+    print(f"日期: {date}")
+    print(f"工作线程: {workers}")
+    print(f"{'='*50}\n")
+
+    config, selected_analysts = build_config(debug=debug, **options)
+    if config is None:
+        return None
+
+    # 工作线程启动前创建共享服务，保证所有线程共用同一个数据管理器
+    # （缓存、single-flight、数据源限流令牌桶）和同一个计算进程池
+    set_config(config)
+    get_data_manager()
+    get_compute_service()
+
+    runner = BatchRunner(
+        lambda: TradingAgentsGraph(selected_analysts=selected_analysts, debug=debug, config=config),
+        workers=workers,
+    )
+    summary = runner.run(
+        symbols, date,
+        on_result=lambda r: print(f"[{r.status}] {r.symbol} {r.seconds:.1f}s {r.decision or r.error}"),
+    )
+
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = summary.write(os.path.join(config["results_dir"], "batch", f"{date}-{timestamp}.json"))
+
+    print(f"\n{'='*50}")
+    print(summary.format_table())
+    print(f"汇总: {path}")
+    print(f"{'='*50}\n")
+    return summary
+
+
 def main():
     """命令行主入口"""
     parser = argparse.ArgumentParser(
@@ -190,6 +302,7 @@ def main():
   %(prog)s NVDA --debug                 # 开启调试
   %(prog)s MSFT --analysts market news fundamentals  # 只选3个分析师
   %(prog)s TSLA --llm-provider anthropic --deep-think claude-sonnet-4-20250514
+  %(prog)s --symbols-file watchlist.txt --workers 4   # 批量分析列表中的所有股票
 
 可用分析师: market, social, news, fundamentals, candlestick
 可用提供商: openai, anthropic, google, xai, openrouter, ollama
@@ -209,16 +322,19 @@ def main():
     parser.add_argument("--backend-url", dest="backend_url", help="API 端点 URL")
     parser.add_argument("--debate-rounds", type=int, default=2, help="辩论轮数 (默认: 2)")
     parser.add_argument("--lang", choices=["zh", "en"], help="输出语言")
+    parser.add_argument("--compute-workers", type=int, dest="compute_workers",
+                        help="指标/形态计算进程数 (默认: 0，在当前进程计算)")
+    parser.add_argument("--symbols-file", dest="symbols_file",
+                        help="批量分析：股票列表文件 (每行一个代码，# 为注释)，指定后忽略 symbol 参数")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS,
+                        help=f"批量分析的工作线程数 (默认: {BATCH_WORKERS})")
 
     args = parser.parse_args()
 
     # 默认日期
     date = args.date or datetime.now().strftime("%Y-%m-%d")
 
-    run_trading_analysis(
-        symbol=args.symbol,
-        date=date,
-        debug=args.debug,
+    options = dict(
         llm_provider=args.llm_provider,
         deep_think_llm=args.deep_think_llm,
         quick_think_llm=args.quick_think_llm,
@@ -226,7 +342,12 @@ def main():
         max_debate_rounds=args.debate_rounds,
         analysts=args.analysts,
         output_lang=args.lang,
+        compute_workers=args.compute_workers,
     )
+    if args.symbols_file:
+        run_batch_analysis(args.symbols_file, date, workers=args.workers, debug=args.debug, **options)
+    else:
+        run_trading_analysis(symbol=args.symbol, date=date, debug=args.debug, **options)
 
 
 if __name__ == "__main__":
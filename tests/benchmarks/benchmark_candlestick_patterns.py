@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+蜡烛图形态识别性能基准测试
+
+detect（形态位集合）与 identify_patterns（解码为记录）在不同数据长度上的耗时；
+逐行 iloc 的旧实现在 10 年日线（2520 根）上约 0.8 秒
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from tradingagents.dataflows.patterns import CandlestickPatternRecognizer
+
+
+def generate_test_data(n_rows):
+    """生成测试数据"""
+    rng = np.random.default_rng(42)
+    close = 100 + np.cumsum(rng.standard_normal(n_rows))
+    open_ = close + rng.standard_normal(n_rows) * rng.choice([0.05, 0.5, 1.5], n_rows)
+    return pd.DataFrame({
+        'timestamp': pd.bdate_range('2015-01-01', periods=n_rows).strftime('%Y-%m-%d'),
+        'open': open_,
+        'high': np.maximum(open_, close) + np.abs(rng.standard_normal(n_rows)),
+        'low': np.minimum(open_, close) - np.abs(rng.standard_normal(n_rows)),
+        'close': close,
+        'volume': rng.integers(100000, 1000000, n_rows),
+    })
+
+
+def benchmark(func, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    print("=" * 80)
+    print("蜡烛图形态识别性能基准测试")
+    print("=" * 80)
+    print(f"{'K线数':>8} {'detect':>12} {'identify_patterns':>20} {'识别到形态的K线':>16}")
+    print("-" * 80)
+
+    for n_rows in [250, 2520, 10000]:
+        df = generate_test_data(n_rows)
+        detect_time = benchmark(lambda: CandlestickPatternRecognizer.detect(df))
+        identify_time = benchmark(lambda: CandlestickPatternRecognizer.identify_patterns(df))
+        n_matched = np.count_nonzero(CandlestickPatternRecognizer.detect(df)[0])
+        print(f"{n_rows:>8} {detect_time * 1000:>10.2f}ms {identify_time * 1000:>18.2f}ms {n_matched:>16}")
+
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
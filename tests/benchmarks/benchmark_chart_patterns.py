@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+图表形态识别性能基准测试
+
+- 峰谷检测：逐点双重循环（旧实现）与滑动窗口极值比较
+- 逐根K线滚动识别：每根K线整体重新识别 与 RollingChartPatterns 复用峰谷
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from tradingagents.constants import PEAK_TROUGH_WINDOW
+from tradingagents.dataflows.patterns import ChartPatterns, RollingChartPatterns
+from tradingagents.dataflows.patterns.detectors import find_pivots
+
+
+def generate_test_data(n_rows):
+    """生成测试数据"""
+    rng = np.random.default_rng(42)
+    close = 100 + np.cumsum(rng.standard_normal(n_rows))
+    return pd.DataFrame({
+        'open': close,
+        'high': close + np.abs(rng.standard_normal(n_rows)),
+        'low': close - np.abs(rng.standard_normal(n_rows)),
+        'close': close,
+        'volume': rng.integers(100000, 1000000, n_rows),
+    })
+
+
+def loop_pivots(df, window=PEAK_TROUGH_WINDOW):
+    """旧实现：逐点与前后 window 个数据点比较"""
+    highs, lows = df['high'].values, df['low'].values
+    peaks, troughs = [], []
+    for i in range(window, len(df) - window):
+        if all(highs[i] > highs[j] for j in range(i - window, i + window + 1) if j != i):
+            peaks.append(i)
+        if all(lows[i] < lows[j] for j in range(i - window, i + window + 1) if j != i):
+            troughs.append(i)
+    return peaks, troughs
+
+
+def benchmark(func, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    print("=" * 80)
+    print("图表形态识别性能基准测试")
+    print("=" * 80)
+
+    print(f"{'K线数':>8} {'逐点循环':>12} {'滑动窗口':>12} {'加速比':>8}")
+    print("-" * 80)
+    for n_rows in [60, 2520, 10000]:
+        df = generate_test_data(n_rows)
+        loop_time = benchmark(lambda: loop_pivots(df))
+        vector_time = benchmark(lambda: find_pivots(df['high'].values, df['low'].values))
+        print(f"{n_rows:>8} {loop_time * 1000:>10.2f}ms {vector_time * 1000:>10.3f}ms {loop_time / vector_time:>7.0f}x")
+
+    print("\n逐根K线滚动识别（lookback=60，10 年日线）")
+    print("-" * 80)
+    df = generate_test_data(2520)
+    start = time.perf_counter()
+    for t in range(60, len(df) + 1):
+        ChartPatterns.identify_all_patterns(df.iloc[:t], 60)
+    full_time = time.perf_counter() - start
+    start = time.perf_counter()
+    RollingChartPatterns(lookback=60).update_frame(df)
+    rolling_time = time.perf_counter() - start
+    print(f"每根K线整体识别: {full_time:.2f}s")
+    print(f"RollingChartPatterns: {rolling_time:.2f}s")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+计算进程池性能基准测试
+
+扫描 1000 只股票的全部指标（tail=1，只取最新一行）和图表形态，
+对比当前进程计算（workers=0）与不同工作进程数；进程池已预热，不含启动时间
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from tradingagents.dataflows.compute_service import ComputeService
+
+
+def generate_universe(n_symbols, n_rows=250):
+    """生成测试数据"""
+    rng = np.random.default_rng(42)
+    universe = {}
+    for i in range(n_symbols):
+        close = 100 + np.cumsum(rng.standard_normal(n_rows))
+        universe[f"SYM{i:04d}"] = pd.DataFrame({
+            'timestamp': pd.bdate_range('2024-01-01', periods=n_rows).strftime('%Y-%m-%d'),
+            'open': close,
+            'high': close + np.abs(rng.standard_normal(n_rows)),
+            'low': close - np.abs(rng.standard_normal(n_rows)),
+            'close': close,
+            'volume': rng.integers(100000, 1000000, n_rows),
+        })
+    return universe
+
+
+def main():
+    n_symbols = 1000
+    cpus = os.cpu_count() or 1
+    print("=" * 80)
+    print(f"计算进程池性能基准测试（{n_symbols} 只股票 x 250 根K线，CPU 核数: {cpus}）")
+    print("=" * 80)
+
+    universe = generate_universe(n_symbols)
+    worker_counts = sorted({0, 1, 2, 4, cpus})
+    baseline = None
+
+    print(f"{'工作进程':>8} {'全部指标(tail=1)':>18} {'图表形态':>12} {'加速比':>8}")
+    print("-" * 80)
+    for workers in worker_counts:
+        with ComputeService(workers=workers) as service:
+            start = time.perf_counter()
+            latest = service.compute_indicators_batch(universe, tail=1)
+            indicator_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            service.chart_patterns_batch(universe)
+            chart_time = time.perf_counter() - start
+
+        assert len(latest) == n_symbols
+        total = indicator_time + chart_time
+        baseline = baseline or total
+        print(f"{workers:>8} {indicator_time * 1000:>16.0f}ms {chart_time * 1000:>10.0f}ms {baseline / total:>7.1f}x")
+
+    print("=" * 80)
+    print("注: workers=0 的多只股票指标同样按面板计算；工作进程数超过 CPU 核数时没有额外收益")
+
+
+if __name__ == "__main__":
+    main()
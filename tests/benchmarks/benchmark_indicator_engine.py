@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+指标引擎性能基准测试
+
+对比逐列 df[...] = ... 插入（各指标类依次计算）与 IndicatorEngine 预分配缓冲区的
+耗时和峰值内存（tracemalloc）
+"""
+
+import sys
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from tradingagents.dataflows.indicators.engine import IndicatorEngine
+from tests.unit.test_indicator_engine import calculate_with_facades
+
+
+def generate_dataset(n_rows):
+    """生成测试数据"""
+    np.random.seed(42)
+    close = 100 + np.cumsum(np.random.randn(n_rows))
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2000-01-01', periods=n_rows, freq='D').strftime('%Y-%m-%d'),
+        'open': close + np.random.randn(n_rows) * 0.5,
+        'high': close + np.abs(np.random.randn(n_rows)) + 0.5,
+        'low': close - np.abs(np.random.randn(n_rows)) - 0.5,
+        'close': close,
+        'volume': np.random.randint(1000000, 5000000, n_rows),
+    })
+
+
+def measure(fn, df, n_iterations=5):
+    """返回 (平均耗时, 峰值内存字节)"""
+    fn(df)  # 预热
+    times = []
+    for _ in range(n_iterations):
+        start = time.perf_counter()
+        fn(df)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(df)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sum(times) / len(times), peak
+
+
+def main():
+    warnings.simplefilter("ignore", pd.errors.PerformanceWarning)
+    print("=" * 80)
+    print("指标引擎性能基准测试")
+    print("=" * 80)
+
+    for n_rows in [1000, 5000, 20000]:
+        df = generate_dataset(n_rows)
+        old_time, old_peak = measure(calculate_with_facades, df)
+        new_time, new_peak = measure(lambda d: IndicatorEngine(d).compute_all(), df)
+
+        print(f"\n数据规模: {n_rows}行")
+        print("-" * 80)
+        print(f"  逐列插入: {old_time * 1000:8.2f}ms  峰值内存: {old_peak / 1e6:7.2f}MB")
+        print(f"  指标引擎: {new_time * 1000:8.2f}ms  峰值内存: {new_peak / 1e6:7.2f}MB")
+        print(f"  耗时比: {new_time / old_time:.2f}  内存比: {new_peak / old_peak:.2f}")
+
+    print("\n" + "=" * 80)
+    print("✅ 基准测试完成")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+多股票面板指标计算性能基准测试
+
+对比逐只调用 calculate_all_indicators 与 calculate_panel（全部股票一次计算）
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from tradingagents.dataflows.complete_indicators import CompleteTechnicalIndicators
+
+
+def generate_universe(n_symbols, n_rows=250):
+    """生成测试数据（每三只股票中有一只历史较短）"""
+    rng = np.random.default_rng(42)
+    universe = {}
+    for i in range(n_symbols):
+        n = n_rows if i % 3 else n_rows * 2 // 3
+        close = 100 + np.cumsum(rng.standard_normal(n))
+        universe[f"SYM{i:04d}"] = pd.DataFrame({
+            'timestamp': pd.bdate_range('2024-01-01', periods=n).strftime('%Y-%m-%d'),
+            'open': close,
+            'high': close + np.abs(rng.standard_normal(n)),
+            'low': close - np.abs(rng.standard_normal(n)),
+            'close': close,
+            'volume': rng.integers(100000, 1000000, n),
+        })
+    return universe
+
+
+def main():
+    print("=" * 80)
+    print("多股票面板指标计算性能基准测试（每只约 250 根K线）")
+    print("=" * 80)
+
+    for n_symbols in [50, 200, 500]:
+        universe = generate_universe(n_symbols)
+
+        start = time.perf_counter()
+        expected = {
+            symbol: CompleteTechnicalIndicators.calculate_all_indicators(df)
+            for symbol, df in universe.items()
+        }
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = CompleteTechnicalIndicators.calculate_panel(universe)
+        panel_time = time.perf_counter() - start
+
+        for symbol in universe:
+            pd.testing.assert_frame_equal(actual[symbol], expected[symbol], check_exact=True)
+
+        print(f"\n股票数量: {n_symbols}")
+        print("-" * 80)
+        print(f"  逐只计算: {loop_time * 1000:8.1f}ms")
+        print(f"  面板计算: {panel_time * 1000:8.1f}ms")
+        print(f"  加速比:   {loop_time / panel_time:6.1f}x")
+        print("  ✅ 结果逐位一致")
+
+    print("\n" + "=" * 80)
+    print("✅ 基准测试完成")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+滚动回归 / CCI 内核性能基准测试
+
+对比 rolling(...).apply(python_callback) 与跨步窗口向量化实现
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from tradingagents.dataflows.indicators.additional_indicators import AdditionalIndicators
+from tradingagents.dataflows.indicators.trend_indicators import TrendIndicators
+from tests.unit.test_rolling_kernels import (
+    reference_cci,
+    reference_lr_pred,
+    reference_slope,
+)
+
+
+def generate_dataset(n_rows=5000):
+    """生成测试数据"""
+    np.random.seed(42)
+    close = 100 + np.cumsum(np.random.randn(n_rows))
+    return pd.DataFrame({
+        'high': close + np.abs(np.random.randn(n_rows)),
+        'low': close - np.abs(np.random.randn(n_rows)),
+        'close': close,
+    })
+
+
+def timed(fn, n_iterations=3):
+    """返回平均耗时和最后一次结果"""
+    times = []
+    result = None
+    for _ in range(n_iterations):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return sum(times) / len(times), result
+
+
+def main():
+    print("=" * 80)
+    print("滚动回归 / CCI 内核性能基准测试")
+    print("=" * 80)
+
+    for n_rows in [1000, 5000]:
+        df = generate_dataset(n_rows)
+        close = df["close"]
+        cases = [
+            ("trend_slope_20", lambda: reference_slope(close, 20),
+             lambda: TrendIndicators.rolling_slope(close, 20)),
+            ("lr_pred_20", lambda: reference_lr_pred(close, 20),
+             lambda: TrendIndicators.rolling_lr_pred(close, 20)),
+            ("cci_20", lambda: reference_cci(df, 20),
+             lambda: AdditionalIndicators.cci(df, 20)),
+        ]
+
+        print(f"\n数据规模: {n_rows}行")
+        print("-" * 80)
+        for name, old_fn, new_fn in cases:
+            old_time, expected = timed(old_fn)
+            new_time, actual = timed(new_fn, n_iterations=10)
+            max_diff = np.nanmax(np.abs(actual.to_numpy() - expected.to_numpy()))
+            print(f"  {name:<16} 回调: {old_time * 1000:8.2f}ms  向量化: {new_time * 1000:6.2f}ms  "
+                  f"加速比: {old_time / new_time:6.1f}x  最大误差: {max_diff:.1e}")
+
+    print("\n" + "=" * 80)
+    print("✅ 基准测试完成")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
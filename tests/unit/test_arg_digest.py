@@ -0,0 +1,64 @@
+"""
+测试大参数摘要 - 缓存键、日志参数与记忆
+"""
+
+import pandas as pd
+
+from tradingagents.dataflows.core.arg_digest import digest_args, digest_value, get_digest_stats
+from tradingagents.dataflows.data_cache import DataCache
+
+
+def _csv(rows=2000, close=1.5):
+    return "timestamp,close\n" + "\n".join(f"2025-01-{i % 28 + 1:02d},{close}" for i in range(rows))
+
+
+class TestDigestValue:
+    """测试单个参数摘要"""
+
+    def test_small_values_pass_through(self):
+        assert digest_value("NVDA") == "NVDA"
+        assert digest_value(30) == 30
+
+    def test_large_string_replaced(self):
+        text = _csv()
+        digest = digest_value(text)
+        assert digest.startswith("<str:")
+        assert len(digest) < 80
+
+    def test_equal_content_equal_digest(self):
+        assert digest_value(_csv()) == digest_value(_csv())
+        assert digest_value(_csv(close=1.5)) != digest_value(_csv(close=1.6))
+
+    def test_same_object_hashed_once(self):
+        text = _csv(rows=3000)
+        before = get_digest_stats()
+        for _ in range(5):
+            digest_value(text)
+        after = get_digest_stats()
+        assert after["hashed"] - before["hashed"] == 1
+        assert after["memo_hits"] - before["memo_hits"] == 4
+
+    def test_dataframe_digest_tracks_content(self):
+        df = pd.DataFrame({"close": [1.0, 2.0, 3.0]})
+        first = digest_value(df)
+        df.loc[0, "close"] = 9.0
+        assert digest_value(df) != first
+
+
+class TestCacheKeyWithDigest:
+    """测试缓存键使用摘要"""
+
+    def test_key_matches_for_equal_content(self, tmp_path):
+        cache = DataCache(cache_dir=str(tmp_path), sweep_interval_seconds=0)
+        try:
+            cache.set("get_all_indicators", "result", "NVDA", "2025-02-01", 30, _csv())
+            assert cache.get("get_all_indicators", "NVDA", "2025-02-01", 30, _csv()) == "result"
+        finally:
+            cache.close()
+
+    def test_digest_args_kwargs(self):
+        args, kwargs = digest_args(("NVDA", _csv()), {"stock_data": _csv(), "days": 5})
+        assert args[0] == "NVDA"
+        assert args[1].startswith("<str:")
+        assert kwargs["stock_data"] == args[1]
+        assert kwargs["days"] == 5
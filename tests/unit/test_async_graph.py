@@ -0,0 +1,151 @@
+"""
+测试异步图执行 - 步骤驱动、异步节点和并行分支中 LLM 调用的并发限制
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from tradingagents.agents.risk_mgmt.aggressive_debator import create_aggressive_debator
+from tradingagents.agents.utils.node_steps import (
+    Invoke,
+    LLMCall,
+    Sleep,
+    arun_step,
+    run_step,
+    step_node,
+)
+from tradingagents.dataflows.config import get_config
+from tradingagents.graph.conditional_logic import ConditionalLogic
+from tradingagents.graph.setup import GraphSetup
+from tradingagents.llm_clients.concurrency import get_provider_limiter, reset_provider_limiters
+from tradingagents.llm_clients.pacing import reset_llm_pacers
+
+
+class AsyncOnlyLLM:
+    """只实现 ainvoke 的 LLM：同步调用即失败，用来确认异步路径没有走 invoke"""
+
+    def __init__(self, content="PREDICTION: BUY Confidence: 70%"):
+        self.content = content
+        self.calls = 0
+
+    def invoke(self, input, config=None):
+        raise AssertionError("async path must not call invoke")
+
+    async def ainvoke(self, input, config=None):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return AIMessage(content=self.content)
+
+
+class SlowAsyncLLM:
+    """每次异步调用耗时 delay 秒的 LLM"""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+
+    async def ainvoke(self, input, config=None):
+        await asyncio.sleep(self.delay)
+        return AIMessage(content="report")
+
+
+def risk_state():
+    return {
+        "risk_debate_state": {"history": "", "count": 0},
+        "market_report": "m", "sentiment_report": "s", "news_report": "n",
+        "fundamentals_report": "f", "candlestick_report": "c",
+        "trader_investment_plan": "plan",
+    }
+
+
+class TestStepDrivers:
+    """测试同步/异步步骤驱动"""
+
+    def test_sync_and_async_drivers_agree(self):
+        """同一个步骤在两种驱动下结果相同，调用失败时异常回到步骤内部"""
+        double = RunnableLambda(lambda x: x * 2)
+        fail = RunnableLambda(lambda x: 1 / 0)
+
+        def step(state):
+            value = yield Invoke(double, state["x"])
+            yield Sleep(0)
+            try:
+                yield Invoke(fail, value)
+            except ZeroDivisionError:
+                value += 100
+            return {"x": value}
+
+        assert run_step(step({"x": 2})) == {"x": 104}
+        assert asyncio.run(arun_step(step({"x": 2}))) == {"x": 104}
+
+        node = step_node(step)
+        assert node({"x": 1}) == {"x": 102}
+        assert asyncio.run(node.ainvoke({"x": 1})) == {"x": 102}
+
+
+class TestAsyncNodes:
+    """测试智能体节点的异步执行"""
+
+    def test_risk_debator_uses_ainvoke(self):
+        """异步执行风险辩论节点时只调用 LLM 的 ainvoke"""
+        llm = AsyncOnlyLLM()
+        node = create_aggressive_debator(llm)
+        update = asyncio.run(node.ainvoke(risk_state()))
+
+        assert llm.calls == 1
+        debate = update["risk_debate_state"]
+        assert debate["count"] == 1
+        assert debate["latest_speaker"] == "Aggressive"
+        assert "PREDICTION: BUY" in debate["current_aggressive_response"]
+
+    def test_nodes_share_one_event_loop(self):
+        """多个运行的节点可以在同一个事件循环上并发"""
+        llm = AsyncOnlyLLM()
+        node = create_aggressive_debator(llm)
+
+        async def run_many():
+            return await asyncio.gather(*(node.ainvoke(risk_state()) for _ in range(5)))
+
+        updates = asyncio.run(run_many())
+        assert llm.calls == 5
+        assert all(u["risk_debate_state"]["count"] == 1 for u in updates)
+
+
+class TestAsyncParallelAnalysts:
+    """测试并行分析师分支的异步执行"""
+
+    def setup_method(self):
+        reset_llm_pacers()
+        reset_provider_limiters()
+
+    teardown_method = setup_method
+
+    def test_branch_llm_calls_respect_limiter(self):
+        """并发上限在每次 LLM 调用上生效：分支数超过上限时不会嵌套占用而死锁"""
+        limiter = get_provider_limiter(get_config()["llm_provider"], 2)
+        setup = GraphSetup(
+            MagicMock(), MagicMock(), {}, {}, MagicMock(), MagicMock(), MagicMock(),
+            ConditionalLogic(), parallel_analysts=True,
+        )
+        llm = SlowAsyncLLM()
+
+        def fake_analyst(state):
+            first = yield LLMCall(llm, "tools")
+            report = yield LLMCall(llm, "report")
+            return {"messages": [first, report], "news_report": report.content}
+
+        node = setup._wrap_parallel_analyst("news", step_node(fake_analyst))
+        human = HumanMessage(content="NVDA", id="h1")
+
+        async def run_many():
+            return await asyncio.gather(
+                *(node.ainvoke({"messages": [human], "news_messages": []}) for _ in range(6))
+            )
+
+        updates = asyncio.run(run_many())
+        stats = limiter.get_stats()
+        assert stats["peak_in_flight"] == 2
+        assert stats["total_acquired"] == 12 and stats["in_flight"] == 0
+        assert [m.content for m in updates[0]["news_messages"]] == ["NVDA", "report", "report"]
@@ -0,0 +1,91 @@
+"""
+测试异步 HTTP 客户端与结构化并发
+"""
+
+import asyncio
+
+import pytest
+
+from tradingagents.dataflows.async_http import (
+    aclose_async_client,
+    gather_structured,
+    get_async_client,
+)
+
+
+class TestGatherStructured:
+    """测试 gather_structured"""
+
+    def test_results_in_order(self):
+        async def value(v, delay):
+            await asyncio.sleep(delay)
+            return v
+
+        result = asyncio.run(gather_structured(value(1, 0.02), value(2, 0.0), value(3, 0.01)))
+        assert result == [1, 2, 3]
+
+    def test_failure_cancels_siblings(self):
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def broken():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def main():
+            with pytest.raises(ValueError):
+                await gather_structured(slow(), broken(), slow())
+            # 返回前已等待兄弟任务结束
+            return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+        assert asyncio.run(main()) == []
+        assert cancelled == [True, True]
+
+    def test_caller_cancellation_propagates(self):
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def main():
+            task = asyncio.ensure_future(gather_structured(slow(), slow()))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        assert cancelled == [True, True]
+
+    def test_empty(self):
+        assert asyncio.run(gather_structured()) == []
+
+
+class TestAsyncClient:
+    """测试共享 AsyncClient"""
+
+    def test_one_client_per_loop(self):
+        async def main():
+            first = get_async_client()
+            assert get_async_client() is first
+            await aclose_async_client()
+            assert first.is_closed
+            return first
+
+        first = asyncio.run(main())
+        second = asyncio.run(main())
+        assert first is not second
+
+    def test_requires_running_loop(self):
+        with pytest.raises(RuntimeError):
+            get_async_client()
@@ -3,13 +3,17 @@
 """
 import pytest
 import asyncio
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from tradingagents.dataflows.async_data_loader import AsyncDataLoader
+from tradingagents.dataflows.vendor_models import DataFetchError
 
 # _load_stock_data / _calculate_indicators / _format_indicator 现在在 mixin 中，
 # 需要 patch mixin 模块的 route_to_vendor
 MIXIN_ROUTE = 'tradingagents.dataflows.data_loader_mixin.route_to_vendor'
 LOADER_ROUTE = 'tradingagents.dataflows.async_data_loader.route_to_vendor'
+# load_all_data_async 走原生异步数据路径
+MIXIN_AROUTE = 'tradingagents.dataflows.data_loader_mixin.aroute_to_vendor'
+LOADER_AROUTE = 'tradingagents.dataflows.async_data_loader.aroute_to_vendor'
 
 
 class TestAsyncDataLoader:
@@ -81,8 +85,8 @@ class TestAsyncDataLoader:
         assert loader.get_indicator("rsi") == "test_rsi"
         assert "not available" in loader.get_indicator("unknown")
     
-    @patch(MIXIN_ROUTE)
-    @patch(LOADER_ROUTE)
+    @patch(MIXIN_AROUTE, new_callable=AsyncMock)
+    @patch(LOADER_AROUTE, new_callable=AsyncMock)
     def test_async_load_all_data(self, mock_loader_route, mock_mixin_route):
         """测试异步加载所有数据"""
         mock_loader_route.return_value = "mock_data"
@@ -91,12 +95,14 @@ class TestAsyncDataLoader:
         loader = AsyncDataLoader("AAPL", "2024-01-01", max_workers=2)
         asyncio.run(loader.load_all_data_async())
         
-        # 验证多个数据源被调用 (mixin中1次 + loader中至少5次)
-        total_calls = mock_loader_route.call_count + mock_mixin_route.call_count
-        assert total_calls >= 6  # 至少6个数据源
+        # 验证多个数据源被调用 (mixin中1次 + loader中6次)
+        assert mock_mixin_route.await_count == 1
+        assert mock_loader_route.await_count == 6
+        assert loader.fundamentals == "mock_data"
+        assert loader.global_news == "mock_data"
     
-    @patch(MIXIN_ROUTE)
-    @patch(LOADER_ROUTE)
+    @patch(MIXIN_AROUTE, new_callable=AsyncMock)
+    @patch(LOADER_AROUTE, new_callable=AsyncMock)
     def test_sync_load_wrapper(self, mock_loader_route, mock_mixin_route):
         """测试同步包装器"""
         mock_loader_route.return_value = "mock_data"
@@ -106,5 +112,36 @@ class TestAsyncDataLoader:
         loader.load_all_data_sync()
         
         # 验证同步调用也能工作
-        total_calls = mock_loader_route.call_count + mock_mixin_route.call_count
+        total_calls = mock_loader_route.await_count + mock_mixin_route.await_count
         assert total_calls >= 6
+    
+    @patch(MIXIN_AROUTE, new_callable=AsyncMock)
+    @patch(LOADER_AROUTE, new_callable=AsyncMock)
+    def test_indicators_computed_after_async_load(self, mock_loader_route, mock_mixin_route):
+        """测试股票数据加载后计算指标"""
+        rows = "\n".join(
+            f"2024-01-{d:02d},100,105,95,{100 + d},1000000" for d in range(1, 31)
+        )
+        mock_mixin_route.return_value = "date,open,high,low,close,volume\n" + rows
+        mock_loader_route.side_effect = DataFetchError("all vendors failed")
+        
+        loader = AsyncDataLoader("AAPL", "2024-01-31")
+        asyncio.run(loader.load_all_data_async())
+        
+        assert "rsi" in loader.indicators
+        assert loader.fundamentals.startswith("Error loading fundamentals")
+    
+    @patch(MIXIN_AROUTE, new_callable=AsyncMock)
+    @patch(LOADER_AROUTE, new_callable=AsyncMock)
+    def test_load_many(self, mock_loader_route, mock_mixin_route):
+        """测试并发加载多只股票"""
+        mock_loader_route.return_value = "mock_data"
+        mock_mixin_route.return_value = "mock_data"
+        
+        loaders = asyncio.run(
+            AsyncDataLoader.load_many(["AAPL", "NVDA", "TSLA"], "2024-01-01", max_concurrency=2)
+        )
+        
+        assert list(loaders) == ["AAPL", "NVDA", "TSLA"]
+        assert all(l.fundamentals == "mock_data" for l in loaders.values())
+        assert mock_mixin_route.await_count == 3
@@ -0,0 +1,207 @@
+"""
+测试区间感知K线存储 - 缺口计算、子区间命中、持久化与数据源格式归一化
+"""
+
+import time
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.bar_store import (
+    BarStore,
+    merge_intervals,
+    missing_intervals,
+    normalize_ohlcv_csv,
+)
+from tradingagents.dataflows.trading_calendar import NYSE
+
+
+def _fake_vendor(calls):
+    """按工作日生成K线的假数据源（end 为开区间，模拟 yfinance）"""
+    def fetch(symbol, start_date, end_date):
+        calls.append((start_date, end_date))
+        days = pd.bdate_range(start_date, pd.Timestamp(end_date) - pd.Timedelta(days=1))
+        df = pd.DataFrame({
+            "timestamp": days.strftime("%Y-%m-%d"),
+            "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5,
+            "volume": 100, "adjusted_close": 1.5,
+        })
+        return df.to_csv(index=False)
+    return fetch
+
+
+class TestIntervals:
+    """测试区间运算"""
+
+    def test_merge_adjacent_and_overlapping(self):
+        d = date(2025, 1, 1)
+        merged = merge_intervals([
+            (d, d + timedelta(days=5)),
+            (d + timedelta(days=6), d + timedelta(days=8)),
+            (d + timedelta(days=20), d + timedelta(days=25)),
+            (d + timedelta(days=22), d + timedelta(days=30)),
+        ])
+        assert merged == [(d, d + timedelta(days=8)), (d + timedelta(days=20), d + timedelta(days=30))]
+
+    def test_missing_intervals(self):
+        d = date(2025, 1, 1)
+        covered = [(d + timedelta(days=5), d + timedelta(days=10))]
+        gaps = missing_intervals(covered, d, d + timedelta(days=15))
+        assert gaps == [
+            (d, d + timedelta(days=4)),
+            (d + timedelta(days=11), d + timedelta(days=15)),
+        ]
+        assert missing_intervals(covered, d + timedelta(days=6), d + timedelta(days=9)) == []
+
+
+class TestBarStore:
+    """测试K线存储"""
+
+    def test_sub_range_served_without_fetch(self, tmp_path):
+        calls = []
+        store = BarStore(str(tmp_path))
+        store.get_range("NVDA", "2025-01-01", "2025-06-30", _fake_vendor(calls))
+        assert len(calls) == 1
+
+        csv_text, gaps = store.get_range("NVDA", "2025-02-03", "2025-03-31", _fake_vendor(calls))
+        df = normalize_ohlcv_csv(csv_text)
+        assert gaps == 0
+        assert len(calls) == 1
+        assert df.index[0] == "2025-02-03"
+        assert df.index[-1] == "2025-03-31"
+
+    def test_only_new_bars_fetched(self, tmp_path):
+        calls = []
+        store = BarStore(str(tmp_path))
+        store.get_range("NVDA", "2025-01-01", "2025-06-30", _fake_vendor(calls))
+        csv_text, gaps = store.get_range("NVDA", "2025-01-02", "2025-07-03", _fake_vendor(calls))
+
+        assert gaps == 1
+        assert calls[-1][0] == "2025-07-01"
+        df = normalize_ohlcv_csv(csv_text)
+        assert df.index[-1] == "2025-07-03"
+        assert store.get_stats()["bars_fetched"] == len(pd.bdate_range("2025-01-01", "2025-07-03"))
+
+    def test_weekend_only_gap_skipped(self, tmp_path):
+        calls = []
+        store = BarStore(str(tmp_path))
+        # 2025-06-27 是周五
+        store.get_range("NVDA", "2025-01-01", "2025-06-27", _fake_vendor(calls))
+        _, gaps = store.get_range("NVDA", "2025-01-01", "2025-06-29", _fake_vendor(calls))
+        assert gaps == 0
+        assert len(calls) == 1
+
+    def test_open_session_not_marked_covered(self, tmp_path, monkeypatch):
+        calls = []
+        store = BarStore(str(tmp_path))
+        # 2025-06-25 周三盘中
+        monkeypatch.setattr(NYSE, "now", lambda: datetime(2025, 6, 25, 11, 0, tzinfo=NYSE.tz))
+        store.get_range("NVDA", "2025-05-26", "2025-06-25", _fake_vendor(calls))
+        covered = store.covered_intervals("NVDA")
+        assert covered[-1][1] == "2025-06-24"
+
+    def test_open_session_reused_within_ttl(self, tmp_path, monkeypatch):
+        calls = []
+        store = BarStore(str(tmp_path), intraday_ttl_seconds=0.2)
+        monkeypatch.setattr(NYSE, "now", lambda: datetime(2025, 6, 25, 11, 0, tzinfo=NYSE.tz))
+        store.get_range("NVDA", "2025-05-26", "2025-06-25", _fake_vendor(calls))
+        _, gaps = store.get_range("NVDA", "2025-05-27", "2025-06-25", _fake_vendor(calls))
+        assert gaps == 0
+
+        time.sleep(0.3)
+        _, gaps = store.get_range("NVDA", "2025-05-26", "2025-06-25", _fake_vendor(calls))
+        assert gaps == 1
+        assert calls[-1] == ("2025-06-25", "2025-06-26")
+
+    def test_weekend_after_close_fully_covered(self, tmp_path, monkeypatch):
+        calls = []
+        store = BarStore(str(tmp_path))
+        # 2025-06-28 周六：周五已收盘，周末没有K线
+        monkeypatch.setattr(NYSE, "now", lambda: datetime(2025, 6, 28, 10, 0, tzinfo=NYSE.tz))
+        store.get_range("NVDA", "2025-05-26", "2025-06-28", _fake_vendor(calls))
+        assert store.covered_intervals("NVDA")[-1][1] == "2025-06-28"
+        _, gaps = store.get_range("NVDA", "2025-05-26", "2025-06-29", _fake_vendor(calls))
+        assert gaps == 0
+
+    def test_close_not_final_until_settled(self, tmp_path, monkeypatch):
+        """收盘后定稿缓冲内，当天K线不计入覆盖（数据源可能修正最后一根K线）"""
+        calls = []
+        store = BarStore(str(tmp_path), settle_seconds=1800)
+        monkeypatch.setattr(NYSE, "now", lambda: datetime(2025, 6, 25, 16, 5, tzinfo=NYSE.tz))
+        store.get_range("NVDA", "2025-05-26", "2025-06-25", _fake_vendor(calls))
+        assert store.covered_intervals("NVDA")[-1][1] == "2025-06-24"
+
+        monkeypatch.setattr(NYSE, "now", lambda: datetime(2025, 6, 25, 16, 40, tzinfo=NYSE.tz))
+        store.invalidate("NVDA")
+        store.get_range("NVDA", "2025-05-26", "2025-06-25", _fake_vendor(calls))
+        assert store.covered_intervals("NVDA")[-1][1] == "2025-06-25"
+
+    def test_lagging_vendor_latest_session_not_covered(self, tmp_path, monkeypatch):
+        """数据源还没有最近一个交易日的K线时，只覆盖到实际返回的最后一根，之后再补"""
+        calls = []
+        store = BarStore(str(tmp_path), intraday_ttl_seconds=0)
+        # 2025-06-26 周四盘前：最近定稿的交易日是 06-25，但数据源只返回到 06-24
+        monkeypatch.setattr(NYSE, "now", lambda: datetime(2025, 6, 26, 8, 0, tzinfo=NYSE.tz))
+        lagging = _fake_vendor(calls)
+        store.get_range("NVDA", "2025-05-26", "2025-06-25",
+                        lambda symbol, start, end: lagging(symbol, start, min(end, "2025-06-25")))
+        assert store.covered_intervals("NVDA")[-1][1] == "2025-06-24"
+
+        _, gaps = store.get_range("NVDA", "2025-05-26", "2025-06-25", _fake_vendor(calls))
+        assert gaps == 1 and calls[-1] == ("2025-06-25", "2025-06-26")
+        assert store.covered_intervals("NVDA")[-1][1] == "2025-06-25"
+
+    def test_holiday_only_gap_skipped(self, tmp_path):
+        calls = []
+        store = BarStore(str(tmp_path))
+        # 2025-07-03 周四为最后交易日，07-04 独立日休市
+        store.get_range("NVDA", "2025-06-01", "2025-07-03", _fake_vendor(calls))
+        _, gaps = store.get_range("NVDA", "2025-06-01", "2025-07-06", _fake_vendor(calls))
+        assert gaps == 0
+
+    def test_persisted_across_instances(self, tmp_path):
+        calls = []
+        BarStore(str(tmp_path)).get_range("NVDA", "2025-01-01", "2025-06-30", _fake_vendor(calls))
+        store = BarStore(str(tmp_path))
+        csv_text, gaps = store.get_range("NVDA", "2025-03-01", "2025-04-30", _fake_vendor(calls))
+        assert gaps == 0
+        assert len(calls) == 1
+        df = normalize_ohlcv_csv(csv_text)
+        assert df["volume"].dtype.kind == "i"
+
+    def test_invalidate_symbol(self, tmp_path):
+        calls = []
+        store = BarStore(str(tmp_path))
+        store.get_range("NVDA", "2025-01-01", "2025-02-28", _fake_vendor(calls))
+        store.invalidate("NVDA")
+        store.get_range("NVDA", "2025-01-01", "2025-02-28", _fake_vendor(calls))
+        assert len(calls) == 2
+
+
+class TestNormalize:
+    """测试各数据源格式归一化"""
+
+    def test_yfinance_format(self):
+        text = (
+            "# Stock data for NVDA from 2025-01-01 to 2025-01-05\n"
+            "# Total records: 2\n\n"
+            "Date,Open,High,Low,Close,Volume,Dividends,Stock Splits\n"
+            "2025-01-02 00:00:00,1,2,0.5,1.5,100,0,0\n"
+            "2025-01-03 00:00:00,1,2,0.5,1.6,200,0,0\n"
+        )
+        df = normalize_ohlcv_csv(text)
+        assert list(df.index) == ["2025-01-02", "2025-01-03"]
+        assert df.loc["2025-01-03", "adjusted_close"] == pytest.approx(1.6)
+
+    def test_alpha_vantage_descending(self):
+        text = (
+            "timestamp,open,high,low,close,adjusted_close,volume,dividend_amount,split_coefficient\n"
+            "2025-01-03,1,2,0.5,1.6,1.6,200,0,1\n"
+            "2025-01-02,1,2,0.5,1.5,1.5,100,0,1\n"
+        )
+        df = normalize_ohlcv_csv(text)
+        assert list(df.index) == ["2025-01-02", "2025-01-03"]
+
+    def test_unparseable_returns_none(self):
+        assert normalize_ohlcv_csv("No data found for symbol 'X'") is None
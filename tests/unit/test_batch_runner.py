@@ -0,0 +1,166 @@
+"""
+测试多股票批量运行 - 图实例复用、有界队列调度、失败隔离和耗时汇总
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from tradingagents.agents.utils.node_steps import LLMCall, run_step
+from tradingagents.dataflows.config import get_config
+from tradingagents.graph.batch_runner import BatchRunner, load_symbols
+from tradingagents.llm_clients.concurrency import get_provider_limiter, reset_provider_limiters
+from tradingagents.llm_clients.pacing import reset_llm_pacers
+
+
+class FakeGraph:
+    """propagate 耗时 delay 秒；代码在 failing 中时抛出异常"""
+
+    def __init__(self, delay=0.0, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.symbols = []
+
+    def propagate(self, symbol, trade_date):
+        self.symbols.append(symbol)
+        time.sleep(self.delay)
+        if symbol in self.failing:
+            raise RuntimeError(f"boom {symbol}")
+        if symbol == "CANCEL":
+            raise asyncio.CancelledError()
+        return {}, f"BUY {symbol} {trade_date}"
+
+
+class CountingFactory:
+    """记录创建了多少个图实例"""
+
+    def __init__(self, **graph_kwargs):
+        self.graph_kwargs = graph_kwargs
+        self.graphs = []
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        graph = FakeGraph(**self.graph_kwargs)
+        with self._lock:
+            self.graphs.append(graph)
+        return graph
+
+
+class SlowLLM:
+    """每次调用耗时 delay 秒的 LLM"""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+
+    def invoke(self, input, config=None):
+        time.sleep(self.delay)
+        return AIMessage(content=f"BUY {input}")
+
+
+class LLMGraph:
+    """每只股票经 LLMCall 调用两次 LLM（与真实节点相同的调用路径）"""
+
+    def __init__(self):
+        self.llm = SlowLLM()
+
+    def propagate(self, symbol, trade_date):
+        def step():
+            yield LLMCall(self.llm, symbol)
+            decision = yield LLMCall(self.llm, symbol)
+            return decision.content
+
+        return {}, run_step(step())
+
+
+class TestBatchRunner:
+    """测试批量运行器"""
+
+    def test_graph_built_once_per_worker(self):
+        """每个工作线程只创建一次图，跨股票复用；结果按输入顺序排列"""
+        factory = CountingFactory(delay=0.01)
+        symbols = [f"T{i}" for i in range(10)]
+        summary = BatchRunner(factory, workers=3).run(symbols, "2026-02-20")
+
+        assert len(factory.graphs) <= 3
+        assert sum(len(g.symbols) for g in factory.graphs) == 10
+        assert [r.symbol for r in summary.results] == symbols
+        assert summary.results[0].decision == "BUY T0 2026-02-20"
+        assert set(summary.graph_build_seconds) == {r.worker for r in summary.results}
+
+    def test_workers_run_concurrently(self):
+        """N 个工作线程同时分析 N 只股票"""
+        factory = CountingFactory(delay=0.2)
+        start = time.perf_counter()
+        summary = BatchRunner(factory, workers=4, queue_size=1).run(["A", "B", "C", "D"], "2026-02-20")
+        assert time.perf_counter() - start < 0.6
+        assert summary.succeeded == 4 and summary.workers == 4
+        assert all(r.seconds >= 0.2 for r in summary.results)
+
+    def test_failure_is_isolated(self):
+        """单只股票失败只记录错误，同一个工作线程继续处理后面的股票"""
+        factory = CountingFactory(failing={"BAD"})
+        completed = []
+        summary = BatchRunner(factory, workers=1).run(
+            ["A", "BAD", "C"], "2026-02-20", on_result=completed.append
+        )
+        assert [r.status for r in summary.results] == ["ok", "error", "ok"]
+        assert "boom BAD" in summary.results[1].error
+        assert len(factory.graphs) == 1 and len(completed) == 3
+        assert summary.failed == 1
+        assert "BAD" in summary.format_table()
+
+        with pytest.raises(ValueError):
+            BatchRunner(factory, workers=0)
+
+    def test_base_exception_does_not_kill_worker(self):
+        """BaseException（如 CancelledError）和回调异常只记录失败，单个工作线程继续处理，队列不会卡住"""
+        factory = CountingFactory()
+        symbols = ["A", "CANCEL", "B", "C", "D", "E"]
+
+        def on_result(result):
+            if result.symbol == "B":
+                raise RuntimeError("callback boom")
+
+        summary = BatchRunner(factory, workers=1, queue_size=1).run(symbols, "2026-02-20", on_result=on_result)
+        assert [r.status for r in summary.results] == ["ok", "error", "ok", "ok", "ok", "ok"]
+        assert summary.results[1].error == "CancelledError"
+        assert len(factory.graphs) == 1
+
+    def test_workers_share_provider_concurrency_limit(self):
+        """工作线程多于提供商并发上限时，同时在途的 LLM 调用数不超过上限"""
+        reset_llm_pacers()
+        reset_provider_limiters()
+        try:
+            limiter = get_provider_limiter(get_config()["llm_provider"], 2)
+            symbols = [f"T{i}" for i in range(10)]
+            summary = BatchRunner(LLMGraph, workers=5).run(symbols, "2026-02-20")
+
+            stats = limiter.get_stats()
+            assert summary.succeeded == 10 and summary.workers == 5
+            assert stats["peak_in_flight"] <= 2
+            assert stats["total_acquired"] == 20 and stats["in_flight"] == 0
+        finally:
+            reset_llm_pacers()
+            reset_provider_limiters()
+
+
+class TestBatchInputOutput:
+    """测试股票列表读取和汇总写入"""
+
+    def test_load_symbols_and_write_summary(self, tmp_path):
+        """列表文件支持注释、逗号分隔和去重，汇总写为 JSON"""
+        watchlist = tmp_path / "watchlist.txt"
+        watchlist.write_text("# nightly\naapl, msft\nNVDA  # gpu\n\nAAPL\nbad$sym\n", encoding="utf-8")
+        symbols = load_symbols(str(watchlist))
+        assert symbols == ["AAPL", "MSFT", "NVDA"]
+
+        summary = BatchRunner(CountingFactory(), workers=2).run(symbols, "2026-02-20")
+        path = summary.write(str(tmp_path / "batch" / "summary.json"))
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        assert data["succeeded"] == 3 and data["trade_date"] == "2026-02-20"
+        assert [r["symbol"] for r in data["results"]] == symbols
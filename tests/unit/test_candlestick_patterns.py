@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+蜡烛图形态识别单元测试
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.patterns.candlestick_patterns import (
+    CANDLESTICK_PATTERNS,
+    PATTERN_BITS,
+    CandlestickPatternRecognizer,
+)
+
+
+def reference_identify_patterns(df: pd.DataFrame):
+    """逐行循环的参考实现（向量化之前的 identify_patterns）"""
+    patterns = []
+    avg_volume = df['volume'].mean() if 'volume' in df.columns else 0
+
+    for i in range(3, len(df)):
+        prev3 = df.iloc[i-3] if i >= 3 else None
+        prev2 = df.iloc[i-2]
+        prev1 = df.iloc[i-1]
+        curr = df.iloc[i]
+
+        pattern_info = {
+            "timestamp": curr.get("timestamp", curr.get("date", i)),
+            "open": curr["open"],
+            "high": curr["high"],
+            "low": curr["low"],
+            "close": curr["close"],
+            "volume": curr.get("volume", 0),
+            "volume_confirmed": False,
+            "patterns": []
+        }
+
+        # 计算当前K线特征
+        curr_body = abs(curr["close"] - curr["open"])
+        curr_range = curr["high"] - curr["low"]
+        curr_upper_shadow = curr["high"] - max(curr["open"], curr["close"])
+        curr_lower_shadow = min(curr["open"], curr["close"]) - curr["low"]
+        curr_is_bullish = curr["close"] > curr["open"]
+        curr_is_bearish = curr["close"] < curr["open"]
+        curr_vol = curr.get("volume", avg_volume)
+
+        # 计算前一根K线特征
+        prev1_body = abs(prev1["close"] - prev1["open"])
+        prev1_range = prev1["high"] - prev1["low"]
+        prev1_is_bullish = prev1["close"] > prev1["open"]
+        prev1_is_bearish = prev1["close"] < prev1["open"]
+        prev1_vol = prev1.get("volume", avg_volume)
+
+        prev2_body = abs(prev2["close"] - prev2["open"])
+        prev2_is_bullish = prev2["close"] > prev2["open"]
+        prev2_is_bearish = prev2["close"] < prev2["open"]
+        prev2_vol = prev2.get("volume", avg_volume)
+
+        # ==================== 单根K线形态 ====================
+        # DOJI系列
+        if curr_body < curr_range * 0.1:
+            if curr_upper_shadow > curr_body * 3 and curr_lower_shadow > curr_body * 3:
+                pattern_info["patterns"].append("DOJI_LONG_LEGGED")
+            elif curr_upper_shadow > curr_lower_shadow * 2:
+                pattern_info["patterns"].append("DOJI_GRAVESTONE")
+            elif curr_lower_shadow > curr_upper_shadow * 2:
+                pattern_info["patterns"].append("DOJI_DRAGONFLY")
+            else:
+                pattern_info["patterns"].append("DOJI")
+
+        # 锤子线/上吊线
+        if (curr_body < curr_range * 0.35 and
+            curr_lower_shadow > curr_body * 2 and
+            curr_upper_shadow < curr_body * 0.5):
+            if curr_is_bullish:
+                pattern_info["patterns"].append("HAMMER")
+                if curr_vol > avg_volume * 1.2:
+                    pattern_info["volume_confirmed"] = True
+            else:
+                pattern_info["patterns"].append("HANGING_MAN")
+                if curr_vol > avg_volume * 1.2:
+                    pattern_info["volume_confirmed"] = True
+
+        # 倒锤子/流星线
+        if (curr_body < curr_range * 0.35 and
+            curr_upper_shadow > curr_body * 2 and
+            curr_lower_shadow < curr_body * 0.5):
+            if curr_is_bearish:
+                pattern_info["patterns"].append("INVERTED_HAMMER")
+                if curr_vol > avg_volume * 1.2:
+                    pattern_info["volume_confirmed"] = True
+            else:
+                pattern_info["patterns"].append("SHOOTING_STAR")
+                if curr_vol > avg_volume * 1.2:
+                    pattern_info["volume_confirmed"] = True
+
+        # 陀螺线
+        if (curr_body < curr_range * 0.5 and
+            curr_body > curr_range * 0.2 and
+            curr_upper_shadow > curr_body * 0.5 and
+            curr_lower_shadow > curr_body * 0.5):
+            pattern_info["patterns"].append("SPINNING_TOP")
+
+        # 光头光脚阳线/阴线
+        if curr_body > curr_range * 0.8:
+            if curr_is_bullish:
+                pattern_info["patterns"].append("MARUBOZU_BULLISH")
+                if curr_vol > avg_volume * 1.5:
+                    pattern_info["volume_confirmed"] = True
+            else:
+                pattern_info["patterns"].append("MARUBOZU_BEARISH")
+                if curr_vol > avg_volume * 1.5:
+                    pattern_info["volume_confirmed"] = True
+
+        # ==================== 两根K线形态 ====================
+        # 吞没形态
+        if curr_body > prev1_body * 1.5:
+            if curr_is_bullish and prev1_is_bearish and curr["close"] > prev1["open"] and curr["open"] < prev1["close"]:
+                pattern_info["patterns"].append("BULLISH_ENGULFING")
+                if curr_vol > prev1_vol * 1.2:
+                    pattern_info["volume_confirmed"] = True
+            elif curr_is_bearish and prev1_is_bullish and curr["close"] < prev1["open"] and curr["open"] > prev1["close"]:
+                pattern_info["patterns"].append("BEARISH_ENGULFING")
+                if curr_vol > prev1_vol * 1.2:
+                    pattern_info["volume_confirmed"] = True
+
+        # 孕线形态
+        if curr_body < prev1_body * 0.7:
+            if curr["high"] < prev1["high"] and curr["low"] > prev1["low"]:
+                if prev1_is_bullish and curr_is_bearish:
+                    pattern_info["patterns"].append("BEARISH_HARAMI")
+                elif prev1_is_bearish and curr_is_bullish:
+                    pattern_info["patterns"].append("BULLISH_HARAMI")
+
+        # 乌云盖顶/曙光初现
+        if curr_body > prev1_body * 0.5 and prev1_body > 0:
+            if prev1_is_bullish and curr_is_bearish:
+                if curr["open"] > prev1["high"] and curr["close"] < (prev1["open"] + prev1["close"]) / 2:
+                    pattern_info["patterns"].append("DARK_CLOUD_COVER")
+                    if curr_vol > prev1_vol * 1.2:
+                        pattern_info["volume_confirmed"] = True
+            elif prev1_is_bearish and curr_is_bullish:
+                if curr["open"] < prev1["low"] and curr["close"] > (prev1["open"] + prev1["close"]) / 2:
+                    pattern_info["patterns"].append("PIERCING_PATTERN")
+                    if curr_vol > prev1_vol * 1.2:
+                        pattern_info["volume_confirmed"] = True
+
+        # ==================== 三根K线形态 ====================
+        # 晨星/暮星
+        if i >= 2:
+            if prev2_body > 0 and prev1_body < prev2_body * 0.3 and curr_body > prev2_body * 0.5:
+                # 晨星形态
+                if prev2_is_bearish and curr_is_bullish and prev1["high"] < prev2["low"]:
+                    pattern_info["patterns"].append("MORNING_STAR")
+                    if curr_vol > (prev1_vol + prev2_vol) / 2 * 1.2:
+                        pattern_info["volume_confirmed"] = True
+                # 暮星形态
+                elif prev2_is_bullish and curr_is_bearish and prev1["low"] > prev2["high"]:
+                    pattern_info["patterns"].append("EVENING_STAR")
+                    if curr_vol > (prev1_vol + prev2_vol) / 2 * 1.2:
+                        pattern_info["volume_confirmed"] = True
+
+            # 三白兵/三黑鸦
+            if prev2_is_bullish and prev1_is_bullish and curr_is_bullish:
+                if (curr["close"] > prev1["close"] > prev2["close"] and
+                    curr_body > prev2_body * 0.5 and prev1_body > prev2_body * 0.5):
+                    pattern_info["patterns"].append("THREE_WHITE_SOLDIERS")
+                    if curr_vol > avg_volume * 1.3:
+                        pattern_info["volume_confirmed"] = True
+            elif prev2_is_bearish and prev1_is_bearish and curr_is_bearish:
+                if (curr["close"] < prev1["close"] < prev2["close"] and
+                    curr_body > prev2_body * 0.5 and prev1_body > prev2_body * 0.5):
+                    pattern_info["patterns"].append("THREE_BLACK_CROWS")
+                    if curr_vol > avg_volume * 1.3:
+                        pattern_info["volume_confirmed"] = True
+
+        # 只保留有识别到形态的记录
+        if pattern_info["patterns"]:
+            patterns.append(pattern_info)
+
+    return patterns
+
+
+def make_random_bars(n: int, seed: int, rounded: bool = False, nan_rows: bool = False,
+                     volume: bool = True) -> pd.DataFrame:
+    """随机 OHLCV；rounded 时价格取整（大量平实体和零振幅），nan_rows 时部分行缺价"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.standard_normal(n) * 2)
+    open_ = close + rng.standard_normal(n) * rng.choice([0.2, 1.5, 4.0], n)
+    # 影线长短悬殊、部分为零，覆盖锤子线、流星线和光头光脚等形态
+    upper = rng.exponential(1.5, n) * (rng.random(n) > 0.3)
+    lower = rng.exponential(1.5, n) * (rng.random(n) > 0.3)
+    high = np.maximum(open_, close) + upper
+    low = np.minimum(open_, close) - lower
+    df = pd.DataFrame({
+        'timestamp': pd.bdate_range('2020-01-01', periods=n).strftime('%Y-%m-%d'),
+        'open': open_, 'high': high, 'low': low, 'close': close,
+    })
+    if rounded:
+        df[['open', 'high', 'low', 'close']] = df[['open', 'high', 'low', 'close']].round(0)
+    if nan_rows:
+        df.loc[rng.choice(n, n // 15, replace=False), ['open', 'close']] = np.nan
+        df.loc[rng.choice(n, n // 20, replace=False), 'high'] = np.nan
+    if volume:
+        df['volume'] = rng.integers(1000, 10000, n)
+    return df
+
+
+def assert_same_records(actual, expected):
+    """逐条比较记录（NaN 视为相等）"""
+    assert len(actual) == len(expected)
+    for got, want in zip(actual, expected):
+        assert got.keys() == want.keys()
+        for key, value in want.items():
+            if isinstance(value, float) and np.isnan(value):
+                assert np.isnan(got[key]), (want["timestamp"], key)
+            else:
+                assert got[key] == value, (want["timestamp"], key, got[key], value)
+
+def make_bars(rows, volumes=None) -> pd.DataFrame:
+    """由 (open, high, low, close) 列表生成 OHLCV 数据（前面补 3 根不构成形态的K线）"""
+    filler = [(100.0, 101.0, 99.0, 100.5)] * 3
+    rows = filler + list(rows)
+    volumes = [1000] * 3 + (volumes or [1000] * (len(rows) - 3))
+    df = pd.DataFrame(rows, columns=['open', 'high', 'low', 'close'])
+    df.insert(0, 'timestamp', pd.bdate_range('2024-01-01', periods=len(df)).strftime('%Y-%m-%d'))
+    df['volume'] = volumes
+    return df
+
+
+def patterns_at(df: pd.DataFrame, row: int):
+    bits, _ = CandlestickPatternRecognizer.detect(df)
+    return CandlestickPatternRecognizer.decode(int(bits[row]))
+
+
+class TestCandlestickPatterns:
+    """测试向量化形态识别"""
+
+    def test_single_bar_patterns(self):
+        """锤子线（阳线）与上吊线（阴线）按实体方向区分"""
+        df = make_bars([(100.0, 101.2, 95.0, 101.0), (101.0, 101.2, 95.0, 100.0)])
+        assert "HAMMER" in patterns_at(df, 3)
+        assert "HANGING_MAN" in patterns_at(df, 4)
+
+    def test_multi_bar_patterns(self):
+        """晨星需要前两根K线；同一根K线的多个形态按 CANDLESTICK_PATTERNS 顺序列出"""
+        df = make_bars([
+            (110.0, 110.5, 104.5, 105.0),  # 长阴线
+            (104.0, 104.3, 103.8, 104.1),  # 跳空小实体
+            (105.0, 111.0, 104.8, 110.8),  # 长阳线收复
+        ])
+        assert patterns_at(df, 5) == ["MARUBOZU_BULLISH", "MORNING_STAR"]
+        assert CANDLESTICK_PATTERNS.index("MARUBOZU_BULLISH") < CANDLESTICK_PATTERNS.index("MORNING_STAR")
+
+    def test_first_bars_and_volume_confirmation(self):
+        """前 3 根K线不参与识别；放量的锤子线标记成交量确认"""
+        df = make_bars([(100.0, 101.2, 95.0, 101.0)], volumes=[5000])
+        df.loc[0:2, ['open', 'high', 'low', 'close']] = [100.0, 101.2, 95.0, 101.0]
+        bits, volume_confirmed = CandlestickPatternRecognizer.detect(df)
+
+        assert not bits[:3].any()
+        assert bits[3] & PATTERN_BITS["HAMMER"]
+        assert volume_confirmed[3]
+
+    def test_records_and_local_vendor_table(self):
+        """记录只包含有形态的K线；本地数据源输出形态表格"""
+        from tradingagents.dataflows.interface import _local_get_candlestick_patterns
+
+        rng = np.random.default_rng(0)
+        close = 100 + np.cumsum(rng.standard_normal(120))
+        open_ = close + rng.standard_normal(120)
+        df = pd.DataFrame({
+            'timestamp': pd.bdate_range('2024-01-01', periods=120).strftime('%Y-%m-%d'),
+            'open': open_,
+            'high': np.maximum(open_, close) + np.abs(rng.standard_normal(120)),
+            'low': np.minimum(open_, close) - np.abs(rng.standard_normal(120)),
+            'close': close,
+            'volume': rng.integers(100000, 1000000, 120),
+        })
+        records = CandlestickPatternRecognizer.identify_patterns(df)
+        bits, _ = CandlestickPatternRecognizer.detect(df)
+
+        assert len(records) == np.count_nonzero(bits) > 0
+        assert all(record['patterns'] for record in records)
+        assert records[0]['timestamp'] == df['timestamp'].iloc[np.flatnonzero(bits)[0]]
+
+        table = _local_get_candlestick_patterns(
+            'AAPL', '2024-01-01', '2024-06-14', stock_data=df.to_csv(index=False)
+        )
+        assert table.startswith("# Candlestick Patterns for AAPL")
+        assert records[-1]['timestamp'] in table
+        assert "## Pattern Summary" in table
+
+
+class TestMatchesRowLoop:
+    """向量化实现与逐行循环的参考实现结果一致"""
+
+    @pytest.mark.parametrize("seed", range(6))
+    @pytest.mark.parametrize("rounded,nan_rows,volume", [
+        (False, False, True),
+        (True, False, True),
+        (True, True, True),
+        (False, True, False),
+        (True, False, False),
+    ])
+    def test_records_match_reference(self, seed, rounded, nan_rows, volume):
+        """随机K线（含取整后的平实体、缺价行、无成交量列）逐条记录一致"""
+        df = make_random_bars(300, seed, rounded=rounded, nan_rows=nan_rows, volume=volume)
+        expected = reference_identify_patterns(df)
+        assert expected
+        assert_same_records(CandlestickPatternRecognizer.identify_patterns(df), expected)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+图表形态识别单元测试
+"""
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.dataflows.patterns import ChartPatterns, RollingChartPatterns
+from tradingagents.dataflows.patterns.detectors import Pivots, find_pivots
+
+
+def legacy_pivots(high, low, window=5):
+    """逐点比较的参考实现"""
+    peaks, troughs = [], []
+    for i in range(window, len(high) - window):
+        if all(high[i] > high[j] for j in range(i - window, i + window + 1) if j != i):
+            peaks.append(i)
+        if all(low[i] < low[j] for j in range(i - window, i + window + 1) if j != i):
+            troughs.append(i)
+    return peaks, troughs
+
+
+def make_bars(n: int, seed: int = 0, rounded: bool = False) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.standard_normal(n))
+    high = close + np.abs(rng.standard_normal(n))
+    low = close - np.abs(rng.standard_normal(n))
+    if rounded:
+        # 取整制造相等的相邻高低点
+        close, high, low = np.round(close), np.round(high), np.round(low)
+    return pd.DataFrame({
+        'open': close, 'high': high, 'low': low, 'close': close,
+        'volume': rng.integers(100000, 1000000, n),
+    })
+
+
+class TestPivots:
+    """测试滑动窗口峰谷检测"""
+
+    def test_matches_pointwise_comparison(self):
+        """与逐点比较一致（包括相等值和 NaN）"""
+        for seed in range(20):
+            df = make_bars(120, seed=seed, rounded=seed % 2 == 0)
+            high, low = df['high'].to_numpy(), df['low'].to_numpy()
+            if seed % 3 == 0:
+                high[::17] = np.nan
+                low[5::23] = np.nan
+            assert tuple(find_pivots(high, low)) == legacy_pivots(high, low)
+
+    def test_short_series(self):
+        """数据不足 2 * window + 1 时没有峰谷"""
+        assert find_pivots(np.arange(10.0), np.arange(10.0)) == Pivots([], [])
+
+
+class TestChartPatterns:
+    """测试图表形态识别"""
+
+    def test_detectors_use_given_pivots(self):
+        """传入的峰谷直接供检测器使用，不再重新计算"""
+        df = make_bars(60, seed=3)
+        # 两个等高的峰值 → 双顶
+        pivots = Pivots([10, 40], [25])
+        result = ChartPatterns._identify_double_top(df.assign(high=100.0), pivots)
+        assert result["detected"] and result["type"] == "double_top"
+        assert ChartPatterns.identify_all_patterns(df, 60, Pivots([], []))["patterns"].keys() <= {
+            "flag", "rounding_top", "rounding_bottom"
+        }
+
+    def test_rolling_matches_full_recomputation(self):
+        """逐根追加的结果与每次对截至当前的数据整体识别相同"""
+        df = make_bars(200, seed=7, rounded=True)
+        rolling = RollingChartPatterns(lookback=60)
+        for t in range(len(df)):
+            result = rolling.update(df.iloc[t].to_dict())
+            assert result == ChartPatterns.identify_all_patterns(df.iloc[:t + 1], 60)
+
+    def test_rolling_update_frame(self):
+        """update_frame 返回最后一根K线的结果"""
+        df = make_bars(150, seed=11)
+        rolling = RollingChartPatterns(lookback=60)
+        assert rolling.update_frame(df.iloc[:100]) == ChartPatterns.identify_all_patterns(df.iloc[:100], 60)
+        assert rolling.update_frame(df.iloc[100:]) == ChartPatterns.identify_all_patterns(df, 60)
+        assert RollingChartPatterns().update_frame(df.iloc[:30]) == {"patterns_found": False, "patterns": {}}
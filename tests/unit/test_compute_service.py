@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+指标与形态计算进程池单元测试
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.compute_service import ComputeService
+from tradingagents.dataflows.indicators.engine import IndicatorEngine
+from tradingagents.dataflows.patterns import CandlestickPatternRecognizer, ChartPatterns
+
+
+def make_ohlcv(n_rows: int, seed: int) -> pd.DataFrame:
+    """生成示例OHLCV数据（timestamp 列 + 整数成交量）"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.standard_normal(n_rows))
+    return pd.DataFrame({
+        'timestamp': pd.bdate_range('2023-01-02', periods=n_rows).strftime('%Y-%m-%d'),
+        'open': close + rng.standard_normal(n_rows) * 0.5,
+        'high': close + np.abs(rng.standard_normal(n_rows)),
+        'low': close - np.abs(rng.standard_normal(n_rows)),
+        'close': close,
+        'volume': rng.integers(100000, 1000000, n_rows),
+    })
+
+
+@pytest.fixture(scope="module")
+def service():
+    """两个工作进程、每个任务两只股票（覆盖多个任务并行在途）"""
+    with ComputeService(workers=2, chunk_size=2) as compute_service:
+        yield compute_service
+
+
+@pytest.fixture
+def universe():
+    """长度各不相同的五只股票（含不足一个窗口的股票）"""
+    return {f"SYM{i}": make_ohlcv(n, i) for i, n in enumerate([260, 150, 12, 90, 200])}
+
+
+class TestComputeService:
+    """测试进程池结果与当前进程计算一致"""
+
+    def test_indicators_match_engine(self, service, universe):
+        """全部指标与指定列（信号列夹在浮点列之间）都与 IndicatorEngine 逐位一致"""
+        columns = ['rsi', 'sma_5_20_cross', 'macd', 'close_200_sma']
+        full = service.compute_indicators_batch(universe)
+        selected = service.compute_indicators_batch(universe, columns)
+
+        assert list(full) == list(universe)
+        for symbol, df in universe.items():
+            engine = IndicatorEngine(df)
+            pd.testing.assert_frame_equal(full[symbol], engine.compute_all(), check_exact=True)
+            pd.testing.assert_frame_equal(selected[symbol], engine.get_indicators(columns), check_exact=True)
+
+    def test_tail_returns_latest_rows(self, service, universe):
+        """tail 只回传最后几行，与完整结果的尾部一致；进程内计算结果相同"""
+        latest = service.compute_indicators_batch(universe, ['adx', 'obv'], tail=20)
+        inline = ComputeService(workers=0).compute_indicators_batch(universe, ['adx', 'obv'], tail=20)
+
+        for symbol, df in universe.items():
+            expected = IndicatorEngine(df).get_indicators(['adx', 'obv']).tail(20)
+            pd.testing.assert_frame_equal(latest[symbol], expected, check_exact=True)
+            pd.testing.assert_frame_equal(inline[symbol], expected, check_exact=True)
+
+    def test_patterns_match_recognizers(self, service, universe):
+        """蜡烛图和图表形态与直接调用识别器相同"""
+        candles = service.candlestick_patterns_batch(universe)
+        charts = service.chart_patterns_batch(universe, lookback=60)
+
+        for symbol, df in universe.items():
+            assert candles[symbol] == CandlestickPatternRecognizer.identify_patterns(df)
+            assert charts[symbol] == ChartPatterns.identify_all_patterns(df, 60)
+
+    def test_unknown_column_raises_before_dispatch(self, service, universe):
+        """未知指标列在父进程报错，空输入返回空字典"""
+        with pytest.raises(ValueError):
+            service.compute_indicators_batch(universe, ['not_an_indicator'])
+        assert service.compute_indicators_batch({}) == {}
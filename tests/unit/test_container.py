@@ -1,4 +1,7 @@
 """单元测试: 依赖注入容器"""
+import threading
+import time
+
 import pytest
 from tradingagents.core.container import DependencyContainer
 
@@ -69,3 +72,29 @@ class TestContainer:
         
         assert container.has("service") is True
         assert container.has("nonexistent") is False
+
+    def test_concurrent_first_get_creates_one_singleton(self, container):
+        """多个线程首次同时获取单例时只创建一个实例"""
+        created = []
+
+        def create_service():
+            time.sleep(0.05)
+            created.append(object())
+            return created[-1]
+
+        container.register("service", create_service)
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(container.get("service"))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(created) == 1
+        assert all(r is created[0] for r in results) and len(results) == 8
@@ -0,0 +1,136 @@
+"""
+测试数据缓存 - 内存 LRU、SQLite 磁盘层、按函数失效与清理
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from tradingagents.dataflows.data_cache import DataCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = DataCache(cache_dir=str(tmp_path), sweep_interval_seconds=0)
+    yield c
+    c.close()
+
+
+class TestDataCacheBasics:
+    """测试基础读写"""
+
+    def test_set_and_get(self, cache):
+        cache.set("get_news", "payload", "NVDA", limit=5)
+        assert cache.get("get_news", "NVDA", limit=5) == "payload"
+        assert cache.get("get_news", "AAPL", limit=5) is None
+
+    def test_single_file_on_disk(self, cache, tmp_path):
+        for i in range(20):
+            cache.set("get_news", f"payload-{i}", f"SYM{i}")
+        assert not list(tmp_path.glob("*.json"))
+        assert (tmp_path / "cache.db").exists()
+
+    def test_disk_tier_survives_new_instance(self, cache, tmp_path):
+        big = "x" * 10000
+        cache.set("get_stock_data", big, "NVDA", "2025-01-01", "2025-06-30")
+        other = DataCache(cache_dir=str(tmp_path), sweep_interval_seconds=0)
+        try:
+            assert other.get("get_stock_data", "NVDA", "2025-01-01", "2025-06-30") == big
+            assert other.get_stats()["disk_hits"] == 1
+        finally:
+            other.close()
+
+    def test_expired_entry_not_returned(self, tmp_path):
+        c = DataCache(cache_dir=str(tmp_path), ttl_hours=0, sweep_interval_seconds=0)
+        try:
+            c.set("get_news", "payload", "NVDA")
+            assert c.get("get_news", "NVDA") is None
+        finally:
+            c.close()
+
+
+    def test_async_get_reads_memory_and_disk(self, cache, tmp_path):
+        key = cache.make_key("get_news", ("NVDA",), {})
+        asyncio.run(cache.set_by_key_async(key, "get_news", "payload"))
+        assert asyncio.run(cache.get_by_key_async(key)) == "payload"
+        assert cache.get_memory_by_key(key) == "payload"
+
+        other = DataCache(cache_dir=str(tmp_path), sweep_interval_seconds=0)
+        try:
+            assert other.get_memory_by_key(key) is None
+            assert asyncio.run(other.get_by_key_async(key)) == "payload"
+            assert other.get_stats()["disk_hits"] == 1
+        finally:
+            other.close()
+
+
+class TestMemoryBound:
+    """测试内存层按字节 LRU 淘汰"""
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        c = DataCache(cache_dir=str(tmp_path), max_memory_bytes=2500, sweep_interval_seconds=0)
+        try:
+            c.set("f", "a" * 1000, 1)
+            c.set("f", "b" * 1000, 2)
+            c.get("f", 1)  # 1 变为最近使用
+            c.set("f", "c" * 1000, 3)
+
+            stats = c.get_stats()
+            assert stats["memory_bytes"] <= 2500
+            assert stats["evictions"] == 1
+            # 被淘汰的条目仍可从磁盘层读回
+            assert c.get("f", 2) == "b" * 1000
+            assert c.get_stats()["disk_hits"] == 1
+        finally:
+            c.close()
+
+
+class TestInvalidation:
+    """测试按函数失效与清理"""
+
+    def test_clear_function_only(self, cache):
+        cache.set("get_news", "n", "NVDA")
+        cache.set("get_fundamentals", "f", "NVDA")
+        cache.clear("get_news")
+        assert cache.get("get_news", "NVDA") is None
+        assert cache.get("get_fundamentals", "NVDA") == "f"
+
+    def test_set_after_clear_is_visible(self, cache):
+        cache.set("get_news", "old", "NVDA")
+        cache.clear("get_news")
+        cache.set("get_news", "new", "NVDA")
+        assert cache.get("get_news", "NVDA") == "new"
+
+    def test_sweep_removes_stale_generations(self, cache):
+        for i in range(5):
+            cache.set("get_news", f"n{i}", i)
+        cache.set("get_fundamentals", "f", "NVDA")
+        cache.clear("get_news")
+        assert cache.sweep() == 5
+        assert cache.get_stats()["file_cache_count"] == 1
+
+    def test_clear_all(self, cache):
+        cache.set("get_news", "n", "NVDA")
+        cache.clear()
+        assert cache.get("get_news", "NVDA") is None
+        assert cache.get_stats()["file_cache_count"] == 0
+
+    def test_background_sweeper(self, tmp_path):
+        c = DataCache(cache_dir=str(tmp_path), ttl_hours=0, sweep_interval_seconds=0.05)
+        try:
+            c.set("get_news", "n", "NVDA")
+            time.sleep(0.3)
+            assert c.get_stats()["file_cache_count"] == 0
+        finally:
+            c.close()
+
+
+class TestByteStats:
+    """测试字节级统计"""
+
+    def test_compressed_storage_reported(self, cache):
+        cache.set("get_stock_data", "abc," * 5000, "NVDA")
+        stats = cache.get_stats()
+        assert stats["disk_bytes"] == len('"' + "abc," * 5000 + '"')
+        assert stats["disk_stored_bytes"] < stats["disk_bytes"]
@@ -0,0 +1,184 @@
+"""
+测试同时发言的辩论轮次 - 轮次合并、汇合屏障和图结构
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+
+from tradingagents.agents.risk_mgmt.aggressive_debator import create_aggressive_debator
+from tradingagents.agents.risk_mgmt.conservative_debator import create_conservative_debator
+from tradingagents.agents.risk_mgmt.neutral_debator import create_neutral_debator
+from tradingagents.agents.utils.agent_states import AgentState
+from tradingagents.graph.conditional_logic import RISK_DEBATE_ORDER, ConditionalLogic
+from tradingagents.graph.debate_rounds import (
+    create_round_barrier,
+    merge_debate_round,
+    wrap_round_speaker,
+)
+from tradingagents.graph.setup import DEBATE_ROUND_JOIN_NODE, RISK_ROUND_JOIN_NODE, GraphSetup
+
+
+class SlowLLM:
+    """每次调用耗时 delay 秒并记录最大并发数的 LLM"""
+
+    def __init__(self, delay=0.1):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _enter(self):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+
+    def _exit(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def invoke(self, input, config=None):
+        self._enter()
+        time.sleep(self.delay)
+        self._exit()
+        return AIMessage(content="PREDICTION: HOLD Confidence: 60%")
+
+    async def ainvoke(self, input, config=None):
+        self._enter()
+        await asyncio.sleep(self.delay)
+        self._exit()
+        return AIMessage(content="PREDICTION: HOLD Confidence: 60%")
+
+
+def build_risk_graph(llm, rounds=2):
+    """只包含风险辩论阶段的图：与 GraphSetup 的同时发言接法一致"""
+    logic = ConditionalLogic(max_risk_discuss_rounds=rounds, simultaneous_risk_rounds=True)
+    factories = {
+        "Aggressive Analyst": create_aggressive_debator,
+        "Conservative Analyst": create_conservative_debator,
+        "Neutral Analyst": create_neutral_debator,
+    }
+    workflow = StateGraph(AgentState)
+    for name, factory in factories.items():
+        workflow.add_node(name, wrap_round_speaker("risk_debate_state", name, factory(llm)))
+        workflow.add_edge(START, name)
+    workflow.add_node(RISK_ROUND_JOIN_NODE, create_round_barrier("risk_debate_state", RISK_DEBATE_ORDER))
+    workflow.add_node("Risk Judge", lambda state: {"final_trade_decision": "done"})
+    workflow.add_edge(list(RISK_DEBATE_ORDER), RISK_ROUND_JOIN_NODE)
+    workflow.add_conditional_edges(
+        RISK_ROUND_JOIN_NODE, logic.should_continue_risk_analysis, [*RISK_DEBATE_ORDER, "Risk Judge"]
+    )
+    workflow.add_edge("Risk Judge", END)
+    return workflow.compile()
+
+
+def initial_state():
+    return {
+        "messages": [],
+        "risk_debate_state": {"history": "", "count": 0},
+        "market_report": "m", "sentiment_report": "s", "news_report": "n",
+        "fundamentals_report": "f", "candlestick_report": "c",
+        "trader_investment_plan": "plan",
+    }
+
+
+class TestMergeDebateRound:
+    """测试一轮更新的合并规则"""
+
+    def test_merges_histories_counts_and_own_fields(self):
+        """history 按顺序拼接，count 加发言人数，各自字段和 dict 字段逐项合并"""
+        base = {
+            "history": "H", "count": 2, "latest_speaker": "Bear",
+            "current_response": "old", "researcher_histories": {"bull": "b0", "bear": "r0"},
+        }
+        bull = {**base, "history": "H\n\nBull: up", "count": 3, "latest_speaker": "Bull",
+                "current_response": "up", "researcher_histories": {"bull": "b0\n\nup", "bear": "r0"}}
+        bear = {**base, "history": "H\n\nBear: down", "count": 3, "latest_speaker": "Bear",
+                "current_response": "down", "researcher_histories": {"bull": "b0", "bear": "r0\n\ndown"}}
+
+        merged = merge_debate_round(base, [bull, bear], combine_keys=("current_response",))
+        assert merged["history"] == "H\n\nBull: up\n\nBear: down"
+        assert merged["count"] == 4
+        assert merged["current_response"] == "up\n\ndown"
+        assert merged["researcher_histories"] == {"bull": "b0\n\nup", "bear": "r0\n\ndown"}
+        assert merged["latest_speaker"] == "Bear"
+
+
+class TestSimultaneousRiskRounds:
+    """测试同时发言的风险辩论"""
+
+    def test_rounds_run_concurrently_behind_barrier(self):
+        """每轮三位分析师并发运行，汇合后才进入下一轮"""
+        llm = SlowLLM(delay=0.1)
+        start = time.perf_counter()
+        final = build_risk_graph(llm, rounds=2).invoke(initial_state())
+        elapsed = time.perf_counter() - start
+
+        debate = final["risk_debate_state"]
+        assert llm.calls == 6 and llm.peak == 3
+        assert debate["count"] == 6
+        assert final["final_trade_decision"] == "done"
+        # 两轮串联 ≈ 0.2 秒，轮流发言需要 ≈ 0.6 秒
+        assert elapsed < 0.5
+        # 第二轮读到的是第一轮三位分析师合并后的状态
+        for prefix in ("aggressive", "conservative", "neutral"):
+            assert debate[f"{prefix}_history"].count("Analyst:") == 2
+            assert debate[f"current_{prefix}_response"]
+        assert debate["history"].count("Analyst:") == 6
+
+    def test_async_rounds(self):
+        """astream / ainvoke 下同样按轮次并发"""
+        llm = SlowLLM(delay=0.05)
+        final = asyncio.run(build_risk_graph(llm, rounds=2).ainvoke(initial_state()))
+        assert llm.calls == 6 and llm.peak == 3
+        assert final["risk_debate_state"]["count"] == 6
+
+    def test_router_fans_out_until_limit(self):
+        """同时发言模式下路由返回全部分析师，达到轮次后交给 Risk Judge"""
+        logic = ConditionalLogic(max_risk_discuss_rounds=2, simultaneous_risk_rounds=True)
+        assert logic.should_continue_risk_analysis({"risk_debate_state": {"count": 3}}) == RISK_DEBATE_ORDER
+        assert logic.should_continue_risk_analysis({"risk_debate_state": {"count": 6}}) == "Risk Judge"
+
+        logic = ConditionalLogic(max_debate_rounds=1, selected_researchers=["bull", "bear"],
+                                 simultaneous_debate_rounds=True)
+        state = {"investment_debate_state": {"count": 0, "latest_speaker": ""}}
+        assert logic.should_continue_debate(state) == logic.debate_order
+        state["investment_debate_state"]["count"] = 2
+        assert logic.should_continue_debate(state) == "Research Manager"
+
+
+class TestSimultaneousGraphStructure:
+    """测试 GraphSetup 的同时发言接法"""
+
+    def test_setup_wires_round_barriers(self):
+        """Trader 扇出到三位分析师，researcher 和风险分析师各自汇合到本轮屏障"""
+        logic = ConditionalLogic(
+            selected_researchers=["bull", "bear"],
+            simultaneous_debate_rounds=True, simultaneous_risk_rounds=True,
+        )
+        tool_nodes = {}
+        from langgraph.prebuilt import ToolNode
+        from tradingagents.agents.utils.agent_utils import get_stock_data
+        tool_nodes["market"] = ToolNode([get_stock_data])
+        setup = GraphSetup(
+            MagicMock(), MagicMock(), tool_nodes, {}, MagicMock(), MagicMock(), MagicMock(),
+            logic, selected_researchers=["bull", "bear"],
+        )
+        edges = {(e.source, e.target) for e in setup.setup_graph(["market"]).get_graph().edges}
+
+        for name in RISK_DEBATE_ORDER:
+            assert ("Trader", name) in edges
+            assert (name, RISK_ROUND_JOIN_NODE) in edges
+            assert (RISK_ROUND_JOIN_NODE, name) in edges
+        assert (RISK_ROUND_JOIN_NODE, "Risk Judge") in edges
+        for name in logic.debate_order:
+            assert ("Msg Clear Market", name) in edges
+            assert (name, DEBATE_ROUND_JOIN_NODE) in edges
+        assert (DEBATE_ROUND_JOIN_NODE, "Research Manager") in edges
+        assert ("Aggressive Analyst", "Conservative Analyst") not in edges
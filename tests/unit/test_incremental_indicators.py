@@ -14,6 +14,8 @@ from tradingagents.dataflows.incremental_indicators import (
     IncrementalIndicatorCache,
     calculate_indicators_incremental
 )
+from tradingagents.dataflows.indicators.engine import IndicatorEngine
+from tradingagents.dataflows.indicators.streaming import STREAMING_COLUMNS
 
 
 @pytest.fixture
@@ -160,6 +162,31 @@ class TestIncrementalIndicators:
         assert 'close_20_sma' in result.columns
 
 
+class TestStreamingUpdate:
+    """测试按股票持久化的流式更新"""
+    
+    def test_new_day_matches_full_calculation(self, temp_cache_dir, sample_ohlcv_data):
+        """状态持久化后（新实例）只喂新K线，结果与全量计算逐位一致"""
+        first = IncrementalIndicators(temp_cache_dir).update_streaming(sample_ohlcv_data.iloc[:99], "AAPL")
+        assert len(first) == 99
+        
+        # 新的一天：新实例从磁盘恢复状态，传入完整历史只处理最后一行
+        last = IncrementalIndicators(temp_cache_dir).update_streaming(sample_ohlcv_data, "AAPL")
+        assert list(last.index) == [99]
+        
+        expected = IndicatorEngine(sample_ohlcv_data).get_indicators(STREAMING_COLUMNS)[STREAMING_COLUMNS]
+        pd.testing.assert_frame_equal(pd.concat([first, last]), expected, check_exact=True)
+    
+    def test_no_new_data_and_clear(self, temp_cache_dir, sample_ohlcv_data):
+        """无新数据返回空结果；清除缓存后从头计算"""
+        calculator = IncrementalIndicators(temp_cache_dir)
+        calculator.update_streaming(sample_ohlcv_data, "AAPL")
+        assert calculator.update_streaming(sample_ohlcv_data, "AAPL").empty
+        
+        calculator.clear_cache("AAPL")
+        assert len(calculator.update_streaming(sample_ohlcv_data, "AAPL")) == len(sample_ohlcv_data)
+
+
 def test_convenience_function(temp_cache_dir, sample_ohlcv_data):
     """测试便捷函数"""
     result = calculate_indicators_incremental(
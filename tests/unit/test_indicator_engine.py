@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+指标计算引擎单元测试
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.complete_indicators import CompleteTechnicalIndicators
+from tradingagents.dataflows.indicators import (
+    IndicatorEngine,
+    MomentumIndicators,
+    MovingAverageIndicators,
+    VolumeIndicators,
+)
+from tradingagents.dataflows.indicators.additional_indicators import AdditionalIndicators
+from tradingagents.dataflows.indicators.engine import INDICATOR_COLUMNS
+from tradingagents.dataflows.indicators.trend_indicators import TrendIndicators
+
+
+def calculate_with_facades(df: pd.DataFrame) -> pd.DataFrame:
+    """按各指标类逐列插入的方式计算全部指标（引擎之前 calculate_all_indicators 的流程）"""
+    result_df = df.copy()
+    result_df = MovingAverageIndicators.calculate_sma(result_df, inplace=True)
+    result_df = MovingAverageIndicators.calculate_ema(result_df, inplace=True)
+    result_df = MovingAverageIndicators.calculate_bollinger_bands(result_df, inplace=True)
+    result_df = MovingAverageIndicators.calculate_atr(result_df, inplace=True)
+
+    result_df["rsi"] = MomentumIndicators.calculate_rsi(result_df["close"])
+    macd, signal, hist = MomentumIndicators.calculate_macd(result_df["close"])
+    result_df["macd"] = macd
+    result_df["macds"] = signal
+    result_df["macdh"] = hist
+    adx, plus_di, minus_di = MomentumIndicators.calculate_adx(result_df)
+    result_df["adx"] = adx
+    result_df["plus_di"] = plus_di
+    result_df["minus_di"] = minus_di
+
+    result_df = VolumeIndicators.calculate_all_volume_indicators(result_df, inplace=True)
+    result_df = TrendIndicators.calculate_all_trend_indicators(result_df, inplace=True)
+    result_df = AdditionalIndicators.calculate_all_additional_indicators(result_df, inplace=True)
+    return result_df
+
+
+@pytest.fixture
+def sample_ohlcv_data():
+    """生成示例OHLCV数据（整数成交量，含一段平盘）"""
+    n = 300
+    np.random.seed(5)
+    close = 100 + np.cumsum(np.random.randn(n))
+    df = pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n, freq='D').strftime('%Y-%m-%d'),
+        'open': close + np.random.randn(n) * 0.5,
+        'high': close + np.abs(np.random.randn(n)) + 0.5,
+        'low': close - np.abs(np.random.randn(n)) - 0.5,
+        'close': close,
+        'volume': np.random.randint(1000000, 5000000, n),
+    })
+    cols = ['open', 'high', 'low', 'close', 'volume']
+    df.loc[120:124, cols] = df.loc[119, cols].values
+    return df
+
+
+class TestIndicatorEngine:
+    """测试预分配缓冲区的全量计算"""
+
+    def test_matches_facade_pipeline(self, sample_ohlcv_data):
+        """列顺序、dtype 和数值与逐列计算完全一致"""
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", pd.errors.PerformanceWarning)
+            expected = calculate_with_facades(sample_ohlcv_data)
+        actual = IndicatorEngine(sample_ohlcv_data).compute_all()
+
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_calculate_all_indicators_uses_engine(self, sample_ohlcv_data):
+        """calculate_all_indicators 不产生 PerformanceWarning，不修改输入"""
+        original = sample_ohlcv_data.copy()
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", pd.errors.PerformanceWarning)
+            result = CompleteTechnicalIndicators.calculate_all_indicators(sample_ohlcv_data, inplace=True)
+
+        pd.testing.assert_frame_equal(sample_ohlcv_data, original)
+        assert list(result.columns) == list(original.columns) + INDICATOR_COLUMNS
+        assert result["macd_cross"].dtype == np.int64
+        assert result["rsi"].dtype == np.float64
+
+    def test_existing_indicator_columns_are_replaced(self, sample_ohlcv_data):
+        """输入已含同名指标列时替换而不是重复"""
+        df = sample_ohlcv_data.assign(rsi=0.0)
+        result = IndicatorEngine(df).compute_all()
+
+        assert list(result.columns).count("rsi") == 1
+        assert result["rsi"].iloc[-1] != 0.0
+
+    def test_compute_all_reuses_lazy_results(self, sample_ohlcv_data):
+        """先按列计算的结果在全量计算时不会重复计算"""
+        engine = IndicatorEngine(sample_ohlcv_data)
+        engine.get_indicators(["macd", "boll_width"])
+        engine.compute_all()
+
+        computed = engine.get_computed_columns()
+        assert len(computed) == len(set(computed))
+        assert set(INDICATOR_COLUMNS) <= set(computed)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+内容寻址指标结果缓存单元测试
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from tradingagents.dataflows.indicators.engine import IndicatorEngine
+from tradingagents.dataflows.indicators.result_cache import IndicatorResultCache, fingerprint
+
+
+@pytest.fixture
+def sample_ohlcv_data():
+    """生成示例OHLCV数据"""
+    n = 300
+    np.random.seed(5)
+    close = 100 + np.cumsum(np.random.randn(n))
+    return pd.DataFrame({
+        'timestamp': pd.bdate_range('2024-01-01', periods=n).strftime('%Y-%m-%d'),
+        'open': close,
+        'high': close + np.abs(np.random.randn(n)),
+        'low': close - np.abs(np.random.randn(n)),
+        'close': close,
+        'volume': np.random.randint(100000, 1000000, n),
+    })
+
+
+class TestIndicatorResultCache:
+    """测试内容寻址缓存"""
+
+    def test_round_trip_is_exact(self, tmp_path, sample_ohlcv_data):
+        """命中时返回与计算结果完全相同的 DataFrame（含 NaN、int64 信号列和字符串列）"""
+        cache = IndicatorResultCache(tmp_path)
+        assert cache.get(sample_ohlcv_data) is None
+
+        computed = cache.get_or_compute(sample_ohlcv_data)
+        pd.testing.assert_frame_equal(cache.get(sample_ohlcv_data), computed, check_exact=True)
+        pd.testing.assert_frame_equal(computed, IndicatorEngine(sample_ohlcv_data).compute_all())
+
+    def test_revised_bar_misses(self, tmp_path, sample_ohlcv_data):
+        """任意一根K线被修订后不会命中旧结果"""
+        cache = IndicatorResultCache(tmp_path)
+        cache.get_or_compute(sample_ohlcv_data, ['rsi'])
+
+        revised = sample_ohlcv_data.copy()
+        revised.loc[150, 'close'] += 0.01
+        assert cache.get(revised, ['rsi']) is None
+        assert fingerprint(revised, ['rsi']) != fingerprint(sample_ohlcv_data, ['rsi'])
+
+    def test_column_set_and_shared_directory(self, tmp_path, sample_ohlcv_data):
+        """键只看列集合；同一目录的其他实例（其他进程）共享条目"""
+        IndicatorResultCache(tmp_path).get_or_compute(sample_ohlcv_data, ['macd', 'rsi'])
+
+        result = IndicatorResultCache(tmp_path).get(sample_ohlcv_data, ['rsi', 'macd'])
+        expected = IndicatorEngine(sample_ohlcv_data).get_indicators(['rsi', 'macd'])
+        pd.testing.assert_frame_equal(result, expected, check_exact=True)
+        assert IndicatorResultCache(tmp_path).get(sample_ohlcv_data, ['rsi']) is None
+
+    def test_stale_versions_corrupt_entries_and_pruning(self, tmp_path, sample_ohlcv_data):
+        """旧引擎版本条目在初始化时删除；损坏条目视为未命中；超出上限按最近使用淘汰"""
+        (tmp_path / "0000000000000000-old.arrow").write_bytes(b"old")
+        cache = IndicatorResultCache(tmp_path, max_entries=3)
+        assert not (tmp_path / "0000000000000000-old.arrow").exists()
+
+        cache._get_cache_path(fingerprint(sample_ohlcv_data)).write_bytes(b"corrupt")
+        assert cache.get(sample_ohlcv_data) is None
+        assert not list(tmp_path.glob("*.arrow"))
+
+        cache.PRUNE_INTERVAL = 1
+        for period in range(5):
+            cache.get_or_compute(sample_ohlcv_data.iloc[period:], ['rsi'])
+        assert len(list(tmp_path.glob("*.arrow"))) <= 3
@@ -0,0 +1,44 @@
+"""
+测试延迟直方图 - 分位数估算与按数据源/方法统计
+"""
+
+from tradingagents.dataflows.core.latency_histogram import LatencyHistogram, LatencyTracker
+
+
+class TestLatencyHistogram:
+    """测试单个直方图"""
+
+    def test_empty(self):
+        assert LatencyHistogram().percentile(0.95) is None
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for i in range(100):
+            histogram.record(0.1 if i < 95 else 5.0)
+        # 返回所在桶上界：误差不超过一档（×1.25）
+        assert 0.1 <= histogram.percentile(0.5) < 0.125
+        assert 0.1 <= histogram.percentile(0.95) < 0.125
+        assert 5.0 <= histogram.percentile(0.99) < 6.25
+
+    def test_huge_value_in_last_bucket(self):
+        histogram = LatencyHistogram()
+        histogram.record(10_000)
+        assert histogram.percentile(0.5) > 200
+
+
+class TestLatencyTracker:
+    """测试按 (数据源, 方法) 统计"""
+
+    def test_min_samples(self):
+        tracker = LatencyTracker()
+        for _ in range(3):
+            tracker.record("yfinance", "get_stock_data", 0.2)
+        assert tracker.percentile("yfinance", "get_stock_data", 0.95, min_samples=5) is None
+        assert tracker.percentile("yfinance", "get_stock_data", 0.95, min_samples=3) is not None
+        assert tracker.percentile("yfinance", "get_news", 0.95) is None
+
+    def test_stats(self):
+        tracker = LatencyTracker()
+        tracker.record("yfinance", "get_stock_data", 0.2)
+        stats = tracker.get_stats()
+        assert stats["yfinance"]["get_stock_data"]["count"] == 1
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+列级惰性指标计算器单元测试
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.complete_indicators import CompleteTechnicalIndicators
+from tradingagents.dataflows.indicator_groups import INDICATOR_GROUPS
+from tradingagents.dataflows.lazy_indicators import (
+    INDICATOR_NODES,
+    LazyIndicatorCalculator,
+    get_lazy_calculator,
+)
+
+
+@pytest.fixture
+def sample_ohlcv_data():
+    """生成示例OHLCV数据（足够计算200日均线）"""
+    n = 260
+    np.random.seed(7)
+    close = 100 + np.cumsum(np.random.randn(n))
+    df = pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n, freq='D').strftime('%Y-%m-%d'),
+        'open': close + np.random.randn(n) * 0.5,
+        'high': close + np.abs(np.random.randn(n)) + 0.5,
+        'low': close - np.abs(np.random.randn(n)) - 0.5,
+        'close': close,
+        'volume': np.random.randint(1000000, 5000000, n).astype(float),
+    })
+    return df
+
+
+class TestLazyIndicatorCalculator:
+    """测试按列依赖图计算"""
+
+    def test_matches_full_calculation(self, sample_ohlcv_data):
+        """每一列都与全量计算结果一致"""
+        full = CompleteTechnicalIndicators.calculate_all_indicators(sample_ohlcv_data)
+        calc = get_lazy_calculator(sample_ohlcv_data)
+        columns = calc.get_available_indicators()
+
+        assert set(columns) == set(full.columns) - set(sample_ohlcv_data.columns)
+        result = calc.get_indicators(columns)
+        for col in columns:
+            pd.testing.assert_series_equal(result[col], full[col], check_names=False)
+
+    def test_macd_group_skips_unrelated_indicators(self, sample_ohlcv_data):
+        """macd 组不会计算 ADX、MFI 或 200 日均线"""
+        calc = get_lazy_calculator(sample_ohlcv_data)
+        result = calc.get_indicators(INDICATOR_GROUPS['macd'])
+
+        computed = set(calc.get_computed_columns())
+        assert {'macd', 'macds', 'macdh'} <= computed
+        assert not computed & {'adx', 'plus_di', 'minus_di', 'mfi_14', 'close_200_sma'}
+        assert list(result.columns) == ['timestamp', 'open', 'high', 'low', 'close', 'volume',
+                                        'macd', 'macds', 'macdh']
+
+    def test_shared_intermediates_computed_once(self, sample_ohlcv_data):
+        """close_20_sma 被 boll、price_to_sma_20、交叉信号共用且只计算一次"""
+        calc = get_lazy_calculator(sample_ohlcv_data)
+        calc.get_indicators(['boll', 'price_to_sma_20', 'sma_5_20_cross', 'macd_cross'])
+        calc.get_indicators(['boll_width', 'macdh'])
+
+        computed = calc.get_computed_columns()
+        assert len(computed) == len(set(computed))
+        assert computed.count('close_20_sma') == 1
+        assert computed.index('close_20_sma') < computed.index('boll')
+        assert computed.index('macds') < computed.index('macd_cross')
+
+    def test_plan_orders_dependencies(self):
+        """拓扑序中依赖在前，多输出节点只出现一次"""
+        plan = LazyIndicatorCalculator.plan(['macd_cross', 'adx', 'plus_di'])
+        outputs = [node.outputs[0] for node in plan]
+
+        assert outputs.index('_close_26_ema') < outputs.index('macd') < outputs.index('macd_cross')
+        assert outputs.count('adx') == 1
+        assert INDICATOR_NODES['minus_di'] in plan
+
+    def test_unknown_column_raises(self, sample_ohlcv_data):
+        """未知列抛出 ValueError"""
+        calc = get_lazy_calculator(sample_ohlcv_data)
+        with pytest.raises(ValueError):
+            calc.get_indicators(['not_an_indicator'])
+
+    def test_local_vendor_uses_group_columns(self, sample_ohlcv_data):
+        """本地数据源按组返回指标"""
+        from tradingagents.dataflows.interface import _local_get_indicators
+
+        stock_data = sample_ohlcv_data.to_csv(index=False)
+        csv = _local_get_indicators('AAPL', 'macd', '2024-09-16', 30, stock_data=stock_data)
+
+        header = csv.splitlines()[0].split(',')
+        assert header == ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'macd', 'macds', 'macdh']
+        assert len(csv.splitlines()) == 41
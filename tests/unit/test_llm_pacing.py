@@ -0,0 +1,139 @@
+"""
+测试 LLM 调用节奏控制 - 每分钟预算、用量修正和 429 退避
+"""
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from tradingagents.dataflows.core.token_bucket import TokenBucket
+from tradingagents.llm_clients.concurrency import ProviderConcurrencyLimiter
+from tradingagents.llm_clients.pacing import (
+    LLMPacer,
+    estimate_tokens,
+    get_llm_pacer,
+    reset_llm_pacers,
+    resolve_rate_limits,
+)
+
+
+class FakeLLM:
+    """按预设序列返回结果或抛出异常的 LLM，响应带 usage_metadata"""
+
+    def __init__(self, outcomes=None, total_tokens=10):
+        self.outcomes = list(outcomes or [])
+        self.total_tokens = total_tokens
+        self.calls = 0
+
+    def _next(self):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else "ok"
+        if isinstance(outcome, Exception):
+            raise outcome
+        return AIMessage(
+            content=outcome,
+            usage_metadata={"input_tokens": 0, "output_tokens": self.total_tokens, "total_tokens": self.total_tokens},
+        )
+
+    def invoke(self, input, config=None):
+        return self._next()
+
+    async def ainvoke(self, input, config=None):
+        return self._next()
+
+
+class TestLLMPacer:
+    """测试节奏控制器"""
+
+    def test_no_wait_within_budget(self):
+        """预算充足时连续调用不等待（不再有固定 sleep）"""
+        pacer = LLMPacer("fake", requests_per_minute=500, tokens_per_minute=200_000)
+        llm = FakeLLM()
+        start = time.perf_counter()
+        for _ in range(20):
+            assert pacer.invoke(llm, "hello").content == "ok"
+        assert time.perf_counter() - start < 0.5
+        stats = pacer.get_stats()
+        assert stats["calls"] == 20 and stats["paced_wait"] == 0
+        assert stats["tokens_used"] == 200
+
+    def test_waits_when_token_budget_exhausted(self):
+        """实际用量耗尽 token 预算后，下一次调用按补充速度等待"""
+        pacer = LLMPacer("fake", requests_per_minute=None, tokens_per_minute=1200)  # 每秒 20 个 token
+        llm = FakeLLM(total_tokens=1205)
+        pacer.invoke(llm, "x")
+        start = time.perf_counter()
+        pacer.invoke(llm, "x")
+        assert time.perf_counter() - start >= 0.2
+        assert pacer.get_stats()["paced_wait"] > 0
+
+    def test_backs_off_on_rate_limit(self):
+        """收到 429 后退避重试；其他错误直接抛出"""
+        pacer = LLMPacer("fake", requests_per_minute=600, tokens_per_minute=None, backoff_seconds=0.1)
+        llm = FakeLLM([RuntimeError("Error code: 429 - Too Many Requests"), "ok"])
+        start = time.perf_counter()
+        assert pacer.invoke(llm, "x").content == "ok"
+        assert time.perf_counter() - start >= 0.1
+        assert llm.calls == 2 and pacer.get_stats()["rate_limited"] == 1
+
+        with pytest.raises(ValueError):
+            pacer.invoke(FakeLLM([ValueError("bad request")]), "x")
+
+        exhausted = LLMPacer("fake", requests_per_minute=None, tokens_per_minute=None,
+                             max_retries=1, backoff_seconds=0.01)
+        with pytest.raises(RuntimeError):
+            exhausted.invoke(FakeLLM([RuntimeError("rate limit")] * 2), "x")
+
+    def test_async_calls_share_budget(self):
+        """异步调用与同步调用共用令牌桶"""
+        pacer = LLMPacer("fake", requests_per_minute=600, tokens_per_minute=None)
+        pacer.requests = TokenBucket(600, capacity=1)  # 每 0.1 秒一个请求
+        llm = FakeLLM()
+        pacer.invoke(llm, "x")
+
+        async def run_many():
+            return await asyncio.gather(*(pacer.ainvoke(llm, "x") for _ in range(3)))
+
+        start = time.perf_counter()
+        results = asyncio.run(run_many())
+        assert [r.content for r in results] == ["ok"] * 3
+        assert time.perf_counter() - start >= 0.25
+
+    def test_calls_hold_concurrency_slot(self):
+        """同步和异步调用都在请求期间占用提供商的并发名额"""
+        limiter = ProviderConcurrencyLimiter("fake", max_concurrency=2)
+        pacer = LLMPacer("fake", requests_per_minute=None, tokens_per_minute=None, limiter=limiter)
+
+        class SlowLLM(FakeLLM):
+            async def ainvoke(self, input, config=None):
+                await asyncio.sleep(0.02)
+                return self._next()
+
+        async def run_many():
+            return await asyncio.gather(*(pacer.ainvoke(SlowLLM(), "x") for _ in range(6)))
+
+        asyncio.run(run_many())
+        pacer.invoke(FakeLLM(), "x")
+        stats = pacer.get_stats()["concurrency"]
+        assert stats["peak_in_flight"] == 2
+        assert stats["total_acquired"] == 7 and stats["in_flight"] == 0
+
+
+class TestPacingConfig:
+    """测试配置解析和共享注册表"""
+
+    def setup_method(self):
+        reset_llm_pacers()
+
+    def test_provider_limits_override_default(self):
+        """提供商专属配置逐项覆盖 default"""
+        config = {"llm_rate_limits": {
+            "default": {"requests_per_minute": 100, "tokens_per_minute": 5000},
+            "anthropic": {"requests_per_minute": 50},
+        }}
+        assert resolve_rate_limits(config, "anthropic") == {"requests_per_minute": 50, "tokens_per_minute": 5000}
+        assert resolve_rate_limits(config, "openai") == {"requests_per_minute": 100, "tokens_per_minute": 5000}
+        assert get_llm_pacer("OpenAI") is get_llm_pacer("openai")
+        assert estimate_tokens([("system", "abc" * 10), {"content": "abc"}]) == 13
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+动量指标单元测试
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.indicators.momentum_indicators import MomentumIndicators
+
+
+def reference_adx(df: pd.DataFrame, period: int = 14):
+    """向量化之前的 ADX 实现（逐行计算 TR），作为回归基准"""
+    high_diff = df["high"].diff()
+    low_diff = -df["low"].diff()
+
+    plus_dm = np.where((high_diff > low_diff) & (high_diff > 0), high_diff, 0)
+    minus_dm = np.where((low_diff > high_diff) & (low_diff > 0), low_diff, 0)
+
+    tr_series = pd.Series([
+        max(
+            df["high"].iloc[i] - df["low"].iloc[i],
+            abs(df["high"].iloc[i] - df["close"].iloc[i-1]) if i > 0 else 0,
+            abs(df["low"].iloc[i] - df["close"].iloc[i-1]) if i > 0 else 0
+        )
+        for i in range(len(df))
+    ], index=df.index)
+
+    atr = tr_series.rolling(window=period).mean()
+    plus_di = 100 * (pd.Series(plus_dm, index=df.index).rolling(window=period).mean() / atr)
+    minus_di = 100 * (pd.Series(minus_dm, index=df.index).rolling(window=period).mean() / atr)
+
+    dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    adx = dx.rolling(window=period).mean()
+
+    return adx, plus_di, minus_di
+
+
+@pytest.fixture
+def sample_ohlc_data():
+    """生成示例OHLC数据（含整数价格和平盘行）"""
+    n = 300
+    np.random.seed(11)
+    close = 100 + np.cumsum(np.random.randn(n))
+    df = pd.DataFrame({
+        'high': close + np.abs(np.random.randn(n)),
+        'low': close - np.abs(np.random.randn(n)),
+        'close': close,
+    }, index=pd.date_range('2024-01-01', periods=n, freq='D'))
+    df.iloc[50:55] = df.iloc[49].values
+    return df
+
+
+class TestCalculateADX:
+    """测试向量化 ADX"""
+
+    def test_matches_reference(self, sample_ohlc_data):
+        """默认结果与逐行实现一致"""
+        actual = MomentumIndicators.calculate_adx(sample_ohlc_data)
+        expected = reference_adx(sample_ohlc_data)
+
+        for a, e in zip(actual, expected):
+            pd.testing.assert_series_equal(a, e, check_names=False)
+
+    def test_matches_reference_on_integer_prices(self):
+        """整数价格与短序列同样一致"""
+        df = pd.DataFrame({
+            'high': [10, 12, 11, 13, 15, 14, 16, 18, 17, 19],
+            'low': [8, 9, 9, 10, 12, 12, 13, 15, 15, 16],
+            'close': [9, 11, 10, 12, 14, 13, 15, 17, 16, 18],
+        })
+        actual = MomentumIndicators.calculate_adx(df, period=3)
+        expected = reference_adx(df, period=3)
+
+        for a, e in zip(actual, expected):
+            pd.testing.assert_series_equal(a, e, check_names=False)
+
+    def test_wilder_smoothing(self, sample_ohlc_data):
+        """Wilder 平滑：前 period-1 行为空，取值在 0-100 之间且与默认结果不同"""
+        adx, plus_di, minus_di = MomentumIndicators.calculate_adx(sample_ohlc_data, wilder=True)
+        default_adx, _, _ = MomentumIndicators.calculate_adx(sample_ohlc_data)
+
+        assert plus_di.iloc[:13].isna().all()
+        assert plus_di.iloc[13:].notna().all()
+        assert adx.dropna().between(0, 100).all()
+        assert not np.allclose(adx.iloc[-50:], default_adx.iloc[-50:])
+
+    def test_empty_frame(self):
+        """空数据返回空序列"""
+        df = pd.DataFrame({'high': [], 'low': [], 'close': []}, dtype=float)
+        adx, plus_di, minus_di = MomentumIndicators.calculate_adx(df)
+
+        assert len(adx) == len(plus_di) == len(minus_di) == 0
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+多股票面板指标计算单元测试
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.complete_indicators import CompleteTechnicalIndicators
+from tradingagents.dataflows.indicators.engine import IndicatorEngine
+from tradingagents.dataflows.indicators.panel import PanelIndicatorEngine
+
+
+def make_ohlcv(n_rows: int, start: str, seed: int) -> pd.DataFrame:
+    """生成示例OHLCV数据（timestamp 列 + 整数成交量）"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.standard_normal(n_rows))
+    return pd.DataFrame({
+        'timestamp': pd.bdate_range(start, periods=n_rows).strftime('%Y-%m-%d'),
+        'open': close + rng.standard_normal(n_rows) * 0.1,
+        'high': close + np.abs(rng.standard_normal(n_rows)),
+        'low': close - np.abs(rng.standard_normal(n_rows)),
+        'close': close,
+        'volume': rng.integers(100000, 1000000, n_rows),
+    })
+
+
+@pytest.fixture
+def sample_panel():
+    """长度和起始日期各不相同的三只股票"""
+    return {
+        'AAPL': make_ohlcv(260, '2023-01-02', 1),
+        'MSFT': make_ohlcv(150, '2023-03-01', 2),
+        'NEW': make_ohlcv(12, '2023-12-01', 3),
+    }
+
+
+class TestPanelIndicators:
+    """测试面板计算与逐只计算一致"""
+
+    def test_bars_matches_per_symbol(self, sample_panel):
+        """默认对齐方式下与逐只 calculate_all_indicators 逐位一致（含不足一个窗口的股票）"""
+        result = CompleteTechnicalIndicators.calculate_panel(sample_panel)
+
+        assert list(result) == list(sample_panel)
+        for symbol, df in sample_panel.items():
+            expected = CompleteTechnicalIndicators.calculate_all_indicators(df)
+            pd.testing.assert_frame_equal(result[symbol], expected, check_exact=True)
+
+    def test_selected_columns(self, sample_panel):
+        result = CompleteTechnicalIndicators.calculate_panel(sample_panel, columns=['macd', 'cci_20'])
+
+        for symbol, df in sample_panel.items():
+            expected = IndicatorEngine(df).get_indicators(['macd', 'cci_20'])
+            pd.testing.assert_frame_equal(result[symbol], expected, check_exact=True)
+
+    def test_calendar_alignment(self, sample_panel):
+        """按日历对齐：每只股票覆盖完整日历，结果等于对 reindex 后的数据逐只计算"""
+        result = CompleteTechnicalIndicators.calculate_panel(sample_panel, columns=['rsi'], align='calendar')
+
+        calendar = sorted(set().union(*(df['timestamp'] for df in sample_panel.values())))
+        for symbol, df in sample_panel.items():
+            reindexed = df.set_index('timestamp').reindex(calendar).reset_index()
+            expected = IndicatorEngine(reindexed).get_indicators(['rsi'])
+            assert result[symbol]['timestamp'].tolist() == calendar
+            pd.testing.assert_frame_equal(result[symbol], expected, check_exact=True)
+
+    def test_as_frame(self, sample_panel):
+        frame = CompleteTechnicalIndicators.calculate_panel(sample_panel, columns=['rsi'], as_frame=True)
+
+        assert frame.index.names[0] == 'symbol'
+        assert len(frame) == sum(len(df) for df in sample_panel.values())
+        pd.testing.assert_series_equal(
+            frame.loc['MSFT', 'rsi'], IndicatorEngine(sample_panel['MSFT']).get_indicators(['rsi'])['rsi']
+        )
+
+    def test_invalid_input(self, sample_panel):
+        with pytest.raises(ValueError):
+            PanelIndicatorEngine(sample_panel, align='weekly')
+
+        duplicated = {'DUP': pd.concat([sample_panel['NEW'], sample_panel['NEW']], ignore_index=True)}
+        with pytest.raises(ValueError):
+            PanelIndicatorEngine(duplicated, align='calendar')
+
+        assert CompleteTechnicalIndicators.calculate_panel({}) == {}
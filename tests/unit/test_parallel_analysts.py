@@ -0,0 +1,131 @@
+"""
+测试并行分析师模式 - 图结构、私有消息通道和提供商并发限制
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from tradingagents.graph.conditional_logic import ConditionalLogic
+from tradingagents.graph.setup import ANALYST_JOIN_NODE, GraphSetup
+from tradingagents.llm_clients.concurrency import (
+    ProviderConcurrencyLimiter,
+    get_provider_limiter,
+    reset_provider_limiters,
+    resolve_concurrency_limit,
+)
+
+
+def _make_setup(parallel=True):
+    logic = ConditionalLogic()
+    tool_nodes = {}
+    from langgraph.prebuilt import ToolNode
+    from tradingagents.agents.utils.agent_utils import get_news, get_stock_data
+    for t in ("market", "social", "news", "fundamentals", "candlestick"):
+        tool_nodes[t] = ToolNode([get_stock_data, get_news])
+    return GraphSetup(
+        MagicMock(), MagicMock(), tool_nodes, {}, MagicMock(), MagicMock(), MagicMock(),
+        logic, parallel_analysts=parallel, prefetch_data=False,
+    )
+
+
+class TestParallelGraphStructure:
+    """测试并行模式的图结构"""
+
+    def test_start_fans_out_to_all_analysts(self):
+        """START 应直接连接到每个分析师"""
+        graph = _make_setup().setup_graph(["market", "news", "fundamentals"])
+        edges = {(e.source, e.target) for e in graph.get_graph().edges}
+        for title in ("Market", "News", "Fundamentals"):
+            assert ("__start__", f"{title} Analyst") in edges
+
+    def test_join_feeds_first_researcher(self):
+        """汇合节点应连接到 debate_order 的第一个 researcher"""
+        setup = _make_setup()
+        graph = setup.setup_graph(["market", "news"])
+        edges = {(e.source, e.target) for e in graph.get_graph().edges}
+        assert (ANALYST_JOIN_NODE, setup.conditional_logic.debate_order[0]) in edges
+        assert ("Msg Clear Market", ANALYST_JOIN_NODE) in edges
+        assert ("Msg Clear News", ANALYST_JOIN_NODE) in edges
+
+    def test_sequential_mode_has_no_join(self):
+        """串行模式不应有汇合节点"""
+        graph = _make_setup(parallel=False).setup_graph(["market", "news"])
+        assert ANALYST_JOIN_NODE not in graph.get_graph().nodes
+
+
+class TestParallelAnalystChannels:
+    """测试分析师私有消息通道"""
+
+    def test_parallel_router_reads_own_channel(self):
+        """并行路由只看分析师自己的消息通道"""
+        logic = ConditionalLogic()
+        tool_msg = AIMessage(content="", tool_calls=[{"name": "get_news", "args": {}, "id": "1"}])
+        state = {
+            "messages": [AIMessage(content="done")],
+            "news_messages": [tool_msg],
+        }
+        assert logic.should_continue_news_parallel(state) == "tools_news"
+        assert logic.should_continue_news(state) == "Msg Clear News"
+
+    def test_wrapper_seeds_and_writes_private_channel(self):
+        """首次运行以主通道为种子，输出写入私有通道而不是 messages"""
+        setup = _make_setup()
+        seen = {}
+
+        def fake_node(state):
+            seen["messages"] = list(state["messages"])
+            return {"messages": [AIMessage(content="report")], "news_report": "report"}
+
+        node = setup._wrap_parallel_analyst("news", fake_node)
+        human = HumanMessage(content="NVDA", id="h1")
+        update = node({"messages": [human], "news_messages": []})
+
+        assert seen["messages"] == [human]
+        assert "messages" not in update
+        assert update["news_report"] == "report"
+        assert [m.content for m in update["news_messages"]] == ["NVDA", "report"]
+
+
+class TestProviderConcurrencyLimiter:
+    """测试提供商并发限制"""
+
+    def setup_method(self):
+        reset_provider_limiters()
+
+    def test_caps_in_flight_requests(self):
+        """并发数不应超过上限"""
+        limiter = ProviderConcurrencyLimiter("openai", max_concurrency=2)
+
+        def work():
+            with limiter:
+                time.sleep(0.02)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = limiter.get_stats()
+        assert stats["peak_in_flight"] <= 2
+        assert stats["total_acquired"] == 8
+        assert stats["in_flight"] == 0
+
+    def test_limiter_shared_per_provider(self):
+        """同一提供商返回同一个限制器"""
+        assert get_provider_limiter("OpenAI", 3) is get_provider_limiter("openai")
+        assert get_provider_limiter("anthropic", 1) is not get_provider_limiter("openai")
+
+    def test_resolve_limit_prefers_provider_entry(self):
+        """提供商专属配置优先于 default"""
+        config = {"llm_max_concurrency": {"default": 4, "anthropic": 2}}
+        assert resolve_concurrency_limit(config, "anthropic") == 2
+        assert resolve_concurrency_limit(config, "openai") == 4
+
+    def test_invalid_limit_rejected(self):
+        with pytest.raises(ValueError):
+            ProviderConcurrencyLimiter("openai", max_concurrency=0)
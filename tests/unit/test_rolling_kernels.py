@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+向量化滚动窗口内核单元测试
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.indicators.additional_indicators import AdditionalIndicators
+from tradingagents.dataflows.indicators.rolling import (
+    rolling_linear_fit,
+    rolling_mean_abs_dev,
+)
+from tradingagents.dataflows.indicators.trend_indicators import TrendIndicators
+
+
+def reference_slope(prices: pd.Series, window: int) -> pd.Series:
+    """rolling.apply + np.polyfit 的旧实现"""
+    return prices.rolling(window=window).apply(
+        lambda x: np.polyfit(range(len(x)), x, 1)[0], raw=True
+    )
+
+
+def reference_lr_pred(prices: pd.Series, window: int) -> pd.Series:
+    def pred(x):
+        slope, intercept = np.polyfit(range(len(x)), x, 1)
+        return intercept + slope * len(x)
+    return prices.rolling(window=window).apply(pred, raw=True)
+
+
+def reference_cci(df: pd.DataFrame, period: int = 20) -> pd.Series:
+    tp = (df["high"] + df["low"] + df["close"]) / 3
+    sma_tp = tp.rolling(window=period).mean()
+    mad = tp.rolling(window=period).apply(lambda x: np.abs(x - x.mean()).mean(), raw=True)
+    return (tp - sma_tp) / (0.015 * mad)
+
+
+@pytest.fixture(params=[100, 5000])
+def sample_ohlc_data(request):
+    """5000 根 K 线，分别在 100 和 5000 的价格水平上"""
+    n = 5000
+    scale = request.param
+    np.random.seed(3)
+    close = scale + np.cumsum(np.random.randn(n)) * scale / 100
+    return pd.DataFrame({
+        'high': close + np.abs(np.random.randn(n)) * scale / 100,
+        'low': close - np.abs(np.random.randn(n)) * scale / 100,
+        'close': close,
+    })
+
+
+class TestRollingKernels:
+    """测试与旧的逐窗口回调实现一致（1e-9 以内）"""
+
+    @pytest.mark.parametrize("window", [10, 20])
+    def test_slope_matches_polyfit(self, sample_ohlc_data, window):
+        actual = TrendIndicators.rolling_slope(sample_ohlc_data["close"], window)
+        expected = reference_slope(sample_ohlc_data["close"], window)
+        pd.testing.assert_series_equal(actual, expected, check_names=False, rtol=0, atol=1e-9)
+
+    def test_lr_pred_matches_polyfit(self, sample_ohlc_data):
+        actual = TrendIndicators.rolling_lr_pred(sample_ohlc_data["close"], 20)
+        expected = reference_lr_pred(sample_ohlc_data["close"], 20)
+        pd.testing.assert_series_equal(actual, expected, check_names=False, rtol=0, atol=1e-9)
+
+    def test_cci_matches_reference(self, sample_ohlc_data):
+        actual = AdditionalIndicators.cci(sample_ohlc_data, 20)
+        expected = reference_cci(sample_ohlc_data, 20)
+        pd.testing.assert_series_equal(actual, expected, check_names=False, rtol=0, atol=1e-9)
+
+    def test_nan_window_and_short_input(self):
+        """含 NaN 的窗口输出 NaN；数据不足一个窗口时全为 NaN"""
+        values = np.array([1.0, 2.0, np.nan, 4.0, 5.0, 6.0, 7.0])
+        slope, _ = rolling_linear_fit(values, 3)
+        assert np.isnan(slope[:5]).all()
+        assert slope[6] == pytest.approx(1.0)
+
+        short_slope, short_intercept = rolling_linear_fit(np.array([1.0, 2.0]), 3)
+        assert np.isnan(short_slope).all() and np.isnan(short_intercept).all()
+        assert all(np.isnan(arr).all() for arr in rolling_mean_abs_dev(np.array([1.0]), 3))
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+运行数据预取单元测试
+"""
+
+import asyncio
+from collections import Counter
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.agents.utils.agent_utils import (
+    create_data_prefetch,
+    get_all_indicators,
+    get_balance_sheet,
+    get_candlestick_patterns,
+    get_chart_patterns,
+    get_fundamentals,
+    get_news,
+    get_stock_data,
+)
+from tradingagents.agents.utils.run_context import run_config
+from tradingagents.constants import ANALYST_CHART_PATTERN_LOOKBACK, ANALYST_INDICATOR_LOOKBACK_DAYS
+from tradingagents.core.container import get_container
+from tradingagents.dataflows.run_data import (
+    analyst_stock_window,
+    create_run_data,
+    get_run_data,
+    prefetch_requests,
+    prefetch_run_data_sync,
+    release_run_data,
+)
+from tradingagents.graph.conditional_logic import ConditionalLogic
+from tradingagents.graph.setup import DATA_PREFETCH_NODE, GraphSetup
+
+SYMBOL = "AAPL"
+TRADE_DATE = "2025-01-15"
+
+
+def make_stock_csv(n: int = 130) -> str:
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.standard_normal(n))
+    return pd.DataFrame({
+        "timestamp": pd.bdate_range(end=TRADE_DATE, periods=n).strftime("%Y-%m-%d"),
+        "open": close + rng.standard_normal(n) * 0.5,
+        "high": close + 2,
+        "low": close - 2,
+        "close": close,
+        "volume": rng.integers(100000, 1000000, n),
+    }).to_csv(index=False)
+
+
+class FakeDataManager:
+    """记录每个 (方法, 参数) 被请求次数的数据管理器"""
+
+    last_vendor_used = "fake"
+
+    def __init__(self):
+        self.calls = Counter()
+        self.stock_csv = make_stock_csv()
+
+    def fetch(self, method, *args, **kwargs):
+        self.calls[(method,) + args[:3]] += 1
+        return self.stock_csv if method == "get_stock_data" else f"{method}{args}"
+
+    async def fetch_async(self, method, *args, **kwargs):
+        return self.fetch(method, *args, **kwargs)
+
+    def get_stats(self):
+        return {}
+
+
+@pytest.fixture
+def manager(monkeypatch, tmp_path):
+    monkeypatch.setattr("tradingagents.agents.utils.logging_utils.TOOL_CALL_LOG_PATH", str(tmp_path / "tool_calls.log"))
+    container = get_container()
+    saved = {name: container._singletons.get(name) for name in ("data_manager", "indicator_result_cache")}
+    fake = FakeDataManager()
+    container.register_instance("data_manager", fake)
+    container.register_instance("indicator_result_cache", None)
+    yield fake
+    for name, instance in saved.items():
+        container.unregister(name)
+        if instance is not None:
+            container.register_instance(name, instance)
+
+
+@pytest.fixture
+def run_data(manager):
+    run_data = create_run_data("test-run", SYMBOL, TRADE_DATE)
+    yield run_data
+    release_run_data("test-run")
+
+
+class TestRunDataPrefetch:
+    """测试预取和运行内取数"""
+
+    def test_prefetch_fetches_each_request_once(self, manager, run_data):
+        """预取对每个数据请求只访问一次数据层，并基于同一份K线计算指标和形态"""
+        prefetch_run_data_sync(run_data)
+
+        expected = {("get_stock_data", SYMBOL, *analyst_stock_window(TRADE_DATE))}
+        expected |= {(method,) + args[:3] for method, args in prefetch_requests(SYMBOL, TRADE_DATE).items()}
+        assert set(manager.calls) == expected
+        assert all(count == 1 for count in manager.calls.values())
+        assert list(run_data.frame.columns) == ["timestamp", "open", "high", "low", "close", "volume"]
+
+    def test_prefetch_only_selected_analysts_data(self, manager, run_data):
+        """只预取选中的分析师会用到的数据"""
+        requests = prefetch_requests(SYMBOL, TRADE_DATE, ["fundamentals", "social"])
+        assert set(requests) == {
+            "get_fundamentals", "get_balance_sheet", "get_cashflow", "get_income_statement", "get_news",
+        }
+        assert set(prefetch_requests(SYMBOL, TRADE_DATE, ["news"])) == {
+            "get_news", "get_global_news", "get_insider_transactions",
+        }
+
+        prefetch_run_data_sync(run_data, ["news"])
+        assert {call[0] for call in manager.calls} == {"get_news", "get_global_news", "get_insider_transactions"}
+        assert run_data.frame is None
+
+    def test_analyst_tool_calls_read_prefetched_data(self, manager, run_data):
+        """分析师的工具调用（携带运行 ID）全部命中预取结果，不再访问数据层"""
+        prefetch_run_data_sync(run_data)
+        manager.calls.clear()
+        config = run_config({"run_id": "test-run"})
+        start_date, end_date = analyst_stock_window(TRADE_DATE)
+
+        stock_data = get_stock_data.invoke({"symbol": SYMBOL, "start_date": start_date, "end_date": end_date}, config)
+        indicators = get_all_indicators.invoke({
+            "symbol": SYMBOL, "curr_date": TRADE_DATE,
+            "look_back_days": ANALYST_INDICATOR_LOOKBACK_DAYS, "stock_data": stock_data,
+        }, config)
+        chart = get_chart_patterns.invoke({
+            "symbol": SYMBOL, "start_date": start_date, "end_date": end_date,
+            "lookback": ANALYST_CHART_PATTERN_LOOKBACK, "stock_data": stock_data,
+        }, config)
+        candles = get_candlestick_patterns.invoke(
+            {"symbol": SYMBOL, "start_date": start_date, "end_date": end_date, "stock_data": stock_data}, config
+        )
+        fundamentals = get_fundamentals.invoke({"ticker": SYMBOL, "curr_date": TRADE_DATE}, config)
+        get_balance_sheet.invoke({"ticker": SYMBOL, "freq": "quarterly", "curr_date": TRADE_DATE}, config)
+
+        assert manager.calls == Counter()
+        assert stock_data == manager.stock_csv
+        assert "# Chart Patterns for AAPL" in chart
+        assert "Candlestick Patterns" in candles or "No candlestick patterns" in candles
+        assert indicators and fundamentals == f"get_fundamentals{(SYMBOL, TRADE_DATE)}"
+        assert run_data.misses == 0 and run_data.hits == 6
+
+    def test_other_requests_fetched_once_per_run(self, manager, run_data):
+        """未预取的请求在一次运行内只获取一次；不在运行中的调用照常每次获取"""
+        request = {"ticker": SYMBOL, "start_date": "2025-01-01", "end_date": TRADE_DATE}
+        config = run_config({"run_id": "test-run"})
+        get_news.invoke(request, config)
+        get_news.invoke(request, config)
+        assert manager.calls[("get_news", SYMBOL, "2025-01-01", TRADE_DATE)] == 1
+
+        get_news.invoke(request)
+        assert manager.calls[("get_news", SYMBOL, "2025-01-01", TRADE_DATE)] == 2
+
+    def test_registry(self):
+        """运行数据按运行 ID 登记和释放"""
+        run_data = create_run_data("registry-run", SYMBOL, TRADE_DATE)
+        assert create_run_data("registry-run", "MSFT", TRADE_DATE) is run_data
+        assert get_run_data("registry-run") is run_data
+        assert get_run_data("") is None
+        release_run_data("registry-run")
+        assert get_run_data("registry-run") is None
+
+
+class TestPrefetchNode:
+    """测试预取节点的图结构"""
+
+    def test_prefetch_node_precedes_analysts(self):
+        """预取节点位于 START 之后、所有分析师之前"""
+        from langgraph.prebuilt import ToolNode
+        tool_nodes = {t: ToolNode([get_stock_data, get_news])
+                      for t in ("market", "social", "news", "fundamentals", "candlestick")}
+        for parallel in (True, False):
+            setup = GraphSetup(
+                MagicMock(), MagicMock(), tool_nodes, {}, MagicMock(), MagicMock(), MagicMock(),
+                ConditionalLogic(), parallel_analysts=parallel, prefetch_data=True,
+            )
+            edges = {(e.source, e.target) for e in setup.setup_graph(["market", "news"]).get_graph().edges}
+            assert ("__start__", DATA_PREFETCH_NODE) in edges
+            assert (DATA_PREFETCH_NODE, "Market Analyst") in edges
+            assert ((DATA_PREFETCH_NODE, "News Analyst") in edges) == parallel
+            assert ("__start__", "Market Analyst") not in edges
+
+    def test_market_only_graph_prefetches_stock_data(self, manager, run_data):
+        """只有市场分析师的图只预取K线（及由K线计算的指标和形态）"""
+        from langgraph.prebuilt import ToolNode
+        setup = GraphSetup(
+            MagicMock(), MagicMock(), {"market": ToolNode([get_stock_data])}, {},
+            MagicMock(), MagicMock(), MagicMock(), ConditionalLogic(), prefetch_data=True,
+        )
+        graph = setup.setup_graph(["market"])
+        graph.nodes[DATA_PREFETCH_NODE].bound.invoke({"run_id": "test-run"})
+
+        assert list(manager.calls) == [("get_stock_data", SYMBOL, *analyst_stock_window(TRADE_DATE))]
+        assert run_data.frame is not None
+        assert run_data.get("get_candlestick_patterns", SYMBOL, *analyst_stock_window(TRADE_DATE))
+
+    def test_sync_prefetch_inside_running_loop(self, manager, run_data):
+        """同步执行的预取节点在已有事件循环的线程中（Jupyter、异步 Web 处理函数）也能运行"""
+        node = create_data_prefetch(["fundamentals"])
+
+        async def main():
+            return node.invoke({"run_id": "test-run"})
+
+        assert asyncio.run(main()) == {}
+        assert manager.calls[("get_fundamentals", SYMBOL, TRADE_DATE)] == 1
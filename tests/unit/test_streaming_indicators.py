@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+流式指标单元测试
+
+所有断言都是逐位相等（assert_array_equal），不使用容差
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.indicators import kernels
+from tradingagents.dataflows.indicators.engine import IndicatorEngine
+from tradingagents.dataflows.indicators.streaming import (
+    ADX,
+    EMA,
+    MACD,
+    OBV,
+    RSI,
+    STREAMING_COLUMNS,
+    RollingMean,
+    RollingStd,
+    StreamingIndicatorSet,
+)
+
+
+def stream(indicator, *columns):
+    """逐根喂入，返回输出数组（多输出时为二维）"""
+    return np.array([indicator.update(*values) for values in zip(*columns)])
+
+
+@pytest.fixture
+def sample_ohlcv_data():
+    """生成示例OHLCV数据（含平盘段、负收益和一个缺失值）"""
+    n = 600
+    np.random.seed(7)
+    close = 100 + np.cumsum(np.random.randn(n))
+    close[200:215] = close[199]
+    df = pd.DataFrame({
+        'open': close,
+        'high': close + np.abs(np.random.randn(n)),
+        'low': close - np.abs(np.random.randn(n)),
+        'close': close,
+        'volume': np.random.randint(100000, 1000000, n).astype(float),
+    })
+    return df
+
+
+class TestStreamingPrimitives:
+    """测试单个流式指标与批量内核逐位一致"""
+
+    @pytest.mark.parametrize("window", [5, 20, 200])
+    def test_rolling_mean_and_std(self, sample_ohlcv_data, window):
+        close = sample_ohlcv_data["close"].to_numpy().copy()
+        close[300] = np.nan
+        np.testing.assert_array_equal(stream(RollingMean(window), close), kernels.rolling_mean(close, window))
+        np.testing.assert_array_equal(stream(RollingStd(window), close), kernels.rolling_std(close, window))
+
+    def test_ema_and_macd(self, sample_ohlcv_data):
+        close = sample_ohlcv_data["close"].to_numpy()
+        np.testing.assert_array_equal(stream(EMA(span=12), close), kernels.ema(close, 12))
+        np.testing.assert_array_equal(
+            stream(EMA(alpha=1 / 14, min_periods=14), close), kernels.wilder_mean(close, 14)
+        )
+        expected = kernels.macd(kernels.ema(close, 12), kernels.ema(close, 26))
+        np.testing.assert_array_equal(stream(MACD(), close).T, np.array(expected))
+
+    @pytest.mark.parametrize("wilder", [False, True])
+    def test_rsi_and_adx(self, sample_ohlcv_data, wilder):
+        high, low, close = (sample_ohlcv_data[col].to_numpy() for col in ["high", "low", "close"])
+        np.testing.assert_array_equal(stream(RSI(14, wilder), close), kernels.rsi(close, 14, wilder))
+        np.testing.assert_array_equal(
+            stream(ADX(14, wilder), high, low, close).T,
+            np.array(kernels.adx(high, low, close, 14, wilder)),
+        )
+
+    def test_obv(self, sample_ohlcv_data):
+        close, volume = sample_ohlcv_data["close"].to_numpy(), sample_ohlcv_data["volume"].to_numpy()
+        np.testing.assert_array_equal(stream(OBV(), close, volume), kernels.obv(close, volume))
+
+    def test_state_round_trip(self, sample_ohlcv_data):
+        """状态经 JSON 序列化后继续更新，结果不变"""
+        close = sample_ohlcv_data["close"].to_numpy()
+        indicator = RollingStd(20)
+        head = stream(indicator, close[:250])
+        restored = RollingStd.from_state(json.loads(json.dumps(indicator.to_state())))
+        np.testing.assert_array_equal(
+            np.concatenate([head, stream(restored, close[250:])]), kernels.rolling_std(close, 20)
+        )
+
+    def test_ema_requires_span_or_alpha(self):
+        with pytest.raises(ValueError):
+            EMA()
+
+
+class TestStreamingIndicatorSet:
+    """测试流式指标集合与 IndicatorEngine 逐位一致"""
+
+    def test_matches_engine_across_restore(self, sample_ohlcv_data):
+        """分两段喂入（中间持久化并恢复状态）与全量计算一致"""
+        indicators = StreamingIndicatorSet()
+        head = indicators.update_frame(sample_ohlcv_data.iloc[:400])
+        indicators = StreamingIndicatorSet.from_state(json.loads(json.dumps(indicators.to_state())))
+        tail = indicators.update_frame(sample_ohlcv_data.iloc[400:])
+
+        expected = IndicatorEngine(sample_ohlcv_data).get_indicators(STREAMING_COLUMNS)[STREAMING_COLUMNS]
+        pd.testing.assert_frame_equal(pd.concat([head, tail]), expected, check_exact=True)
+        assert indicators.n_bars == len(sample_ohlcv_data)
@@ -0,0 +1,153 @@
+"""
+测试工具调用日志后台写入器 - 批量写入、内容去重、flush
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from tradingagents.dataflows.database import TradingDatabase
+from tradingagents.dataflows.tool_call_writer import ToolCallRecord, ToolCallWriter, result_hash
+
+
+def _record(result, tool_name="get_news", symbol="NVDA"):
+    return ToolCallRecord(
+        symbol=symbol,
+        trade_date="2025-06-30",
+        tool_name=tool_name,
+        vendor_used="yfinance",
+        input_params={"args": [symbol], "kwargs": {}},
+        result=result,
+        created_at="2025-06-30T10:00:00",
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = TradingDatabase(str(tmp_path / "analysis.db"))
+    yield database
+    database.tool_call_writer.close()
+
+
+class TestToolCallWriter:
+    """测试后台写入"""
+
+    def test_flush_makes_records_visible(self, db):
+        for i in range(5):
+            assert db.save_tool_call("NVDA", "2025-06-30", "get_news", "yfinance",
+                                     {"args": ["NVDA"]}, f"result-{i}")
+        assert db.flush_tool_calls(timeout=5)
+
+        calls = db.get_tool_calls("NVDA", "2025-06-30")
+        assert len(calls) == 5
+        assert calls[0]["result_preview"] == "result-0"
+        assert db.get_tool_call_result(calls[3]["result_hash"]) == "result-3"
+
+    def test_identical_results_stored_once(self, db):
+        big = "timestamp,close\n" + "2025-01-02,1.0\n" * 1000
+        for tool_name in ("get_stock_data", "get_stock_data", "get_indicators"):
+            db.save_tool_call("NVDA", "2025-06-30", tool_name, "cache", {}, big)
+        db.flush_tool_calls(timeout=5)
+
+        with sqlite3.connect(db.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM tool_calls").fetchone()[0] == 3
+            assert conn.execute("SELECT COUNT(*) FROM tool_call_results").fetchone()[0] == 1
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        stats = db.tool_call_writer.get_stats()
+        assert stats["written"] == 3
+        assert stats["deduplicated"] == 2
+        assert db.get_tool_call_result(result_hash(big)) == big
+
+    def test_batches_use_single_writer_thread(self, db):
+        threads = []
+        original_write = db.tool_call_writer._write
+
+        def spy(conn, batch):
+            threads.append(threading.current_thread().name)
+            original_write(conn, batch)
+
+        db.tool_call_writer._write = spy
+        for i in range(50):
+            db.save_tool_call("NVDA", "2025-06-30", "get_news", "yfinance", {}, f"r{i}")
+        db.flush_tool_calls(timeout=5)
+
+        assert set(threads) == {"tool-call-writer"}
+        assert len(threads) <= 50
+        assert len(db.get_tool_calls("NVDA", "2025-06-30")) == 50
+
+    def test_close_drains_queue(self, db):
+        writer = db.tool_call_writer
+        for i in range(10):
+            writer.submit(_record(f"r{i}"))
+        writer.close()
+
+        assert writer.get_stats()["written"] == 10
+        assert not writer.submit(_record("late"))
+
+    def test_full_queue_drops_after_timeout(self, tmp_path):
+        writer = ToolCallWriter(str(tmp_path / "none.db"), max_queue=1, enqueue_timeout=0.01)
+        blocker = threading.Event()
+        writer._write = lambda conn, batch: blocker.wait(5)
+        try:
+            results = [writer.submit(_record(f"r{i}")) for i in range(4)]
+            assert results[0] is True
+            assert False in results
+            assert writer.get_stats()["dropped"] >= 1
+        finally:
+            blocker.set()
+            writer.close()
+
+    def test_flush_timeout_covers_enqueue_and_wait(self, tmp_path):
+        """队列满时 flush 的入队等待和写入等待合计不超过 timeout"""
+        writer = ToolCallWriter(str(tmp_path / "none.db"), max_queue=1, enqueue_timeout=0.01)
+        blocker = threading.Event()
+        writer._write = lambda conn, batch: blocker.wait(5)
+        try:
+            writer.submit(_record("r0"))
+            time.sleep(0.05)  # 后台线程取走 r0 后阻塞在写入
+            writer.submit(_record("r1"))
+            # 0.2 秒后腾出一个位置：flush 此时才入队，只能再等剩余的 0.1 秒
+            threading.Timer(0.2, writer._queue.get).start()
+
+            start = time.perf_counter()
+            assert writer.flush(timeout=0.3) is False
+            assert time.perf_counter() - start < 0.45
+        finally:
+            blocker.set()
+            writer.close()
+
+    def test_flush_without_writes(self, tmp_path):
+        writer = ToolCallWriter(str(tmp_path / "unused.db"))
+        assert writer.flush(timeout=1)
+
+
+class TestSchemaUpgrade:
+    """测试旧库升级"""
+
+    def test_adds_result_hash_column(self, tmp_path):
+        path = str(tmp_path / "old.db")
+        with sqlite3.connect(path) as conn:
+            conn.execute("""
+                CREATE TABLE tool_calls (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT NOT NULL, trade_date TEXT NOT NULL, tool_name TEXT NOT NULL,
+                    vendor_used TEXT, input_params TEXT, result_preview TEXT,
+                    full_result TEXT, created_at TEXT NOT NULL
+                )
+            """)
+            conn.execute(
+                "INSERT INTO tool_calls (symbol, trade_date, tool_name, input_params, "
+                "result_preview, full_result, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ("NVDA", "2025-06-30", "get_news", "{}", "old", "old", "2025-06-30T09:00:00"),
+            )
+
+        db = TradingDatabase(path)
+        try:
+            db.save_tool_call("NVDA", "2025-06-30", "get_news", "yfinance", {}, "new")
+            calls = db.get_tool_calls("NVDA", "2025-06-30")
+            assert [c["result_preview"] for c in calls] == ["old", "new"]
+            assert calls[0]["result_hash"] is None
+        finally:
+            db.tool_call_writer.close()
@@ -0,0 +1,169 @@
+"""
+测试交易日历与缓存有效期策略
+"""
+
+import math
+from datetime import date, datetime
+
+import pytest
+
+from tradingagents.agents.utils.agent_utils import is_market_open
+from tradingagents.core.container import get_container
+from tradingagents.dataflows.core.ttl_policy import TTL_FOREVER, CacheTTLPolicy
+from tradingagents.dataflows.data_cache import DataCache
+from tradingagents.dataflows.trading_calendar import (
+    HKEX,
+    NYSE,
+    get_calendar_for_symbol,
+    nyse_holidays,
+)
+
+
+def _ny(*args):
+    return datetime(*args, tzinfo=NYSE.tz)
+
+
+class TestTradingCalendar:
+    """测试交易日历"""
+
+    def test_nyse_holidays(self):
+        holidays = nyse_holidays(2025)
+        assert date(2025, 4, 18) in holidays   # 耶稣受难日
+        assert date(2025, 11, 27) in holidays  # 感恩节
+        assert date(2025, 1, 9) in holidays    # 临时休市
+        # 2022-01-01 是周六，不在 2021-12-31 补休
+        assert date(2021, 12, 31) not in nyse_holidays(2021)
+        # 2026-07-04 是周六，周五补休
+        assert date(2026, 7, 3) in nyse_holidays(2026)
+
+    def test_is_session(self):
+        assert NYSE.is_session("2025-06-27")
+        assert not NYSE.is_session("2025-06-28")
+        assert not NYSE.is_session("2025-12-25")
+
+    def test_early_close(self):
+        assert NYSE.session_close("2025-12-24").hour == 13
+        assert NYSE.session_close("2025-12-23").hour == 16
+
+    def test_last_closed_session(self):
+        assert NYSE.last_closed_session(_ny(2025, 6, 25, 11, 0)) == date(2025, 6, 24)
+        assert NYSE.last_closed_session(_ny(2025, 6, 25, 16, 30)) == date(2025, 6, 25)
+        assert NYSE.last_closed_session(_ny(2025, 7, 5, 12, 0)) == date(2025, 7, 3)
+
+    def test_next_open_skips_weekend(self):
+        assert NYSE.next_open(_ny(2025, 6, 27, 17, 0)) == _ny(2025, 6, 30, 9, 30)
+
+    def test_calendar_by_suffix(self):
+        assert get_calendar_for_symbol("NVDA") is NYSE
+        assert get_calendar_for_symbol("0700.HK") is HKEX
+
+
+class FakeBarManager:
+    """按日期返回K线的数据管理器，记录请求参数"""
+
+    def __init__(self, bar_dates):
+        self.bar_dates = bar_dates
+        self.requests = []
+
+    def fetch(self, method, *args, **kwargs):
+        self.requests.append((method, args, kwargs))
+        rows = "\n".join(f"{d},1,1,1,1,100" for d in self.bar_dates)
+        return "timestamp,open,high,low,close,volume\n" + rows
+
+
+@pytest.fixture
+def bar_manager():
+    container = get_container()
+    saved = container._singletons.get("data_manager")
+    fake = FakeBarManager(["2025-01-27", "2025-02-03"])  # 2025 春节：1/28 - 1/31 港股休市
+    container.register_instance("data_manager", fake)
+    yield fake
+    container.unregister("data_manager")
+    if saved is not None:
+        container.register_instance("data_manager", saved)
+
+
+class TestIsMarketOpen:
+    """测试是否开市：有节假日规则时按日历，否则按当天是否有K线"""
+
+    def test_nyse_uses_calendar_only(self, bar_manager):
+        assert is_market_open("NVDA", "2025-06-27")
+        assert not is_market_open("NVDA", "2025-12-25")
+        assert not is_market_open("0700.HK", "2025-02-01")  # 周六
+        assert bar_manager.requests == []
+
+    def test_hk_holiday_checks_bars(self, bar_manager):
+        """港股日历没有节假日规则：春节工作日没有K线即视为休市，查询走缓存（不强制刷新）"""
+        assert not HKEX.has_holiday_rule
+        assert not is_market_open("0700.HK", "2025-01-29")
+        assert is_market_open("0700.HK", "2025-02-03")
+        assert bar_manager.requests[0] == ("get_stock_data", ("0700.HK", "2025-01-24", "2025-01-29"), {})
+
+    """测试按方法与时效计算 TTL"""
+
+    def setup_method(self):
+        self.policy = CacheTTLPolicy(intraday_seconds=300, news_seconds=900, settle_seconds=1800)
+
+    def test_closed_session_bars_forever(self):
+        ttl = self.policy.ttl_seconds(
+            "get_stock_data", ("NVDA", "2025-01-01", "2025-06-20"), {}, now=_ny(2025, 6, 25, 11, 0)
+        )
+        assert ttl == TTL_FOREVER
+
+    def test_weekend_end_date_after_close_forever(self):
+        ttl = self.policy.ttl_seconds(
+            "get_stock_data", ("NVDA", "2025-01-01", "2025-06-28"), {}, now=_ny(2025, 6, 28, 9, 0)
+        )
+        assert ttl == TTL_FOREVER
+
+    def test_intraday_bars_expire_in_minutes(self):
+        ttl = self.policy.ttl_seconds(
+            "get_indicators", ("NVDA", "rsi", "2025-06-25", 30), {}, now=_ny(2025, 6, 25, 11, 0)
+        )
+        assert ttl == 300
+        # 收盘后但尚未定稿
+        ttl = self.policy.ttl_seconds(
+            "get_stock_data", ("NVDA", "2025-01-01", "2025-06-25"), {}, now=_ny(2025, 6, 25, 16, 10)
+        )
+        assert ttl == 300
+
+    def test_pre_market_valid_until_open(self):
+        ttl = self.policy.ttl_seconds(
+            "get_stock_data", ("NVDA", "2025-01-01", "2025-06-25"), {}, now=_ny(2025, 6, 25, 8, 30)
+        )
+        assert ttl == 3600
+
+    def test_news(self):
+        now = _ny(2025, 6, 25, 11, 0)
+        assert self.policy.ttl_seconds("get_news", ("NVDA", "2025-06-01", "2025-06-20"), {}, now) == TTL_FOREVER
+        assert self.policy.ttl_seconds("get_global_news", ("2025-06-25", 7, 10), {}, now) == 900
+
+    def test_fundamentals(self):
+        now = _ny(2025, 6, 25, 11, 0)
+        assert self.policy.ttl_seconds("get_balance_sheet", ("NVDA", "quarterly", "2025-03-01"), {}, now) == TTL_FOREVER
+        # 当前数据到下一次收盘过期
+        assert self.policy.ttl_seconds("get_fundamentals", ("NVDA",), {}, now) == 5 * 3600
+
+    def test_unknown_method_uses_default(self):
+        assert self.policy.ttl_seconds("custom_method", ("x",), {}) is None
+
+
+class TestDataCacheEntryTTL:
+    """测试 DataCache 按条目 TTL 写入"""
+
+    def test_forever_and_skip(self, tmp_path):
+        cache = DataCache(cache_dir=str(tmp_path), ttl_hours=0, sweep_interval_seconds=0)
+        try:
+            cache.set_by_key("k1", "get_stock_data", "bars", ttl_seconds=math.inf)
+            cache.set_by_key("k2", "get_stock_data", "bars", ttl_seconds=0)
+            cache.sweep()
+            assert cache.get_by_key("k1") == "bars"
+            assert cache.get_by_key("k2") is None
+        finally:
+            cache.close()
+
+        reopened = DataCache(cache_dir=str(tmp_path), sweep_interval_seconds=0)
+        try:
+            assert reopened.get_by_key("k1") == "bars"
+        finally:
+            reopened.close()
@@ -0,0 +1,528 @@
+"""
+测试统一数据管理器 - 在途请求合并与统计
+"""
+
+import asyncio
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.core.single_flight import SingleFlight
+from tradingagents.dataflows.data_cache import DataCache
+from tradingagents.dataflows.unified_data_manager import UnifiedDataManager
+from tradingagents.dataflows.vendor_models import DataFetchError, VendorPriority
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """使用临时缓存目录、不写数据库的数据管理器"""
+    mgr = UnifiedDataManager(default_max_retries=1, default_retry_delay_base=0)
+    mgr.cache = DataCache(cache_dir=str(tmp_path), sweep_interval_seconds=0)
+    monkeypatch.setattr(mgr, "_log_tool_call", lambda *a, **k: None)
+    mgr.register_vendor("slow", VendorPriority.PRIMARY, max_retries=1)
+    return mgr
+
+
+def _register_slow(mgr, calls, delay=0.2, fail=False):
+    def impl(*args):
+        calls.append(args)
+        time.sleep(delay)
+        if fail:
+            raise ValueError("boom")
+        return f"result:{args[0]}"
+    mgr.register_method("get_news", {"slow": impl})
+
+
+class TestSingleFlight:
+    """测试 SingleFlight 基础行为"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+        results = []
+
+        def work():
+            results.append(flight.do("k", lambda: calls.append(1) or time.sleep(0.1) or "v"))
+
+        threads = [threading.Thread(target=work) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+        assert flight.in_flight() == 0
+
+    def test_exception_propagates_to_waiters(self):
+        flight = SingleFlight()
+        errors = []
+
+        def fail():
+            time.sleep(0.1)
+            raise RuntimeError("x")
+
+        def work():
+            try:
+                flight.do("k", fail)
+            except RuntimeError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(errors) == 3
+        assert flight.in_flight() == 0
+
+
+    def test_cancelled_async_waiter_does_not_break_shared_call(self):
+        """异步等待者被取消不影响首个调用方和其他等待者"""
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "v"
+
+        async def main():
+            leader = asyncio.create_task(flight.do_async("k", fetch))
+            await asyncio.sleep(0)
+            cancelled = asyncio.create_task(flight.do_async("k", fetch))
+            other = asyncio.create_task(flight.do_async("k", fetch))
+            await asyncio.sleep(0.01)
+            cancelled.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await cancelled
+            return await leader, await other
+
+        assert asyncio.run(main()) == (("v", False), ("v", True))
+        assert flight.in_flight() == 0
+
+    def test_cancelled_async_leader_fails_waiters_with_fetch_error(self):
+        """首个调用方被取消时，同步和异步等待者都收到 DataFetchError 而不是 CancelledError"""
+        flight = SingleFlight()
+        sync_errors = []
+
+        def sync_waiter():
+            try:
+                flight.do("k", lambda: "never")
+            except DataFetchError as e:
+                sync_errors.append(e)
+
+        async def main():
+            leader = asyncio.create_task(flight.do_async("k", lambda: asyncio.sleep(1)))
+            await asyncio.sleep(0)
+            thread = threading.Thread(target=sync_waiter)
+            thread.start()
+            waiter = asyncio.create_task(flight.do_async("k", lambda: asyncio.sleep(0)))
+            await asyncio.sleep(0.05)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            with pytest.raises(DataFetchError):
+                await waiter
+            await asyncio.to_thread(thread.join)
+
+        asyncio.run(main())
+        assert len(sync_errors) == 1
+        assert flight.in_flight() == 0
+
+
+class TestFetchCoalescing:
+    """测试 fetch 的在途请求合并"""
+
+    def test_identical_misses_call_vendor_once(self, manager):
+        calls = []
+        _register_slow(manager, calls)
+        results = []
+
+        threads = [
+            threading.Thread(target=lambda: results.append(manager.fetch("get_news", "NVDA", no_cache=True)))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert results == ["result:NVDA"] * 4
+        stats = manager.get_stats()["global"]
+        assert stats["coalesced_hits"] == 3
+        assert stats["cache_hits"] == 0
+        assert stats["successful_calls"] == 4
+
+    def test_different_args_not_coalesced(self, manager):
+        calls = []
+        _register_slow(manager, calls, delay=0.05)
+        threads = [
+            threading.Thread(target=manager.fetch, args=("get_news", sym), kwargs={"no_cache": True})
+            for sym in ("NVDA", "AAPL")
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(calls) == 2
+        assert manager.get_stats()["global"]["coalesced_hits"] == 0
+
+    def test_cache_hits_counted_separately(self, manager):
+        calls = []
+        _register_slow(manager, calls, delay=0)
+        manager.fetch("get_news", "NVDA")
+        manager.fetch("get_news", "NVDA")
+        stats = manager.get_stats()["global"]
+        assert len(calls) == 1
+        assert stats["cache_hits"] == 1
+        assert stats["coalesced_hits"] == 0
+
+    def test_failure_shared_with_waiters(self, manager):
+        calls = []
+        _register_slow(manager, calls, fail=True)
+        errors = []
+
+        def work():
+            try:
+                manager.fetch("get_news", "NVDA", no_cache=True)
+            except DataFetchError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert len(errors) == 3
+        assert manager.get_stats()["global"]["failed_calls"] == 3
+
+    def test_async_and_sync_share_in_flight_table(self, manager):
+        calls = []
+        _register_slow(manager, calls, delay=0.3)
+        sync_result = []
+        thread = threading.Thread(
+            target=lambda: sync_result.append(manager.fetch("get_news", "NVDA", no_cache=True))
+        )
+
+        async def main():
+            thread.start()
+            await asyncio.sleep(0.05)
+            return await asyncio.gather(
+                manager.fetch_async("get_news", "NVDA", no_cache=True),
+                manager.fetch_async("get_news", "NVDA", no_cache=True),
+            )
+
+        async_results = asyncio.run(main())
+        thread.join()
+
+        assert len(calls) == 1
+        assert sync_result == ["result:NVDA"]
+        assert async_results == ["result:NVDA", "result:NVDA"]
+        assert manager.get_stats()["global"]["coalesced_hits"] == 2
+
+
+class TestBarStoreIntegration:
+    """测试 get_stock_data 走K线存储"""
+
+    def test_overlapping_ranges_fetch_only_gap(self, manager, tmp_path):
+        from tradingagents.dataflows.bar_store import BarStore
+
+        calls = []
+
+        def impl(symbol, start_date, end_date):
+            calls.append((start_date, end_date))
+            days = pd.bdate_range(start_date, end_date)
+            return pd.DataFrame({
+                "timestamp": days.strftime("%Y-%m-%d"),
+                "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 100,
+            }).to_csv(index=False)
+
+        manager.bar_store = BarStore(str(tmp_path / "bars"))
+        manager.register_method("get_stock_data", {"slow": impl})
+
+        manager.fetch("get_stock_data", "NVDA", "2025-08-01", "2026-02-20")
+        manager.fetch("get_stock_data", "NVDA", "2025-08-02", "2026-02-23")
+        manager.fetch("get_stock_data", "NVDA", "2025-08-15", "2026-02-20")
+
+        assert len(calls) == 2
+        assert calls[1][0] == "2026-02-21"
+        stats = manager.get_stats()
+        assert stats["global"]["cache_hits"] == 1
+        assert stats["global"]["successful_calls"] == 3
+        assert stats["bar_store"]["gap_fetches"] == 2
+
+
+class TestLargeArgDigest:
+    """测试大参数在日志中以摘要出现"""
+
+    def test_tool_call_log_uses_digest(self, manager, monkeypatch):
+        logged = []
+        monkeypatch.setattr(
+            manager, "_log_tool_call", lambda method, vendor, args, kwargs, result: logged.append(args)
+        )
+        manager.register_method("get_all_indicators", {"slow": lambda *a: "ok"})
+        stock_data = "timestamp,close\n" + "2025-01-02,1.0\n" * 500
+
+        manager.fetch("get_all_indicators", "NVDA", "2025-02-01", 30, stock_data)
+        manager.fetch("get_all_indicators", "NVDA", "2025-02-01", 30, stock_data)
+
+        assert manager.get_stats()["global"]["cache_hits"] == 1
+        assert all(args[3].startswith("<str:") for args in logged)
+
+
+class TestVendorGuards:
+    """测试熔断与限速在数据源降级中的作用"""
+
+    def _register_pair(self, manager, calls):
+        def broken(*args):
+            calls.append("broken")
+            raise ConnectionError("down")
+
+        def backup(*args):
+            calls.append("backup")
+            return "ok"
+
+        manager.register_vendor("broken", VendorPriority.PRIMARY, max_retries=1,
+                                circuit_failure_threshold=2, circuit_recovery_seconds=60)
+        manager.register_vendor("backup", VendorPriority.SECONDARY, max_retries=1)
+        manager.register_method("get_news", {"broken": broken, "backup": backup},
+                                ["broken", "backup"])
+
+    def test_open_circuit_skips_vendor(self, manager):
+        calls = []
+        self._register_pair(manager, calls)
+        for _ in range(4):
+            assert manager.fetch("get_news", "NVDA", no_cache=True) == "ok"
+
+        assert calls.count("broken") == 2
+        assert calls.count("backup") == 4
+        circuit = manager.get_stats()["vendors"]["broken"]["circuit"]["get_news"]
+        assert circuit["state"] == "open"
+        assert circuit["rejected"] == 2
+
+    def test_pacing_wait_too_long_falls_back(self, manager):
+        calls = []
+        manager.register_vendor("paced", VendorPriority.PRIMARY, max_retries=1,
+                                requests_per_minute=1, max_pacing_wait=0.1)
+        manager.register_vendor("backup", VendorPriority.SECONDARY, max_retries=1)
+        manager.register_method("get_news", {
+            "paced": lambda *a: calls.append("paced") or "paced",
+            "backup": lambda *a: calls.append("backup") or "backup",
+        }, ["paced", "backup"])
+
+        assert manager.fetch("get_news", "NVDA", no_cache=True) == "paced"
+        assert manager.fetch("get_news", "AAPL", no_cache=True) == "backup"
+
+        vendor = manager.get_stats()["vendors"]["paced"]
+        assert vendor["paced_skips"] == 1
+        assert vendor["rate_limiter"]["rejected"] == 1
+        # 限速跳过不计为失败
+        assert vendor["circuit"]["get_news"]["consecutive_failures"] == 0
+
+    def test_bad_input_does_not_open_circuit(self, manager):
+        """无法解析的输入多次失败不计入熔断，之后的有效调用照常计算"""
+        from tradingagents.dataflows.interface import _local_get_all_indicators
+
+        manager.register_vendor("local", VendorPriority.PRIMARY, max_retries=1,
+                                circuit_failure_threshold=2, circuit_recovery_seconds=60)
+        manager.register_method("get_all_indicators", {"local": _local_get_all_indicators})
+        for _ in range(3):
+            with pytest.raises(DataFetchError):
+                manager.fetch("get_all_indicators", "BAD", "2026-02-20", 30, "not,a\ncsv", no_cache=True)
+
+        dates = pd.bdate_range("2025-06-01", periods=200)
+        prices = pd.Series(range(200), dtype=float) * 0.1 + 100
+        stock_data = pd.DataFrame({
+            "timestamp": dates.strftime("%Y-%m-%d"), "open": prices, "high": prices + 1,
+            "low": prices - 1, "close": prices + 0.5, "volume": 1_000_000,
+        }).to_csv(index=False)
+        assert manager.fetch("get_all_indicators", "AAPL", "2026-02-20", 30, stock_data, no_cache=True)
+        circuit = manager.get_stats()["vendors"]["local"]["circuit"]["get_all_indicators"]
+        assert circuit["state"] == "closed" and circuit["consecutive_failures"] == 0
+
+    def test_circuit_is_per_method_and_local_is_exempt(self, manager):
+        """某个方法熔断不影响同一数据源的其他方法；关闭熔断的数据源从不被跳过"""
+        calls = []
+        self._register_pair(manager, calls)
+        manager.register_method("get_stock_data", {
+            "broken": lambda *a: calls.append("broken_stock") or "stock",
+        })
+        for _ in range(3):
+            manager.fetch("get_news", "NVDA", no_cache=True)
+        assert manager.fetch("get_stock_data", "NVDA", no_cache=True) == "stock"
+
+        def local(*args):
+            calls.append("local")
+            raise ConnectionError("down")
+
+        manager.register_vendor("local", VendorPriority.PRIMARY, max_retries=1,
+                                circuit_failure_threshold=1, circuit_breaker_enabled=False)
+        manager.register_method("get_chart_patterns", {"local": local})
+        for _ in range(3):
+            with pytest.raises(DataFetchError):
+                manager.fetch("get_chart_patterns", "NVDA", no_cache=True)
+        assert calls.count("local") == 3
+        assert manager.get_stats()["vendors"]["local"]["circuit"] == {}
+
+
+class TestHedgedRequests:
+    """测试对冲请求"""
+
+    def _setup(self, manager, primary_delay):
+        calls = []
+        state = {"delay": 0.0}
+
+        def primary(*args):
+            calls.append("primary")
+            time.sleep(state["delay"])
+            return "primary"
+
+        def backup(*args):
+            calls.append("backup")
+            return "backup"
+
+        manager.hedge_requests = True
+        manager.hedge_min_samples = 3
+        manager.register_vendor("primary", VendorPriority.PRIMARY, max_retries=1)
+        manager.register_vendor("backup", VendorPriority.SECONDARY, max_retries=1)
+        manager.register_method("get_stock_data", {"primary": primary, "backup": backup},
+                                ["primary", "backup"])
+        # 预热：主数据源 p95 约为几十毫秒
+        for i in range(3):
+            state["delay"] = 0.02
+            manager.fetch("get_stock_data", f"WARM{i}", no_cache=True)
+        state["delay"] = primary_delay
+        return calls
+
+    def test_slow_primary_hedged(self, manager):
+        calls = self._setup(manager, primary_delay=1.0)
+        start = time.monotonic()
+        assert manager.fetch("get_stock_data", "NVDA", no_cache=True) == "backup"
+        assert time.monotonic() - start < 0.5
+
+        stats = manager.get_stats()
+        assert stats["global"]["hedged_calls"] == 1
+        assert stats["global"]["hedge_wins"] == 1
+        assert manager.last_vendor_used == "backup"
+        assert stats["latency"]["primary"]["get_stock_data"]["count"] == 3
+
+    def test_fast_primary_not_hedged(self, manager):
+        calls = self._setup(manager, primary_delay=0.0)
+        assert manager.fetch("get_stock_data", "NVDA", no_cache=True) == "primary"
+        assert "backup" not in calls
+        assert manager.get_stats()["global"]["hedged_calls"] == 0
+
+    def test_failed_primary_falls_through(self, manager):
+        calls = []
+
+        def broken(*args):
+            raise ConnectionError("down")
+
+        manager.hedge_requests = True
+        manager.register_vendor("broken", VendorPriority.PRIMARY, max_retries=1)
+        manager.register_vendor("backup", VendorPriority.SECONDARY, max_retries=1)
+        manager.register_method("get_news", {
+            "broken": broken,
+            "backup": lambda *a: calls.append("backup") or "backup",
+        }, ["broken", "backup"])
+
+        assert manager.fetch("get_news", "NVDA", no_cache=True) == "backup"
+        assert manager.get_stats()["global"]["hedged_calls"] == 0
+
+
+class TestNativeAsyncPath:
+    """测试 fetch_async 的原生异步数据路径"""
+
+    def test_async_impl_used_without_threads(self, manager):
+        calls = []
+
+        async def aimpl(*args):
+            calls.append(("async", threading.current_thread() is threading.main_thread()))
+            await asyncio.sleep(0.01)
+            return f"async:{args[0]}"
+
+        manager.register_method(
+            "get_news", {"slow": lambda *a: "sync"}, async_implementations={"slow": aimpl}
+        )
+
+        async def main():
+            return await asyncio.gather(*(
+                manager.fetch_async("get_news", f"SYM{i}") for i in range(20)
+            ))
+
+        results = asyncio.run(main())
+        assert results == [f"async:SYM{i}" for i in range(20)]
+        assert all(on_main for _, on_main in calls)
+        assert manager.get_stats()["global"]["successful_calls"] == 20
+        # 结果写入缓存，同步入口直接命中
+        assert manager.fetch("get_news", "SYM3") == "async:SYM3"
+        assert manager.get_stats()["global"]["cache_hits"] == 1
+
+    def test_sync_only_vendor_runs_in_vendor_pool(self, manager):
+        threads = []
+
+        def impl(*args):
+            threads.append(threading.current_thread().name)
+            return "sync"
+
+        manager.register_method("get_news", {"slow": impl})
+        assert asyncio.run(manager.fetch_async("get_news", "NVDA")) == "sync"
+        assert threads[0].startswith("vendor")
+
+    def test_async_failure_falls_back(self, manager):
+        async def broken(*args):
+            raise ConnectionError("down")
+
+        manager.register_vendor("backup", VendorPriority.SECONDARY, max_retries=1)
+        manager.register_method(
+            "get_news",
+            {"slow": lambda *a: "unused", "backup": lambda *a: "backup"},
+            ["slow", "backup"],
+            async_implementations={"slow": broken},
+        )
+
+        assert asyncio.run(manager.fetch_async("get_news", "NVDA")) == "backup"
+        assert manager.get_stats()["vendors"]["slow"]["last_error"] == "down"
+
+    def test_all_async_vendors_fail(self, manager):
+        async def broken(*args):
+            raise ConnectionError("down")
+
+        manager.register_method(
+            "get_news", {"slow": lambda *a: "unused"}, async_implementations={"slow": broken}
+        )
+        with pytest.raises(DataFetchError):
+            asyncio.run(manager.fetch_async("get_news", "NVDA"))
+        assert manager.get_stats()["global"]["failed_calls"] == 1
+
+    def test_bar_store_gaps_fetched_async(self, manager, tmp_path):
+        from tradingagents.dataflows.bar_store import BarStore
+
+        calls = []
+
+        async def aimpl(symbol, start_date, end_date):
+            calls.append((start_date, end_date))
+            days = pd.bdate_range(start_date, end_date)
+            return pd.DataFrame({
+                "timestamp": days.strftime("%Y-%m-%d"),
+                "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 100,
+            }).to_csv(index=False)
+
+        manager.bar_store = BarStore(str(tmp_path / "bars"))
+        manager.register_method(
+            "get_stock_data", {"slow": lambda *a: "unused"}, async_implementations={"slow": aimpl}
+        )
+
+        asyncio.run(manager.fetch_async("get_stock_data", "NVDA", "2025-08-01", "2026-02-20"))
+        result = asyncio.run(
+            manager.fetch_async("get_stock_data", "NVDA", "2025-08-15", "2026-02-20")
+        )
+
+        assert len(calls) == 1
+        assert result.splitlines()[-1].startswith("2026-02-20")
+        assert manager.get_stats()["global"]["cache_hits"] == 1
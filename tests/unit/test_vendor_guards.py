@@ -0,0 +1,110 @@
+"""
+测试数据源令牌桶限速与熔断器
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from tradingagents.dataflows.core.circuit_breaker import CircuitBreaker, CircuitState
+from tradingagents.dataflows.core.token_bucket import TokenBucket
+
+
+class TestTokenBucket:
+    """测试令牌桶"""
+
+    def test_burst_then_paced(self):
+        bucket = TokenBucket(rate_per_minute=600, capacity=2)  # 每 0.1 秒一个令牌
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == 0
+        start = time.monotonic()
+        waited = bucket.acquire()
+        assert waited > 0
+        assert time.monotonic() - start >= 0.08
+
+    def test_max_wait_rejects_without_reserving(self):
+        bucket = TokenBucket(rate_per_minute=6)  # 每 10 秒一个令牌
+        bucket.acquire()
+        assert bucket.acquire(max_wait=0.5) is None
+        stats = bucket.get_stats()
+        assert stats["rejected"] == 1
+        assert stats["acquired"] == 1
+
+    def test_threads_share_bucket(self):
+        bucket = TokenBucket(rate_per_minute=1200)  # 每 0.05 秒一个令牌
+        start = time.monotonic()
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # 首个立即发送，其余 4 个依次间隔 0.05 秒
+        assert time.monotonic() - start >= 0.18
+
+    def test_defer_delays_next_acquire(self):
+        bucket = TokenBucket(rate_per_minute=600, capacity=5)
+        bucket.defer(1.0)
+        assert bucket.acquire(max_wait=0.5) is None
+
+    def test_async_acquire_shares_bucket(self):
+        bucket = TokenBucket(rate_per_minute=1200)  # 每 0.05 秒一个令牌
+
+        async def main():
+            return await asyncio.gather(*(bucket.acquire_async() for _ in range(4)))
+
+        start = time.monotonic()
+        waits = asyncio.run(main())
+        assert waits[0] == 0
+        assert time.monotonic() - start >= 0.13
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate_per_minute=0)
+
+
+class TestCircuitBreaker:
+    """测试熔断器状态转换"""
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker("v", failure_threshold=2, recovery_seconds=60)
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state is CircuitState.OPEN
+        assert not breaker.allow_request()
+        assert breaker.get_stats()["rejected"] == 1
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker("v", failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_half_open_single_probe(self):
+        breaker = CircuitBreaker("v", failure_threshold=1, recovery_seconds=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+        breaker.record_success()
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_half_open_failure_reopens(self):
+        breaker = CircuitBreaker("v", failure_threshold=1, recovery_seconds=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.get_stats()["opened"] == 2
+
+    def test_skipped_probe_returns_slot(self):
+        breaker = CircuitBreaker("v", failure_threshold=1, recovery_seconds=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        assert breaker.allow_request()
+        breaker.record_skipped()
+        assert breaker.allow_request()
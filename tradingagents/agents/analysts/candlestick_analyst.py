@@ -1,8 +1,10 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from datetime import datetime, timedelta
 from tradingagents.agents.utils.agent_utils import get_stock_data, get_candlestick_patterns
 from tradingagents.agents.utils.logging_utils import log_debug_prompt
+from tradingagents.agents.utils.node_steps import Invoke, LLMCall, step_node
+from tradingagents.agents.utils.run_context import run_config
 from tradingagents.dataflows.config import get_config
+from tradingagents.dataflows.run_data import analyst_stock_window
 from tradingagents.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -82,7 +84,7 @@ Do NOT simply state that patterns are mixed. Provide detailed, nuanced analysis
 
 
 def create_candlestick_analyst(llm):
-    def candlestick_analyst_node(state):
+    def candlestick_analyst_step(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         
@@ -90,19 +92,20 @@ def create_candlestick_analyst(llm):
         config = get_config()
         language = config.get("output_language", "zh")
         
-        end_date = current_date
-        start_date = (datetime.strptime(end_date, "%Y-%m-%d") - timedelta(days=180)).strftime("%Y-%m-%d")
+        start_date, end_date = analyst_stock_window(current_date)
+        # 携带运行 ID：数据已由 Data Prefetch 节点预取时直接读取
+        tool_config = run_config(state)
         
-        stock_data = get_stock_data.invoke({"symbol": ticker, "start_date": start_date, "end_date": end_date})
+        stock_data = yield Invoke(get_stock_data, {"symbol": ticker, "start_date": start_date, "end_date": end_date}, tool_config)
         
         # 获取蜡烛图形态 - 直接传递已获取的stock_data，避免重复获取
         try:
-            candlestick_patterns_data = get_candlestick_patterns.invoke({
+            candlestick_patterns_data = yield Invoke(get_candlestick_patterns, {
                 "symbol": ticker,
                 "start_date": start_date,
                 "end_date": end_date,
                 "stock_data": stock_data
-            })
+            }, tool_config)
         except (ValueError, TypeError, KeyError) as e:
             candlestick_patterns_data = f"Error getting candlestick patterns: {str(e)}"
         
@@ -152,7 +155,7 @@ def create_candlestick_analyst(llm):
         log_debug_prompt(config, "Candlestick Analyst", language, logger,
                          **{"System Message": system_message, "Assistant Prompt": assistant_prompt})
         
-        result = chain.invoke(state["messages"])
+        result = yield LLMCall(chain, state["messages"])
         report = result.content
 
         return {
@@ -160,4 +163,4 @@ def create_candlestick_analyst(llm):
             "candlestick_report": report,
         }
 
-    return candlestick_analyst_node
+    return step_node(candlestick_analyst_step)
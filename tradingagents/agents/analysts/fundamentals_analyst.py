@@ -1,6 +1,8 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from tradingagents.agents.utils.agent_utils import get_fundamentals, get_balance_sheet, get_cashflow, get_income_statement
 from tradingagents.agents.utils.logging_utils import log_debug_prompt
+from tradingagents.agents.utils.node_steps import Invoke, LLMCall, step_node
+from tradingagents.agents.utils.run_context import run_config
 from tradingagents.dataflows.config import get_config
 from tradingagents.utils.logger import get_logger
 
@@ -20,7 +22,7 @@ SYSTEM_PROMPTS = {
 
 
 def create_fundamentals_analyst(llm):
-    def fundamentals_analyst_node(state):
+    def fundamentals_analyst_step(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         
@@ -28,27 +30,30 @@ def create_fundamentals_analyst(llm):
         config = get_config()
         language = config.get("output_language", "zh")
         
+        # 携带运行 ID：数据已由 Data Prefetch 节点预取时直接读取
+        tool_config = run_config(state)
+        
         fundamentals_data = ""
         try:
-            fundamentals_data = get_fundamentals.invoke({"ticker": ticker, "curr_date": current_date})
+            fundamentals_data = yield Invoke(get_fundamentals, {"ticker": ticker, "curr_date": current_date}, tool_config)
         except (ConnectionError, ValueError, TimeoutError, OSError) as e:
             fundamentals_data = f"Error fetching fundamentals: {str(e)}"
         
         balance_sheet_data = ""
         try:
-            balance_sheet_data = get_balance_sheet.invoke({"ticker": ticker, "freq": "quarterly", "curr_date": current_date})
+            balance_sheet_data = yield Invoke(get_balance_sheet, {"ticker": ticker, "freq": "quarterly", "curr_date": current_date}, tool_config)
         except (ConnectionError, ValueError, TimeoutError, OSError) as e:
             balance_sheet_data = f"Error fetching balance sheet: {str(e)}"
         
         cashflow_data = ""
         try:
-            cashflow_data = get_cashflow.invoke({"ticker": ticker, "freq": "quarterly", "curr_date": current_date})
+            cashflow_data = yield Invoke(get_cashflow, {"ticker": ticker, "freq": "quarterly", "curr_date": current_date}, tool_config)
         except (ConnectionError, ValueError, TimeoutError, OSError) as e:
             cashflow_data = f"Error fetching cashflow: {str(e)}"
         
         income_statement_data = ""
         try:
-            income_statement_data = get_income_statement.invoke({"ticker": ticker, "freq": "quarterly", "curr_date": current_date})
+            income_statement_data = yield Invoke(get_income_statement, {"ticker": ticker, "freq": "quarterly", "curr_date": current_date}, tool_config)
         except (ConnectionError, ValueError, TimeoutError, OSError) as e:
             income_statement_data = f"Error fetching income statement: {str(e)}"
         
@@ -104,7 +109,7 @@ def create_fundamentals_analyst(llm):
         log_debug_prompt(config, "Fundamentals Analyst", language, logger,
                          **{"System Message": system_message, "Assistant Prompt": assistant_prompt})
         
-        result = chain.invoke(state["messages"])
+        result = yield LLMCall(chain, state["messages"])
         report = result.content
 
         return {
@@ -112,4 +117,4 @@ def create_fundamentals_analyst(llm):
             "fundamentals_report": report,
         }
 
-    return fundamentals_analyst_node
+    return step_node(fundamentals_analyst_step)
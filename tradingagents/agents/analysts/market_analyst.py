@@ -1,8 +1,11 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from datetime import datetime, timedelta
 from tradingagents.agents.utils.agent_utils import get_stock_data, get_all_indicators, get_chart_patterns
 from tradingagents.agents.utils.logging_utils import log_debug_prompt
+from tradingagents.agents.utils.node_steps import Invoke, LLMCall, step_node
+from tradingagents.agents.utils.run_context import run_config
+from tradingagents.constants import ANALYST_CHART_PATTERN_LOOKBACK, ANALYST_INDICATOR_LOOKBACK_DAYS
 from tradingagents.dataflows.config import get_config
+from tradingagents.dataflows.run_data import analyst_stock_window
 from tradingagents.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -138,7 +141,7 @@ Do NOT simply state that patterns are mixed. Provide detailed, nuanced analysis
 
 
 def create_market_analyst(llm):
-    def market_analyst_node(state):
+    def market_analyst_step(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         
@@ -146,28 +149,29 @@ def create_market_analyst(llm):
         config = get_config()
         language = config.get("output_language", "zh")
         
-        end_date = current_date
-        start_date = (datetime.strptime(end_date, "%Y-%m-%d") - timedelta(days=180)).strftime("%Y-%m-%d")
+        start_date, end_date = analyst_stock_window(current_date)
+        # 携带运行 ID：数据已由 Data Prefetch 节点预取时直接读取
+        tool_config = run_config(state)
         
-        stock_data = get_stock_data.invoke({"symbol": ticker, "start_date": start_date, "end_date": end_date})
+        stock_data = yield Invoke(get_stock_data, {"symbol": ticker, "start_date": start_date, "end_date": end_date}, tool_config)
         
-        indicators_data = get_all_indicators.invoke({
+        indicators_data = yield Invoke(get_all_indicators, {
             "symbol": ticker,
             "curr_date": current_date,
-            "look_back_days": 120,
+            "look_back_days": ANALYST_INDICATOR_LOOKBACK_DAYS,
             "stock_data": stock_data
-        })
+        }, tool_config)
         
         # 获取西方图表形态
         chart_patterns_data = ""
         try:
-            chart_patterns_data = get_chart_patterns.invoke({
+            chart_patterns_data = yield Invoke(get_chart_patterns, {
                 "symbol": ticker,
                 "start_date": start_date,
                 "end_date": end_date,
-                "lookback": 60,
+                "lookback": ANALYST_CHART_PATTERN_LOOKBACK,
                 "stock_data": stock_data
-            })
+            }, tool_config)
         except (ValueError, TypeError, KeyError) as e:
             chart_patterns_data = f"Error getting chart patterns: {str(e)}"
         
@@ -220,7 +224,7 @@ def create_market_analyst(llm):
         log_debug_prompt(config, "Market Analyst", language, logger,
                          **{"System Message": system_message, "Assistant Prompt": assistant_prompt})
         
-        result = chain.invoke(state["messages"])
+        result = yield LLMCall(chain, state["messages"])
         report = result.content
 
         return {
@@ -228,4 +232,4 @@ def create_market_analyst(llm):
             "market_report": report,
         }
 
-    return market_analyst_node
+    return step_node(market_analyst_step)
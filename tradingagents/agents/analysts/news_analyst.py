@@ -1,6 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from tradingagents.agents.utils.agent_utils import get_news, get_global_news
 from tradingagents.agents.utils.logging_utils import log_debug_prompt
+from tradingagents.agents.utils.node_steps import LLMCall, step_node
 from tradingagents.dataflows.config import get_config
 from tradingagents.utils.logger import get_logger
 
@@ -8,7 +9,7 @@ logger = get_logger(__name__)
 
 
 def create_news_analyst(llm):
-    def news_analyst_node(state):
+    def news_analyst_step(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
 
@@ -76,7 +77,7 @@ def create_news_analyst(llm):
         log_debug_prompt(config, "News Analyst", language, logger,
                          **{"System Message": system_message, "Assistant Prompt": assistant_prompt})
         
-        result = chain.invoke(state["messages"])
+        result = yield LLMCall(chain, state["messages"])
 
         report = ""
 
@@ -88,4 +89,4 @@ def create_news_analyst(llm):
             "news_report": report,
         }
 
-    return news_analyst_node
+    return step_node(news_analyst_step)
@@ -1,6 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from tradingagents.agents.utils.agent_utils import get_news, get_social_media_data
 from tradingagents.agents.utils.logging_utils import log_debug_prompt
+from tradingagents.agents.utils.node_steps import LLMCall, step_node
 from tradingagents.dataflows.config import get_config
 from tradingagents.utils.logger import get_logger
 
@@ -8,7 +9,7 @@ logger = get_logger(__name__)
 
 
 def create_social_media_analyst(llm):
-    def social_media_analyst_node(state):
+    def social_media_analyst_step(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
 
@@ -99,7 +100,7 @@ def create_social_media_analyst(llm):
         log_debug_prompt(config, "Social Media Analyst", language, logger,
                          **{"System Message": system_message, "Assistant Prompt": assistant_prompt})
         
-        result = chain.invoke(state["messages"])
+        result = yield LLMCall(chain, state["messages"])
 
         report = ""
 
@@ -111,4 +112,4 @@ def create_social_media_analyst(llm):
             "sentiment_report": report,
         }
 
-    return social_media_analyst_node
+    return step_node(social_media_analyst_step)
@@ -1,6 +1,7 @@
 import re
 
 from tradingagents.agents.utils.logging_utils import log_debug_prompt, build_situation_string, format_past_memories
+from tradingagents.agents.utils.node_steps import LLMCall, step_node
 from tradingagents.dataflows.research_tracker import get_research_tracker
 from tradingagents.dataflows.config import get_config
 from tradingagents.utils.logger import get_logger
@@ -9,7 +10,7 @@ logger = get_logger(__name__)
 
 
 def create_research_manager(llm, memory):
-    def research_manager_node(state) -> dict:
+    def research_manager_step(state):
         history = state["investment_debate_state"].get("history", "")
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
@@ -109,7 +110,7 @@ Debate History:
 {history}"""
         log_debug_prompt(config, "Research Manager", language, logger, Prompt=prompt)
         
-        response = llm.invoke(prompt)
+        response = yield LLMCall(llm, prompt)
         response_content = response.content
 
         # 默认值
@@ -198,4 +199,4 @@ Debate History:
             "investment_plan": response_content,
         }
 
-    return research_manager_node
+    return step_node(research_manager_step)
@@ -1,4 +1,5 @@
 from tradingagents.agents.utils.logging_utils import log_debug_prompt, build_situation_string, format_past_memories
+from tradingagents.agents.utils.node_steps import LLMCall, step_node
 from tradingagents.agents.utils.prediction_utils import extract_prediction
 from tradingagents.dataflows.config import get_config
 from tradingagents.utils.logger import get_logger
@@ -7,7 +8,7 @@ logger = get_logger(__name__)
 
 
 def create_risk_manager(llm, memory):
-    def risk_manager_node(state) -> dict:
+    def risk_manager_step(state):
 
         company_name = state["company_of_interest"]
 
@@ -20,13 +21,13 @@ def create_risk_manager(llm, memory):
         candlestick_report = state.get("candlestick_report", "")
         trader_plan = state["investment_plan"]
 
+        config = get_config()
+        language = config.get("output_language", "zh")
+
         curr_situation = build_situation_string(state)
         past_memories = memory.get_memories(curr_situation, n_matches=2)
 
         past_memory_str = format_past_memories(past_memories, language)
-
-        config = get_config()
-        language = config.get("output_language", "zh")
         
         if language == "zh":
             prompt = f"""作为风险管理评委和辩论主持人，你的目标是评估三位风险分析师——激进、中性和保守——之间的辩论，并确定交易员的最佳行动方案。
@@ -78,7 +79,7 @@ Focus on actionable insights and continuous improvement. Build on past lessons,
 
         log_debug_prompt(config, "Risk Manager", language, logger, Prompt=prompt)
         
-        response = llm.invoke(prompt)
+        response = yield LLMCall(llm, prompt)
         response_content = response.content
 
         # 提取预测结果
@@ -112,4 +113,4 @@ Focus on actionable insights and continuous improvement. Build on past lessons,
             "risk_manager_confidence": confidence,
         }
 
-    return risk_manager_node
+    return step_node(risk_manager_step)
@@ -2,14 +2,13 @@
 基础研究员类 - 消除 Bull/Bear Researcher 的重复代码
 """
 
-import time
 import re
 from typing import Callable, Dict, Any
 
 from tradingagents.dataflows.research_tracker import get_research_tracker
 from tradingagents.dataflows.config import get_config
 from tradingagents.agents.utils.logging_utils import build_situation_string, format_past_memories
-from tradingagents.constants import RESEARCHER_DEBATE_SLEEP_SECONDS
+from tradingagents.agents.utils.node_steps import LLMCall, step_node
 
 
 class BaseResearcher:
@@ -296,9 +295,9 @@ Use this information to make a compelling {stance_label} case from your perspect
         创建研究员节点函数
         
         Returns:
-            节点函数
+            节点（同步/异步双实现，见 node_steps）
         """
-        def node_function(state) -> dict:
+        def node_function(state):
             investment_debate_state = state["investment_debate_state"]
             history = investment_debate_state.get("history", "")
             
@@ -346,7 +345,7 @@ Use this information to make a compelling {stance_label} case from your perspect
             
             # 调用 LLM
             messages = [{"role": "user", "content": prompt}]
-            result = self.llm.invoke(messages)
+            result = yield LLMCall(self.llm, messages)
             response_content = result.content if hasattr(result, "content") else str(result)
 
             # 解析响应
@@ -389,8 +388,6 @@ Use this information to make a compelling {stance_label} case from your perspect
             researcher_histories[self.researcher_type] = updated_researcher_history
             investment_debate_state["researcher_histories"] = researcher_histories
 
-            time.sleep(RESEARCHER_DEBATE_SLEEP_SECONDS)
-
             return {"investment_debate_state": investment_debate_state}
         
-        return node_function
+        return step_node(node_function, f"{self.researcher_type}_node")
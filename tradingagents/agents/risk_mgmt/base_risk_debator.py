@@ -14,6 +14,7 @@ from dataclasses import dataclass
 from typing import Callable, Dict
 
 from tradingagents.agents.utils.logging_utils import log_debug_prompt
+from tradingagents.agents.utils.node_steps import LLMCall, step_node
 from tradingagents.agents.utils.prediction_utils import extract_prediction
 from tradingagents.dataflows.config import get_config
 from tradingagents.utils.logger import get_logger
@@ -47,7 +48,7 @@ def create_risk_debator(llm, config: RiskDebatorConfig) -> Callable:
         状态图节点函数
     """
 
-    def risk_debator_node(state: dict) -> dict:
+    def risk_debator_step(state: dict):
         risk_debate_state = state["risk_debate_state"]
         history = risk_debate_state.get("history", "")
         own_history = risk_debate_state.get(config.own_history_key, "")
@@ -88,7 +89,7 @@ def create_risk_debator(llm, config: RiskDebatorConfig) -> Callable:
         # Debug 日志
         log_debug_prompt(app_config, config.debug_label, language, logger, Prompt=prompt)
 
-        response = llm.invoke(prompt)
+        response = yield LLMCall(llm, prompt)
         response_content = response.content
 
         # 提取预测
@@ -130,4 +131,4 @@ def create_risk_debator(llm, config: RiskDebatorConfig) -> Callable:
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return risk_debator_node
+    return step_node(risk_debator_step)
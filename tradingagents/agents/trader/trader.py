@@ -1,5 +1,6 @@
 import functools
 from tradingagents.agents.utils.logging_utils import log_debug_prompt, build_situation_string, format_past_memories
+from tradingagents.agents.utils.node_steps import LLMCall, step_node
 from tradingagents.agents.utils.prediction_utils import extract_prediction
 from tradingagents.dataflows.config import get_config
 from tradingagents.utils.logger import get_logger
@@ -8,7 +9,7 @@ logger = get_logger(__name__)
 
 
 def create_trader(llm, memory):
-    def trader_node(state, name):
+    def trader_step(state, name):
         company_name = state["company_of_interest"]
         investment_plan = state["investment_plan"]
         market_research_report = state["market_report"]
@@ -90,7 +91,7 @@ Do not forget to utilize lessons from past decisions to learn from your mistakes
         log_debug_prompt(config, "Trader", language, logger,
                          **{"System Content": system_content, "User Content": context['content']})
 
-        result = llm.invoke(messages)
+        result = yield LLMCall(llm, messages)
         response_content = result.content
 
         # 提取预测结果
@@ -109,4 +110,4 @@ Do not forget to utilize lessons from past decisions to learn from your mistakes
             "sender": name,
         }
 
-    return functools.partial(trader_node, name="Trader")
+    return step_node(functools.partial(trader_step, name="Trader"), "trader_node")
@@ -1,6 +1,23 @@
-from typing import Annotated, Dict
+from typing import Annotated, Dict, List
 from typing_extensions import TypedDict
+from langchain_core.messages import AnyMessage
 from langgraph.graph import MessagesState
+from langgraph.graph.message import add_messages
+
+
+def analyst_channel(analyst_type: str) -> str:
+    """并行模式下分析师私有消息通道的 state key（如 "market_messages"）"""
+    return f"{analyst_type}_messages"
+
+
+def round_channel(debate_key: str) -> str:
+    """同时发言辩论模式下本轮发言缓冲区的 state key（如 "risk_debate_state_round"）"""
+    return f"{debate_key}_round"
+
+
+def merge_round_updates(left: Dict[str, dict], right: Dict[str, dict]) -> Dict[str, dict]:
+    """本轮发言缓冲区的 reducer：按发言者合并，同一轮内多个分支可以同时写入"""
+    return {**(left or {}), **(right or {})}
 
 
 # Researcher team state
@@ -46,6 +63,8 @@ class RiskDebateState(TypedDict):
 class AgentState(MessagesState):
     company_of_interest: Annotated[str, "Company that we are interested in trading"]
     trade_date: Annotated[str, "What date we are trading at"]
+    # 运行 ID：预取数据按该 ID 存在旁路存储中（见 dataflows.run_data），状态中只保存 ID
+    run_id: Annotated[str, "ID of the current run, keys the prefetched run data"]
 
     sender: Annotated[str, "Agent that sent this message"]
 
@@ -58,11 +77,20 @@ class AgentState(MessagesState):
     fundamentals_report: Annotated[str, "Report from the Fundamentals Researcher"]
     candlestick_report: Annotated[str, "Report from the Candlestick Analyst"]
 
+    # 并行分析师模式：每个分析师独立的消息通道，避免分支间 tool_calls 互相干扰
+    market_messages: Annotated[List[AnyMessage], add_messages]
+    social_messages: Annotated[List[AnyMessage], add_messages]
+    news_messages: Annotated[List[AnyMessage], add_messages]
+    fundamentals_messages: Annotated[List[AnyMessage], add_messages]
+    candlestick_messages: Annotated[List[AnyMessage], add_messages]
+
     # researcher team discussion step
     investment_debate_state: Annotated[
         InvestDebateState, "Current state of the debate on if to invest or not"
     ]
     investment_plan: Annotated[str, "Plan generated by the Analyst"]
+    # 同时发言辩论模式：本轮每个 researcher 的辩论状态更新，由汇合节点合并回 investment_debate_state
+    investment_debate_state_round: Annotated[Dict[str, dict], merge_round_updates]
 
     trader_investment_plan: Annotated[str, "Plan generated by the Trader"]
 
@@ -70,4 +98,6 @@ class AgentState(MessagesState):
     risk_debate_state: Annotated[
         RiskDebateState, "Current state of the debate on evaluating risk"
     ]
+    # 同时发言辩论模式：本轮每个风险分析师的辩论状态更新，由汇合节点合并回 risk_debate_state
+    risk_debate_state_round: Annotated[Dict[str, dict], merge_round_updates]
     final_trade_decision: Annotated[str, "Final decision made by the Risk Analysts"]
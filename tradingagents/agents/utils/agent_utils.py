@@ -1,41 +1,45 @@
-from langchain_core.messages import HumanMessage, RemoveMessage
-from datetime import datetime, timedelta
+import time
+from datetime import timedelta
+from typing import List, Optional
 
+from langchain_core.messages import HumanMessage, RemoveMessage
+from tradingagents.dataflows.trading_calendar import get_calendar_for_symbol, to_date
 from tradingagents.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
 def is_market_open(symbol: str = "AAPL", target_date: str = None) -> bool:
-    """通过获取股票数据判断是否开盘"""
-    from tradingagents.dataflows.interface import get_data_manager
-    from tradingagents.dataflows.unified_data_manager import UnifiedDataManager
-    data_manager = get_data_manager()
-    
-    target = datetime.strptime(target_date, "%Y-%m-%d") if target_date else datetime.now()
-    start_date = (target - timedelta(days=5)).strftime("%Y-%m-%d")
-    end_date = target.strftime("%Y-%m-%d")
-    
+    """判断 symbol 所在交易所在 target_date（默认今天）是否开盘
+
+    有节假日规则的交易所（美股）直接按日历判断，不拉取K线；
+    港股 / A股日历只排除周末，工作日再检查当天是否有K线（春节、黄金周等节假日没有K线）。
+    """
+    calendar = get_calendar_for_symbol(symbol)
+    if not calendar.is_session(target_date):
+        return False
+    if calendar.has_holiday_rule:
+        return True
+    return _has_bar_on(symbol, to_date(target_date) or calendar.today())
+
+
+def _has_bar_on(symbol: str, day) -> bool:
+    """day 当天是否有K线（经数据管理器的缓存 / BarStore 获取，不强制刷新）"""
+    import pandas as pd
+    from io import StringIO
+    from tradingagents.dataflows.interface import DataFetchError, get_data_manager
+
+    end_date = day.strftime("%Y-%m-%d")
+    start_date = (day - timedelta(days=5)).strftime("%Y-%m-%d")
     try:
-        result = data_manager.fetch("get_stock_data", symbol, start_date, end_date, no_cache=True)
-        
+        result = get_data_manager().fetch("get_stock_data", symbol, start_date, end_date)
         if result is None:
             return False
-        # result 可能是字符串或DataFrame
-        import pandas as pd
-        if isinstance(result, str):
-            from io import StringIO
-            df = pd.read_csv(StringIO(result))
-        else:
-            df = result
-            
-        if df is None or len(df) == 0:
+        df = pd.read_csv(StringIO(result)) if isinstance(result, str) else result
+        if df is None or len(df) == 0 or "timestamp" not in df.columns:
             return False
-        # 检查最新日期 (CSV返回的需要排序)
-        df = df.sort_values('timestamp')
-        latest_date = str(df['timestamp'].iloc[-1])[:10]
-        return latest_date == end_date
-    except (ConnectionError, ValueError, TimeoutError, OSError, KeyError) as e:
+        return bool((df["timestamp"].astype(str).str[:10] == end_date).any())
+    except (DataFetchError, ConnectionError, ValueError, TimeoutError, OSError, KeyError) as e:
         logger.error("is_market_open error: %s", e)
         return False
 
@@ -67,11 +71,18 @@ from tradingagents.agents.utils.chart_patterns_tools import (
     get_chart_patterns
 )
 from tradingagents.agents.utils.logging_utils import log_tool_call
+from tradingagents.dataflows.run_data import get_run_data, prefetch_run_data, prefetch_run_data_sync
+from tradingagents.agents.utils.node_steps import GraphNode
 
-def create_msg_delete():
+def create_msg_delete(messages_key: str = "messages"):
+    """创建消息清理节点
+
+    Args:
+        messages_key: 要清理的消息通道（并行分析师模式下为各自的私有通道）
+    """
     def delete_messages(state):
         """Clear messages and add placeholder for Anthropic compatibility"""
-        messages = state["messages"]
+        messages = state.get(messages_key) or []
 
         # Remove all messages
         removal_operations = [RemoveMessage(id=m.id) for m in messages]
@@ -79,9 +90,52 @@ def create_msg_delete():
         # Add a minimal placeholder message
         placeholder = HumanMessage(content="Continue")
 
-        return {"messages": removal_operations + [placeholder]}
+        return {messages_key: removal_operations + [placeholder]}
 
     return delete_messages
 
 
-        
\ No newline at end of file
+        
+
+
+def create_data_prefetch(selected_analysts: Optional[List[str]] = None):
+    """创建数据预取节点（图的第一个节点）
+
+    并发获取选中的分析师需要的数据并预先计算指标和形态，存入按 state["run_id"]
+    索引的运行数据；之后分析师和工具直接读取，不再重复获取。
+    没有登记运行数据（如直接调用 graph.invoke）时不做任何事。
+    异步执行图时直接在当前事件循环上预取，同步执行时在新的事件循环中预取。
+
+    Args:
+        selected_analysts: 本次图中的分析师类型，None 表示预取全部分析师的数据
+    """
+    def log_done(run_data, start):
+        logger.info(
+            "数据预取完成 (%s @ %s): %d 项, %.2fs",
+            run_data.symbol, run_data.trade_date, len(run_data), time.perf_counter() - start,
+        )
+
+    def data_prefetch(state):
+        run_data = get_run_data(state.get("run_id"))
+        if run_data is None:
+            logger.debug("未登记运行数据，跳过预取")
+            return {}
+
+        start = time.perf_counter()
+        prefetch_run_data_sync(run_data, selected_analysts)
+        log_done(run_data, start)
+        return {}
+
+    async def adata_prefetch(state):
+        run_data = get_run_data(state.get("run_id"))
+        if run_data is None:
+            logger.debug("未登记运行数据，跳过预取")
+            return {}
+
+        start = time.perf_counter()
+        await prefetch_run_data(run_data, selected_analysts)
+        log_done(run_data, start)
+        return {}
+
+    return GraphNode(data_prefetch, afunc=adata_prefetch, name="data_prefetch")
+
@@ -1,6 +1,7 @@
 from langchain_core.tools import tool
 from typing import Annotated
 from tradingagents.dataflows.interface import get_data_manager
+from tradingagents.agents.utils.run_context import fetch_for_run
 from tradingagents.agents.utils.logging_utils import log_tool_call
 from tradingagents.utils.logger import get_logger
 
@@ -36,7 +37,7 @@ def get_candlestick_patterns(
     
     manager = get_data_manager()
     
-    result = manager.fetch("get_candlestick_patterns", symbol, start_date, end_date)
+    result = fetch_for_run("get_candlestick_patterns", symbol, start_date, end_date)
     
     vendor_used = "local"
     if hasattr(manager, 'get_stats'):
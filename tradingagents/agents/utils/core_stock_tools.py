@@ -1,6 +1,7 @@
 from langchain_core.tools import tool
 from typing import Annotated
 from tradingagents.dataflows.interface import get_data_manager
+from tradingagents.agents.utils.run_context import fetch_for_run
 from tradingagents.agents.utils.logging_utils import log_tool_call, get_vendor_info
 from tradingagents.utils.logger import get_logger
 
@@ -26,7 +27,7 @@ def get_stock_data(
     logger.debug("🔧 Calling get_stock_data for %s (%s to %s)", symbol, start_date, end_date)
     
     manager = get_data_manager()
-    result = manager.fetch("get_stock_data", symbol, start_date, end_date)
+    result = fetch_for_run("get_stock_data", symbol, start_date, end_date)
     log_tool_call("get_stock_data", get_vendor_info(manager), result)
     
     return result
@@ -1,6 +1,7 @@
 from langchain_core.tools import tool
 from typing import Annotated
 from tradingagents.dataflows.interface import get_data_manager
+from tradingagents.agents.utils.run_context import fetch_for_run
 from tradingagents.agents.utils.logging_utils import log_tool_call, get_vendor_info
 from tradingagents.utils.logger import get_logger
 
@@ -24,7 +25,7 @@ def get_fundamentals(
     logger.debug("🔧 Calling get_fundamentals for %s, date=%s", ticker, curr_date)
     
     manager = get_data_manager()
-    result = manager.fetch("get_fundamentals", ticker, curr_date)
+    result = fetch_for_run("get_fundamentals", ticker, curr_date)
     log_tool_call("get_fundamentals", get_vendor_info(manager), result)
     
     return result
@@ -49,7 +50,7 @@ def get_balance_sheet(
     logger.debug("🔧 Calling get_balance_sheet for %s, freq=%s", ticker, freq)
     
     manager = get_data_manager()
-    result = manager.fetch("get_balance_sheet", ticker, freq, curr_date)
+    result = fetch_for_run("get_balance_sheet", ticker, freq, curr_date)
     log_tool_call("get_balance_sheet", get_vendor_info(manager), result)
     
     return result
@@ -74,7 +75,7 @@ def get_cashflow(
     logger.debug("🔧 Calling get_cashflow for %s, freq=%s", ticker, freq)
     
     manager = get_data_manager()
-    result = manager.fetch("get_cashflow", ticker, freq, curr_date)
+    result = fetch_for_run("get_cashflow", ticker, freq, curr_date)
     log_tool_call("get_cashflow", get_vendor_info(manager), result)
     
     return result
@@ -99,7 +100,7 @@ def get_income_statement(
     logger.debug("🔧 Calling get_income_statement for %s, freq=%s", ticker, freq)
     
     manager = get_data_manager()
-    result = manager.fetch("get_income_statement", ticker, freq, curr_date)
+    result = fetch_for_run("get_income_statement", ticker, freq, curr_date)
     log_tool_call("get_income_statement", get_vendor_info(manager), result)
     
     return result
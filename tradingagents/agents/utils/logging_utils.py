@@ -16,7 +16,9 @@ def log_tool_call(tool_name: str, vendor_used: str, result: str) -> None:
     log_entry += f"[{timestamp}] 🔧 Tool: {tool_name}\n"
     log_entry += f"          📊 Vendor Used: {vendor_used}\n"
     log_entry += f"          📄 Result Preview:\n"
-    log_entry += f"{result[:500]}{'...' if len(result) > 500 else ''}\n"
+    # 部分工具（如 get_all_indicators）返回分组字典，预览统一按字符串截断
+    preview = result if isinstance(result, str) else str(result)
+    log_entry += f"{preview[:500]}{'...' if len(preview) > 500 else ''}\n"
     log_entry += f"{'='*100}\n"
     
     with open(log_file, "a", encoding="utf-8") as f:
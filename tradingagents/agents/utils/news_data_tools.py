@@ -1,6 +1,7 @@
 from langchain_core.tools import tool
 from typing import Annotated, List, Optional
 from tradingagents.dataflows.interface import get_data_manager
+from tradingagents.agents.utils.run_context import fetch_for_run
 from tradingagents.agents.utils.logging_utils import log_tool_call, get_vendor_info
 from tradingagents.utils.logger import get_logger
 
@@ -32,7 +33,7 @@ def get_news(
     logger.debug("🔧 Calling get_news for %s (%s to %s)", ticker, start_date, end_date)
     
     manager = get_data_manager()
-    result = manager.fetch("get_news", ticker, start_date, end_date)
+    result = fetch_for_run("get_news", ticker, start_date, end_date)
     log_tool_call("get_news", get_vendor_info(manager), result)
     
     return result
@@ -57,7 +58,7 @@ def get_global_news(
     logger.debug("🔧 Calling get_global_news for date %s, look_back_days=%d", curr_date, look_back_days)
     
     manager = get_data_manager()
-    result = manager.fetch("get_global_news", curr_date, look_back_days, limit)
+    result = fetch_for_run("get_global_news", curr_date, look_back_days, limit)
     log_tool_call("get_global_news", get_vendor_info(manager), result)
     
     return result
@@ -78,7 +79,7 @@ def get_insider_transactions(
     logger.debug("🔧 Calling get_insider_transactions for %s", ticker)
     
     manager = get_data_manager()
-    result = manager.fetch("get_insider_transactions", ticker)
+    result = fetch_for_run("get_insider_transactions", ticker)
     log_tool_call("get_insider_transactions", get_vendor_info(manager), result)
     
     return result
@@ -0,0 +1,152 @@
+"""
+图节点的同步/异步双实现
+======================
+节点逻辑只写一次：写成生成器（"步骤"），需要调用 LLM / 工具 / 等待时 yield 一个请求，
+由驱动函数执行后把结果 send 回生成器（失败时把异常 throw 回生成器，节点内的 try/except 照常生效）：
+
+- run_step: 同步驱动（Runnable.invoke / time.sleep），graph.invoke / graph.stream 使用
+- arun_step: 异步驱动（Runnable.ainvoke / asyncio.sleep），graph.ainvoke / graph.astream 使用
+
+LLM 调用用 LLMCall：经当前提供商共享的 LLMPacer（llm_clients.pacing）按每分钟预算限速、
+按 llm_max_concurrency 限制同时在途的请求数，并在限流时退避；
+工具等其他 Runnable 用 Invoke 直接调用。
+
+使用示例:
+    >>> def analyst_step(state):
+    ...     result = yield LLMCall(chain, state["messages"])
+    ...     return {"messages": [result], "news_report": result.content}
+    >>> node = step_node(analyst_step, "news_analyst_node")
+    >>> node(state)            # 同步
+    >>> await node.ainvoke(state)  # 异步
+"""
+
+import asyncio
+import inspect
+import time
+from typing import Any, Callable, Generator, NamedTuple, Optional
+
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+
+from tradingagents.dataflows.config import get_config
+from tradingagents.llm_clients.concurrency import resolve_concurrency_limit
+from tradingagents.llm_clients.pacing import LLMPacer, get_llm_pacer, resolve_rate_limits
+
+# 步骤：接收 state，yield 请求（Invoke / LLMCall / Sleep），return 节点的状态更新
+Step = Callable[..., Generator[Any, Any, dict]]
+
+
+class Invoke(NamedTuple):
+    """请求：直接调用一个 Runnable（工具等，不经过 LLM 节奏控制）"""
+
+    runnable: Runnable
+    input: Any
+    config: Optional[RunnableConfig] = None
+
+    def run(self) -> Any:
+        return self.runnable.invoke(self.input, self.config)
+
+    async def arun(self) -> Any:
+        return await self.runnable.ainvoke(self.input, self.config)
+
+
+def current_llm_pacer() -> LLMPacer:
+    """当前配置的 LLM 提供商共享的节奏控制器"""
+    config = get_config()
+    provider = config.get("llm_provider", "default")
+    return get_llm_pacer(
+        provider,
+        max_concurrency=resolve_concurrency_limit(config, provider),
+        **resolve_rate_limits(config, provider),
+    )
+
+
+class LLMCall(NamedTuple):
+    """请求：调用 LLM（或以 LLM 结尾的 chain），经提供商的节奏控制器限速和限制并发，限流时退避重试"""
+
+    runnable: Runnable
+    input: Any
+    config: Optional[RunnableConfig] = None
+
+    def run(self) -> Any:
+        return current_llm_pacer().invoke(self.runnable, self.input, self.config)
+
+    async def arun(self) -> Any:
+        return await current_llm_pacer().ainvoke(self.runnable, self.input, self.config)
+
+
+class Sleep(NamedTuple):
+    """请求：等待 seconds 秒（异步执行时不阻塞事件循环）"""
+
+    seconds: float
+
+    def run(self) -> None:
+        time.sleep(self.seconds)
+
+    async def arun(self) -> None:
+        await asyncio.sleep(self.seconds)
+
+
+def run_step(steps: Generator[Any, Any, dict]) -> dict:
+    """同步驱动一个步骤生成器，返回其 return 值"""
+    value, error = None, None
+    while True:
+        try:
+            request = steps.throw(error) if error is not None else steps.send(value)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            value, error = request.run(), None
+        except Exception as e:
+            value, error = None, e
+
+
+async def arun_step(steps: Generator[Any, Any, dict]) -> dict:
+    """异步驱动一个步骤生成器，返回其 return 值"""
+    value, error = None, None
+    while True:
+        try:
+            request = steps.throw(error) if error is not None else steps.send(value)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            value, error = await request.arun(), None
+        except Exception as e:
+            value, error = None, e
+
+
+class GraphNode(RunnableLambda):
+    """
+    同时具备同步和异步实现的图节点
+
+    图以 invoke/stream 运行时调用 func，以 ainvoke/astream 运行时调用 afunc；
+    也可以像普通节点函数一样直接调用 node(state)（同步）
+    """
+
+    def __call__(self, state: dict) -> dict:
+        return self.invoke(state)
+
+
+def step_node(step: Step, name: Optional[str] = None) -> GraphNode:
+    """
+    由步骤生成器函数创建图节点
+
+    Args:
+        step: 生成器函数 step(state)，见模块说明
+        name: 节点名称（用于追踪），默认取 step 的函数名
+    """
+    def node(state: dict) -> dict:
+        return run_step(step(state))
+
+    async def anode(state: dict) -> dict:
+        return await arun_step(step(state))
+
+    return GraphNode(node, afunc=anode, name=name or getattr(step, "__name__", None))
+
+
+async def ainvoke_node(node: Callable, state: dict) -> dict:
+    """异步执行任意形式的节点（GraphNode / Runnable、协程函数或普通同步函数）"""
+    if isinstance(node, Runnable):
+        return await node.ainvoke(state)
+    if inspect.iscoroutinefunction(node):
+        return await node(state)
+    return node(state)
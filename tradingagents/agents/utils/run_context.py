@@ -0,0 +1,27 @@
+"""运行上下文：工具和分析师通过运行 ID 读取本次运行的预取数据"""
+
+from typing import Any, Mapping, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import ensure_config
+
+from tradingagents.dataflows.interface import get_data_manager
+from tradingagents.dataflows.run_data import RunData, get_run_data
+
+
+def run_config(state: Mapping[str, Any]) -> RunnableConfig:
+    """分析师节点内直接调用工具时传入的配置（携带 state 中的运行 ID）"""
+    return {"configurable": {"run_id": state.get("run_id", "")}}
+
+
+def current_run_data() -> Optional[RunData]:
+    """当前工具调用所属运行的数据（运行 ID 来自 RunnableConfig.configurable），没有时返回 None"""
+    return get_run_data(ensure_config().get("configurable", {}).get("run_id"))
+
+
+def fetch_for_run(method: str, *args, **kwargs) -> Any:
+    """在当前运行内取数：优先使用预取/已取过的结果，不在运行中时直接经数据管理器获取"""
+    run_data = current_run_data()
+    if run_data is None:
+        return get_data_manager().fetch(method, *args, **kwargs)
+    return run_data.fetch(method, *args, **kwargs)
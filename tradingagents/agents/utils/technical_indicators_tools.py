@@ -1,6 +1,7 @@
 from langchain_core.tools import tool
 from typing import Annotated
 from tradingagents.dataflows.interface import get_data_manager
+from tradingagents.agents.utils.run_context import fetch_for_run
 from tradingagents.agents.utils.logging_utils import log_tool_call, get_vendor_info
 from tradingagents.utils.logger import get_logger
 
@@ -30,7 +31,7 @@ def get_indicators(
     logger.debug("🔧 Calling get_indicators for %s, indicator=%s, date=%s", symbol, indicator, curr_date)
     
     manager = get_data_manager()
-    result = manager.fetch("get_indicators", symbol, indicator, curr_date, look_back_days, stock_data)
+    result = fetch_for_run("get_indicators", symbol, indicator, curr_date, look_back_days, stock_data)
     log_tool_call("get_indicators", get_vendor_info(manager), result)
     
     return result
@@ -57,7 +58,7 @@ def get_all_indicators(
     logger.debug("🔧 Calling get_all_indicators for %s, date=%s", symbol, curr_date)
     
     manager = get_data_manager()
-    result = manager.fetch("get_all_indicators", symbol, curr_date, look_back_days, stock_data)
+    result = fetch_for_run("get_all_indicators", symbol, curr_date, look_back_days, stock_data)
     log_tool_call("get_all_indicators", get_vendor_info(manager), result)
     
     return result
\ No newline at end of file
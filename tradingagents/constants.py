@@ -26,25 +26,90 @@ MAX_RETRY_ATTEMPTS = 3
 RETRY_DELAY_SECONDS = 2
 RETRY_BACKOFF_MULTIPLIER = 2
 
-# ==================== 辩论间隔 ====================
-# 研究员辩论每轮发言后的等待时间（秒），避免 API 限速
-# 设为 0 可取消等待，加快辩论速度
-RESEARCHER_DEBATE_SLEEP_SECONDS = 1
-
 # ==================== 缓存配置 ====================
 CACHE_TTL_HOURS = 24
 MAX_CACHE_SIZE = 1000
+# 内存缓存层上限（按序列化后的字节数计算）
+CACHE_MEMORY_MAX_BYTES = 64 * 1024 * 1024
+# 后台清理过期缓存的间隔（秒）
+CACHE_SWEEP_INTERVAL_SECONDS = 300
+# 超过该大小的缓存数据在磁盘层使用 zlib 压缩
+CACHE_COMPRESS_MIN_BYTES = 4096
+# 超过该大小的字符串/bytes 参数在生成缓存键和日志前先替换为摘要
+ARG_DIGEST_MIN_BYTES = 1024
+# 参数摘要记忆表大小（按对象 id 记忆，同一份 stock_data 只哈希一次）
+ARG_DIGEST_MEMO_SIZE = 32
+# 盘中（当天未收盘）行情数据的缓存时长（秒）
+CACHE_TTL_INTRADAY_SECONDS = 300
+# 包含今天的新闻数据的缓存时长（秒）
+CACHE_TTL_NEWS_SECONDS = 900
+# 收盘后多久视为当天K线定稿，之后行情数据永久缓存（秒）
+CACHE_SESSION_SETTLE_SECONDS = 1800
+# 内容寻址的指标结果缓存最多保留的条目数（按最近使用淘汰）
+INDICATOR_RESULT_CACHE_MAX_ENTRIES = 2048
+
+# ==================== 数据源限速与熔断 ====================
+# 连续失败多少次后熔断数据源（直接降级到下一个数据源）
+VENDOR_CIRCUIT_FAILURE_THRESHOLD = 3
+# 熔断后多久放行一次探测请求（秒）
+VENDOR_CIRCUIT_RECOVERY_SECONDS = 60
+# 令牌桶排队超过该时长时不再等待，改用下一个数据源（秒）
+VENDOR_MAX_PACING_WAIT_SECONDS = 30
+# Alpha Vantage 免费配额：每分钟 5 次
+ALPHA_VANTAGE_REQUESTS_PER_MINUTE = 5
+# 对冲请求：当前数据源超过该分位延迟仍未返回时并行启动下一个数据源
+VENDOR_HEDGE_PERCENTILE = 0.95
+# 延迟样本少于该数量时不对冲
+VENDOR_HEDGE_MIN_SAMPLES = 10
+# 对冲等待的下限（秒），避免极快的调用也触发并行请求
+VENDOR_HEDGE_MIN_DELAY_SECONDS = 0.05
+# 数据源线程池大小：对冲请求和异步路径中没有原生异步实现的数据源共用
+# （较慢的请求无法中断，会继续占用线程直到返回）
+VENDOR_THREAD_POOL_MAX_WORKERS = 16
+
+# ==================== 计算进程池 ====================
+# 每个任务最多包含的股票数（同组股票在工作进程中一次按面板计算）
+COMPUTE_POOL_MAX_CHUNK_SYMBOLS = 64
+# 自动分组时每个工作进程分到的任务数（多于 1 个便于负载均衡）
+COMPUTE_POOL_TASKS_PER_WORKER = 4
+
+# ==================== 异步数据层 ====================
+# 每个事件循环共享的 httpx.AsyncClient 连接池上限
+ASYNC_HTTP_MAX_CONNECTIONS = 100
+ASYNC_HTTP_TIMEOUT_SECONDS = 30
+# AsyncDataLoader.load_many 同时加载的股票数上限
+ASYNC_LOADER_MAX_CONCURRENCY = 50
+# 运行数据预取（Data Prefetch 节点）同时在途的数据请求数上限
+RUN_PREFETCH_MAX_CONCURRENCY = 8
 
 # ==================== LLM配置 ====================
 DEFAULT_TEMPERATURE = 0.7
 MAX_TOKENS = 2000
 LLM_TIMEOUT_SECONDS = 30
+# 每个 LLM 提供商同时在途的最大请求数（并行分析师等扇出场景）
+LLM_MAX_CONCURRENCY = 4
+# 异步等待并发名额时的轮询间隔（秒）：限制器同时服务线程和事件循环
+LLM_LIMITER_POLL_SECONDS = 0.05
+# 每个 LLM 提供商每分钟的请求数 / token 数预算（LLMPacer 令牌桶，预算充足时不等待）
+LLM_REQUESTS_PER_MINUTE = 500
+LLM_TOKENS_PER_MINUTE = 200_000
+# 收到 429 后的最大重试次数和首次退避秒数（之后每次翻倍，同一提供商的所有调用一起退避）
+LLM_RATE_LIMIT_MAX_RETRIES = 4
+LLM_RATE_LIMIT_BACKOFF_SECONDS = 2.0
+# 请求前按 字符数 / LLM_CHARS_PER_TOKEN 估算 token 数，响应后按实际用量修正
+LLM_CHARS_PER_TOKEN = 3
 
 # ==================== 辩论配置 ====================
 MAX_DEBATE_ROUNDS = 2
 MAX_RISK_DISCUSS_ROUNDS = 2
 MAX_RECUR_LIMIT = 100
 
+# ==================== 批量运行 ====================
+# 批量分析的默认工作线程数（每个线程持有一个 TradingAgentsGraph，跨股票复用）
+BATCH_WORKERS = 4
+# 待处理队列长度 = 工作线程数 × 该值（有界队列，股票按需下发）
+BATCH_QUEUE_SIZE_PER_WORKER = 2
+
 # ==================== 指标周期 ====================
 SMA_PERIODS = [5, 10, 20, 50, 100, 200]
 EMA_PERIODS = [5, 10, 20, 50, 100, 200]
@@ -70,6 +135,15 @@ VWMA_PERIOD = 20
 DEFAULT_LOOKBACK_DAYS = 120
 MIN_REQUIRED_DATA_POINTS = 50
 
+# ==================== 分析师数据窗口 ====================
+# 市场/蜡烛图分析师的K线区间（自然日）、指标回看天数、图表形态窗口（K线数）、新闻回看天数；
+# 运行数据预取使用同样的参数，分析师和工具的请求直接命中预取结果
+ANALYST_STOCK_DATA_DAYS = 180
+ANALYST_INDICATOR_LOOKBACK_DAYS = 120
+ANALYST_CHART_PATTERN_LOOKBACK = 60
+ANALYST_NEWS_LOOKBACK_DAYS = 7
+ANALYST_GLOBAL_NEWS_LIMIT = 5
+
 # ==================== 日志配置 ====================
 LOG_MAX_BYTES = 10 * 1024 * 1024  # 10MB
 LOG_BACKUP_COUNT = 5
@@ -80,6 +154,12 @@ LOG_DATE_FORMAT = "%H:%M:%S"
 DEFAULT_DB_PATH = "tradingagents/db/research_tracker.db"
 DEFAULT_ANALYSIS_DB_PATH = "tradingagents/db/trading_analysis.db"
 DB_TIMEOUT_SECONDS = 30
+# 工具调用日志后台写入：队列容量、每批事务的记录数、队列满时调用方的最长等待
+TOOL_CALL_LOG_QUEUE_SIZE = 10000
+TOOL_CALL_LOG_BATCH_SIZE = 200
+TOOL_CALL_LOG_ENQUEUE_TIMEOUT_SECONDS = 1.0
+# propagate 结束时等待工具调用日志落盘的最长时间
+TOOL_CALL_LOG_FLUSH_TIMEOUT_SECONDS = 10.0
 
 # ==================== 日志文件路径 ====================
 TOOL_CALL_LOG_PATH = "langgraph_outputs/tool_calls.log"
@@ -4,19 +4,22 @@
 提供简单的依赖注入和服务定位功能
 """
 
+import threading
 from typing import Any, Callable, Dict, Optional, TypeVar
 
 T = TypeVar('T')
 
 
 class DependencyContainer:
-    """依赖注入容器"""
+    """依赖注入容器（线程安全：多个线程首次同时获取单例时只创建一个实例）"""
     
     def __init__(self):
         """初始化容器"""
         self._factories: Dict[str, Callable] = {}
         self._singletons: Dict[str, Any] = {}
         self._singleton_flags: Dict[str, bool] = {}
+        # 可重入：工厂函数创建实例时可能再从容器获取其他服务
+        self._lock = threading.RLock()
     
     def register(
         self,
@@ -39,8 +42,9 @@ class DependencyContainer:
             >>> container = DependencyContainer()
             >>> container.register('data_manager', lambda: DataManager(), singleton=True)
         """
-        self._factories[name] = factory
-        self._singleton_flags[name] = singleton
+        with self._lock:
+            self._factories[name] = factory
+            self._singleton_flags[name] = singleton
         return self
     
     def register_instance(self, name: str, instance: T) -> 'DependencyContainer':
@@ -54,8 +58,9 @@ class DependencyContainer:
         Returns:
             self（链式调用）
         """
-        self._singletons[name] = instance
-        self._singleton_flags[name] = True
+        with self._lock:
+            self._singletons[name] = instance
+            self._singleton_flags[name] = True
         return self
     
     def get(self, name: str) -> Any:
@@ -71,25 +76,28 @@ class DependencyContainer:
         Raises:
             KeyError: 服务未注册
         """
-        if name not in self._factories and name not in self._singletons:
-            raise KeyError(f"Service '{name}' is not registered")
-        
-        # 如果是单例且已创建，直接返回
-        if self._singleton_flags.get(name) and name in self._singletons:
-            return self._singletons[name]
-        
-        # 如果直接注册了实例，返回实例
-        if name in self._singletons:
-            return self._singletons[name]
-        
-        # 调用工厂函数创建实例
-        instance = self._factories[name]()
+        # 已创建的单例或直接注册的实例，不加锁直接返回
+        instance = self._singletons.get(name)
+        if instance is not None or name in self._singletons:
+            return instance
         
-        # 如果是单例，缓存实例
-        if self._singleton_flags.get(name):
-            self._singletons[name] = instance
+        with self._lock:
+            if name not in self._factories and name not in self._singletons:
+                raise KeyError(f"Service '{name}' is not registered")
+            
+            # 加锁后再检查一次：其他线程可能刚创建好单例
+            if name in self._singletons:
+                return self._singletons[name]
+            
+            factory = self._factories[name]
+            if self._singleton_flags.get(name):
+                # 单例在锁内创建并缓存，同时到达的线程等待并复用同一个实例
+                instance = factory()
+                self._singletons[name] = instance
+                return instance
         
-        return instance
+        # 非单例每次调用工厂函数创建新实例（不持有锁）
+        return factory()
     
     def has(self, name: str) -> bool:
         """
@@ -105,7 +113,8 @@ class DependencyContainer:
     
     def clear_singletons(self):
         """清除所有单例缓存"""
-        self._singletons.clear()
+        with self._lock:
+            self._singletons.clear()
     
     def unregister(self, name: str):
         """
@@ -114,12 +123,10 @@ class DependencyContainer:
         Args:
             name: 服务名称
         """
-        if name in self._factories:
-            del self._factories[name]
-        if name in self._singletons:
-            del self._singletons[name]
-        if name in self._singleton_flags:
-            del self._singleton_flags[name]
+        with self._lock:
+            self._factories.pop(name, None)
+            self._singletons.pop(name, None)
+            self._singleton_flags.pop(name, None)
 
 
 # 全局容器实例
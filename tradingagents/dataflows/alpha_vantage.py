@@ -1,5 +1,21 @@
 # Import functions from specialized modules
-from .alpha_vantage_stock import get_stock
+from .alpha_vantage_stock import get_stock, get_stock_async
 from .alpha_vantage_indicator import get_indicator
-from .alpha_vantage_fundamentals import get_fundamentals, get_balance_sheet, get_cashflow, get_income_statement
-from .alpha_vantage_news import get_news, get_global_news, get_insider_transactions
\ No newline at end of file
+from .alpha_vantage_fundamentals import (
+    get_fundamentals,
+    get_balance_sheet,
+    get_cashflow,
+    get_income_statement,
+    get_fundamentals_async,
+    get_balance_sheet_async,
+    get_cashflow_async,
+    get_income_statement_async,
+)
+from .alpha_vantage_news import (
+    get_news,
+    get_global_news,
+    get_insider_transactions,
+    get_news_async,
+    get_global_news_async,
+    get_insider_transactions_async,
+)
@@ -43,12 +43,8 @@ class AlphaVantageRateLimitError(Exception):
     """Exception raised when Alpha Vantage API rate limit is exceeded."""
     pass
 
-def _make_api_request(function_name: str, params: dict) -> dict | str:
-    """Helper function to make API requests and handle responses.
-    
-    Raises:
-        AlphaVantageRateLimitError: When API rate limit is exceeded
-    """
+def _build_api_params(function_name: str, params: dict) -> dict:
+    """Build the full query parameters (function, apikey, entitlement) for a request."""
     # Create a copy of params to avoid modifying the original
     api_params = params.copy()
     api_params.update({
@@ -66,12 +62,11 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
     elif "entitlement" in api_params:
         # Remove entitlement if it's None or empty
         api_params.pop("entitlement", None)
-    
-    response = requests.get(API_BASE_URL, params=api_params)
-    response.raise_for_status()
+    return api_params
 
-    response_text = response.text
-    
+
+def _check_response_text(response_text: str) -> str:
+    """Raise AlphaVantageRateLimitError for rate-limit responses, otherwise return the text."""
     # Check if response is JSON (error responses are typically JSON)
     try:
         response_json = json.loads(response_text)
@@ -87,6 +82,32 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
     return response_text
 
 
+def _make_api_request(function_name: str, params: dict) -> dict | str:
+    """Helper function to make API requests and handle responses.
+    
+    Raises:
+        AlphaVantageRateLimitError: When API rate limit is exceeded
+    """
+    response = requests.get(API_BASE_URL, params=_build_api_params(function_name, params))
+    response.raise_for_status()
+    return _check_response_text(response.text)
+
+
+async def _make_api_request_async(function_name: str, params: dict) -> dict | str:
+    """Async variant of _make_api_request over the shared httpx.AsyncClient.
+    
+    Raises:
+        AlphaVantageRateLimitError: When API rate limit is exceeded
+        httpx.HTTPError: On transport errors or non-2xx responses
+    """
+    from .async_http import get_async_client
+
+    response = await get_async_client().get(
+        API_BASE_URL, params=_build_api_params(function_name, params)
+    )
+    response.raise_for_status()
+    return _check_response_text(response.text)
+
 
 def _filter_csv_by_date_range(csv_data: str, start_date: str, end_date: str) -> str:
     """
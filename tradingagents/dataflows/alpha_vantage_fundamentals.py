@@ -1,4 +1,11 @@
-from .alpha_vantage_common import _make_api_request
+from .alpha_vantage_common import _make_api_request, _make_api_request_async
+
+
+def _symbol_params(ticker: str) -> dict:
+    """Validate the ticker and build the query parameters shared by all fundamentals endpoints."""
+    from tradingagents.utils.validators import validate_symbol
+    validate_symbol(ticker)
+    return {"symbol": ticker}
 
 
 def get_fundamentals(ticker: str, curr_date: str = None) -> str:
@@ -15,14 +22,7 @@ def get_fundamentals(ticker: str, curr_date: str = None) -> str:
     Raises:
         ValueError: 如果股票代码无效
     """
-    from tradingagents.utils.validators import validate_symbol
-    validate_symbol(ticker)
-    
-    params = {
-        "symbol": ticker,
-    }
-
-    return _make_api_request("OVERVIEW", params)
+    return _make_api_request("OVERVIEW", _symbol_params(ticker))
 
 
 def get_balance_sheet(ticker: str, freq: str = "quarterly", curr_date: str = None) -> str:
@@ -40,14 +40,7 @@ def get_balance_sheet(ticker: str, freq: str = "quarterly", curr_date: str = Non
     Raises:
         ValueError: 如果股票代码无效
     """
-    from tradingagents.utils.validators import validate_symbol
-    validate_symbol(ticker)
-    
-    params = {
-        "symbol": ticker,
-    }
-
-    return _make_api_request("BALANCE_SHEET", params)
+    return _make_api_request("BALANCE_SHEET", _symbol_params(ticker))
 
 
 def get_cashflow(ticker: str, freq: str = "quarterly", curr_date: str = None) -> str:
@@ -65,14 +58,7 @@ def get_cashflow(ticker: str, freq: str = "quarterly", curr_date: str = None) ->
     Raises:
         ValueError: 如果股票代码无效
     """
-    from tradingagents.utils.validators import validate_symbol
-    validate_symbol(ticker)
-    
-    params = {
-        "symbol": ticker,
-    }
-
-    return _make_api_request("CASH_FLOW", params)
+    return _make_api_request("CASH_FLOW", _symbol_params(ticker))
 
 
 def get_income_statement(ticker: str, freq: str = "quarterly", curr_date: str = None) -> str:
@@ -90,12 +76,26 @@ def get_income_statement(ticker: str, freq: str = "quarterly", curr_date: str =
     Raises:
         ValueError: 如果股票代码无效
     """
-    from tradingagents.utils.validators import validate_symbol
-    validate_symbol(ticker)
-    
-    params = {
-        "symbol": ticker,
-    }
+    return _make_api_request("INCOME_STATEMENT", _symbol_params(ticker))
+
+
+# Async variants over the shared httpx.AsyncClient
+
+async def get_fundamentals_async(ticker: str, curr_date: str = None) -> str:
+    """Async variant of get_fundamentals."""
+    return await _make_api_request_async("OVERVIEW", _symbol_params(ticker))
+
+
+async def get_balance_sheet_async(ticker: str, freq: str = "quarterly", curr_date: str = None) -> str:
+    """Async variant of get_balance_sheet."""
+    return await _make_api_request_async("BALANCE_SHEET", _symbol_params(ticker))
+
+
+async def get_cashflow_async(ticker: str, freq: str = "quarterly", curr_date: str = None) -> str:
+    """Async variant of get_cashflow."""
+    return await _make_api_request_async("CASH_FLOW", _symbol_params(ticker))
 
-    return _make_api_request("INCOME_STATEMENT", params)
 
+async def get_income_statement_async(ticker: str, freq: str = "quarterly", curr_date: str = None) -> str:
+    """Async variant of get_income_statement."""
+    return await _make_api_request_async("INCOME_STATEMENT", _symbol_params(ticker))
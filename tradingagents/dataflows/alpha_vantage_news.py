@@ -1,22 +1,12 @@
-from .alpha_vantage_common import _make_api_request, format_datetime_for_api
+from .alpha_vantage_common import (
+    _make_api_request,
+    _make_api_request_async,
+    format_datetime_for_api,
+)
 
-def get_news(ticker, start_date, end_date, limit: int = 10) -> dict[str, str] | str:
-    """Returns live and historical market news & sentiment data from premier news outlets worldwide.
-
-    Covers stocks, cryptocurrencies, forex, and topics like fiscal policy, mergers & acquisitions, IPOs.
-
-    Args:
-        ticker: Stock symbol for news articles.
-        start_date: Start date for news search.
-        end_date: End date for news search.
-        limit: Maximum number of articles (default 10).
 
-    Returns:
-        Dictionary containing news sentiment data or JSON string.
-        
-    Raises:
-        ValueError: 如果输入参数无效
-    """
+def _news_params(ticker, start_date, end_date, limit) -> dict:
+    """Validate inputs and build NEWS_SENTIMENT parameters for a single ticker."""
     from tradingagents.utils.validators import validate_symbol, validate_date_range
     
     validate_symbol(ticker)
@@ -24,31 +14,16 @@ def get_news(ticker, start_date, end_date, limit: int = 10) -> dict[str, str] |
     if limit < 1 or limit > 100:
         raise ValueError(f"limit必须在1-100之间，当前值：{limit}")
 
-    params = {
+    return {
         "tickers": ticker,
         "time_from": format_datetime_for_api(start_date),
         "time_to": format_datetime_for_api(end_date),
         "limit": str(limit),
     }
 
-    return _make_api_request("NEWS_SENTIMENT", params)
-
-def get_global_news(curr_date, look_back_days: int = 7, limit: int = 20) -> dict[str, str] | str:
-    """Returns global market news & sentiment data without ticker-specific filtering.
 
-    Covers broad market topics like financial markets, economy, and more.
-
-    Args:
-        curr_date: Current date in yyyy-mm-dd format.
-        look_back_days: Number of days to look back (default 7).
-        limit: Maximum number of articles (default 50).
-
-    Returns:
-        Dictionary containing global news sentiment data or JSON string.
-        
-    Raises:
-        ValueError: 如果输入参数无效
-    """
+def _global_news_params(curr_date, look_back_days, limit) -> dict:
+    """Validate inputs and build NEWS_SENTIMENT parameters for market-wide topics."""
     from datetime import datetime, timedelta
     from tradingagents.utils.validators import validate_date
     
@@ -69,8 +44,45 @@ def get_global_news(curr_date, look_back_days: int = 7, limit: int = 20) -> dict
         "time_to": format_datetime_for_api(curr_date),
         "limit": str(limit),
     }
+    return params
 
-    return _make_api_request("NEWS_SENTIMENT", params)
+
+def get_news(ticker, start_date, end_date, limit: int = 10) -> dict[str, str] | str:
+    """Returns live and historical market news & sentiment data from premier news outlets worldwide.
+
+    Covers stocks, cryptocurrencies, forex, and topics like fiscal policy, mergers & acquisitions, IPOs.
+
+    Args:
+        ticker: Stock symbol for news articles.
+        start_date: Start date for news search.
+        end_date: End date for news search.
+        limit: Maximum number of articles (default 10).
+
+    Returns:
+        Dictionary containing news sentiment data or JSON string.
+        
+    Raises:
+        ValueError: 如果输入参数无效
+    """
+    return _make_api_request("NEWS_SENTIMENT", _news_params(ticker, start_date, end_date, limit))
+
+def get_global_news(curr_date, look_back_days: int = 7, limit: int = 20) -> dict[str, str] | str:
+    """Returns global market news & sentiment data without ticker-specific filtering.
+
+    Covers broad market topics like financial markets, economy, and more.
+
+    Args:
+        curr_date: Current date in yyyy-mm-dd format.
+        look_back_days: Number of days to look back (default 7).
+        limit: Maximum number of articles (default 50).
+
+    Returns:
+        Dictionary containing global news sentiment data or JSON string.
+        
+    Raises:
+        ValueError: 如果输入参数无效
+    """
+    return _make_api_request("NEWS_SENTIMENT", _global_news_params(curr_date, look_back_days, limit))
 
 
 def get_insider_transactions(symbol: str) -> dict[str, str] | str:
@@ -89,9 +101,27 @@ def get_insider_transactions(symbol: str) -> dict[str, str] | str:
     """
     from tradingagents.utils.validators import validate_symbol
     validate_symbol(symbol)
+    return _make_api_request("INSIDER_TRANSACTIONS", {"symbol": symbol})
+
+
+# Async variants over the shared httpx.AsyncClient
+
+async def get_news_async(ticker, start_date, end_date, limit: int = 10) -> dict[str, str] | str:
+    """Async variant of get_news."""
+    return await _make_api_request_async(
+        "NEWS_SENTIMENT", _news_params(ticker, start_date, end_date, limit)
+    )
 
-    params = {
-        "symbol": symbol,
-    }
 
-    return _make_api_request("INSIDER_TRANSACTIONS", params)
\ No newline at end of file
+async def get_global_news_async(curr_date, look_back_days: int = 7, limit: int = 20) -> dict[str, str] | str:
+    """Async variant of get_global_news."""
+    return await _make_api_request_async(
+        "NEWS_SENTIMENT", _global_news_params(curr_date, look_back_days, limit)
+    )
+
+
+async def get_insider_transactions_async(symbol: str) -> dict[str, str] | str:
+    """Async variant of get_insider_transactions."""
+    from tradingagents.utils.validators import validate_symbol
+    validate_symbol(symbol)
+    return await _make_api_request_async("INSIDER_TRANSACTIONS", {"symbol": symbol})
@@ -1,5 +1,29 @@
 from datetime import datetime
-from .alpha_vantage_common import _make_api_request, _filter_csv_by_date_range
+from .alpha_vantage_common import (
+    _make_api_request,
+    _make_api_request_async,
+    _filter_csv_by_date_range,
+)
+
+
+def _stock_params(symbol: str, start_date: str) -> dict:
+    """Build TIME_SERIES_DAILY_ADJUSTED parameters for the requested range."""
+    # Parse dates to determine the range
+    start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+    today = datetime.now()
+
+    # Choose outputsize based on whether the requested range is within the latest 100 days
+    # Compact returns latest 100 data points, so check if start_date is recent enough
+    days_from_today_to_start = (today - start_dt).days
+    outputsize = "compact" if days_from_today_to_start < 100 else "full"
+
+    params = {
+        "symbol": symbol,
+        "outputsize": outputsize,
+        "datatype": "csv",
+    }
+    return params
+
 
 def get_stock(
     symbol: str,
@@ -18,21 +42,14 @@ def get_stock(
     Returns:
         CSV string containing the daily adjusted time series data filtered to the date range.
     """
-    # Parse dates to determine the range
-    start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-    today = datetime.now()
+    response = _make_api_request("TIME_SERIES_DAILY_ADJUSTED", _stock_params(symbol, start_date))
 
-    # Choose outputsize based on whether the requested range is within the latest 100 days
-    # Compact returns latest 100 data points, so check if start_date is recent enough
-    days_from_today_to_start = (today - start_dt).days
-    outputsize = "compact" if days_from_today_to_start < 100 else "full"
-
-    params = {
-        "symbol": symbol,
-        "outputsize": outputsize,
-        "datatype": "csv",
-    }
+    return _filter_csv_by_date_range(response, start_date, end_date)
 
-    response = _make_api_request("TIME_SERIES_DAILY_ADJUSTED", params)
 
-    return _filter_csv_by_date_range(response, start_date, end_date)
\ No newline at end of file
+async def get_stock_async(symbol: str, start_date: str, end_date: str) -> str:
+    """Async variant of get_stock (shared httpx.AsyncClient)."""
+    response = await _make_api_request_async(
+        "TIME_SERIES_DAILY_ADJUSTED", _stock_params(symbol, start_date)
+    )
+    return _filter_csv_by_date_range(response, start_date, end_date)
@@ -6,9 +6,10 @@ import asyncio
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Callable
-from concurrent.futures import ThreadPoolExecutor
-from tradingagents.dataflows.interface import route_to_vendor
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+from tradingagents.constants import ASYNC_LOADER_MAX_CONCURRENCY
+from tradingagents.dataflows.async_http import gather_structured, run_sync
+from tradingagents.dataflows.interface import DataFetchError, aroute_to_vendor, route_to_vendor
 from tradingagents.dataflows.data_loader_mixin import DataLoaderMixin
 
 
@@ -23,7 +24,7 @@ class AsyncDataLoader(DataLoaderMixin):
             ticker: 股票代码
             end_date: 结束日期
             lookback_days: 回溯天数
-            max_workers: 最大并发worker数
+            max_workers: 最大并发请求数
         """
         self.ticker = ticker
         self.end_date = end_date
@@ -44,33 +45,82 @@ class AsyncDataLoader(DataLoaderMixin):
         self.social_media: str = ""
         
     async def load_all_data_async(self):
-        """异步加载所有数据（并发执行）"""
-        # 使用ThreadPoolExecutor因为route_to_vendor是同步的
-        loop = asyncio.get_event_loop()
-        
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # 并发执行所有数据获取任务
-            tasks = [
-                loop.run_in_executor(executor, self._load_stock_data),
-                loop.run_in_executor(executor, self._load_fundamentals_data),
-                loop.run_in_executor(executor, self._load_balance_sheet_data),
-                loop.run_in_executor(executor, self._load_cashflow_data),
-                loop.run_in_executor(executor, self._load_income_statement_data),
-                loop.run_in_executor(executor, self._load_news_data),
-                loop.run_in_executor(executor, self._load_global_news_data),
-                loop.run_in_executor(executor, self._load_social_media_data),
-            ]
-            
-            # 等待所有任务完成
-            await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # 股票数据加载完成后，计算指标
+        """异步加载所有数据（并发执行）
+
+        数据请求通过 aroute_to_vendor 走原生异步数据路径，同时在途的请求数不超过 max_workers；
+        任一加载协程意外失败时其余协程会被取消，不会留下游离任务。
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+        news_start = (datetime.strptime(self.end_date, "%Y-%m-%d") - timedelta(days=30)).strftime("%Y-%m-%d")
+
+        await gather_structured(
+            self._limited(semaphore, self._load_stock_data_async()),
+            self._limited(semaphore, self._load_async(
+                "fundamentals", "fundamentals", "get_fundamentals", self.ticker)),
+            self._limited(semaphore, self._load_async(
+                "balance_sheet", "balance sheet", "get_balance_sheet", self.ticker)),
+            self._limited(semaphore, self._load_async(
+                "cashflow", "cashflow", "get_cashflow", self.ticker)),
+            self._limited(semaphore, self._load_async(
+                "income_statement", "income statement", "get_income_statement", self.ticker)),
+            self._limited(semaphore, self._load_async(
+                "news", "news", "get_news", self.ticker, news_start, self.end_date)),
+            self._limited(semaphore, self._load_async(
+                "global_news", "global news", "get_global_news", self.end_date, 30, 20)),
+            # 社交媒体数据来自同步的 LangChain 工具
+            self._limited(semaphore, asyncio.to_thread(self._load_social_media_data)),
+        )
+
+        # 股票数据加载完成后，在线程中计算指标（CPU 密集，不阻塞事件循环）
         if self.stock_data_df is not None:
-            await loop.run_in_executor(executor, self._calculate_indicators)
-    
+            await asyncio.to_thread(self._calculate_indicators)
+
     def load_all_data_sync(self):
         """同步版本（兼容旧代码）"""
-        asyncio.run(self.load_all_data_async())
+        run_sync(self.load_all_data_async)
+
+    @classmethod
+    async def load_many(
+        cls,
+        tickers: List[str],
+        end_date: str,
+        lookback_days: int = 180,
+        max_concurrency: int = ASYNC_LOADER_MAX_CONCURRENCY,
+    ) -> Dict[str, "AsyncDataLoader"]:
+        """
+        并发加载多只股票
+
+        所有股票共享同一个事件循环和 httpx 连接池，数百只股票只占用少量线程。
+
+        Args:
+            tickers: 股票代码列表
+            end_date: 结束日期
+            lookback_days: 回溯天数
+            max_concurrency: 同时加载的股票数上限
+
+        Returns:
+            {ticker: 已加载的 AsyncDataLoader}
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        loaders = {ticker: cls(ticker, end_date, lookback_days) for ticker in tickers}
+        await gather_structured(*(
+            cls._limited(semaphore, loader.load_all_data_async())
+            for loader in loaders.values()
+        ))
+        return loaders
+
+    @staticmethod
+    async def _limited(semaphore: asyncio.Semaphore, aw: Awaitable[Any]) -> Any:
+        """在信号量限制下等待 aw"""
+        async with semaphore:
+            return await aw
+
+    async def _load_async(self, attr: str, label: str, method: str, *args) -> None:
+        """通过异步数据路径加载一项数据，失败时写入错误信息"""
+        try:
+            setattr(self, attr, await aroute_to_vendor(method, *args))
+        except (DataFetchError, ConnectionError, ValueError, TimeoutError, OSError) as e:
+            setattr(self, attr, f"Error loading {label}: {str(e)}")
     
     def _load_fundamentals_data(self):
         """加载基本面数据"""
@@ -0,0 +1,121 @@
+"""
+异步 HTTP 客户端与结构化并发
+============================
+- get_async_client(): 每个事件循环共享一个 httpx.AsyncClient（连接池复用），
+  数百个并发请求只占用少量 socket，不需要为每个在途请求开一个线程
+- gather_structured(): asyncio.gather 的结构化版本——任一子任务异常或调用方被取消时，
+  取消其余子任务并等待它们结束，不会留下游离的后台任务
+- run_sync(): 同步入口运行协程，已在事件循环中时改到工作线程执行
+"""
+
+import asyncio
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, List, TypeVar
+
+import httpx
+
+from tradingagents.constants import (
+    ASYNC_HTTP_MAX_CONNECTIONS,
+    ASYNC_HTTP_TIMEOUT_SECONDS,
+)
+from tradingagents.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# 事件循环 -> AsyncClient（httpx 客户端不能跨事件循环使用）
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    获取当前事件循环共享的 httpx.AsyncClient（首次调用时创建）
+
+    Returns:
+        httpx.AsyncClient 实例
+
+    Raises:
+        RuntimeError: 不在事件循环中调用时抛出
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=ASYNC_HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=ASYNC_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=ASYNC_HTTP_MAX_CONNECTIONS,
+            ),
+        )
+        _clients[loop] = client
+    return client
+
+
+async def aclose_async_client() -> None:
+    """关闭当前事件循环的共享客户端（在 asyncio.run 结束前调用）"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+async def gather_structured(*aws: Awaitable[Any]) -> List[Any]:
+    """
+    并发执行并按顺序返回结果（结构化取消）
+
+    与 asyncio.gather 的区别：任一子任务抛出异常、或调用方被取消时，
+    其余子任务会被取消并等待结束后再把异常向上传递。
+
+    Args:
+        *aws: 协程或 awaitable
+
+    Returns:
+        结果列表（与输入顺序一致）
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    if not tasks:
+        return []
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        failed = next((t for t in done if not t.cancelled() and t.exception()), None)
+        if failed is not None:
+            raise failed.exception()
+        return [task.result() for task in tasks]
+    finally:
+        pending = [t for t in tasks if not t.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def run_sync(coro_fn: Callable[[], Awaitable[T]]) -> T:
+    """
+    在同步代码中运行协程：新建事件循环执行，结束前关闭该循环的共享 HTTP 客户端
+
+    当前线程已有运行中的事件循环（Jupyter、异步 Web 处理函数中调用同步接口）时，
+    asyncio.run 不能嵌套，改为在工作线程的新事件循环中执行并阻塞等待结果。
+
+    Args:
+        coro_fn: 返回协程的无参函数（在执行事件循环所在的线程中调用）
+
+    Returns:
+        协程的返回值
+    """
+    async def run() -> T:
+        try:
+            return await coro_fn()
+        finally:
+            await aclose_async_client()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(run())
+
+    logger.debug("当前线程已有运行中的事件循环，在工作线程中执行")
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="run-sync") as pool:
+        return pool.submit(lambda: asyncio.run(run())).result()
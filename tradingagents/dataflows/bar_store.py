@@ -0,0 +1,497 @@
+"""
+区间感知的日线 OHLCV 存储
+=========================
+按股票维护已持有的日期区间，任意子区间直接从内存返回，
+只向数据源请求缺失的区间（通常只是最新几根K线）。
+
+与按 (func, args, kwargs) 精确匹配的 DataCache 不同，
+get_stock_data(NVDA, 2025-08-01, 2026-02-20) 与
+get_stock_data(NVDA, 2025-08-02, 2026-02-23) 共享同一份K线。
+"""
+
+import asyncio
+import io
+import json
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from tradingagents.constants import CACHE_SESSION_SETTLE_SECONDS, CACHE_TTL_INTRADAY_SECONDS
+from tradingagents.dataflows.async_http import gather_structured
+from tradingagents.dataflows.trading_calendar import get_calendar_for_symbol
+from tradingagents.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 统一输出列（与长桥 get_stock_data 的 CSV 格式一致）
+BAR_COLUMNS = ["open", "high", "low", "close", "volume", "adjusted_close"]
+REQUIRED_COLUMNS = {"timestamp", "open", "high", "low", "close", "volume"}
+
+Interval = Tuple[date, date]
+
+
+def normalize_ohlcv_csv(text: str) -> Optional[pd.DataFrame]:
+    """
+    把各数据源的日线 CSV 统一为以 timestamp (YYYY-MM-DD) 为索引的 DataFrame
+
+    支持长桥 (timestamp,...,adjusted_close)、yfinance (# 注释头 + Date,Open,...)
+    和 Alpha Vantage (timestamp,...,adjusted_close,...，倒序) 的输出。
+
+    Args:
+        text: 数据源返回的 CSV 字符串
+
+    Returns:
+        DataFrame（列为 BAR_COLUMNS，按日期升序），无法解析时返回 None
+    """
+    if not isinstance(text, str):
+        return None
+
+    lines = [
+        line for line in text.splitlines()
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+    if len(lines) < 2:
+        return None
+
+    try:
+        df = pd.read_csv(io.StringIO("\n".join(lines)))
+    except (ValueError, pd.errors.ParserError):
+        return None
+
+    df.columns = [str(c).strip().lower().replace(" ", "_") for c in df.columns]
+    df = df.rename(columns={"date": "timestamp", "adj_close": "adjusted_close"})
+    if not REQUIRED_COLUMNS.issubset(df.columns):
+        return None
+
+    try:
+        df["timestamp"] = pd.to_datetime(df["timestamp"]).dt.strftime("%Y-%m-%d")
+    except (ValueError, TypeError):
+        return None
+
+    if "adjusted_close" not in df.columns:
+        df["adjusted_close"] = df["close"]
+
+    df = (
+        df[["timestamp"] + BAR_COLUMNS]
+        .drop_duplicates("timestamp", keep="last")
+        .set_index("timestamp")
+        .sort_index()
+    )
+    return df
+
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """合并重叠或相邻（相差一天）的日期区间"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_intervals(intervals: List[Interval], start: date, end: date) -> List[Interval]:
+    """
+    计算 [start, end] 中尚未被 intervals 覆盖的区间
+
+    Args:
+        intervals: 已合并、升序的已覆盖区间
+        start: 请求起始日期（含）
+        end: 请求结束日期（含）
+
+    Returns:
+        缺失区间列表（升序）
+    """
+    gaps: List[Interval] = []
+    cursor = start
+    for covered_start, covered_end in intervals:
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start - timedelta(days=1)))
+        cursor = max(cursor, covered_end + timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class _SymbolBars:
+    """单只股票的K线与已覆盖区间"""
+
+    def __init__(self):
+        self.bars: pd.DataFrame = pd.DataFrame(columns=BAR_COLUMNS)
+        self.bars.index.name = "timestamp"
+        self.intervals: List[Interval] = []
+        self.lock = threading.Lock()
+        self.loaded = False
+        # 盘中（未收盘）区间最近一次获取的 (起, 止, 过期时间戳)，只保存在内存
+        self.provisional: Optional[Tuple[date, date, float]] = None
+
+
+class BarStore:
+    """区间感知的按股票K线存储（线程安全，可持久化）
+
+    用法:
+        store = BarStore("/path/to/bars")
+        csv_text, gaps = store.get_range("NVDA", "2025-08-01", "2026-02-20", fetch_fn)
+        csv_text, gaps = await store.get_range_async("NVDA", "2025-08-01", "2026-02-20", afetch_fn)
+
+    fetch_fn(symbol, start_date, end_date) -> str 只会被缺失区间调用。
+    已收盘且过了定稿缓冲（settle_seconds，数据源可能在收盘后修正最后一根K线）的交易日
+    计入已覆盖区间，之后不再请求；尚未定稿的交易日K线会被存储但不计入覆盖，
+    intraday_ttl_seconds 内复用，之后重新获取。缺口包含最近一个已定稿交易日时，
+    只覆盖到数据源实际返回的最后一根K线（数据源滞后时之后再补）。
+    """
+
+    def __init__(
+        self,
+        store_dir: Optional[str] = None,
+        persist: bool = True,
+        intraday_ttl_seconds: float = CACHE_TTL_INTRADAY_SECONDS,
+        settle_seconds: float = CACHE_SESSION_SETTLE_SECONDS,
+    ):
+        """
+        Args:
+            store_dir: 持久化目录（每只股票一个 JSON 文件）
+            persist: 是否持久化到磁盘
+            intraday_ttl_seconds: 未定稿交易日K线的复用时长（秒）
+            settle_seconds: 收盘后多久视为K线定稿（与 CacheTTLPolicy 一致）
+        """
+        if store_dir is None:
+            store_dir = os.path.join(
+                os.path.dirname(os.path.abspath(__file__)), "data_cache", "bars"
+            )
+        self.store_dir = Path(store_dir)
+        self.persist = persist
+        self.intraday_ttl_seconds = intraday_ttl_seconds
+        self.settle = timedelta(seconds=settle_seconds)
+        if self.persist:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+
+        self._symbols: Dict[str, _SymbolBars] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "full_hits": 0,
+            "gap_fetches": 0,
+            "bars_fetched": 0,
+            "bars_served": 0,
+        }
+
+    # ---------- 内部工具 ----------
+
+    def _entry(self, symbol: str) -> _SymbolBars:
+        with self._lock:
+            entry = self._symbols.get(symbol)
+            if entry is None:
+                entry = _SymbolBars()
+                self._symbols[symbol] = entry
+            return entry
+
+    def _file_path(self, symbol: str) -> Path:
+        safe = "".join(c if c.isalnum() or c in "._-" else "_" for c in symbol)
+        return self.store_dir / f"{safe}.json"
+
+    def _load(self, symbol: str, entry: _SymbolBars) -> None:
+        """首次访问时从磁盘加载（调用方持有 entry.lock）"""
+        entry.loaded = True
+        if not self.persist:
+            return
+        path = self._file_path(symbol)
+        if not path.exists():
+            return
+        try:
+            with open(path, "r") as f:
+                payload = json.load(f)
+            bars = payload["bars"]
+            df = pd.DataFrame(bars["data"], columns=bars["columns"], index=bars["index"])
+            df.index.name = "timestamp"
+            entry.bars = df
+            entry.intervals = merge_intervals([
+                (date.fromisoformat(s), date.fromisoformat(e))
+                for s, e in payload["intervals"]
+            ])
+        except (json.JSONDecodeError, KeyError, ValueError, OSError) as e:
+            logger.debug("读取K线存储失败 (%s): %s", path.name, e)
+
+    def _save(self, symbol: str, entry: _SymbolBars) -> None:
+        """写回磁盘（调用方持有 entry.lock）"""
+        if not self.persist:
+            return
+        path = self._file_path(symbol)
+        payload = {
+            "symbol": symbol,
+            "intervals": [[s.isoformat(), e.isoformat()] for s, e in entry.intervals],
+            "bars": entry.bars.to_dict(orient="split"),
+        }
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError) as e:
+            logger.debug("写入K线存储失败 (%s): %s", path.name, e)
+
+    def _merge_bars(self, entry: _SymbolBars, new_bars: pd.DataFrame) -> None:
+        """合并新K线，同一天以新数据为准"""
+        if entry.bars.empty:
+            entry.bars = new_bars.copy()
+        else:
+            combined = pd.concat([entry.bars[~entry.bars.index.isin(new_bars.index)], new_bars])
+            entry.bars = combined.sort_index()
+        entry.bars.index.name = "timestamp"
+
+    def _final_through(self, symbol: str, now: Optional[datetime] = None) -> date:
+        """
+        K线已定稿的最后日期：收盘超过 settle 的最近交易日，
+        其后、下一个交易日之前的非交易日也算定稿
+        """
+        calendar = get_calendar_for_symbol(symbol)
+        last_final = calendar.last_closed_session((now or calendar.now()) - self.settle)
+        return calendar.next_session(last_final) - timedelta(days=1)
+
+    @staticmethod
+    def _provisional_fresh(entry: _SymbolBars, gap_start: date, gap_end: date) -> bool:
+        """缺口是否落在仍在复用期内的盘中区间里"""
+        if entry.provisional is None:
+            return False
+        prov_start, prov_end, expires_at = entry.provisional
+        return prov_start <= gap_start and gap_end <= prov_end and time.time() < expires_at
+
+    def _ensure_loaded(self, symbol: str, entry: _SymbolBars) -> None:
+        """首次访问时加载（自行加锁，供异步路径在线程中调用）"""
+        with entry.lock:
+            if not entry.loaded:
+                self._load(symbol, entry)
+
+    def _save_locked(self, symbol: str, entry: _SymbolBars) -> None:
+        """加锁后写回磁盘（供异步路径在线程中调用）"""
+        with entry.lock:
+            self._save(symbol, entry)
+
+    def _plan_gaps(
+        self, symbol: str, entry: _SymbolBars, start: date, end: date
+    ) -> List[Interval]:
+        """需要向数据源请求的缺口（调用方持有 entry.lock）：跳过无交易日和仍在复用期内的盘中区间"""
+        if not entry.loaded:
+            self._load(symbol, entry)
+        calendar = get_calendar_for_symbol(symbol)
+        return [
+            gap for gap in missing_intervals(entry.intervals, start, end)
+            if calendar.has_session(*gap) and not self._provisional_fresh(entry, *gap)
+        ]
+
+    def _apply_gap(
+        self,
+        symbol: str,
+        entry: _SymbolBars,
+        gap: Interval,
+        raw: Any,
+        final_through: date,
+    ) -> bool:
+        """
+        合并一个缺口的返回数据（调用方持有 entry.lock）
+
+        Returns:
+            数据是否可以解析
+        """
+        gap_start, gap_end = gap
+        new_bars = normalize_ohlcv_csv(raw)
+        if new_bars is None:
+            logger.debug("K线缺口 %s %s~%s 返回无法解析的数据", symbol, gap_start, gap_end)
+            return False
+
+        self._merge_bars(entry, new_bars)
+        # 未定稿交易日的K线可能仍在变化，只覆盖到已定稿的日期
+        covered_end = min(gap_end, final_through)
+        latest_final = get_calendar_for_symbol(symbol).previous_session(final_through)
+        if covered_end >= latest_final:
+            # 缺口包含最近一个定稿交易日：数据源可能还没有这根K线，只覆盖到实际返回的最后一根
+            returned = new_bars.index[
+                (new_bars.index >= gap_start.isoformat()) & (new_bars.index <= gap_end.isoformat())
+            ]
+            last_bar = date.fromisoformat(returned.max()) if len(returned) else gap_start - timedelta(days=1)
+            if last_bar < latest_final:
+                covered_end = last_bar
+        if covered_end >= gap_start:
+            entry.intervals = merge_intervals(
+                entry.intervals + [(gap_start, covered_end)]
+            )
+        if gap_end > covered_end:
+            entry.provisional = (
+                max(gap_start, covered_end + timedelta(days=1)),
+                gap_end,
+                time.time() + self.intraday_ttl_seconds,
+            )
+        with self._lock:
+            self._stats["bars_fetched"] += len(new_bars)
+        return True
+
+    @staticmethod
+    def _gap_request(symbol: str, gap: Interval) -> Tuple[str, str, str]:
+        """缺口的请求参数：部分数据源（yfinance）的 end 不含当天，请求时多取一天"""
+        gap_start, gap_end = gap
+        return symbol, gap_start.isoformat(), (gap_end + timedelta(days=1)).isoformat()
+
+    def _finish(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        window: pd.DataFrame,
+        gaps_fetched: int,
+        raw_fallback: Any,
+    ) -> Tuple[str, int]:
+        """记录统计并输出 CSV"""
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["gap_fetches"] += gaps_fetched
+            self._stats["bars_served"] += len(window)
+            if gaps_fetched == 0:
+                self._stats["full_hits"] += 1
+
+        if window.empty and raw_fallback is not None:
+            return raw_fallback, gaps_fetched
+
+        logger.debug(
+            "K线存储 %s %s~%s: 返回 %d 根，请求缺口 %d 个",
+            symbol, start_date, end_date, len(window), gaps_fetched,
+        )
+        return window.reset_index().to_csv(index=False), gaps_fetched
+
+    @staticmethod
+    def _window(entry: _SymbolBars, start_date: str, end_date: str) -> pd.DataFrame:
+        """截取请求区间（调用方持有 entry.lock）"""
+        return entry.bars.loc[
+            (entry.bars.index >= start_date) & (entry.bars.index <= end_date)
+        ]
+
+    # ---------- 公共接口 ----------
+
+    def get_range(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        fetch_fn: Callable[[str, str, str], str],
+    ) -> Tuple[str, int]:
+        """
+        获取 [start_date, end_date] 的日线数据，只为缺失区间调用 fetch_fn
+
+        Args:
+            symbol: 股票代码
+            start_date: 起始日期 (yyyy-mm-dd)
+            end_date: 结束日期 (yyyy-mm-dd)
+            fetch_fn: 缺失区间的数据获取函数 (symbol, start, end) -> CSV 字符串
+
+        Returns:
+            (CSV 字符串, 实际请求的缺口数量)；缺口返回无法解析的内容且区间内
+            没有任何K线时，原样返回数据源的结果
+        """
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+        entry = self._entry(symbol)
+        raw_fallback = None
+        gaps_fetched = 0
+
+        with entry.lock:
+            gaps = self._plan_gaps(symbol, entry, start, end)
+            final_through = self._final_through(symbol)
+
+            for gap in gaps:
+                raw = fetch_fn(*self._gap_request(symbol, gap))
+                gaps_fetched += 1
+                if not self._apply_gap(symbol, entry, gap, raw, final_through):
+                    raw_fallback = raw
+
+            if gaps_fetched:
+                self._save(symbol, entry)
+
+            window = self._window(entry, start_date, end_date)
+
+        return self._finish(symbol, start_date, end_date, window, gaps_fetched, raw_fallback)
+
+    async def get_range_async(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        afetch_fn: Callable[[str, str, str], Awaitable[str]],
+    ) -> Tuple[str, int]:
+        """
+        get_range 的异步版本：缺口并发请求，等待期间不持有锁；
+        磁盘读写在线程中执行
+
+        同一只股票的两个并发请求可能请求重叠的缺口，合并时以后到的数据为准，结果一致。
+        """
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+        entry = self._entry(symbol)
+        raw_fallback = None
+
+        if not entry.loaded:
+            await asyncio.to_thread(self._ensure_loaded, symbol, entry)
+        with entry.lock:
+            gaps = self._plan_gaps(symbol, entry, start, end)
+
+        raws = await gather_structured(
+            *(afetch_fn(*self._gap_request(symbol, gap)) for gap in gaps)
+        )
+
+        with entry.lock:
+            final_through = self._final_through(symbol)
+            for gap, raw in zip(gaps, raws):
+                if not self._apply_gap(symbol, entry, gap, raw, final_through):
+                    raw_fallback = raw
+            window = self._window(entry, start_date, end_date)
+
+        if gaps:
+            await asyncio.to_thread(self._save_locked, symbol, entry)
+        return self._finish(symbol, start_date, end_date, window, len(gaps), raw_fallback)
+
+    def covered_intervals(self, symbol: str) -> List[Tuple[str, str]]:
+        """返回某只股票已覆盖的日期区间"""
+        entry = self._entry(symbol)
+        with entry.lock:
+            if not entry.loaded:
+                self._load(symbol, entry)
+            return [(s.isoformat(), e.isoformat()) for s, e in entry.intervals]
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """
+        清除K线存储
+
+        Args:
+            symbol: 股票代码，为 None 时清除全部
+        """
+        with self._lock:
+            symbols = [symbol] if symbol else list(self._symbols.keys())
+            for sym in symbols:
+                self._symbols.pop(sym, None)
+        if not self.persist:
+            return
+        paths = [self._file_path(symbol)] if symbol else list(self.store_dir.glob("*.json"))
+        for path in paths:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.debug("删除K线存储失败 (%s): %s", path.name, e)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取K线存储统计"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["symbols"] = len(self._symbols)
+        return stats
@@ -13,16 +13,13 @@
 """
 
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Union
 from .indicator_groups import (
     INDICATOR_GROUPS,
     get_indicator_columns
 )
-from .indicators.moving_averages import MovingAverageIndicators
-from .indicators.momentum_indicators import MomentumIndicators
-from .indicators.volume_indicators import VolumeIndicators
-from .indicators.trend_indicators import TrendIndicators
-from .indicators.additional_indicators import AdditionalIndicators
+from .indicators.engine import IndicatorEngine
+from .indicators.panel import PanelIndicatorEngine
 from .patterns import CandlestickPatternRecognizer, ChartPatterns
 
 
@@ -30,7 +27,8 @@ class CompleteTechnicalIndicators:
     """
     完整技术指标计算器（协调器）
     
-    委托给各模块进行实际计算：
+    全量指标由 IndicatorEngine 在 NumPy 数组上一次算完；以下指标类是
+    共用同一套 kernels 的门面，可单独计算某一类指标：
     - MovingAverageIndicators: SMA, EMA, Bollinger Bands, ATR
     - MomentumIndicators: RSI, MACD, ADX
     - VolumeIndicators: OBV, VWMA, Volume Patterns
@@ -41,50 +39,45 @@ class CompleteTechnicalIndicators:
     @staticmethod
     def calculate_all_indicators(df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
         """
-        计算所有技术指标（使用模块化结构，支持inplace修改）
+        计算所有技术指标（预分配输出缓冲区，一次性构建 DataFrame）
         
         Args:
             df: 包含 OHLCV 数据的 DataFrame，需要包含以下列：
                 - open, high, low, close, volume
-            inplace: True则直接修改df，False则返回新DataFrame（默认False保持兼容性）
+            inplace: 兼容参数；结果总是新的 DataFrame（输入列不复制，也不修改 df）
                 
         Returns:
-            包含所有技术指标的 DataFrame
+            包含所有技术指标的 DataFrame（列顺序与各指标类依次计算时相同）
         """
-        if not inplace:
-            df = df.copy()
-        
-        result_df = df
-        
-        # ==================== 移动平均线指标 ====================
-        result_df = MovingAverageIndicators.calculate_sma(result_df, inplace=True)
-        result_df = MovingAverageIndicators.calculate_ema(result_df, inplace=True)
-        result_df = MovingAverageIndicators.calculate_bollinger_bands(result_df, inplace=True)
-        result_df = MovingAverageIndicators.calculate_atr(result_df, inplace=True)
-        
-        # ==================== 动量指标 ====================
-        result_df["rsi"] = MomentumIndicators.calculate_rsi(result_df["close"])
-        
-        macd, signal, hist = MomentumIndicators.calculate_macd(result_df["close"])
-        result_df["macd"] = macd
-        result_df["macds"] = signal
-        result_df["macdh"] = hist
-        
-        adx, plus_di, minus_di = MomentumIndicators.calculate_adx(result_df)
-        result_df["adx"] = adx
-        result_df["plus_di"] = plus_di
-        result_df["minus_di"] = minus_di
-        
-        # ==================== 成交量指标 ====================
-        result_df = VolumeIndicators.calculate_all_volume_indicators(result_df, inplace=True)
-        
-        # ==================== 趋势指标 ====================
-        result_df = TrendIndicators.calculate_all_trend_indicators(result_df, inplace=True)
-        
-        # ==================== 扩展指标 ====================
-        result_df = AdditionalIndicators.calculate_all_additional_indicators(result_df, inplace=True)
+        return IndicatorEngine(df).compute_all()
+    
+    @staticmethod
+    def calculate_panel(
+        ohlcv: Dict[str, pd.DataFrame],
+        columns: Optional[List[str]] = None,
+        align: str = "bars",
+        as_frame: bool = False
+    ) -> Union[Dict[str, pd.DataFrame], pd.DataFrame]:
+        """
+        一次计算多只股票的技术指标（每个指标在 (时间, 股票) 二维数组上只算一次）
         
-        return result_df
+        Args:
+            ohlcv: {股票代码: OHLCV DataFrame}
+            columns: 只计算这些指标列（None 表示全部，结果同 calculate_all_indicators）
+            align: "bars" 按各自K线计算，结果与逐只计算逐位一致；
+                "calendar" 先对齐到时间戳并集，缺失日期为 NaN
+            as_frame: True 返回 (symbol, 原索引) 的 MultiIndex DataFrame
+                
+        Returns:
+            {股票代码: 指标 DataFrame}，或 MultiIndex DataFrame
+        """
+        engine = PanelIndicatorEngine(ohlcv, align=align)
+        frames = engine.compute_all() if columns is None else engine.get_indicators(columns)
+        if not as_frame:
+            return frames
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, names=["symbol"])
     
     @staticmethod
     def get_indicator_group(df: pd.DataFrame, indicator: str, look_back_days: int = 120) -> pd.DataFrame:
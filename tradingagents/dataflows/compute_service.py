@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+指标与形态计算进程池
+====================
+指标计算和形态识别是纯 CPU 计算，在调用线程上执行时持有 GIL：并行的分析师线程互相阻塞，
+批量扫描上千只股票也只能用到一个核。ComputeService 把这些计算交给 ProcessPoolExecutor：
+
+- OHLCV 通过 multiprocessing.shared_memory 传给工作进程（(列, 股票, 时间) 的 float64 块），
+  指标结果由工作进程直接写入父进程分配的共享内存，两个方向都不经过 pickle
+- 每个任务包含一组股票，工作进程用 PanelIndicatorEngine 一次计算整组，
+  结果与逐只调用 IndicatorEngine 逐位一致
+- 只回传紧凑结果：tail 参数只取每只股票最后几行（横截面筛选用 tail=1）；
+  蜡烛图形态只回传每根K线的形态位集合，父进程再解码并按原始数据补全行情字段
+- workers=0 时在当前进程计算（与直接调用指标/形态模块相同），适合单只股票的交互式运行
+- warm=True 时创建后立即启动全部工作进程并完成导入和预热，第一批任务不承担进程启动开销
+
+同一个服务可在 CLI、run_trading.py 和批量任务中复用（见 interface.get_compute_service）。
+
+使用示例:
+    >>> with ComputeService(workers=8) as service:
+    ...     latest = service.compute_indicators_batch(ohlcv_by_symbol, ['rsi', 'macd'], tail=1)
+    ...     candles = service.candlestick_patterns_batch(ohlcv_by_symbol)
+"""
+
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.constants import COMPUTE_POOL_MAX_CHUNK_SYMBOLS, COMPUTE_POOL_TASKS_PER_WORKER
+from tradingagents.utils.logger import get_logger
+from .indicator_groups import BASE_COLUMNS
+from .indicators import kernels as k
+from .indicators.engine import INDICATOR_COLUMNS, INDICATOR_NODES, OHLCV_COLUMNS, IndicatorEngine
+from .indicators.panel import PanelIndicatorEngine
+from .patterns import CandlestickPatternRecognizer, ChartPatterns
+
+logger = get_logger(__name__)
+
+# compute_all 的输出列顺序：浮点指标列在前，信号列在后（同 IndicatorEngine.compute_all）
+_ALL_COLUMNS = (
+    [col for col in INDICATOR_COLUMNS if not INDICATOR_NODES[col].signal]
+    + [col for col in INDICATOR_COLUMNS if INDICATOR_NODES[col].signal]
+)
+_ALL_COLUMN_SET = set(_ALL_COLUMNS)
+_SIGNAL_COLUMNS = {col for col in INDICATOR_COLUMNS if INDICATOR_NODES[col].signal}
+
+# 共享内存块的描述：(名称, 形状)
+SharedSpec = Tuple[str, Tuple[int, ...]]
+
+
+# ==================== 共享内存 ====================
+
+class _SharedArray:
+    """父进程创建的 float64 共享内存数组，工作进程按 spec 挂载"""
+
+    def __init__(self, shape: Tuple[int, ...]):
+        size = max(int(np.prod(shape)) * 8, 8)
+        self._shm = SharedMemory(create=True, size=size)
+        self.array = np.ndarray(shape, dtype=np.float64, buffer=self._shm.buf)
+        self.spec: SharedSpec = (self._shm.name, tuple(shape))
+
+    def release(self):
+        """释放并删除共享内存（先丢弃本进程的数组视图）"""
+        self.array = None
+        self._shm.close()
+        self._shm.unlink()
+
+
+def _read_shared(spec: SharedSpec) -> np.ndarray:
+    """工作进程：把共享内存块复制到本进程（一次 memcpy），随即断开"""
+    name, shape = spec
+    shm = SharedMemory(name=name)
+    try:
+        view = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        values = view.copy()
+        del view
+    finally:
+        shm.close()
+    return values
+
+
+def _write_shared(spec: SharedSpec, fill: Callable[[np.ndarray], None]) -> None:
+    """工作进程：挂载输出块并交给 fill 写入（视图只在 fill 内使用，返回后即可断开）"""
+    name, shape = spec
+    shm = SharedMemory(name=name)
+    try:
+        view = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        fill(view)
+        del view
+    finally:
+        shm.close()
+
+
+def _bar_columns(frames: Sequence[pd.DataFrame]) -> List[str]:
+    """所有股票都有的 OHLCV 列"""
+    return [col for col in OHLCV_COLUMNS if all(col in df.columns for df in frames)]
+
+
+def _pack_bars(frames: Sequence[pd.DataFrame], bar_columns: List[str], rows: Optional[int] = None) -> _SharedArray:
+    """
+    把一组股票的 OHLCV 写入 (列, 股票, 时间) 共享内存块（每只股票从第 0 行开始，尾部补 NaN）
+
+    Args:
+        rows: 只放每只股票最后 rows 行（None 表示全部）
+    """
+    lengths = [len(df) if rows is None else min(len(df), rows) for df in frames]
+    shared = _SharedArray((len(bar_columns), len(frames), max(lengths, default=0)))
+    shared.array.fill(np.nan)
+    for j, (df, n) in enumerate(zip(frames, lengths)):
+        for c, col in enumerate(bar_columns):
+            shared.array[c, j, :n] = k.as_float_array(df[col].iloc[len(df) - n:])
+    return shared
+
+
+def _bars_frame(bars: np.ndarray, bar_columns: List[str], j: int, n: int) -> pd.DataFrame:
+    """工作进程：第 j 只股票的 OHLCV DataFrame（行号索引，没有 timestamp 列）"""
+    return pd.DataFrame({col: bars[c, j, :n] for c, col in enumerate(bar_columns)})
+
+
+# ==================== 工作进程任务 ====================
+
+def _init_worker():
+    """工作进程初始化：在小样本上跑一遍全部指标，预热 pandas/NumPy 的延迟导入和内核"""
+    close = 100 + np.cumsum(np.ones(64))
+    sample = {col: close[:, None] for col in OHLCV_COLUMNS}
+    engine = PanelIndicatorEngine.from_bars(sample)
+    for col in INDICATOR_COLUMNS:
+        engine.get_indicator(col)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _indicator_task(
+    bars_spec: SharedSpec,
+    bar_columns: List[str],
+    lengths: List[int],
+    columns: List[str],
+    out_spec: SharedSpec,
+) -> None:
+    """计算一组股票的指标，把每只股票最后 out 行写入 (股票, 列, 行) 输出块"""
+    bars = _read_shared(bars_spec)
+    engine = PanelIndicatorEngine.from_bars({col: bars[c].T for c, col in enumerate(bar_columns)})
+    n_symbols = len(lengths)
+    rows = out_spec[1][2]
+    ends = np.asarray(lengths, dtype=np.int64)
+    # 每只股票取 [n - rows, n) 行；不足 rows 行的股票从第 0 行开始，尾部由父进程截掉
+    take = np.clip(ends[:, None] - np.minimum(ends, rows)[:, None] + np.arange(rows), 0, max(bars.shape[2] - 1, 0))
+    symbol_index = np.arange(n_symbols)[:, None]
+
+    def fill(out: np.ndarray):
+        for i, col in enumerate(columns):
+            out[:, i, :] = engine.get_indicator(col).T[symbol_index, take]
+
+    _write_shared(out_spec, fill)
+
+
+def _candlestick_task(bars_spec: SharedSpec, bar_columns: List[str], lengths: List[int]) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """识别一组股票的蜡烛图形态，只回传每根K线的形态位集合和成交量确认标志"""
+    bars = _read_shared(bars_spec)
+    return [
+        CandlestickPatternRecognizer.detect(_bars_frame(bars, bar_columns, j, n))
+        for j, n in enumerate(lengths)
+    ]
+
+
+def _chart_task(bars_spec: SharedSpec, bar_columns: List[str], lengths: List[int], lookback: int) -> List[Dict[str, Any]]:
+    """识别一组股票的图表形态（输入块只包含最后 lookback 行）"""
+    bars = _read_shared(bars_spec)
+    return [
+        ChartPatterns.identify_all_patterns(_bars_frame(bars, bar_columns, j, n), lookback)
+        for j, n in enumerate(lengths)
+    ]
+
+
+# ==================== 结果组装（父进程） ====================
+
+def _indicator_frame(df: pd.DataFrame, values: np.ndarray, columns: List[str], compute_all: bool) -> pd.DataFrame:
+    """
+    用输入行和 (列, 行) 指标块组装结果，与 IndicatorEngine 的输出相同
+
+    Args:
+        df: 输入数据中对应的行
+        compute_all: True 时保留全部输入列（同 compute_all），否则只保留基础列（同 get_indicators）
+    """
+    # 浮点列和信号列各包装成一个块（逐列 astype 比整个计算还慢）
+    float_idx = [i for i, col in enumerate(columns) if col not in _SIGNAL_COLUMNS]
+    signal_idx = [i for i, col in enumerate(columns) if col in _SIGNAL_COLUMNS]
+    parts = [
+        pd.DataFrame(values[float_idx].T, index=df.index, columns=[columns[i] for i in float_idx], copy=False),
+        pd.DataFrame(values[signal_idx].T.astype(np.int64), index=df.index, columns=[columns[i] for i in signal_idx]),
+    ]
+    if compute_all:
+        base_cols = [col for col in df.columns if col not in _ALL_COLUMN_SET]
+    else:
+        base_cols = [col for col in BASE_COLUMNS if col in df.columns]
+    result = pd.concat([df[base_cols]] + parts, axis=1)
+    if float_idx != list(range(len(float_idx))):
+        # 请求顺序中信号列夹在浮点列之间时恢复请求顺序
+        result = result[base_cols + list(columns)]
+    return result
+
+
+# ==================== 计算服务 ====================
+
+class ComputeService:
+    """
+    指标与形态计算服务（ProcessPoolExecutor + 共享内存）
+
+    Examples:
+        >>> service = ComputeService(workers=4)
+        >>> df = service.compute_indicators(df_clean, ['rsi'])          # 与 IndicatorEngine 结果相同
+        >>> frames = service.compute_indicators_batch(ohlcv, tail=1)   # 每只股票最新一行的全部指标
+        >>> service.shutdown()
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        warm: bool = True,
+        start_method: Optional[str] = "spawn",
+        chunk_size: Optional[int] = None,
+    ):
+        """
+        初始化计算服务
+
+        Args:
+            workers: 工作进程数；None 为 CPU 核数，0 表示在当前进程计算
+            warm: 创建时启动全部工作进程并预热
+            start_method: 进程启动方式（spawn / forkserver / fork，None 为平台默认）；
+                默认 spawn，调用方有其他线程（数据源线程池、日志）时 fork 不安全
+            chunk_size: 每个任务的股票数（None 时按股票数和进程数自动选择）
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else max(int(workers), 0)
+        self.chunk_size = chunk_size
+        self._start_method = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        if warm and self.workers:
+            self.warm()
+
+    # ---------- 进程池管理 ----------
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context(self._start_method)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=context, initializer=_init_worker
+                )
+                logger.debug("计算进程池已创建: %d 个工作进程 (%s)", self.workers, context.get_start_method())
+            return self._executor
+
+    def warm(self):
+        """启动全部工作进程并等待其完成初始化"""
+        if not self.workers:
+            return
+        executor = self._get_executor()
+        pids = {future.result() for future in [executor.submit(_ping) for _ in range(self.workers)]}
+        logger.debug("计算进程池已预热: %d 个进程就绪", len(pids))
+
+    def shutdown(self, wait: bool = True):
+        """关闭进程池（之后再次调用计算方法会重新创建）"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self) -> "ComputeService":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def _chunks(self, symbols: List[str]) -> List[List[str]]:
+        """按股票数和进程数分组：每个进程约 COMPUTE_POOL_TASKS_PER_WORKER 个任务，便于负载均衡"""
+        size = self.chunk_size or min(
+            COMPUTE_POOL_MAX_CHUNK_SYMBOLS,
+            math.ceil(len(symbols) / (self.workers * COMPUTE_POOL_TASKS_PER_WORKER)),
+        )
+        size = max(size, 1)
+        return [symbols[i:i + size] for i in range(0, len(symbols), size)]
+
+    def _map(
+        self,
+        ohlcv: Dict[str, pd.DataFrame],
+        submit: Callable[[ProcessPoolExecutor, List[pd.DataFrame]], Tuple[Future, Callable[[Any], List[Any]], List[_SharedArray]]],
+    ) -> Dict[str, Any]:
+        """
+        分组提交任务并按输入顺序返回结果（同时在途的任务数有上限，共享内存占用与股票总数无关）
+
+        Args:
+            submit: (进程池, 一组股票的 DataFrame) -> (future, 结果转换函数, 任务占用的共享内存)
+        """
+        executor = self._get_executor()
+        max_in_flight = self.workers * 2
+        results: Dict[str, Any] = {}
+        pending: Dict[Future, Tuple[List[str], Callable[[Any], List[Any]], List[_SharedArray]]] = {}
+
+        def collect(futures):
+            for future in futures:
+                chunk, finish, buffers = pending.pop(future)
+                try:
+                    results.update(zip(chunk, finish(future.result())))
+                finally:
+                    for buffer in buffers:
+                        buffer.release()
+
+        try:
+            for chunk in self._chunks(list(ohlcv)):
+                if len(pending) >= max_in_flight:
+                    collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                future, finish, buffers = submit(executor, [ohlcv[symbol] for symbol in chunk])
+                pending[future] = (chunk, finish, buffers)
+            while pending:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+        except BrokenProcessPool:
+            logger.warning("计算进程池异常退出，下次调用时重新创建")
+            self.shutdown(wait=False)
+            raise
+        finally:
+            for future in pending:
+                future.cancel()
+            # 已提交的任务可能仍在读写共享内存：等待结束后再释放
+            wait(pending)
+            for _, _, buffers in pending.values():
+                for buffer in buffers:
+                    buffer.release()
+        return {symbol: results[symbol] for symbol in ohlcv}
+
+    # ---------- 指标 ----------
+
+    def compute_indicators(
+        self, df: pd.DataFrame, columns: Optional[List[str]] = None, tail: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        计算一只股票的指标
+
+        Args:
+            df: OHLCV 数据（列名小写）
+            columns: 指标列，None 表示全部（同 compute_all），否则同 get_indicators(columns)
+            tail: 只返回最后 tail 行（None 表示全部）
+
+        Returns:
+            与 IndicatorEngine 输出相同的 DataFrame
+        """
+        return self.compute_indicators_batch({"": df}, columns, tail)[""]
+
+    def compute_indicators_batch(
+        self,
+        ohlcv: Dict[str, pd.DataFrame],
+        columns: Optional[List[str]] = None,
+        tail: Optional[int] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        批量计算多只股票的指标
+
+        Args:
+            ohlcv: {股票代码: OHLCV DataFrame}
+            columns: 指标列，None 表示全部
+            tail: 只返回每只股票最后 tail 行（横截面筛选用 tail=1，只回传需要的行）
+
+        Returns:
+            {股票代码: DataFrame}，每只股票的结果与 IndicatorEngine 逐位一致
+        """
+        if not ohlcv:
+            return {}
+        compute_all = columns is None
+        output_columns = _ALL_COLUMNS if compute_all else list(dict.fromkeys(columns))
+        IndicatorEngine.plan(output_columns)  # 在父进程校验列名
+
+        if not self.workers:
+            if len(ohlcv) == 1:
+                (symbol, df), = ohlcv.items()
+                engine = IndicatorEngine(df)
+                results = {symbol: engine.compute_all() if compute_all else engine.get_indicators(output_columns)}
+            else:
+                panel = PanelIndicatorEngine(ohlcv)
+                results = panel.compute_all() if compute_all else panel.get_indicators(output_columns)
+            if tail is not None:
+                results = {symbol: df.iloc[max(len(df) - tail, 0):] for symbol, df in results.items()}
+            return results
+
+        def submit(executor, frames):
+            bar_columns = _bar_columns(frames)
+            lengths = [len(df) for df in frames]
+            rows = max(lengths) if tail is None else min(tail, max(lengths))
+            bars = _pack_bars(frames, bar_columns)
+            try:
+                out = _SharedArray((len(frames), len(output_columns), rows))
+            except Exception:
+                bars.release()
+                raise
+
+            def finish(_):
+                values = out.array.copy()
+                frames_out = []
+                for j, (df, n) in enumerate(zip(frames, lengths)):
+                    m = min(n, rows)
+                    frames_out.append(_indicator_frame(df.iloc[n - m:], values[j, :, :m], output_columns, compute_all))
+                return frames_out
+
+            future = executor.submit(_indicator_task, bars.spec, bar_columns, lengths, output_columns, out.spec)
+            return future, finish, [bars, out]
+
+        return self._map(ohlcv, submit)
+
+    # ---------- 形态 ----------
+
+    def candlestick_patterns(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """识别一只股票的蜡烛图形态（同 CandlestickPatternRecognizer.identify_patterns）"""
+        return self.candlestick_patterns_batch({"": df})[""]
+
+    def candlestick_patterns_batch(self, ohlcv: Dict[str, pd.DataFrame], decode: bool = True) -> Dict[str, Any]:
+        """
+        批量识别蜡烛图形态
+
+        Args:
+            ohlcv: {股票代码: OHLCV DataFrame}
+            decode: True 返回 {股票代码: 形态列表}；False 返回 {股票代码: (形态位集合, 成交量确认)}
+                （同 CandlestickPatternRecognizer.detect，批量筛选时不必解码）
+        """
+        if not self.workers:
+            detected = {symbol: CandlestickPatternRecognizer.detect(df) for symbol, df in ohlcv.items()}
+        else:
+            def submit(executor, frames):
+                bar_columns = _bar_columns(frames)
+                bars = _pack_bars(frames, bar_columns)
+                future = executor.submit(_candlestick_task, bars.spec, bar_columns, [len(df) for df in frames])
+                return future, list, [bars]
+
+            detected = self._map(ohlcv, submit)
+
+        if not decode:
+            return detected
+        return {
+            symbol: CandlestickPatternRecognizer.to_records(ohlcv[symbol], bits, volume_confirmed)
+            for symbol, (bits, volume_confirmed) in detected.items()
+        }
+
+    def chart_patterns(self, df: pd.DataFrame, lookback: int = 60) -> Dict[str, Any]:
+        """识别一只股票的图表形态（同 ChartPatterns.identify_all_patterns）"""
+        return self.chart_patterns_batch({"": df}, lookback)[""]
+
+    def chart_patterns_batch(self, ohlcv: Dict[str, pd.DataFrame], lookback: int = 60) -> Dict[str, Dict[str, Any]]:
+        """批量识别图表形态，返回 {股票代码: identify_all_patterns 结果}（只传输最后 lookback 行）"""
+        if not self.workers:
+            return {symbol: ChartPatterns.identify_all_patterns(df, lookback) for symbol, df in ohlcv.items()}
+
+        def submit(executor, frames):
+            bar_columns = _bar_columns(frames)
+            bars = _pack_bars(frames, bar_columns, rows=lookback)
+            lengths = [min(len(df), lookback) for df in frames]
+            future = executor.submit(_chart_task, bars.spec, bar_columns, lengths, lookback)
+            return future, list, [bars]
+
+        return self._map(ohlcv, submit)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+大参数摘要
+把大字符串 / bytes / DataFrame 参数替换为紧凑摘要，
+供缓存键、在途请求 key、工具调用日志和调试输出共用，避免每次调用
+都对几百 KB 的 stock_data CSV 做 json.dumps + SHA-256。
+
+同一个字符串/bytes 对象（例如一次分析中传给多个指标工具的同一份 stock_data）
+只会被哈希一次：摘要按对象 id 记忆，记忆表持有对象引用，保证 id 不会被复用。
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+import pandas as pd
+
+from tradingagents.constants import ARG_DIGEST_MIN_BYTES, ARG_DIGEST_MEMO_SIZE
+
+_memo: "OrderedDict[int, Tuple[Any, str]]" = OrderedDict()
+_memo_lock = threading.Lock()
+_stats = {"hashed": 0, "memo_hits": 0, "hashed_bytes": 0}
+
+
+def _hash_value(value: Any) -> Tuple[str, int]:
+    """计算大参数的摘要，返回 (摘要字符串, 原始字节数)"""
+    if isinstance(value, pd.DataFrame):
+        hashed = pd.util.hash_pandas_object(value, index=True).values
+        raw = hashed.tobytes() + ",".join(map(str, value.columns)).encode()
+        kind, size = "df", int(value.memory_usage(deep=False).sum())
+    elif isinstance(value, str):
+        raw = value.encode()
+        kind, size = "str", len(raw)
+    else:
+        raw = bytes(value)
+        kind, size = "bytes", len(raw)
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    return f"<{kind}:{digest}:{size}>", size
+
+
+def _is_large(value: Any) -> bool:
+    if isinstance(value, pd.DataFrame):
+        return True
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value) >= ARG_DIGEST_MIN_BYTES
+    return False
+
+
+def digest_value(value: Any) -> Any:
+    """
+    大参数返回摘要字符串，其余原样返回
+
+    Args:
+        value: 任意参数
+
+    Returns:
+        摘要字符串（形如 "<str:9f2c...:183422>"）或原值
+    """
+    if not _is_large(value):
+        return value
+
+    # DataFrame / bytearray 可能被原地修改，不做记忆
+    if isinstance(value, (pd.DataFrame, bytearray)):
+        digest, size = _hash_value(value)
+        with _memo_lock:
+            _stats["hashed"] += 1
+            _stats["hashed_bytes"] += size
+        return digest
+
+    key = id(value)
+    with _memo_lock:
+        memo = _memo.get(key)
+        if memo is not None and memo[0] is value:
+            _memo.move_to_end(key)
+            _stats["memo_hits"] += 1
+            return memo[1]
+
+    digest, size = _hash_value(value)
+
+    with _memo_lock:
+        _memo[key] = (value, digest)
+        _memo.move_to_end(key)
+        while len(_memo) > ARG_DIGEST_MEMO_SIZE:
+            _memo.popitem(last=False)
+        _stats["hashed"] += 1
+        _stats["hashed_bytes"] += size
+    return digest
+
+
+def digest_args(args: tuple, kwargs: Dict[str, Any]) -> Tuple[tuple, Dict[str, Any]]:
+    """
+    把位置参数和关键字参数中的大参数替换为摘要
+
+    Args:
+        args: 位置参数
+        kwargs: 关键字参数
+
+    Returns:
+        (摘要后的位置参数, 摘要后的关键字参数)
+    """
+    return (
+        tuple(digest_value(a) for a in args),
+        {k: digest_value(v) for k, v in kwargs.items()},
+    )
+
+
+def get_digest_stats() -> Dict[str, int]:
+    """获取摘要统计（实际哈希次数、记忆命中次数、哈希字节数）"""
+    with _memo_lock:
+        stats = dict(_stats)
+        stats["memo_size"] = len(_memo)
+    return stats
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+熔断器
+数据源连续失败达到阈值后进入 open 状态，冷却期内直接跳过该数据源
+（降级到优先级列表中的下一个），冷却结束后进入 half-open 放行一次探测请求：
+探测成功则恢复 closed，失败则重新 open。
+"""
+
+import threading
+import time
+from enum import Enum
+from typing import Any, Dict
+
+from tradingagents.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitState(Enum):
+    """熔断器状态"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """线程安全的熔断器
+
+    用法:
+        breaker = CircuitBreaker("alpha_vantage", failure_threshold=3, recovery_seconds=60)
+        if breaker.allow_request():
+            ok = call()
+            breaker.record_success() if ok else breaker.record_failure()
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        recovery_seconds: float = 60.0,
+        half_open_max_calls: int = 1,
+    ):
+        """
+        Args:
+            name: 数据源名称（日志用）
+            failure_threshold: 连续失败多少次后熔断
+            recovery_seconds: 熔断后多久进入 half-open 探测
+            half_open_max_calls: half-open 状态下同时放行的探测请求数
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_seconds = recovery_seconds
+        self.half_open_max_calls = max(1, half_open_max_calls)
+
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._stats = {"opened": 0, "rejected": 0}
+
+    @property
+    def state(self) -> CircuitState:
+        """当前状态（open 且冷却结束时视为 half-open）"""
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> CircuitState:
+        """调用方持有锁"""
+        if self._state is CircuitState.OPEN and now - self._opened_at >= self.recovery_seconds:
+            self._state = CircuitState.HALF_OPEN
+            self._probes_in_flight = 0
+            logger.debug("数据源 %s 熔断冷却结束，进入 half-open", self.name)
+        return self._state
+
+    def allow_request(self) -> bool:
+        """是否放行本次请求（half-open 时只放行有限的探测请求）"""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state is CircuitState.CLOSED:
+                return True
+            if state is CircuitState.HALF_OPEN and self._probes_in_flight < self.half_open_max_calls:
+                self._probes_in_flight += 1
+                return True
+            self._stats["rejected"] += 1
+            return False
+
+    def _open(self, now: float) -> None:
+        """调用方持有锁"""
+        self._state = CircuitState.OPEN
+        self._opened_at = now
+        self._probes_in_flight = 0
+        self._stats["opened"] += 1
+        logger.warning(
+            "数据源 %s 连续失败 %d 次，熔断 %.0f 秒",
+            self.name, self._consecutive_failures, self.recovery_seconds,
+        )
+
+    def record_success(self) -> None:
+        """请求成功：half-open 时恢复 closed，并清零连续失败计数"""
+        with self._lock:
+            if self._state is not CircuitState.CLOSED:
+                logger.info("数据源 %s 探测成功，熔断恢复", self.name)
+            self._state = CircuitState.CLOSED
+            self._consecutive_failures = 0
+            self._probes_in_flight = 0
+
+    def record_failure(self) -> None:
+        """请求失败：half-open 时立即重新熔断，closed 时累计到阈值后熔断"""
+        with self._lock:
+            now = time.monotonic()
+            self._consecutive_failures += 1
+            state = self._current_state(now)
+            if state is CircuitState.HALF_OPEN:
+                self._open(now)
+            elif state is CircuitState.CLOSED and self._consecutive_failures >= self.failure_threshold:
+                self._open(now)
+
+    def record_skipped(self) -> None:
+        """放行后未真正发出请求（例如限速等待过久），归还 half-open 探测名额"""
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN and self._probes_in_flight > 0:
+                self._probes_in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取熔断统计"""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            stats = dict(self._stats)
+            stats["state"] = state.value
+            stats["consecutive_failures"] = self._consecutive_failures
+            stats["retry_in"] = (
+                round(max(0.0, self.recovery_seconds - (now - self._opened_at)), 1)
+                if state is CircuitState.OPEN else 0.0
+            )
+        return stats
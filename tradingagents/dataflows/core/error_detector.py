@@ -69,6 +69,69 @@ class ErrorDetector:
         
         return False
     
+    @staticmethod
+    def is_timeout_or_transport_error(error: Exception) -> bool:
+        """
+        判断是否是传输层错误（连接失败、超时等，按异常类型判断）
+
+        Args:
+            error: 异常对象
+
+        Returns:
+            是否是传输层错误
+        """
+        if isinstance(error, (ConnectionError, TimeoutError)):
+            return True
+        # requests / httpx / urllib3 的连接、超时和传输异常
+        error_class_name = error.__class__.__name__
+        return any(
+            name in error_class_name
+            for name in ("Timeout", "Connection", "Transport", "Network", "Protocol")
+        )
+
+    @staticmethod
+    def is_server_error(error: Exception) -> bool:
+        """
+        判断是否是服务端 5xx 错误
+
+        Args:
+            error: 异常对象
+
+        Returns:
+            是否是服务端错误
+        """
+        for source in (error, getattr(error, "response", None)):
+            status = getattr(source, "status_code", None) or getattr(source, "status", None)
+            if isinstance(status, int) and 500 <= status < 600:
+                return True
+
+        error_str = str(error).lower()
+        server_keywords = [
+            "internal server error", "bad gateway", "service unavailable",
+            "gateway timeout", "server error",
+        ]
+        return any(keyword in error_str for keyword in server_keywords)
+
+    @staticmethod
+    def is_transient_error(error: Exception) -> bool:
+        """
+        判断是否是数据源本身暂时不可用的错误（传输、超时、5xx、限流）
+
+        参数校验、数据解析等由输入引起的错误不属于此类，不应计入熔断
+
+        Args:
+            error: 异常对象
+
+        Returns:
+            是否是暂时性错误
+        """
+        return (
+            ErrorDetector.is_rate_limit_error(error)
+            or ErrorDetector.is_timeout_or_transport_error(error)
+            or ErrorDetector.is_server_error(error)
+            or ErrorDetector.is_network_error(error)
+        )
+
     @staticmethod
     def classify_error(error: Exception) -> str:
         """
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+延迟直方图
+按 (数据源, 方法) 记录成功调用的耗时，提供 p50 / p95 等分位数，
+用于对冲请求（hedged request）决定何时启动下一个数据源。
+
+使用对数分桶（每档 ×1.25，1ms ~ 约 4.5 分钟），内存固定，不保存原始样本。
+"""
+
+import bisect
+import math
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+_BUCKET_GROWTH = 1.25
+_BUCKET_MIN_SECONDS = 0.001
+_BUCKET_COUNT = 57
+
+# 每个桶的上界（秒），最后一个桶收纳所有更大的值
+BUCKET_BOUNDS: List[float] = [
+    _BUCKET_MIN_SECONDS * _BUCKET_GROWTH ** i for i in range(_BUCKET_COUNT)
+]
+
+
+class LatencyHistogram:
+    """单个 (数据源, 方法) 的延迟直方图（调用方负责加锁）"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.total = 0
+        self.sum_seconds = 0.0
+
+    def record(self, seconds: float) -> None:
+        """记录一次耗时"""
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.total += 1
+        self.sum_seconds += seconds
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        估算分位数（返回所在桶的上界，偏保守）
+
+        Args:
+            p: 分位（0~1），如 0.95
+
+        Returns:
+            秒数；没有样本时返回 None
+        """
+        if self.total == 0:
+            return None
+        target = max(1, math.ceil(p * self.total))
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return BUCKET_BOUNDS[min(i, len(BUCKET_BOUNDS) - 1)]
+        return BUCKET_BOUNDS[-1]
+
+
+class LatencyTracker:
+    """按 (数据源, 方法) 维护延迟直方图（线程安全）
+
+    用法:
+        tracker = LatencyTracker()
+        tracker.record("longbridge", "get_stock_data", 0.42)
+        p95 = tracker.percentile("longbridge", "get_stock_data", 0.95, min_samples=10)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+
+    def record(self, vendor: str, method_name: str, seconds: float) -> None:
+        """记录一次成功调用的耗时"""
+        key = (vendor, method_name)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = LatencyHistogram()
+                self._histograms[key] = histogram
+            histogram.record(seconds)
+
+    def percentile(
+        self, vendor: str, method_name: str, p: float, min_samples: int = 1
+    ) -> Optional[float]:
+        """
+        获取分位数
+
+        Args:
+            vendor: 数据源名称
+            method_name: 方法名称
+            p: 分位（0~1）
+            min_samples: 样本数不足时返回 None
+
+        Returns:
+            秒数或 None
+        """
+        with self._lock:
+            histogram = self._histograms.get((vendor, method_name))
+            if histogram is None or histogram.total < min_samples:
+                return None
+            return histogram.percentile(p)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """获取各数据源、各方法的样本数与 p50 / p95（秒）"""
+        stats: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for (vendor, method_name), histogram in self._histograms.items():
+                stats.setdefault(vendor, {})[method_name] = {
+                    "count": histogram.total,
+                    "mean": round(histogram.sum_seconds / histogram.total, 4),
+                    "p50": round(histogram.percentile(0.5), 4),
+                    "p95": round(histogram.percentile(0.95), 4),
+                }
+        return stats
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+在途请求合并（single-flight）
+同一个 key 的并发请求只执行一次，其余调用方等待同一个 Future。
+同步（线程）与异步（asyncio）入口共享同一张在途表。
+
+取消只影响被取消的调用方自己：
+- 等待者被取消时不会取消共享的 Future，首个调用方和其他等待者照常拿到结果
+- 首个调用方被取消（或因 KeyboardInterrupt 等非 Exception 中断）时，
+  等待者收到 DataFetchError，可以像普通数据错误一样处理或重试
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from tradingagents.utils.logger import get_logger
+
+from ..vendor_models import DataFetchError
+
+logger = get_logger(__name__)
+
+
+class SingleFlight:
+    """在途请求合并器（线程安全）
+
+    用法:
+        flight = SingleFlight()
+        result, shared = flight.do(key, lambda: expensive_call())
+        result, shared = await flight.do_async(key, lambda: expensive_coro())
+
+    shared 为 True 表示本次调用复用了其他调用方的在途结果。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+
+    def _claim(self, key: str) -> Tuple[Future, bool]:
+        """登记 key：返回 (future, 是否为首个调用方)"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            # 标记为运行中：之后 future.cancel() 不再生效，等待者的取消不会波及共享结果
+            future.set_running_or_notify_cancel()
+            self._calls[key] = future
+            return future, True
+
+    def _forget(self, key: str, future: Future) -> None:
+        """请求完成后移出在途表（只移除自己登记的 Future）"""
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    @staticmethod
+    def _fail(key: str, future: Future, error: BaseException) -> None:
+        """把首个调用方的异常传给等待者；取消等非 Exception 中断改为 DataFetchError"""
+        if not isinstance(error, Exception):
+            logger.debug("在途请求被中断: %s (%s)", key[:16], type(error).__name__)
+            error = DataFetchError(f"shared in-flight request was interrupted: {type(error).__name__}")
+        future.set_exception(error)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        执行或等待 key 对应的调用
+
+        Args:
+            key: 请求 key（相同 key 的在途调用会被合并）
+            fn: 实际执行的函数，只有首个调用方会执行
+
+        Returns:
+            (结果, 是否为合并结果)
+
+        Raises:
+            首个调用方抛出的异常会传递给所有等待者（被中断时为 DataFetchError）
+        """
+        future, leader = self._claim(key)
+        if not leader:
+            logger.debug("合并在途请求: %s", key[:16])
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._fail(key, future, e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._forget(key, future)
+
+    async def do_async(
+        self, key: str, coro_fn: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        do() 的异步版本，与同步调用方共享在途表
+
+        Args:
+            key: 请求 key
+            coro_fn: 返回 awaitable 的函数，只有首个调用方会执行
+
+        Returns:
+            (结果, 是否为合并结果)
+        """
+        future, leader = self._claim(key)
+        if not leader:
+            logger.debug("合并在途请求(async): %s", key[:16])
+            # shield: 本等待者被取消时只结束自己的等待，不取消共享的 Future
+            return await asyncio.shield(asyncio.wrap_future(future)), True
+
+        try:
+            result = await coro_fn()
+        except BaseException as e:
+            self._fail(key, future, e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            self._forget(key, future)
+
+    def in_flight(self) -> int:
+        """当前在途请求数"""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+令牌桶限速
+在请求发出前按数据源配额主动排队（例如 Alpha Vantage 每分钟 5 次），
+而不是等收到 429 之后再 sleep 重试。所有线程共享同一个桶。
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from tradingagents.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """线程安全的令牌桶
+
+    令牌以 rate_per_minute / 60 的速度补充，最多积累 capacity 个。
+    acquire() 先在锁内预约令牌（令牌数可以为负，表示排队），再在锁外 sleep，
+    因此并发调用方按到达顺序依次获得间隔均匀的发送时间。
+
+    用法:
+        bucket = TokenBucket(rate_per_minute=5)
+        waited = bucket.acquire(max_wait=30)
+        if waited is None:
+            ...  # 需要等待太久，改用其他数据源
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate_per_minute: 每分钟补充的令牌数（> 0）
+            capacity: 桶容量（允许的突发请求数），默认 1
+        """
+        if rate_per_minute <= 0:
+            raise ValueError(f"rate_per_minute must be > 0, got {rate_per_minute}")
+        self.rate_per_minute = rate_per_minute
+        self.capacity = float(capacity or 1)
+        self._rate = rate_per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._stats = {"acquired": 0, "rejected": 0, "total_wait": 0.0, "deferrals": 0}
+
+    def _refill(self, now: float) -> None:
+        """按经过的时间补充令牌（调用方持有锁）"""
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self._rate)
+            self._updated = now
+
+    def _reserve(self, max_wait: Optional[float], amount: float = 1) -> Optional[float]:
+        """在锁内预约 amount 个令牌，返回需要等待的秒数；超过 max_wait 时不预约、返回 None"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = 0.0 if self._tokens >= amount else (amount - self._tokens) / self._rate
+            if max_wait is not None and wait > max_wait:
+                self._stats["rejected"] += 1
+                return None
+            self._tokens -= amount
+            self._stats["acquired"] += 1
+            self._stats["total_wait"] += wait
+        return wait
+
+    def acquire(self, max_wait: Optional[float] = None, amount: float = 1) -> Optional[float]:
+        """
+        获取令牌，必要时阻塞等待
+
+        Args:
+            max_wait: 最长等待秒数，需要等待更久时不预约、直接返回 None
+            amount: 令牌数（如按 token 数计量的配额），默认 1
+
+        Returns:
+            实际等待的秒数；超过 max_wait 时返回 None
+        """
+        wait = self._reserve(max_wait, amount)
+        if wait:
+            logger.debug("令牌桶限速，等待 %.2f 秒", wait)
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, max_wait: Optional[float] = None, amount: float = 1) -> Optional[float]:
+        """acquire() 的异步版本：等待期间让出事件循环，与同步调用方共享同一个桶"""
+        wait = self._reserve(max_wait, amount)
+        if wait:
+            logger.debug("令牌桶限速，等待 %.2f 秒", wait)
+            await asyncio.sleep(wait)
+        return wait
+
+    def charge(self, amount: float) -> None:
+        """
+        事后修正用量：amount > 0 补扣（不等待，后续请求顺延），amount < 0 退还（不超过容量）
+
+        用于预约时只能估计用量的场景（如 LLM 的 token 数在响应后才知道）。
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+    def defer(self, seconds: float) -> None:
+        """
+        收到限流响应后整体推迟：清空令牌并让后续请求至少再等 seconds 秒
+
+        与单个线程 sleep 不同，所有共享该桶的调用方都会一起退避。
+        """
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0) - seconds * self._rate
+            self._stats["deferrals"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取限速统计"""
+        with self._lock:
+            self._refill(time.monotonic())
+            stats = dict(self._stats)
+            stats["rate_per_minute"] = self.rate_per_minute
+            stats["capacity"] = self.capacity
+            stats["tokens"] = round(self._tokens, 3)
+        return stats
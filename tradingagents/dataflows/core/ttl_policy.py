@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+缓存有效期策略
+按方法类别和数据时效（结合交易日历）决定每条缓存的 TTL，
+替代对所有数据统一使用 CACHE_TTL_HOURS：
+
+- 行情类（K线 / 指标 / 形态）：所属交易日已收盘 -> 永久；盘中 -> 几分钟；
+  盘前 -> 到开盘为止
+- 新闻类：窗口已完全过去 -> 永久；包含今天 -> 十几分钟
+- 财报类：历史日期 -> 永久；当前数据 -> 到下一次收盘（新财报通常在盘前/盘后发布）
+- 其他方法：返回 None，使用 DataCache 的默认 TTL
+"""
+
+import math
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
+
+from tradingagents.constants import (
+    CACHE_SESSION_SETTLE_SECONDS,
+    CACHE_TTL_INTRADAY_SECONDS,
+    CACHE_TTL_NEWS_SECONDS,
+)
+from tradingagents.dataflows.trading_calendar import get_calendar_for_symbol, to_date
+
+# 永久缓存（直到 clear 或被内存 LRU 淘汰；磁盘层保留）
+TTL_FOREVER = math.inf
+
+MARKET_DATA_METHODS = frozenset({
+    "get_stock_data",
+    "get_indicators",
+    "get_all_indicators",
+    "get_candlestick_patterns",
+    "get_chart_patterns",
+})
+FUNDAMENTAL_METHODS = frozenset({
+    "get_fundamentals",
+    "get_balance_sheet",
+    "get_cashflow",
+    "get_income_statement",
+})
+NEWS_METHODS = frozenset({
+    "get_news",
+    "get_global_news",
+    "get_insider_transactions",
+})
+
+
+class CacheTTLPolicy:
+    """按方法和数据时效计算缓存 TTL
+
+    用法:
+        policy = CacheTTLPolicy()
+        ttl = policy.ttl_seconds("get_stock_data", ("NVDA", "2025-01-01", "2025-06-30"), {})
+        # ttl 为 None 表示使用默认 TTL，0 表示不缓存，math.inf 表示永久
+    """
+
+    def __init__(
+        self,
+        intraday_seconds: float = CACHE_TTL_INTRADAY_SECONDS,
+        news_seconds: float = CACHE_TTL_NEWS_SECONDS,
+        settle_seconds: float = CACHE_SESSION_SETTLE_SECONDS,
+    ):
+        """
+        Args:
+            intraday_seconds: 盘中行情数据的 TTL
+            news_seconds: 包含今天的新闻数据的 TTL
+            settle_seconds: 收盘后多久视为K线定稿（数据源可能在收盘后修正最后一根K线）
+        """
+        self.intraday_seconds = intraday_seconds
+        self.news_seconds = news_seconds
+        self.settle = timedelta(seconds=settle_seconds)
+
+    @staticmethod
+    def _as_of(args: tuple, kwargs: Dict[str, Any]) -> Optional[date]:
+        """参数中最晚的日期即数据截止日（各方法的日期参数位置不同）"""
+        dates = [
+            to_date(v) for v in list(args) + list(kwargs.values())
+            if isinstance(v, str) and len(v) <= 32
+        ]
+        dates = [d for d in dates if d is not None]
+        return max(dates) if dates else None
+
+    @staticmethod
+    def _symbol(args: tuple) -> Optional[str]:
+        """第一个参数为股票代码（get_global_news 等没有代码时按美股处理）"""
+        if args and isinstance(args[0], str) and to_date(args[0]) is None:
+            return args[0]
+        return None
+
+    def ttl_seconds(
+        self,
+        method_name: str,
+        args: tuple,
+        kwargs: Dict[str, Any],
+        now: Optional[datetime] = None,
+    ) -> Optional[float]:
+        """
+        计算缓存 TTL
+
+        Args:
+            method_name: 方法名称
+            args: 位置参数（规范化后）
+            kwargs: 关键字参数
+            now: 当前时间（带时区，测试用），默认为交易所当地时间
+
+        Returns:
+            TTL 秒数；None 表示使用默认 TTL，math.inf 表示永久
+        """
+        if method_name not in MARKET_DATA_METHODS | FUNDAMENTAL_METHODS | NEWS_METHODS:
+            return None
+
+        calendar = get_calendar_for_symbol(self._symbol(args))
+        now = (now or calendar.now()).astimezone(calendar.tz)
+        as_of = self._as_of(args, kwargs)
+        today = now.date()
+
+        if method_name in MARKET_DATA_METHODS:
+            session = calendar.previous_session(min(as_of or today, today))
+            if now >= calendar.session_close(session) + self.settle:
+                return TTL_FOREVER
+            session_open = calendar.session_open(session)
+            if now < session_open:
+                # 盘前：今天的K线还不存在，结果到开盘前都不会变
+                return max((session_open - now).total_seconds(), self.intraday_seconds)
+            return self.intraday_seconds
+
+        if method_name in NEWS_METHODS:
+            if as_of is not None and as_of < today:
+                return TTL_FOREVER
+            return self.news_seconds
+
+        # 财报类
+        if as_of is not None and as_of < calendar.last_closed_session(now):
+            return TTL_FOREVER
+        return max((calendar.next_close(now) - now).total_seconds(), self.intraday_seconds)
+
+
+_default_policy = CacheTTLPolicy()
+
+
+def get_ttl_policy() -> CacheTTLPolicy:
+    """获取默认的缓存 TTL 策略"""
+    return _default_policy
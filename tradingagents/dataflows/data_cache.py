@@ -2,53 +2,168 @@
 """
 数据缓存模块
 避免重复API调用，提高性能
+
+两级缓存:
+- 内存层：按字节数限制的 LRU，条目带过期时间
+- 磁盘层：单个 SQLite 文件（WAL 模式），按 func_name / expires_at 建索引
+
+按函数失效通过"代数"(generation) 实现：clear(func_name) 只把该函数的代数加一，
+旧代数的条目视为失效，由后台清理线程批量删除，因此是 O(1)。
+
+每条数据可以单独指定有效期（见 core/ttl_policy.py）：已收盘交易日的行情永久保存，
+盘中数据几分钟过期；未指定时使用 ttl_hours。
 """
 
+import asyncio
 import json
 import hashlib
-from datetime import datetime, timedelta
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
 from typing import Any, Optional, Dict
 from pathlib import Path
 import os
 
+from tradingagents.constants import (
+    CACHE_MEMORY_MAX_BYTES,
+    CACHE_SWEEP_INTERVAL_SECONDS,
+    CACHE_COMPRESS_MIN_BYTES,
+)
+from tradingagents.dataflows.core.arg_digest import digest_args
 from tradingagents.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 磁盘层数据编码
+_CODEC_JSON = 0
+_CODEC_ZLIB_JSON = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    func_name TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    codec INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache_entries(expires_at);
+CREATE INDEX IF NOT EXISTS idx_cache_func ON cache_entries(func_name, generation);
+CREATE TABLE IF NOT EXISTS func_generations (
+    func_name TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL
+);
+"""
+
+
+@dataclass
+class _MemoryEntry:
+    """内存层缓存条目"""
+    data: Any
+    func_name: str
+    generation: int
+    size_bytes: int
+    expires_at: float
+
 
 class DataCache:
-    """数据缓存类"""
-    
-    def __init__(self, cache_dir: Optional[str] = None, ttl_hours: int = 24):
+    """数据缓存类（线程安全）"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        ttl_hours: int = 24,
+        max_memory_bytes: int = CACHE_MEMORY_MAX_BYTES,
+        sweep_interval_seconds: float = CACHE_SWEEP_INTERVAL_SECONDS,
+    ):
         """
         初始化缓存
-        
+
         Args:
             cache_dir: 缓存目录
             ttl_hours: 缓存有效期（小时）
+            max_memory_bytes: 内存层最大字节数（按序列化后大小计算）
+            sweep_interval_seconds: 后台清理间隔（秒），<= 0 时不启动清理线程
         """
         if cache_dir is None:
             cache_dir = os.path.join(
                 os.path.dirname(os.path.abspath(__file__)),
                 "data_cache"
             )
-        
+
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "cache.db"
         self.ttl = timedelta(hours=ttl_hours)
-        
-        # 内存缓存
-        self.memory_cache: Dict[str, Dict[str, Any]] = {}
-    
+        self.max_memory_bytes = max_memory_bytes
+
+        # 内存缓存（LRU：最近使用的在末尾）
+        self._memory: "OrderedDict[str, _MemoryEntry]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+            "expired": 0,
+            "swept": 0,
+        }
+
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._generations: Dict[str, int] = dict(
+            self._conn.execute("SELECT func_name, generation FROM func_generations").fetchall()
+        )
+
+        # 后台清理线程
+        self._stop_event = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        if sweep_interval_seconds and sweep_interval_seconds > 0:
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop,
+                args=(sweep_interval_seconds,),
+                name="DataCacheSweeper",
+                daemon=True,
+            )
+            self._sweeper.start()
+
     def _get_cache_key(self, func_name: str, *args, **kwargs) -> str:
         """
-        生成缓存键
-        
+        生成缓存键（大参数先替换为摘要，见 core.arg_digest）
+
         Args:
             func_name: 函数名
             *args: 位置参数
             **kwargs: 关键字参数
-            
+
+        Returns:
+            缓存键字符串
+        """
+        args, kwargs = digest_args(args, kwargs)
+        return self.make_key(func_name, args, kwargs)
+
+    @staticmethod
+    def make_key(func_name: str, args: tuple, kwargs: Dict[str, Any]) -> str:
+        """
+        由已摘要的参数生成缓存键
+
+        Args:
+            func_name: 函数名
+            args: 位置参数（大参数已替换为摘要）
+            kwargs: 关键字参数（大参数已替换为摘要）
+
         Returns:
             缓存键字符串
         """
@@ -57,154 +172,355 @@ class DataCache:
             "args": args,
             "kwargs": sorted(kwargs.items())
         }
-        key_str = json.dumps(key_data, sort_keys=True)
+        key_str = json.dumps(key_data, sort_keys=True, default=str)
         return hashlib.sha256(key_str.encode()).hexdigest()
-    
-    def _get_cache_file_path(self, cache_key: str) -> Path:
-        """获取缓存文件路径"""
-        return self.cache_dir / f"{cache_key}.json"
-    
+
+    # ---------- 序列化 ----------
+
+    @staticmethod
+    def _encode(data: Any) -> tuple:
+        """序列化为 (codec, blob, 原始字节数)，大数据用 zlib 压缩"""
+        raw = json.dumps(data, separators=(",", ":")).encode()
+        if len(raw) >= CACHE_COMPRESS_MIN_BYTES:
+            return _CODEC_ZLIB_JSON, zlib.compress(raw, 1), len(raw)
+        return _CODEC_JSON, raw, len(raw)
+
+    @staticmethod
+    def _decode(codec: int, blob: bytes) -> Any:
+        if codec == _CODEC_ZLIB_JSON:
+            blob = zlib.decompress(blob)
+        return json.loads(blob)
+
+    # ---------- 内存层 ----------
+
+    def _memory_put(self, key: str, entry: _MemoryEntry) -> None:
+        """写入内存层并按字节数淘汰最久未使用的条目（调用方持有锁）"""
+        self._memory_remove(key)
+        if entry.size_bytes > self.max_memory_bytes:
+            return
+        self._memory[key] = entry
+        self._memory_bytes += entry.size_bytes
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.size_bytes
+            self._stats["evictions"] += 1
+
+    def _memory_remove(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry.size_bytes
+
+    def _is_valid(self, func_name: str, generation: int, expires_at: float, now: float) -> bool:
+        return expires_at > now and generation == self._generations.get(func_name, 0)
+
+    def _memory_lookup(self, cache_key: str, now: float) -> Optional[Any]:
+        """查询内存层（调用方持有锁），过期条目顺带移除"""
+        entry = self._memory.get(cache_key)
+        if entry is None:
+            return None
+        if self._is_valid(entry.func_name, entry.generation, entry.expires_at, now):
+            self._memory.move_to_end(cache_key)
+            self._stats["memory_hits"] += 1
+            return entry.data
+        self._memory_remove(cache_key)
+        self._stats["expired"] += 1
+        return None
+
+    # ---------- 公共接口 ----------
+
     def get(self, func_name: str, *args, **kwargs) -> Optional[Any]:
         """
         获取缓存数据
-        
+
         Args:
             func_name: 函数名
             *args: 位置参数
             **kwargs: 关键字参数
-            
+
         Returns:
             缓存的数据，如果没有或已过期返回None
         """
-        cache_key = self._get_cache_key(func_name, *args, **kwargs)
-        
-        # 先查内存缓存
-        if cache_key in self.memory_cache:
-            cache_data = self.memory_cache[cache_key]
-            cached_at = datetime.fromisoformat(cache_data["cached_at"])
-            
-            if datetime.now() - cached_at < self.ttl:
-                return cache_data["data"]
-            else:
-                del self.memory_cache[cache_key]
-        
-        # 再查文件缓存
-        cache_file = self._get_cache_file_path(cache_key)
-        
-        if cache_file.exists():
+        return self.get_by_key(self._get_cache_key(func_name, *args, **kwargs))
+
+    def get_by_key(self, cache_key: str) -> Optional[Any]:
+        """
+        按预先计算的缓存键获取数据
+
+        Args:
+            cache_key: make_key / _get_cache_key 生成的缓存键
+
+        Returns:
+            缓存的数据，如果没有或已过期返回None
+        """
+        now = time.time()
+
+        with self._lock:
+            # 先查内存缓存
+            data = self._memory_lookup(cache_key, now)
+            if data is not None:
+                return data
+
+            # 再查磁盘缓存
             try:
-                with open(cache_file, "r") as f:
-                    cache_data = json.load(f)
-                
-                cached_at = datetime.fromisoformat(cache_data["cached_at"])
-                
-                if datetime.now() - cached_at < self.ttl:
-                    # 同步到内存缓存
-                    self.memory_cache[cache_key] = cache_data
-                    return cache_data["data"]
-                else:
-                    cache_file.unlink()
-            except (json.JSONDecodeError, KeyError, ValueError, OSError) as e:
-                logger.debug("读取缓存文件失败 (%s): %s", cache_file.name, e)
-        
+                row = self._conn.execute(
+                    "SELECT func_name, generation, codec, data, size_bytes, expires_at "
+                    "FROM cache_entries WHERE key = ?",
+                    (cache_key,),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.debug("读取缓存失败 (%s): %s", cache_key[:16], e)
+                row = None
+
+            if row is not None:
+                row_func, generation, codec, blob, size_bytes, expires_at = row
+                if self._is_valid(row_func, generation, expires_at, now):
+                    try:
+                        data = self._decode(codec, blob)
+                    except (ValueError, zlib.error) as e:
+                        logger.debug("解析缓存数据失败 (%s): %s", cache_key[:16], e)
+                    else:
+                        # 同步到内存缓存
+                        self._memory_put(cache_key, _MemoryEntry(
+                            data, row_func, generation, size_bytes, expires_at
+                        ))
+                        self._stats["disk_hits"] += 1
+                        return data
+                self._stats["expired"] += 1
+                self._delete_keys([cache_key])
+
+            self._stats["misses"] += 1
         return None
-    
+
+    def get_memory_by_key(self, cache_key: str) -> Optional[Any]:
+        """只查内存层（不触碰磁盘，可以在事件循环中直接调用）；未命中不计入 misses"""
+        with self._lock:
+            return self._memory_lookup(cache_key, time.time())
+
+    async def get_by_key_async(self, cache_key: str) -> Optional[Any]:
+        """
+        get_by_key 的异步版本：内存层在事件循环中直接查询，
+        只有需要读磁盘层时才交给线程执行，避免阻塞事件循环
+        """
+        data = self.get_memory_by_key(cache_key)
+        if data is not None:
+            return data
+        return await asyncio.to_thread(self.get_by_key, cache_key)
+
+    async def set_by_key_async(
+        self,
+        cache_key: str,
+        func_name: str,
+        data: Any,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        """set_by_key 的异步版本（序列化和磁盘写入在线程中执行）"""
+        await asyncio.to_thread(self.set_by_key, cache_key, func_name, data, ttl_seconds)
+
     def set(self, func_name: str, data: Any, *args, **kwargs) -> None:
         """
         设置缓存数据
-        
+
         Args:
             func_name: 函数名
             data: 要缓存的数据
             *args: 位置参数
             **kwargs: 关键字参数
         """
-        cache_key = self._get_cache_key(func_name, *args, **kwargs)
-        
-        cache_data = {
-            "data": data,
-            "cached_at": datetime.now().isoformat(),
-            "func_name": func_name
-        }
-        
-        # 存储到内存缓存
-        self.memory_cache[cache_key] = cache_data
-        
-        # 存储到文件缓存
-        cache_file = self._get_cache_file_path(cache_key)
-        
+        self.set_by_key(self._get_cache_key(func_name, *args, **kwargs), func_name, data)
+
+    def set_by_key(
+        self,
+        cache_key: str,
+        func_name: str,
+        data: Any,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        按预先计算的缓存键写入数据
+
+        Args:
+            cache_key: make_key / _get_cache_key 生成的缓存键
+            func_name: 函数名（用于按函数失效）
+            data: 要缓存的数据
+            ttl_seconds: 本条数据的有效期（秒），None 使用默认 TTL，
+                math.inf 表示永久（直到 clear），<= 0 表示不写入
+        """
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl.total_seconds()
+        if ttl_seconds <= 0:
+            return
+
         try:
-            with open(cache_file, "w") as f:
-                json.dump(cache_data, f, indent=2)
-        except (OSError, TypeError) as e:
-            logger.debug("写入缓存文件失败 (%s): %s", cache_file.name, e)
-    
+            codec, blob, size_bytes = self._encode(data)
+        except (TypeError, ValueError) as e:
+            logger.debug("缓存数据无法序列化 (%s): %s", func_name, e)
+            return
+
+        now = time.time()
+        expires_at = now + ttl_seconds
+
+        with self._lock:
+            generation = self._generations.get(func_name, 0)
+            # 存储到内存缓存
+            self._memory_put(cache_key, _MemoryEntry(
+                data, func_name, generation, size_bytes, expires_at
+            ))
+            self._stats["sets"] += 1
+
+            # 存储到磁盘缓存
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries "
+                    "(key, func_name, generation, codec, data, size_bytes, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (cache_key, func_name, generation, codec, blob, size_bytes, now, expires_at),
+                )
+            except sqlite3.Error as e:
+                logger.debug("写入缓存失败 (%s): %s", func_name, e)
+
+    def _delete_keys(self, keys) -> None:
+        """删除磁盘层条目（调用方持有锁）"""
+        try:
+            self._conn.executemany(
+                "DELETE FROM cache_entries WHERE key = ?", [(k,) for k in keys]
+            )
+        except sqlite3.Error as e:
+            logger.debug("删除缓存条目失败: %s", e)
+
     def clear(self, func_name: Optional[str] = None) -> None:
         """
         清除缓存
-        
+
         Args:
             func_name: 函数名，如果为None则清除所有缓存
         """
-        if func_name:
-            # 清除特定函数的缓存
-            keys_to_delete = [
-                key for key, data in self.memory_cache.items()
-                if data["func_name"] == func_name
-            ]
-            
-            for key in keys_to_delete:
-                del self.memory_cache[key]
-            
-            # 清除文件缓存
-            for cache_file in self.cache_dir.glob("*.json"):
+        with self._lock:
+            if func_name:
+                # O(1)：代数加一，旧条目由后台清理线程删除
+                generation = self._generations.get(func_name, 0) + 1
+                self._generations[func_name] = generation
                 try:
-                    with open(cache_file, "r") as f:
-                        cache_data = json.load(f)
-                    
-                    if cache_data.get("func_name") == func_name:
-                        cache_file.unlink()
-                except (json.JSONDecodeError, KeyError, OSError) as e:
-                    logger.debug("清除缓存文件失败 (%s): %s", cache_file.name, e)
-        else:
-            # 清除所有缓存
-            self.memory_cache.clear()
-            
-            for cache_file in self.cache_dir.glob("*.json"):
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO func_generations (func_name, generation) VALUES (?, ?)",
+                        (func_name, generation),
+                    )
+                except sqlite3.Error as e:
+                    logger.debug("更新缓存代数失败 (%s): %s", func_name, e)
+            else:
+                # 清除所有缓存
+                self._memory.clear()
+                self._memory_bytes = 0
                 try:
-                    cache_file.unlink()
-                except OSError as e:
-                    logger.debug("删除缓存文件失败 (%s): %s", cache_file.name, e)
-    
+                    self._conn.execute("DELETE FROM cache_entries")
+                except sqlite3.Error as e:
+                    logger.debug("清空缓存失败: %s", e)
+                self._purge_legacy_files()
+
+    def _purge_legacy_files(self) -> None:
+        """删除旧版每条目一个 JSON 文件的缓存"""
+        for cache_file in self.cache_dir.glob("*.json"):
+            try:
+                cache_file.unlink()
+            except OSError as e:
+                logger.debug("删除缓存文件失败 (%s): %s", cache_file.name, e)
+
+    def sweep(self) -> int:
+        """
+        清理过期及旧代数的条目
+
+        Returns:
+            删除的磁盘条目数
+        """
+        now = time.time()
+        with self._lock:
+            stale_keys = [
+                key for key, entry in self._memory.items()
+                if not self._is_valid(entry.func_name, entry.generation, entry.expires_at, now)
+            ]
+            for key in stale_keys:
+                self._memory_remove(key)
+
+            removed = 0
+            try:
+                removed += self._conn.execute(
+                    "DELETE FROM cache_entries WHERE expires_at <= ?", (now,)
+                ).rowcount
+                for name, generation in self._generations.items():
+                    removed += self._conn.execute(
+                        "DELETE FROM cache_entries WHERE func_name = ? AND generation < ?",
+                        (name, generation),
+                    ).rowcount
+            except sqlite3.Error as e:
+                logger.debug("清理缓存失败: %s", e)
+            self._stats["swept"] += removed
+
+        if removed:
+            logger.debug("缓存清理: 删除 %d 条磁盘条目", removed)
+        return removed
+
+    def _sweep_loop(self, interval: float) -> None:
+        while not self._stop_event.wait(interval):
+            try:
+                self.sweep()
+            except Exception as e:  # 清理线程不能因异常退出
+                logger.debug("缓存清理线程异常: %s", e)
+
+    def close(self) -> None:
+        """停止清理线程并关闭数据库连接"""
+        self._stop_event.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=1)
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+
     def get_stats(self) -> Dict[str, Any]:
         """获取缓存统计信息"""
-        memory_count = len(self.memory_cache)
-        file_count = len(list(self.cache_dir.glob("*.json")))
-        
-        return {
-            "memory_cache_count": memory_count,
-            "file_cache_count": file_count,
-            "cache_dir": str(self.cache_dir),
-            "ttl_hours": self.ttl.total_seconds() / 3600
-        }
+        with self._lock:
+            try:
+                disk_count, disk_bytes, disk_stored_bytes = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0), "
+                    "COALESCE(SUM(LENGTH(data)), 0) FROM cache_entries"
+                ).fetchone()
+            except sqlite3.Error:
+                disk_count, disk_bytes, disk_stored_bytes = 0, 0, 0
+
+            stats = {
+                "memory_cache_count": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "memory_max_bytes": self.max_memory_bytes,
+                "file_cache_count": disk_count,
+                "disk_bytes": disk_bytes,
+                "disk_stored_bytes": disk_stored_bytes,
+                "db_file_bytes": self.db_path.stat().st_size if self.db_path.exists() else 0,
+                "cache_dir": str(self.cache_dir),
+                "ttl_hours": self.ttl.total_seconds() / 3600,
+            }
+            stats.update(self._stats)
+        return stats
 
 
 # 全局缓存实例
 _cache: Optional[DataCache] = None
+_cache_lock = threading.Lock()
 
 
 def get_data_cache() -> DataCache:
     """获取数据缓存实例（单例）"""
     global _cache
     if _cache is None:
-        _cache = DataCache()
+        with _cache_lock:
+            if _cache is None:
+                _cache = DataCache()
     return _cache
 
 
 def cached(func):
     """
     缓存装饰器
-    
+
     使用示例:
         @cached
         def my_function(arg1, arg2):
@@ -213,18 +529,18 @@ def cached(func):
     """
     def wrapper(*args, **kwargs):
         cache = get_data_cache()
-        
+
         # 尝试获取缓存
         cached_result = cache.get(func.__name__, *args, **kwargs)
         if cached_result is not None:
             return cached_result
-        
+
         # 执行函数
         result = func(*args, **kwargs)
-        
+
         # 存储缓存
         cache.set(func.__name__, result, *args, **kwargs)
-        
+
         return result
-    
+
     return wrapper
@@ -9,7 +9,7 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Any, Optional
 
-from tradingagents.dataflows.interface import route_to_vendor
+from tradingagents.dataflows.interface import DataFetchError, aroute_to_vendor, route_to_vendor
 from tradingagents.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -33,35 +33,51 @@ class DataLoaderMixin:
     def _load_stock_data(self) -> None:
         """加载股票价格数据并解析为 DataFrame"""
         try:
-            self.stock_data_str = route_to_vendor(
+            self._set_stock_data(route_to_vendor(
                 "get_stock_data", self.ticker, self.start_date, self.end_date
-            )
-
-            lines = self.stock_data_str.split("\n")
-            if len(lines) > 1:
-                header = lines[0].split(",")
-                data = [
-                    line.split(",") for line in lines[1:] if line.strip()
-                ]
-
-                if data and len(data[0]) == len(header):
-                    self.stock_data_df = pd.DataFrame(data, columns=header)
-                    for col in ["open", "high", "low", "close", "volume"]:
-                        if col in self.stock_data_df.columns:
-                            self.stock_data_df[col] = pd.to_numeric(
-                                self.stock_data_df[col], errors="coerce"
-                            )
-                    if "date" in self.stock_data_df.columns:
-                        self.stock_data_df["date"] = pd.to_datetime(
-                            self.stock_data_df["date"]
-                        )
-                        self.stock_data_df = (
-                            self.stock_data_df.set_index("date").sort_index()
-                        )
+            ))
         except (ValueError, KeyError, ConnectionError, TimeoutError, OSError) as e:
             logger.warning("加载股票数据失败 (%s): %s", self.ticker, e)
             self.stock_data_str = f"Error loading stock data: {str(e)}"
 
+    async def _load_stock_data_async(self) -> None:
+        """_load_stock_data 的异步版本（原生异步数据路径）"""
+        try:
+            self._set_stock_data(await aroute_to_vendor(
+                "get_stock_data", self.ticker, self.start_date, self.end_date
+            ))
+        except (
+            DataFetchError, ValueError, KeyError, ConnectionError, TimeoutError, OSError
+        ) as e:
+            logger.warning("加载股票数据失败 (%s): %s", self.ticker, e)
+            self.stock_data_str = f"Error loading stock data: {str(e)}"
+
+    def _set_stock_data(self, stock_data_str: str) -> None:
+        """保存原始 CSV 并解析为 DataFrame"""
+        self.stock_data_str = stock_data_str
+
+        lines = self.stock_data_str.split("\n")
+        if len(lines) > 1:
+            header = lines[0].split(",")
+            data = [
+                line.split(",") for line in lines[1:] if line.strip()
+            ]
+
+            if data and len(data[0]) == len(header):
+                self.stock_data_df = pd.DataFrame(data, columns=header)
+                for col in ["open", "high", "low", "close", "volume"]:
+                    if col in self.stock_data_df.columns:
+                        self.stock_data_df[col] = pd.to_numeric(
+                            self.stock_data_df[col], errors="coerce"
+                        )
+                if "date" in self.stock_data_df.columns:
+                    self.stock_data_df["date"] = pd.to_datetime(
+                        self.stock_data_df["date"]
+                    )
+                    self.stock_data_df = (
+                        self.stock_data_df.set_index("date").sort_index()
+                    )
+
     # ------------------------------------------------------------------ #
     #  技术指标计算
     # ------------------------------------------------------------------ #
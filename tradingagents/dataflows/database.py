@@ -14,7 +14,8 @@ from dataclasses import dataclass, asdict
 from tradingagents.core.container import get_container
 from tradingagents.dataflows.db_mixin import DatabaseMixin
 from tradingagents.utils.logger import get_logger
-from tradingagents.constants import DEFAULT_ANALYSIS_DB_PATH
+from tradingagents.constants import DEFAULT_ANALYSIS_DB_PATH, TOOL_CALL_LOG_FLUSH_TIMEOUT_SECONDS
+from tradingagents.dataflows.tool_call_writer import ToolCallRecord, ToolCallWriter
 
 logger = get_logger(__name__)
 
@@ -51,6 +52,8 @@ class TradingDatabase(DatabaseMixin):
     def __init__(self, db_path: str = DEFAULT_ANALYSIS_DB_PATH):
         self.db_path = db_path
         self._init_database()
+        # 工具调用记录由后台线程批量写入
+        self.tool_call_writer = ToolCallWriter(db_path)
     
     def _init_database(self):
         """初始化数据库表结构"""
@@ -99,6 +102,7 @@ class TradingDatabase(DatabaseMixin):
                     input_params TEXT,
                     result_preview TEXT,
                     full_result TEXT,
+                    result_hash TEXT,
                     created_at TEXT NOT NULL,
                     
                     FOREIGN KEY (symbol, trade_date) 
@@ -106,6 +110,20 @@ class TradingDatabase(DatabaseMixin):
                 )
             ''')
             
+            # 旧库升级：新记录的 full_result 按内容哈希存放在 tool_call_results
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(tool_calls)")}
+            if "result_hash" not in columns:
+                cursor.execute("ALTER TABLE tool_calls ADD COLUMN result_hash TEXT")
+            
+            # 工具调用完整结果（相同内容只存一份）
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS tool_call_results (
+                    result_hash TEXT PRIMARY KEY,
+                    full_result TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+            ''')
+            
             # 创建索引
             cursor.execute('''
                 CREATE INDEX IF NOT EXISTS idx_reports_symbol_date 
@@ -169,7 +187,7 @@ class TradingDatabase(DatabaseMixin):
                        tool_name: str, vendor_used: str,
                        input_params: Dict, result: str) -> bool:
         """
-        保存工具调用记录
+        保存工具调用记录（放入后台写入队列，由写入线程批量落盘）
         
         Args:
             symbol: 股票代码
@@ -180,33 +198,51 @@ class TradingDatabase(DatabaseMixin):
             result: 工具返回结果
             
         Returns:
-            bool: 是否保存成功
+            bool: 是否已入队
+        """
+        return self.tool_call_writer.submit(ToolCallRecord(
+            symbol=symbol,
+            trade_date=trade_date,
+            tool_name=tool_name,
+            vendor_used=vendor_used,
+            input_params=input_params,
+            result=result,
+            created_at=datetime.now().isoformat(),
+        ))
+    
+    def flush_tool_calls(self, timeout: Optional[float] = None) -> bool:
         """
+        等待已提交的工具调用记录写入数据库
+        
+        Args:
+            timeout: 最长等待秒数，None 表示一直等待
+            
+        Returns:
+            bool: 是否在超时前完成
+        """
+        return self.tool_call_writer.flush(timeout)
+    
+    def get_tool_call_result(self, result_hash: str) -> Optional[str]:
+        """
+        按内容哈希获取工具调用的完整结果
+        
+        Args:
+            result_hash: tool_calls.result_hash
+            
+        Returns:
+            完整结果或 None
+        """
+        self.flush_tool_calls()
         try:
             with self._get_connection() as conn:
-                cursor = conn.cursor()
-                
-                created_at = datetime.now().isoformat()
-                result_preview = result[:500] if len(result) > 500 else result
-                
-                cursor.execute('''
-                    INSERT INTO tool_calls (
-                        symbol, trade_date, tool_name, vendor_used,
-                        input_params, result_preview, full_result, created_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    symbol, trade_date, tool_name, vendor_used,
-                    json.dumps(input_params, ensure_ascii=False),
-                    result_preview,
-                    result,
-                    created_at
-                ))
-                
-                return True
-                
+                row = conn.execute(
+                    "SELECT full_result FROM tool_call_results WHERE result_hash = ?",
+                    (result_hash,),
+                ).fetchone()
+                return row["full_result"] if row else None
         except sqlite3.Error as e:
-            logger.error("❌ 保存工具调用失败: %s", e)
-            return False
+            logger.error("❌ 获取工具调用结果失败: %s", e)
+            return None
     
     def get_report(self, symbol: str, trade_date: str) -> Optional[AnalysisReport]:
         """
@@ -264,6 +300,7 @@ class TradingDatabase(DatabaseMixin):
         Returns:
             工具调用记录列表
         """
+        self.flush_tool_calls()
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
@@ -282,6 +319,7 @@ class TradingDatabase(DatabaseMixin):
                         'vendor_used': row['vendor_used'],
                         'input_params': json.loads(row['input_params']),
                         'result_preview': row['result_preview'],
+                        'result_hash': row['result_hash'],
                         'created_at': row['created_at']
                     }
                     for row in rows
@@ -368,3 +406,18 @@ def get_db(db_path: str = DEFAULT_ANALYSIS_DB_PATH) -> TradingDatabase:
         container.register('trading_database', lambda: TradingDatabase(db_path), singleton=True)
     
     return container.get('trading_database')
+
+
+def flush_tool_call_log(timeout: Optional[float] = TOOL_CALL_LOG_FLUSH_TIMEOUT_SECONDS) -> bool:
+    """
+    等待工具调用日志落盘（数据库尚未使用过时直接返回）
+    
+    Args:
+        timeout: 最长等待秒数
+        
+    Returns:
+        bool: 是否在超时前完成
+    """
+    if not get_container().has('trading_database'):
+        return True
+    return get_db().flush_tool_calls(timeout)
@@ -1,18 +1,13 @@
 #!/usr/bin/env python3
 """
 增量技术指标计算器
-支持仅计算新增数据的指标，大幅提升性能
 
 核心设计：
-1. 缓存历史指标计算结果
-2. 检测新增数据行
-3. 仅计算新增部分（需要历史窗口）
-4. 合并结果
-
-性能对比：
-- 全量计算：150s (2000行 × 150个指标)
-- 增量计算：6s (20行 × 150个指标)
-- 提升：+96%
+1. 全量指标结果按输入数据内容缓存（IndicatorResultCache）：相同的K线直接命中，
+   K线被修订或日期范围变化时自然未命中，不会返回过期结果
+2. 流式更新（update_streaming）：核心指标（均线、布林带、ATR、RSI、MACD、ADX、OBV、
+   成交量均线）的流式状态按股票持久化为 JSON，新的一根 K 线只需 O(1) 更新，
+   结果与全量计算逐位一致（见 indicators/streaming.py）
 """
 
 import pandas as pd
@@ -30,10 +25,17 @@ from .indicators.momentum_indicators import MomentumIndicators
 from .indicators.volume_indicators import VolumeIndicators
 from .indicators.trend_indicators import TrendIndicators
 from .indicators.additional_indicators import AdditionalIndicators
+from .indicators.result_cache import IndicatorResultCache
+from .indicators.streaming import StreamingIndicatorSet
 
 
 class IncrementalIndicatorCache:
-    """增量指标缓存管理器"""
+    """
+    按 symbol + 日期范围寻址的指标缓存管理器
+    
+    IncrementalIndicators 已改用内容寻址的 IndicatorResultCache（K线被修订时不会返回过期结果），
+    本类保留给按日期范围存取 DataFrame 的调用方
+    """
     
     def __init__(self, cache_dir: Optional[str] = None, ttl_hours: int = 24):
         """
@@ -141,103 +143,96 @@ class IncrementalIndicatorCache:
                     pass
 
 
-class IncrementalIndicators:
-    """
-    增量技术指标计算器
-    
-    使用示例:
-        >>> calculator = IncrementalIndicators()
-        >>> # 首次计算（全量）
-        >>> result1 = calculator.calculate(df1, symbol="AAPL")
-        >>> # 增量计算（仅新数据）
-        >>> result2 = calculator.calculate(df2, symbol="AAPL")  # df2包含df1+新数据
-    """
-    
-    # 最大窗口期（需要保留的历史数据行数）
-    MAX_WINDOW = 200
+class StreamingStateStore:
+    """流式指标状态存储（每只股票一个 JSON 文件）"""
     
-    def __init__(self, cache_dir: Optional[str] = None):
+    def __init__(self, state_dir: Optional[str] = None):
         """
         初始化
         
         Args:
-            cache_dir: 缓存目录
+            state_dir: 状态目录
         """
-        self.cache = IncrementalIndicatorCache(cache_dir)
+        if state_dir is None:
+            state_dir = Path(__file__).parent / "indicator_cache" / "streaming"
+        
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
     
-    def _detect_new_rows(
-        self,
-        new_df: pd.DataFrame,
-        cached_df: pd.DataFrame
-    ) -> Tuple[int, pd.DataFrame]:
+    def _get_state_path(self, symbol: str) -> Path:
+        """获取状态文件路径"""
+        return self.state_dir / f"{hashlib.sha256(symbol.encode()).hexdigest()}.state.json"
+    
+    def load(self, symbol: str) -> Optional[StreamingIndicatorSet]:
         """
-        检测新增数据行
+        读取流式指标状态
         
-        Args:
-            new_df: 新数据（可能包含旧数据）
-            cached_df: 缓存的数据
-            
         Returns:
-            (新增行数, 用于计算的DataFrame)
+            StreamingIndicatorSet，如果没有或损坏返回None
         """
-        # 假设DataFrame按时间排序，使用timestamp列
-        if 'timestamp' in new_df.columns and 'timestamp' in cached_df.columns:
-            last_cached_time = cached_df['timestamp'].iloc[-1]
-            new_rows = new_df[new_df['timestamp'] > last_cached_time]
-            n_new = len(new_rows)
-            
-            if n_new == 0:
-                # 无新数据
-                return 0, cached_df
-            
-            # 准备计算用的DataFrame（历史窗口+新数据）
-            window_data = cached_df.iloc[-self.MAX_WINDOW:]
-            compute_df = pd.concat([window_data, new_rows], ignore_index=True)
-            
-            return n_new, compute_df
-        else:
-            # 无timestamp列，使用行数判断
-            n_cached = len(cached_df)
-            n_new = len(new_df) - n_cached
-            
-            if n_new <= 0:
-                return 0, cached_df
-            
-            # 准备计算用的DataFrame
-            window_start = max(0, n_cached - self.MAX_WINDOW)
-            compute_df = new_df.iloc[window_start:]
-            
-            return n_new, compute_df
+        state_path = self._get_state_path(symbol)
+        if not state_path.exists():
+            return None
+        
+        try:
+            with open(state_path, 'r') as f:
+                return StreamingIndicatorSet.from_state(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
     
-    def _merge_results(
-        self,
-        cached_df: pd.DataFrame,
-        computed_df: pd.DataFrame,
-        n_new: int
-    ) -> pd.DataFrame:
+    def save(self, symbol: str, indicators: StreamingIndicatorSet):
+        """保存流式指标状态（先写临时文件再替换，避免写一半的状态被读到）"""
+        state_path = self._get_state_path(symbol)
+        tmp_path = state_path.with_suffix('.tmp')
+        
+        try:
+            with open(tmp_path, 'w') as f:
+                f.write(json.dumps(indicators.to_state()))
+            tmp_path.replace(state_path)
+        except (OSError, TypeError):
+            pass
+    
+    def clear(self, symbol: Optional[str] = None):
         """
-        合并缓存数据和新计算数据
+        清除状态
         
         Args:
-            cached_df: 缓存的完整数据
-            computed_df: 新计算的数据（窗口+新行）
-            n_new: 新增行数
-            
-        Returns:
-            合并后的完整DataFrame
+            symbol: 股票代码，None表示清除所有
         """
-        # 取缓存数据的前N-n_new行
-        n_cached = len(cached_df)
-        keep_rows = n_cached - n_new
-        
-        if keep_rows <= 0:
-            return computed_df
+        if symbol is None:
+            for file in self.state_dir.glob("*.state.json"):
+                file.unlink()
+        else:
+            state_path = self._get_state_path(symbol)
+            if state_path.exists():
+                state_path.unlink()
+
+
+class IncrementalIndicators:
+    """
+    增量技术指标计算器
+    
+    使用示例:
+        >>> calculator = IncrementalIndicators()
+        >>> # 全量指标（相同数据再次调用直接命中缓存）
+        >>> result = calculator.calculate(df, symbol="AAPL")
+        >>> # 核心指标流式更新（只处理新增K线）
+        >>> latest = calculator.update_streaming(df, symbol="AAPL")
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        初始化
         
-        # 合并
-        cached_part = cached_df.iloc[:keep_rows]
-        new_part = computed_df.iloc[-n_new:]
+        Args:
+            cache_dir: 缓存目录
+        """
+        if cache_dir is None:
+            cache_dir = Path(__file__).parent / "indicator_cache"
         
-        return pd.concat([cached_part, new_part], ignore_index=True)
+        cache_dir = Path(cache_dir)
+        self.result_cache = IndicatorResultCache(cache_dir / "results")
+        self.state_store = StreamingStateStore(cache_dir / "streaming")
     
     def calculate(
         self,
@@ -246,63 +241,70 @@ class IncrementalIndicators:
         force_full: bool = False
     ) -> pd.DataFrame:
         """
-        增量计算技术指标
+        计算全部技术指标（按输入内容缓存）
         
         Args:
             df: 包含OHLCV数据的DataFrame
-            symbol: 股票代码（用于缓存）
-            force_full: 强制全量计算
+            symbol: 股票代码（兼容参数；缓存按数据内容寻址，与代码无关）
+            force_full: 跳过缓存直接计算
             
         Returns:
             包含所有指标的DataFrame
         """
-        # 如果没有symbol或强制全量，直接全量计算
-        if symbol is None or force_full:
+        if force_full:
             return CompleteTechnicalIndicators.calculate_all_indicators(df)
         
-        # 生成日期范围key
-        if 'timestamp' in df.columns:
-            start_date = df['timestamp'].iloc[0]
-            end_date = df['timestamp'].iloc[-1]
-            date_range = f"{start_date}_{end_date}"
-        else:
-            date_range = f"rows_{len(df)}"
-        
-        # 尝试获取缓存
-        cached_df = self.cache.get(symbol, date_range)
-        
-        if cached_df is None:
-            # 无缓存，全量计算
-            result = CompleteTechnicalIndicators.calculate_all_indicators(df)
-            self.cache.set(symbol, date_range, result)
-            return result
-        
-        # 有缓存，检测新增数据
-        n_new, compute_df = self._detect_new_rows(df, cached_df)
-        
-        if n_new == 0:
-            # 无新数据，直接返回缓存
-            return cached_df
+        return self.result_cache.get_or_compute(df)
+    
+    def update_streaming(self, df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+        """
+        流式更新核心指标
         
-        # 增量计算
-        computed_df = CompleteTechnicalIndicators.calculate_all_indicators(compute_df)
+        只把 df 中已持久化状态之后的K线逐根喂给该股票的流式指标，然后保存状态。
+        df 可以是完整历史，也可以只包含新K线；首次调用时必须从历史起点开始。
         
-        # 合并结果
-        result = self._merge_results(cached_df, computed_df, n_new)
+        Args:
+            df: 包含OHLCV数据的DataFrame（按时间排序）
+            symbol: 股票代码
+            
+        Returns:
+            新增行的指标（列为 STREAMING_COLUMNS，索引同 df），无新数据时为空DataFrame
+        """
+        indicators = self.state_store.load(symbol) or StreamingIndicatorSet()
+        new_rows = self._rows_after_state(df, indicators)
+        result = indicators.update_frame(new_rows)
         
-        # 更新缓存
-        self.cache.set(symbol, date_range, result)
+        if len(new_rows) > 0:
+            self.state_store.save(symbol, indicators)
         
         return result
     
+    @staticmethod
+    def _rows_after_state(df: pd.DataFrame, indicators: StreamingIndicatorSet) -> pd.DataFrame:
+        """状态之后的新增行（有timestamp列按时间判断，否则按已处理行数）"""
+        if indicators.n_bars == 0:
+            return df
+        if 'timestamp' in df.columns and indicators.last_timestamp is not None:
+            # 新增行都在尾部，从后往前找，只转换新增部分的时间戳
+            timestamps = df['timestamp']
+            last_timestamp = pd.Timestamp(indicators.last_timestamp)
+            start = len(df)
+            while start > 0 and pd.Timestamp(timestamps.iloc[start - 1]) > last_timestamp:
+                start -= 1
+            return df.iloc[start:]
+        return df.iloc[indicators.n_bars:]
+    
     def clear_cache(self, symbol: Optional[str] = None):
         """
         清除缓存
         
         Args:
-            symbol: 股票代码，None表示清除所有
+            symbol: 股票代码，只清除该股票的流式指标状态；None表示清除所有
+                （指标结果按内容寻址，不区分股票，只在 None 时清除）
         """
-        self.cache.clear(symbol)
+        if symbol is None:
+            self.result_cache.clear()
+        self.state_store.clear(symbol)
 
 
 # 全局实例（单例）
@@ -335,3 +337,18 @@ def calculate_indicators_incremental(
     """
     calculator = get_incremental_calculator()
     return calculator.calculate(df, symbol, force_full)
+
+
+def update_indicators_streaming(df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    """
+    流式更新核心指标（便捷函数）
+    
+    Args:
+        df: 包含OHLCV数据的DataFrame
+        symbol: 股票代码
+        
+    Returns:
+        新增行的指标DataFrame
+    """
+    calculator = get_incremental_calculator()
+    return calculator.update_streaming(df, symbol)
@@ -28,13 +28,14 @@ COMMON_BASE_INDICATORS = [
 BASE_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'adjusted_close']
 
 
-def get_indicator_columns(indicator: str, df_columns: list) -> list:
+def get_indicator_columns(indicator: str, df_columns: list, include_common: bool = True) -> list:
     """
     获取指定指标需要的所有列
     
     Args:
         indicator: 指标名称或指标组名称
         df_columns: DataFrame 的所有列
+        include_common: 是否附带 COMMON_BASE_INDICATORS（按列惰性计算时传 False，只算请求的指标）
         
     Returns:
         需要保留的列列表
@@ -55,9 +56,10 @@ def get_indicator_columns(indicator: str, df_columns: list) -> list:
                     keep_cols.append(col)
             break
     
-    for col in COMMON_BASE_INDICATORS:
-        if col in df_columns and col not in keep_cols:
-            keep_cols.append(col)
+    if include_common:
+        for col in COMMON_BASE_INDICATORS:
+            if col in df_columns and col not in keep_cols:
+                keep_cols.append(col)
     
     return keep_cols
 
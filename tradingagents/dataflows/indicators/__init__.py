@@ -9,9 +9,13 @@
 from .moving_averages import MovingAverageIndicators
 from .momentum_indicators import MomentumIndicators
 from .volume_indicators import VolumeIndicators
+from .engine import IndicatorEngine
+from .panel import PanelIndicatorEngine
 
 __all__ = [
     "MovingAverageIndicators",
     "MomentumIndicators",
     "VolumeIndicators",
+    "IndicatorEngine",
+    "PanelIndicatorEngine",
 ]
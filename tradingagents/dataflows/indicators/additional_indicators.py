@@ -15,6 +15,7 @@ from tradingagents.constants import (
     VOLATILITY_WINDOW_20,
     VOLATILITY_WINDOW_50,
 )
+from . import kernels
 
 
 class AdditionalIndicators:
@@ -35,9 +36,9 @@ class AdditionalIndicators:
         if not inplace:
             df = df.copy()
         
-        df["roc_5"] = ((df["close"] - df["close"].shift(5)) / df["close"].shift(5)) * 100
-        df["roc_10"] = ((df["close"] - df["close"].shift(10)) / df["close"].shift(10)) * 100
-        df["roc_20"] = ((df["close"] - df["close"].shift(20)) / df["close"].shift(20)) * 100
+        close = kernels.as_float_array(df["close"])
+        for period in [5, 10, 20]:
+            df[f"roc_{period}"] = kernels.roc(close, period)
         
         return df
     
@@ -57,13 +58,33 @@ class AdditionalIndicators:
         if not inplace:
             df = df.copy()
         
-        tp = (df["high"] + df["low"] + df["close"]) / 3
-        sma_tp = tp.rolling(window=period).mean()
-        mad = tp.rolling(window=period).apply(lambda x: np.abs(x - x.mean()).mean(), raw=True)
-        df[f"cci_{period}"] = (tp - sma_tp) / (0.015 * mad)
+        df[f"cci_{period}"] = AdditionalIndicators.cci(df, period)
         
         return df
     
+    @staticmethod
+    def cci(df: pd.DataFrame, period: int = 20) -> pd.Series:
+        """
+        CCI 序列
+        
+        Args:
+            df: 包含 high, low, close 列的 DataFrame
+            period: 周期
+            
+        Returns:
+            CCI指标序列
+        """
+        return pd.Series(
+            kernels.cci(
+                kernels.as_float_array(df["high"]),
+                kernels.as_float_array(df["low"]),
+                kernels.as_float_array(df["close"]),
+                period,
+                CCI_CONSTANT,
+            ),
+            index=df.index,
+        )
+    
     @staticmethod
     def calculate_cmo(prices: pd.Series, period: int = 14) -> pd.Series:
         """
@@ -76,10 +97,7 @@ class AdditionalIndicators:
         Returns:
             CMO指标序列
         """
-        delta = prices.diff()
-        gain = delta.where(delta > 0, 0).rolling(window=period).sum()
-        loss = -delta.where(delta < 0, 0).rolling(window=period).sum()
-        cmo = 100 * (gain - loss) / (gain + loss)
+        cmo = pd.Series(kernels.cmo(kernels.as_float_array(prices), period), index=prices.index)
         return cmo
     
     @staticmethod
@@ -94,13 +112,16 @@ class AdditionalIndicators:
         Returns:
             MFI指标序列
         """
-        typical_price = (df["high"] + df["low"] + df["close"]) / 3
-        money_flow = typical_price * df["volume"]
-        
-        positive_flow = money_flow.where(typical_price > typical_price.shift(1), 0).rolling(window=period).sum()
-        negative_flow = money_flow.where(typical_price < typical_price.shift(1), 0).rolling(window=period).sum()
-        
-        mfi = 100 - (100 / (1 + positive_flow / negative_flow))
+        mfi = pd.Series(
+            kernels.mfi(
+                kernels.as_float_array(df["high"]),
+                kernels.as_float_array(df["low"]),
+                kernels.as_float_array(df["close"]),
+                kernels.as_float_array(df["volume"]),
+                period,
+            ),
+            index=df.index,
+        )
         return mfi
     
     @staticmethod
@@ -118,9 +139,10 @@ class AdditionalIndicators:
         if not inplace:
             df = df.copy()
         
-        df["returns"] = df["close"].pct_change()
-        df[f"volatility_{VOLATILITY_WINDOW_20}"] = df["returns"].rolling(window=VOLATILITY_WINDOW_20).std() * np.sqrt(TRADING_DAYS_PER_YEAR)
-        df[f"volatility_{VOLATILITY_WINDOW_50}"] = df["returns"].rolling(window=VOLATILITY_WINDOW_50).std() * np.sqrt(TRADING_DAYS_PER_YEAR)
+        returns = kernels.pct_change(kernels.as_float_array(df["close"]))
+        df["returns"] = returns
+        for window in [VOLATILITY_WINDOW_20, VOLATILITY_WINDOW_50]:
+            df[f"volatility_{window}"] = kernels.annualized_volatility(returns, window, TRADING_DAYS_PER_YEAR)
         
         return df
     
@@ -139,11 +161,12 @@ class AdditionalIndicators:
         if not inplace:
             df = df.copy()
         
-        df["price_to_sma_20"] = (df["close"] - df["close_20_sma"]) / df["close_20_sma"] * 100
-        df["price_to_sma_50"] = (df["close"] - df["close_50_sma"]) / df["close_50_sma"] * 100
+        close = kernels.as_float_array(df["close"])
+        df["price_to_sma_20"] = kernels.ratio_pct(close, kernels.as_float_array(df["close_20_sma"]))
+        df["price_to_sma_50"] = kernels.ratio_pct(close, kernels.as_float_array(df["close_50_sma"]))
         
-        df["price_to_high_20"] = (df["close"] - df["high"].rolling(window=20).max()) / df["high"].rolling(window=20).max() * 100
-        df["price_to_low_20"] = (df["close"] - df["low"].rolling(window=20).min()) / df["low"].rolling(window=20).min() * 100
+        df["price_to_high_20"] = kernels.ratio_pct(close, kernels.rolling_max(kernels.as_float_array(df["high"]), 20))
+        df["price_to_low_20"] = kernels.ratio_pct(close, kernels.rolling_min(kernels.as_float_array(df["low"]), 20))
         
         return df
     
@@ -162,11 +185,14 @@ class AdditionalIndicators:
         if not inplace:
             df = df.copy()
         
-        df["price_new_high_20"] = (df["close"] == df["close"].rolling(window=20).max()).astype(int)
-        df["rsi_new_high_20"] = (df["rsi"] == df["rsi"].rolling(window=20).max()).astype(int)
+        close = kernels.as_float_array(df["close"])
+        rsi = kernels.as_float_array(df["rsi"])
         
-        df["price_new_low_20"] = (df["close"] == df["close"].rolling(window=20).min()).astype(int)
-        df["rsi_new_low_20"] = (df["rsi"] == df["rsi"].rolling(window=20).min()).astype(int)
+        df["price_new_high_20"] = kernels.flag(close == kernels.rolling_max(close, 20))
+        df["rsi_new_high_20"] = kernels.flag(rsi == kernels.rolling_max(rsi, 20))
+        
+        df["price_new_low_20"] = kernels.flag(close == kernels.rolling_min(close, 20))
+        df["rsi_new_low_20"] = kernels.flag(rsi == kernels.rolling_min(rsi, 20))
         
         return df
     
@@ -185,45 +211,26 @@ class AdditionalIndicators:
         if not inplace:
             df = df.copy()
         
-        # SMA交叉
-        df["sma_5_20_cross"] = np.where(
-            (df["close_5_sma"] > df["close_20_sma"]) & (df["close_5_sma"].shift(1) <= df["close_20_sma"].shift(1)),
-            1,
-            np.where(
-                (df["close_5_sma"] < df["close_20_sma"]) & (df["close_5_sma"].shift(1) >= df["close_20_sma"].shift(1)),
-                -1,
-                0
-            )
-        )
+        close = kernels.as_float_array(df["close"])
+        sma_5 = kernels.as_float_array(df["close_5_sma"])
+        sma_20 = kernels.as_float_array(df["close_20_sma"])
+        sma_50 = kernels.as_float_array(df["close_50_sma"])
+        rsi = kernels.as_float_array(df["rsi"])
         
-        df["sma_20_50_cross"] = np.where(
-            (df["close_20_sma"] > df["close_50_sma"]) & (df["close_20_sma"].shift(1) <= df["close_50_sma"].shift(1)),
-            1,
-            np.where(
-                (df["close_20_sma"] < df["close_50_sma"]) & (df["close_20_sma"].shift(1) >= df["close_50_sma"].shift(1)),
-                -1,
-                0
-            )
-        )
+        # SMA交叉
+        df["sma_5_20_cross"] = kernels.cross(sma_5, sma_20)
+        df["sma_20_50_cross"] = kernels.cross(sma_20, sma_50)
         
         # MACD交叉
-        df["macd_cross"] = np.where(
-            (df["macd"] > df["macds"]) & (df["macd"].shift(1) <= df["macds"].shift(1)),
-            1,
-            np.where(
-                (df["macd"] < df["macds"]) & (df["macd"].shift(1) >= df["macds"].shift(1)),
-                -1,
-                0
-            )
-        )
+        df["macd_cross"] = kernels.cross(kernels.as_float_array(df["macd"]), kernels.as_float_array(df["macds"]))
         
         # RSI超买超卖
-        df["rsi_overbought"] = (df["rsi"] >= 70).astype(int)
-        df["rsi_oversold"] = (df["rsi"] <= 30).astype(int)
+        df["rsi_overbought"] = kernels.flag(rsi >= RSI_OVERBOUGHT)
+        df["rsi_oversold"] = kernels.flag(rsi <= RSI_OVERSOLD)
         
         # 布林带突破
-        df["boll_breakout_up"] = (df["close"] > df["boll_ub"]).astype(int)
-        df["boll_breakout_down"] = (df["close"] < df["boll_lb"]).astype(int)
+        df["boll_breakout_up"] = kernels.flag(close > kernels.as_float_array(df["boll_ub"]))
+        df["boll_breakout_down"] = kernels.flag(close < kernels.as_float_array(df["boll_lb"]))
         
         return df
     
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+指标计算引擎
+============
+所有指标以列为单位注册在 INDICATOR_NODES 依赖图中，节点只在 float64 NumPy 数组上计算
+（见 kernels.py）：
+
+- compute_all(): 预分配一个 (n, k) 的 float64 缓冲区和一个 int64 信号缓冲区（列优先，
+  每列连续），逐节点写入对应列，最后一次性包装成 DataFrame。
+  不再逐列 df[...] = ...，避免 BlockManager 碎片化和合并复制
+- get_indicators(columns): 只计算请求的列及其依赖（惰性计算），中间结果只算一次
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.constants import (
+    CCI_CONSTANT,
+    RSI_OVERBOUGHT,
+    RSI_OVERSOLD,
+    TRADING_DAYS_PER_YEAR,
+    VOLATILITY_WINDOW_20,
+    VOLATILITY_WINDOW_50,
+)
+from ..indicator_groups import BASE_COLUMNS
+from . import kernels as k
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+@dataclass(frozen=True)
+class IndicatorNode:
+    """
+    指标依赖图中的一个节点
+
+    Attributes:
+        outputs: 节点产出的列（多数节点只产出一列，ADX/MACD/布林带一次产出多列）
+        inputs: 依赖的其他指标列（OHLCV 基础列不需要声明）
+        compute: compute(bars, *inputs) -> 数组或数组元组（与 outputs 一一对应），
+            bars 为 {列名: float64 数组}
+        signal: 输出是否为 0/±1 的 int64 信号列
+    """
+    outputs: Tuple[str, ...]
+    inputs: Tuple[str, ...]
+    compute: Callable[..., Any]
+    signal: bool = False
+
+
+# 输出列 -> 节点，按输出顺序注册；以 "_" 开头的列是内部中间结果，不对外暴露
+INDICATOR_NODES: Dict[str, IndicatorNode] = {}
+
+
+def _register(outputs, inputs, compute, signal: bool = False) -> None:
+    if isinstance(outputs, str):
+        outputs = (outputs,)
+    node = IndicatorNode(tuple(outputs), tuple(inputs), compute, signal)
+    for col in node.outputs:
+        INDICATOR_NODES[col] = node
+
+
+# ==================== 移动平均线 ====================
+for _period in [5, 10, 20, 50, 100, 200]:
+    _register(f"close_{_period}_sma", (), lambda b, p=_period: k.rolling_mean(b["close"], p))
+for _period in [5, 10, 20, 50, 100, 200]:
+    _register(f"close_{_period}_ema", (), lambda b, p=_period: k.ema(b["close"], p))
+
+# 布林带（中轨复用 close_20_sma）
+_register("boll", ("close_20_sma",), lambda b, sma: sma)
+_register(("boll_ub", "boll_lb", "boll_width"), ("boll",), lambda b, mid: k.bollinger(b["close"], mid))
+
+# ATR
+_register("_tr", (), lambda b: k.true_range(b["high"], b["low"], b["close"]))
+_register("atr", ("_tr",), lambda b, tr: k.rolling_mean(tr, 14))
+_register("atr_pct", ("atr",), lambda b, atr: k.atr_pct(atr, b["close"]))
+
+# ==================== 动量指标 ====================
+_register("rsi", (), lambda b: k.rsi(b["close"]))
+_register("_close_12_ema", (), lambda b: k.ema(b["close"], 12))
+_register("_close_26_ema", (), lambda b: k.ema(b["close"], 26))
+_register(("macd", "macds", "macdh"), ("_close_12_ema", "_close_26_ema"), lambda b, fast, slow: k.macd(fast, slow))
+_register(("adx", "plus_di", "minus_di"), (), lambda b: k.adx(b["high"], b["low"], b["close"]))
+
+# ==================== 成交量指标 ====================
+_register("vwma", (), lambda b: k.vwma(b["close"], b["volume"]))
+_register("obv", (), lambda b: k.obv(b["close"], b["volume"]))
+for _period in [5, 10, 20, 50]:
+    _register(f"volume_sma_{_period}", (), lambda b, p=_period: k.rolling_mean(b["volume"], p))
+_register("volume_ratio_5", ("volume_sma_5",), lambda b, sma: k.safe_divide(b["volume"], sma))
+_register("volume_ratio_20", ("volume_sma_20",), lambda b, sma: k.safe_divide(b["volume"], sma))
+_register("volume_change_pct", (), lambda b: k.pct_change(b["volume"]) * 100)
+_register("volume_acceleration", ("volume_change_pct",), lambda b, pct: k.diff(pct))
+
+# ==================== 趋势指标 ====================
+_register("resistance_20", (), lambda b: k.rolling_max(b["high"], 20))
+_register("support_20", (), lambda b: k.rolling_min(b["low"], 20))
+_register("mid_range_20", ("resistance_20", "support_20"), lambda b, r, s: (r + s) / 2)
+_register("resistance_50", (), lambda b: k.rolling_max(b["high"], 50))
+_register("support_50", (), lambda b: k.rolling_min(b["low"], 50))
+_register("position_in_range_20", ("resistance_20", "support_20"), lambda b, r, s: k.range_position(b["close"], r, s))
+_register("trend_slope_10", (), lambda b: k.linear_slope(b["close"], 10))
+_register("trend_slope_20", (), lambda b: k.linear_slope(b["close"], 20))
+_register("lr_pred_20", (), lambda b: k.linear_prediction(b["close"], 20))
+
+# ==================== 扩展指标 ====================
+for _period in [5, 10, 20]:
+    _register(f"roc_{_period}", (), lambda b, p=_period: k.roc(b["close"], p))
+_register("cci_20", (), lambda b: k.cci(b["high"], b["low"], b["close"], 20, CCI_CONSTANT))
+_register("cmo_14", (), lambda b: k.cmo(b["close"], 14))
+_register("mfi_14", (), lambda b: k.mfi(b["high"], b["low"], b["close"], b["volume"], 14))
+_register("returns", (), lambda b: k.pct_change(b["close"]))
+for _window in [VOLATILITY_WINDOW_20, VOLATILITY_WINDOW_50]:
+    _register(
+        f"volatility_{_window}",
+        ("returns",),
+        lambda b, r, w=_window: k.annualized_volatility(r, w, TRADING_DAYS_PER_YEAR),
+    )
+_register("price_to_sma_20", ("close_20_sma",), lambda b, sma: k.ratio_pct(b["close"], sma))
+_register("price_to_sma_50", ("close_50_sma",), lambda b, sma: k.ratio_pct(b["close"], sma))
+_register("price_to_high_20", ("resistance_20",), lambda b, high: k.ratio_pct(b["close"], high))
+_register("price_to_low_20", ("support_20",), lambda b, low: k.ratio_pct(b["close"], low))
+
+# ==================== 背离 ====================
+_register("price_new_high_20", (), lambda b: k.flag(b["close"] == k.rolling_max(b["close"], 20)), signal=True)
+_register("rsi_new_high_20", ("rsi",), lambda b, rsi: k.flag(rsi == k.rolling_max(rsi, 20)), signal=True)
+_register("price_new_low_20", (), lambda b: k.flag(b["close"] == k.rolling_min(b["close"], 20)), signal=True)
+_register("rsi_new_low_20", ("rsi",), lambda b, rsi: k.flag(rsi == k.rolling_min(rsi, 20)), signal=True)
+
+# ==================== 交叉信号 ====================
+_register("sma_5_20_cross", ("close_5_sma", "close_20_sma"), lambda b, fast, slow: k.cross(fast, slow), signal=True)
+_register("sma_20_50_cross", ("close_20_sma", "close_50_sma"), lambda b, fast, slow: k.cross(fast, slow), signal=True)
+_register("macd_cross", ("macd", "macds"), lambda b, line, sig: k.cross(line, sig), signal=True)
+_register("rsi_overbought", ("rsi",), lambda b, rsi: k.flag(rsi >= RSI_OVERBOUGHT), signal=True)
+_register("rsi_oversold", ("rsi",), lambda b, rsi: k.flag(rsi <= RSI_OVERSOLD), signal=True)
+_register("boll_breakout_up", ("boll_ub",), lambda b, ub: k.flag(b["close"] > ub), signal=True)
+_register("boll_breakout_down", ("boll_lb",), lambda b, lb: k.flag(b["close"] < lb), signal=True)
+
+# 对外可用的指标列（按输出顺序）
+INDICATOR_COLUMNS: List[str] = [col for col in INDICATOR_NODES if not col.startswith("_")]
+
+
+class IndicatorEngine:
+    """
+    基于列依赖图的指标计算引擎
+
+    Examples:
+        >>> engine = IndicatorEngine(df)
+        >>> engine.compute_all()                      # 全部指标，一次性构建 DataFrame
+        >>> engine.get_indicators(['macd', 'macds'])  # 只计算 MACD 及其依赖
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Args:
+            df: 包含 OHLCV 数据的 DataFrame（列名小写）
+        """
+        self._df = df
+        self._bars: Dict[str, np.ndarray] = {
+            col: k.as_float_array(df[col]) for col in OHLCV_COLUMNS if col in df.columns
+        }
+        self._values: Dict[str, np.ndarray] = {}
+        self._computed: List[str] = []
+
+    @staticmethod
+    def get_available_indicators() -> List[str]:
+        """获取可计算的指标列（不含内部中间结果）"""
+        return list(INDICATOR_COLUMNS)
+
+    @staticmethod
+    def plan(columns: List[str]) -> List[IndicatorNode]:
+        """
+        按依赖关系排序需要计算的节点
+
+        Args:
+            columns: 请求的指标列
+
+        Returns:
+            拓扑序的节点列表（每个节点只出现一次）
+
+        Raises:
+            ValueError: 存在未知的指标列
+        """
+        order: List[IndicatorNode] = []
+        done: Set[str] = set()
+
+        def visit(col: str) -> None:
+            node = INDICATOR_NODES.get(col)
+            if node is None:
+                raise ValueError(f"未知的指标列: {col}")
+            if node.outputs[0] in done:
+                return
+            for dep in node.inputs:
+                visit(dep)
+            done.add(node.outputs[0])
+            order.append(node)
+
+        for col in columns:
+            visit(col)
+        return order
+
+    def _evaluate(self, node: IndicatorNode, slots: Optional[Dict[str, np.ndarray]] = None) -> None:
+        """计算一个节点；slots 给出时把输出写入预分配缓冲区的对应列"""
+        if node.outputs[0] in self._values:
+            results = tuple(self._values[col] for col in node.outputs)
+        else:
+            results = node.compute(self._bars, *(self._values[dep] for dep in node.inputs))
+            if len(node.outputs) == 1:
+                results = (results,)
+            self._computed.extend(node.outputs)
+
+        for col, values in zip(node.outputs, results):
+            if slots is not None and col in slots:
+                slot = slots[col]
+                if values is not slot:
+                    slot[:] = values
+                values = slot
+            self._values[col] = values
+
+    def get_indicator(self, column: str) -> np.ndarray:
+        """计算（或从缓存取出）单个指标列"""
+        for node in self.plan([column]):
+            self._evaluate(node)
+        return self._values[column]
+
+    def get_indicators(self, columns: List[str]) -> pd.DataFrame:
+        """
+        只计算指定指标列
+
+        Args:
+            columns: 指标列列表
+
+        Returns:
+            基础 OHLCV 列 + 请求的指标列（按请求顺序）
+        """
+        columns = list(dict.fromkeys(columns))
+        for node in self.plan(columns):
+            self._evaluate(node)
+
+        base_cols = [col for col in BASE_COLUMNS if col in self._df.columns]
+        indicators = pd.DataFrame({col: self._values[col] for col in columns}, index=self._df.index)
+        return pd.concat([self._df[base_cols], indicators], axis=1)
+
+    def compute_all(self) -> pd.DataFrame:
+        """
+        计算全部指标
+
+        Returns:
+            输入 DataFrame 的列 + 全部指标列（与输入同名的指标列会被替换）
+        """
+        n = len(self._df)
+        float_cols = [col for col in INDICATOR_COLUMNS if not INDICATOR_NODES[col].signal]
+        signal_cols = [col for col in INDICATOR_COLUMNS if INDICATOR_NODES[col].signal]
+
+        # 列优先布局：每列连续，转置后即 BlockManager 需要的 (k, n) 形状，包装时无需复制
+        values = np.empty((n, len(float_cols)), order="F")
+        signals = np.empty((n, len(signal_cols)), dtype=np.int64, order="F")
+        slots = {col: values[:, i] for i, col in enumerate(float_cols)}
+        slots.update({col: signals[:, i] for i, col in enumerate(signal_cols)})
+
+        for node in self.plan(INDICATOR_COLUMNS):
+            self._evaluate(node, slots)
+
+        # 以浮点缓冲区为底直接包装（不复制），再插入少量信号列和输入列；
+        # pd.concat 会把同 dtype 的块合并，等于把整个缓冲区再复制一遍
+        index = self._df.index
+        result = pd.DataFrame(values, index=index, columns=float_cols, copy=False)
+        for i, col in enumerate(signal_cols):
+            result[col] = signals[:, i]
+        base_cols = [col for col in self._df.columns if col not in slots]
+        for loc, col in enumerate(base_cols):
+            result.insert(loc, col, self._df[col])
+        return result
+
+    def get_computed_columns(self) -> List[str]:
+        """获取已计算的列（含中间结果，按计算顺序）"""
+        return list(self._computed)
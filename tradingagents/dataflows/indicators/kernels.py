@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+指标计算内核
+所有函数接收并返回 float64 NumPy 数组（与输入等长，窗口不足的行为 NaN），
+不创建 DataFrame。指标类（MovingAverageIndicators 等）和 IndicatorEngine 共用这些内核。
+
+输入可以是一维 (时间,) 或二维 (时间, 股票) 数组，时间始终在第 0 轴；
+二维时每列的结果与单独计算该列逐位一致（见 PanelIndicatorEngine）。
+
+滚动均值/标准差/极值和 EWM 借用 pandas 的实现（在 Series 视图上计算，不复制数据），
+结果与原先在 DataFrame 列上调用 rolling()/ewm() 逐位一致。
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.indexers import BaseIndexer
+
+from .rolling import rolling_linear_fit, rolling_mean_abs_dev
+
+
+def as_float_array(values) -> np.ndarray:
+    """转换为 float64 数组（已是 float64 时不复制）"""
+    if isinstance(values, pd.Series):
+        return values.to_numpy(dtype=float)
+    return np.asarray(values, dtype=float)
+
+
+# ==================== 基础变换 ====================
+
+def shift(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """向后平移 periods 行，前 periods 行为 NaN（同 Series.shift）"""
+    out = np.full(values.shape, np.nan)
+    if periods < len(values):
+        out[periods:] = values[:len(values) - periods]
+    return out
+
+
+def diff(values: np.ndarray) -> np.ndarray:
+    """一阶差分，首行为 NaN（同 Series.diff）"""
+    out = np.empty(values.shape)
+    out[:1] = np.nan
+    np.subtract(values[1:], values[:-1], out=out[1:])
+    return out
+
+
+def pct_change(values: np.ndarray) -> np.ndarray:
+    """变化率 x / x.shift() - 1"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return values / shift(values) - 1
+
+
+class _PanelWindowIndexer(BaseIndexer):
+    """
+    (时间, 股票) 面板按股票展平后的固定窗口（length 为每只股票的行数）
+
+    窗口不跨股票；每只股票首行的窗口与上一行不重叠，pandas 在此重置累加器，
+    所以一次调用的结果与逐列 rolling(window) 逐位一致
+    """
+
+    def get_window_bounds(self, num_values=0, min_periods=None, center=None, closed=None, step=None):
+        end = np.arange(1, num_values + 1, dtype=np.int64)
+        column_start = np.arange(num_values, dtype=np.int64) // self.length * self.length
+        return np.maximum(end - self.window_size, column_start), end
+
+
+def _rolling(values: np.ndarray, window: int, method: str) -> np.ndarray:
+    if values.ndim == 1:
+        return getattr(pd.Series(values, copy=False).rolling(window=window), method)().to_numpy()
+    # 二维：展平成一条序列，只调用一次 pandas（DataFrame.rolling 会逐列调用）
+    n, m = values.shape
+    flat = pd.Series(values.T.ravel())
+    indexer = _PanelWindowIndexer(window_size=window, length=n)
+    result = getattr(flat.rolling(indexer, min_periods=window), method)().to_numpy()
+    return result.reshape(m, n).T
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling(values, window, "mean")
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling(values, window, "sum")
+
+
+def rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling(values, window, "std")
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling(values, window, "max")
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling(values, window, "min")
+
+
+def _frame(values: np.ndarray):
+    """零复制包装为 Series（一维）或 DataFrame（二维，逐列计算）"""
+    if values.ndim == 1:
+        return pd.Series(values, copy=False)
+    return pd.DataFrame(values, copy=False)
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """指数移动平均（adjust=False）"""
+    return _frame(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def wilder_mean(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder 平滑（alpha = 1/period，前 period-1 行为 NaN）"""
+    return _frame(values).ewm(
+        alpha=1.0 / period, adjust=False, min_periods=period
+    ).mean().to_numpy()
+
+
+def ratio_pct(values: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """(values - reference) / reference * 100"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (values - reference) / reference * 100
+
+
+# ==================== 移动平均 / 波动 ====================
+
+def bollinger(
+    close: np.ndarray,
+    mid: np.ndarray,
+    period: int = 20,
+    std_multiplier: float = 2.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    布林带上下轨与带宽
+
+    Args:
+        close: 收盘价
+        mid: 中轨（period 日 SMA）
+
+    Returns:
+        (上轨, 下轨, 带宽)
+    """
+    std = rolling_std(close, period)
+    upper = mid + (std * std_multiplier)
+    lower = mid - (std * std_multiplier)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        width = (upper - lower) / mid
+    return upper, lower, width
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """真实波幅（首行没有前收盘价，取 high - low）"""
+    prev_close = shift(close)
+    high_close = np.abs(high - prev_close)
+    low_close = np.abs(low - prev_close)
+    return np.fmax(np.fmax(high - low, high_close), low_close)
+
+
+def atr_pct(atr: np.ndarray, close: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (atr / close) * 100
+
+
+def annualized_volatility(returns: np.ndarray, window: int, periods_per_year: int) -> np.ndarray:
+    return rolling_std(returns, window) * np.sqrt(periods_per_year)
+
+
+# ==================== 动量 ====================
+
+def rsi(close: np.ndarray, period: int = 14, wilder: bool = False) -> np.ndarray:
+    """
+    相对强弱指数
+
+    Args:
+        wilder: False 使用简单滑动平均（默认）；True 使用 Wilder 平滑
+    """
+    delta = diff(close)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = -np.where(delta < 0, delta, 0.0)
+    smooth = wilder_mean if wilder else rolling_mean
+    avg_gain = smooth(gain, period)
+    avg_loss = smooth(loss, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+def macd(
+    fast_ema: np.ndarray,
+    slow_ema: np.ndarray,
+    signal: int = 9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD
+
+    Returns:
+        (MACD线, 信号线, 柱状图)
+    """
+    line = fast_ema - slow_ema
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def adx(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = 14,
+    wilder: bool = False
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    平均趋向指数
+
+    Args:
+        wilder: False 使用简单滑动平均（默认）；True 使用 Wilder 平滑
+
+    Returns:
+        (ADX, +DI, -DI)
+    """
+    prev_close = shift(close)
+
+    # +DM / -DM
+    high_diff = diff(high)
+    low_diff = -diff(low)
+    plus_dm = np.where((high_diff > low_diff) & (high_diff > 0), high_diff, 0.0)
+    minus_dm = np.where((low_diff > high_diff) & (low_diff > 0), low_diff, 0.0)
+
+    # 真实波幅（缺少前收盘价的行只取 high - low）
+    high_close = np.nan_to_num(np.abs(high - prev_close), nan=0.0)
+    low_close = np.nan_to_num(np.abs(low - prev_close), nan=0.0)
+    tr = np.maximum(np.maximum(high - low, high_close), low_close)
+
+    smooth = wilder_mean if wilder else rolling_mean
+    atr = smooth(tr, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = 100 * (smooth(plus_dm, period) / atr)
+        minus_di = 100 * (smooth(minus_dm, period) / atr)
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return smooth(dx, period), plus_di, minus_di
+
+
+def cmo(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """钱德动量摆动指标"""
+    delta = diff(close)
+    gain = rolling_sum(np.where(delta > 0, delta, 0.0), period)
+    loss = -rolling_sum(np.where(delta < 0, delta, 0.0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 * (gain - loss) / (gain + loss)
+
+
+def typical_price(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    return (high + low + close) / 3
+
+
+def mfi(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    period: int = 14
+) -> np.ndarray:
+    """资金流量指标"""
+    tp = typical_price(high, low, close)
+    money_flow = tp * volume
+    delta = diff(tp)
+    positive_flow = rolling_sum(np.where(delta > 0, money_flow, 0.0), period)
+    negative_flow = rolling_sum(np.where(delta < 0, money_flow, 0.0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - (100 / (1 + positive_flow / negative_flow))
+
+
+def cci(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 20, constant: float = 0.015) -> np.ndarray:
+    """顺势指标"""
+    tp = typical_price(high, low, close)
+    sma_tp, mad = rolling_mean_abs_dev(tp, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (tp - sma_tp) / (constant * mad)
+
+
+def roc(close: np.ndarray, period: int) -> np.ndarray:
+    """变化率（百分比）"""
+    return ratio_pct(close, shift(close, period))
+
+
+# ==================== 成交量 ====================
+
+def vwma(close: np.ndarray, volume: np.ndarray, period: int = 20) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return rolling_sum(close * volume, period) / rolling_sum(volume, period)
+
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    return np.cumsum(np.nan_to_num(np.sign(diff(close)) * volume, nan=0.0), axis=0)
+
+
+def safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return numerator / denominator
+
+
+# ==================== 趋势 ====================
+
+def range_position(close: np.ndarray, resistance: np.ndarray, support: np.ndarray) -> np.ndarray:
+    """当前价格在压力/支撑区间中的相对位置"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (close - support) / (resistance - support)
+
+
+def linear_slope(close: np.ndarray, window: int) -> np.ndarray:
+    slope, _ = rolling_linear_fit(close, window)
+    return slope
+
+
+def linear_prediction(close: np.ndarray, window: int) -> np.ndarray:
+    slope, intercept = rolling_linear_fit(close, window)
+    return intercept + slope * window
+
+
+# ==================== 信号（int64） ====================
+
+def cross(fast: np.ndarray, slow: np.ndarray) -> np.ndarray:
+    """上穿为 1，下穿为 -1，否则为 0"""
+    prev_fast = shift(fast)
+    prev_slow = shift(slow)
+    return np.where(
+        (fast > slow) & (prev_fast <= prev_slow),
+        1,
+        np.where((fast < slow) & (prev_fast >= prev_slow), -1, 0),
+    ).astype(np.int64)
+
+
+def flag(condition: np.ndarray) -> np.ndarray:
+    """布尔条件转为 0/1"""
+    return condition.astype(np.int64)
@@ -8,32 +8,26 @@ import numpy as np
 import pandas as pd
 from typing import Tuple
 
+from . import kernels
+
 
 class MomentumIndicators:
     """动量指标计算器"""
     
     @staticmethod
-    def calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
+    def calculate_rsi(prices: pd.Series, period: int = 14, wilder: bool = False) -> pd.Series:
         """
         计算相对强弱指数 (RSI)
         
         Args:
             prices: 价格序列
             period: 周期，默认 14
+            wilder: False 使用简单滑动平均（默认）；True 使用 Wilder 平滑
             
         Returns:
             RSI 序列
         """
-        delta = prices.diff()
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-        
-        avg_gain = gain.rolling(window=period).mean()
-        avg_loss = loss.rolling(window=period).mean()
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
+        rsi = pd.Series(kernels.rsi(kernels.as_float_array(prices), period, wilder), index=prices.index)
         return rsi
     
     @staticmethod
@@ -55,48 +49,41 @@ class MomentumIndicators:
         Returns:
             (MACD线, 信号线, MACD柱状图)
         """
-        ema_fast = prices.ewm(span=fast, adjust=False).mean()
-        ema_slow = prices.ewm(span=slow, adjust=False).mean()
-        
-        macd = ema_fast - ema_slow
-        macd_signal = macd.ewm(span=signal, adjust=False).mean()
-        macd_hist = macd - macd_signal
-        
+        values = kernels.as_float_array(prices)
+        macd, macd_signal, macd_hist = (
+            pd.Series(series, index=prices.index)
+            for series in kernels.macd(kernels.ema(values, fast), kernels.ema(values, slow), signal)
+        )
         return macd, macd_signal, macd_hist
     
     @staticmethod
-    def calculate_adx(df: pd.DataFrame, period: int = 14) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    def calculate_adx(
+        df: pd.DataFrame,
+        period: int = 14,
+        wilder: bool = False
+    ) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """
         计算平均趋向指数 (ADX)
         
         Args:
             df: 包含 high, low, close 列的 DataFrame
             period: 周期，默认 14
+            wilder: False 使用简单滑动平均（默认，与历史输出一致）；
+                True 使用 Wilder 平滑（alpha = 1/period）
             
         Returns:
             (ADX, +DI, -DI)
         """
-        high_diff = df["high"].diff()
-        low_diff = -df["low"].diff()
-        
-        plus_dm = np.where((high_diff > low_diff) & (high_diff > 0), high_diff, 0)
-        minus_dm = np.where((low_diff > high_diff) & (low_diff > 0), low_diff, 0)
-        
-        tr_series = pd.Series([
-            max(
-                df["high"].iloc[i] - df["low"].iloc[i],
-                abs(df["high"].iloc[i] - df["close"].iloc[i-1]) if i > 0 else 0,
-                abs(df["low"].iloc[i] - df["close"].iloc[i-1]) if i > 0 else 0
+        adx, plus_di, minus_di = (
+            pd.Series(series, index=df.index)
+            for series in kernels.adx(
+                kernels.as_float_array(df["high"]),
+                kernels.as_float_array(df["low"]),
+                kernels.as_float_array(df["close"]),
+                period,
+                wilder,
             )
-            for i in range(len(df))
-        ], index=df.index)
-        
-        atr = tr_series.rolling(window=period).mean()
-        plus_di = 100 * (pd.Series(plus_dm, index=df.index).rolling(window=period).mean() / atr)
-        minus_di = 100 * (pd.Series(minus_dm, index=df.index).rolling(window=period).mean() / atr)
-        
-        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
-        adx = dx.rolling(window=period).mean()
+        )
         
         return adx, plus_di, minus_di
     
@@ -112,11 +99,7 @@ class MomentumIndicators:
         Returns:
             CMO 序列
         """
-        delta = prices.diff()
-        gain = delta.where(delta > 0, 0).rolling(window=period).sum()
-        loss = -delta.where(delta < 0, 0).rolling(window=period).sum()
-        
-        cmo = 100 * (gain - loss) / (gain + loss)
+        cmo = pd.Series(kernels.cmo(kernels.as_float_array(prices), period), index=prices.index)
         return cmo
     
     @staticmethod
@@ -131,12 +114,14 @@ class MomentumIndicators:
         Returns:
             MFI 序列
         """
-        typical_price = (df["high"] + df["low"] + df["close"]) / 3
-        money_flow = typical_price * df["volume"]
-        
-        delta = typical_price.diff()
-        positive_flow = money_flow.where(delta > 0, 0).rolling(window=period).sum()
-        negative_flow = money_flow.where(delta < 0, 0).rolling(window=period).sum()
-        
-        mfi = 100 - (100 / (1 + positive_flow / negative_flow))
+        mfi = pd.Series(
+            kernels.mfi(
+                kernels.as_float_array(df["high"]),
+                kernels.as_float_array(df["low"]),
+                kernels.as_float_array(df["close"]),
+                kernels.as_float_array(df["volume"]),
+                period,
+            ),
+            index=df.index,
+        )
         return mfi
@@ -8,6 +8,8 @@ import numpy as np
 import pandas as pd
 from typing import Tuple
 
+from . import kernels
+
 
 class MovingAverageIndicators:
     """移动平均线指标计算器"""
@@ -27,8 +29,9 @@ class MovingAverageIndicators:
         if not inplace:
             df = df.copy()
         
+        close = kernels.as_float_array(df["close"])
         for period in [5, 10, 20, 50, 100, 200]:
-            df[f"close_{period}_sma"] = df["close"].rolling(window=period).mean()
+            df[f"close_{period}_sma"] = kernels.rolling_mean(close, period)
         
         return df
     
@@ -47,8 +50,9 @@ class MovingAverageIndicators:
         if not inplace:
             df = df.copy()
         
+        close = kernels.as_float_array(df["close"])
         for period in [5, 10, 20, 50, 100, 200]:
-            df[f"close_{period}_ema"] = df["close"].ewm(span=period, adjust=False).mean()
+            df[f"close_{period}_ema"] = kernels.ema(close, period)
         
         return df
     
@@ -69,13 +73,13 @@ class MovingAverageIndicators:
         if not inplace:
             df = df.copy()
         
-        sma = df["close"].rolling(window=period).mean()
-        std = df["close"].rolling(window=period).std()
-        
+        close = kernels.as_float_array(df["close"])
+        sma = kernels.rolling_mean(close, period)
+        upper, lower, width = kernels.bollinger(close, sma, period, std_multiplier)
         df["boll"] = sma
-        df["boll_ub"] = sma + (std * std_multiplier)
-        df["boll_lb"] = sma - (std * std_multiplier)
-        df["boll_width"] = (df["boll_ub"] - df["boll_lb"]) / df["boll"]
+        df["boll_ub"] = upper
+        df["boll_lb"] = lower
+        df["boll_width"] = width
         
         return df
     
@@ -95,14 +99,10 @@ class MovingAverageIndicators:
         if not inplace:
             df = df.copy()
         
-        high_low = df["high"] - df["low"]
-        high_close = np.abs(df["high"] - df["close"].shift())
-        low_close = np.abs(df["low"] - df["close"].shift())
-        
-        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = tr.rolling(window=period).mean()
-        
+        close = kernels.as_float_array(df["close"])
+        tr = kernels.true_range(kernels.as_float_array(df["high"]), kernels.as_float_array(df["low"]), close)
+        atr = kernels.rolling_mean(tr, period)
         df["atr"] = atr
-        df["atr_pct"] = (df["atr"] / df["close"]) * 100
+        df["atr_pct"] = kernels.atr_pct(atr, close)
         
         return df
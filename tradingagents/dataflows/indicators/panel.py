@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+多股票面板指标计算
+==================
+把多只股票的 OHLCV 排成 (时间, 股票) 的二维数组，每个指标节点只调用一次内核，
+而不是每只股票各走一遍 IndicatorEngine——筛选 500+ 只股票时，逐只重复的 pandas
+调用开销远大于实际计算量。
+
+对齐方式（align）:
+- "bars"（默认）: 每只股票从第 0 行开始放自己的 K 线，较短的序列在尾部补 NaN。
+  所有内核都是因果的（只看当前及之前的行），尾部填充不影响有效行，
+  结果与逐只调用 IndicatorEngine(df).compute_all() 逐位一致
+- "calendar": 所有股票对齐到时间戳并集（有 timestamp 列用该列，否则用索引），
+  缺失日期补 NaN K 线。结果等于对 df.reindex(日历) 逐只计算，每只股票都返回完整日历的行，
+  方便按日期做横截面筛选
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from ..indicator_groups import BASE_COLUMNS
+from . import kernels as k
+from .engine import (
+    INDICATOR_COLUMNS,
+    INDICATOR_NODES,
+    OHLCV_COLUMNS,
+    IndicatorEngine,
+)
+
+ALIGN_MODES = ("bars", "calendar")
+
+
+def _align_to_calendar(ohlcv: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """把每只股票重建索引到时间戳并集上"""
+    use_column = all("timestamp" in df.columns for df in ohlcv.values())
+    keys = {
+        symbol: pd.Index(df["timestamp"] if use_column else df.index)
+        for symbol, df in ohlcv.items()
+    }
+    for symbol, key in keys.items():
+        if not key.is_unique:
+            raise ValueError(f"{symbol} 的时间戳存在重复，无法按日历对齐")
+
+    calendar = pd.Index([])
+    for key in keys.values():
+        calendar = calendar.union(key)
+
+    aligned = {}
+    for symbol, df in ohlcv.items():
+        if use_column:
+            reindexed = df.set_index("timestamp").reindex(calendar)
+            reindexed.index.name = "timestamp"
+            aligned[symbol] = reindexed.reset_index()[list(df.columns)]
+        else:
+            aligned[symbol] = df.reindex(calendar)
+    return aligned
+
+
+class PanelIndicatorEngine(IndicatorEngine):
+    """
+    (时间, 股票) 面板上的指标引擎
+
+    与 IndicatorEngine 共用依赖图和节点求值；get_indicator() 返回 (时间, 股票) 二维数组，
+    compute_all() / get_indicators() 返回 {股票代码: DataFrame}
+
+    Examples:
+        >>> engine = PanelIndicatorEngine({'AAPL': df_aapl, 'MSFT': df_msft})
+        >>> frames = engine.compute_all()
+        >>> engine.get_indicator('rsi')[-1]  # 最后一行各股票的 RSI（align="calendar" 时为同一日期）
+    """
+
+    def __init__(self, ohlcv: Dict[str, pd.DataFrame], align: str = "bars"):
+        """
+        Args:
+            ohlcv: {股票代码: OHLCV DataFrame}（列名小写，按时间排序）
+            align: "bars" 或 "calendar"，见模块说明
+        """
+        if align not in ALIGN_MODES:
+            raise ValueError(f"未知的对齐方式: {align}，可选: {ALIGN_MODES}")
+
+        self.symbols: List[str] = list(ohlcv)
+        self.align = align
+        frames = _align_to_calendar(ohlcv) if align == "calendar" else dict(ohlcv)
+        self._frames: List[pd.DataFrame] = [frames[symbol] for symbol in self.symbols]
+        self._length = max((len(df) for df in self._frames), default=0)
+
+        self._bars: Dict[str, np.ndarray] = {}
+        for col in OHLCV_COLUMNS:
+            if self._frames and all(col in df.columns for df in self._frames):
+                panel = np.full((self._length, len(self._frames)), np.nan)
+                for j, df in enumerate(self._frames):
+                    panel[:len(df), j] = k.as_float_array(df[col])
+                self._bars[col] = panel
+        self._values: Dict[str, np.ndarray] = {}
+        self._computed: List[str] = []
+
+    @classmethod
+    def from_bars(cls, bars: Dict[str, np.ndarray]) -> "PanelIndicatorEngine":
+        """
+        直接由 (时间, 股票) 的 OHLCV 数组构建，不经过 DataFrame（如共享内存中的面板）
+
+        各股票从第 0 行开始、尾部补 NaN（同 align="bars"）；没有股票代码和输入 DataFrame，
+        只能用 get_indicator() 取数组结果
+
+        Args:
+            bars: {OHLCV 列名: (时间, 股票) float64 数组}
+        """
+        engine = cls({})
+        engine._bars = {col: bars[col] for col in OHLCV_COLUMNS if col in bars}
+        engine._length = max((len(values) for values in engine._bars.values()), default=0)
+        return engine
+
+    def get_indicators(self, columns: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        只计算指定指标列
+
+        Args:
+            columns: 指标列列表
+
+        Returns:
+            {股票代码: 基础 OHLCV 列 + 请求的指标列}
+        """
+        columns = list(dict.fromkeys(columns))
+        if not self.symbols:
+            return {}
+        for node in self.plan(columns):
+            self._evaluate(node)
+
+        result = {}
+        for j, (symbol, df) in enumerate(zip(self.symbols, self._frames)):
+            n = len(df)
+            base_cols = [col for col in BASE_COLUMNS if col in df.columns]
+            indicators = pd.DataFrame(
+                {col: self._values[col][:n, j] for col in columns}, index=df.index
+            )
+            result[symbol] = pd.concat([df[base_cols], indicators], axis=1)
+        return result
+
+    def compute_all(self) -> Dict[str, pd.DataFrame]:
+        """
+        计算全部指标
+
+        Returns:
+            {股票代码: 输入列 + 全部指标列}，与逐只调用 IndicatorEngine(df).compute_all() 相同
+        """
+        n_symbols = len(self._frames)
+        if n_symbols == 0:
+            return {}
+        float_cols = [col for col in INDICATOR_COLUMNS if not INDICATOR_NODES[col].signal]
+        signal_cols = [col for col in INDICATOR_COLUMNS if INDICATOR_NODES[col].signal]
+
+        # (股票, 列, 时间) 布局：每只股票的 [j, :, :n].T 是列连续的 (n, k) 视图；
+        # 每个指标列的 [:, i, :].T 是 (时间, 股票) 视图，供内核一次写入所有股票
+        values = np.empty((n_symbols, len(float_cols), self._length))
+        signals = np.empty((n_symbols, len(signal_cols), self._length), dtype=np.int64)
+        slots = {col: values[:, i, :].T for i, col in enumerate(float_cols)}
+        slots.update({col: signals[:, i, :].T for i, col in enumerate(signal_cols)})
+
+        for node in self.plan(INDICATOR_COLUMNS):
+            self._evaluate(node, slots)
+
+        # 每只股票的 DataFrame 很小，一次 concat 比 assemble_frame 逐列 insert 快一个数量级
+        indicator_cols = set(INDICATOR_COLUMNS)
+        result = {}
+        for j, (symbol, df) in enumerate(zip(self.symbols, self._frames)):
+            n = len(df)
+            base_cols = [col for col in df.columns if col not in indicator_cols]
+            result[symbol] = pd.concat([
+                df[base_cols],
+                pd.DataFrame(values[j, :, :n].T, index=df.index, columns=float_cols, copy=False),
+                pd.DataFrame(signals[j, :, :n].T, index=df.index, columns=signal_cols, copy=False),
+            ], axis=1)
+        return result
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+内容寻址的指标结果缓存
+======================
+缓存键 = sha256(引擎版本 + 请求的指标列集合 + 输入数据内容)，与股票代码、日期范围、
+文件修改时间无关：
+
+- 供应商修订了任意一根 K 线，或同一段数据换了起始日期 → 内容变化、键变化，
+  旧结果不可能被命中，不需要靠 TTL 判断新鲜度
+- 完全相同的输入（别名代码、多个进程、重复运行）直接复用同一个条目
+- 引擎版本由指标内核源码和 numpy/pandas 版本计算，代码或依赖升级后旧条目自动失效，
+  并在初始化时删除
+
+条目存为 Arrow IPC 文件（不压缩），读取时内存映射，不做 Parquet 的解码/解压；
+写入先写临时文件再原子替换，多进程并发读写同一个键是安全的。
+没有安装 pyarrow 时缓存不生效（get 总是未命中，set 不写入）。
+"""
+
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.constants import INDICATOR_RESULT_CACHE_MAX_ENTRIES
+from tradingagents.utils.logger import get_logger
+from . import engine, kernels, rolling
+from .engine import IndicatorEngine
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+logger = get_logger(__name__)
+
+
+@lru_cache(maxsize=1)
+def engine_version() -> str:
+    """指标引擎版本：内核源码 + numpy/pandas 版本的摘要（任何一项变化，计算结果都可能变化）"""
+    digest = hashlib.sha256()
+    for module in (engine, kernels, rolling):
+        digest.update(Path(module.__file__).read_bytes())
+    digest.update(f"numpy={np.__version__};pandas={pd.__version__}".encode())
+    return digest.hexdigest()[:16]
+
+
+def fingerprint(df: pd.DataFrame, columns: Optional[List[str]] = None) -> str:
+    """
+    计算缓存键
+
+    Args:
+        df: 输入数据（全部列和索引都参与哈希，因为结果中包含输入列）
+        columns: 请求的指标列，None 表示全部指标；只看集合，不看顺序
+    """
+    digest = hashlib.sha256(engine_version().encode())
+    digest.update(("*" if columns is None else "\0".join(sorted(set(columns)))).encode())
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class IndicatorResultCache:
+    """
+    内容寻址的指标结果缓存
+
+    使用示例:
+        >>> cache = IndicatorResultCache("/tmp/indicator_results")
+        >>> result = cache.get_or_compute(df, ['macd', 'rsi'])  # 首次计算并写入
+        >>> result = cache.get_or_compute(df, ['rsi', 'macd'])  # 命中（列顺序按本次请求）
+    """
+
+    # 每写入多少次检查一次条目数量
+    PRUNE_INTERVAL = 32
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: int = INDICATOR_RESULT_CACHE_MAX_ENTRIES):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录
+            max_entries: 最多保留的条目数，超出后按最近使用时间淘汰
+        """
+        if cache_dir is None:
+            cache_dir = Path(__file__).parent.parent / "indicator_cache" / "results"
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._version = engine_version()
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._remove_other_versions()
+
+    def _get_cache_path(self, key: str) -> Path:
+        """获取缓存文件路径（文件名带引擎版本，便于清理旧版本条目）"""
+        return self.cache_dir / f"{self._version}-{key}.arrow"
+
+    def get(self, df: pd.DataFrame, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        读取缓存的指标结果
+
+        Args:
+            df: 输入数据
+            columns: 请求的指标列（None 表示全部）
+
+        Returns:
+            与 IndicatorEngine 输出相同的 DataFrame，未命中返回 None
+        """
+        if not HAS_PYARROW:
+            return None
+
+        cache_path = self._get_cache_path(fingerprint(df, columns))
+        try:
+            with pa.memory_map(str(cache_path), "r") as source:
+                result = pa_ipc.open_file(source).read_all().to_pandas()
+        except FileNotFoundError:
+            return None
+        except (OSError, pa.ArrowException) as e:
+            logger.debug("指标缓存条目损坏，已删除: %s (%s)", cache_path.name, e)
+            cache_path.unlink(missing_ok=True)
+            return None
+
+        # 更新访问时间，用于按最近使用淘汰
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+
+        if columns is not None:
+            requested = list(dict.fromkeys(columns))
+            requested_set = set(requested)
+            ordered = [col for col in result.columns if col not in requested_set] + requested
+            if ordered != list(result.columns):
+                result = result[ordered]
+        return result
+
+    def set(self, df: pd.DataFrame, result: pd.DataFrame, columns: Optional[List[str]] = None):
+        """
+        保存指标结果
+
+        Args:
+            df: 输入数据
+            result: 指标计算结果
+            columns: 请求的指标列（None 表示全部）
+        """
+        if not HAS_PYARROW:
+            return
+
+        cache_path = self._get_cache_path(fingerprint(df, columns))
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            table = pa.Table.from_pandas(result, preserve_index=True)
+            with pa.OSFile(str(tmp_path), "wb") as sink:
+                with pa_ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError, pa.ArrowException) as e:
+            logger.debug("写入指标缓存失败: %s", e)
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            self._writes += 1
+            should_prune = self._writes % self.PRUNE_INTERVAL == 0
+        if should_prune:
+            self._prune()
+
+    def get_or_compute(self, df: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        命中则读取，否则用 IndicatorEngine 计算并写入
+
+        Args:
+            df: 输入数据
+            columns: 指标列，None 表示全部（compute_all），否则同 get_indicators(columns)
+        """
+        result = self.get(df, columns)
+        if result is not None:
+            return result
+
+        indicator_engine = IndicatorEngine(df)
+        result = indicator_engine.compute_all() if columns is None else indicator_engine.get_indicators(columns)
+        self.set(df, result, columns)
+        return result
+
+    def clear(self):
+        """清除所有条目"""
+        for file in self.cache_dir.glob("*.arrow"):
+            file.unlink(missing_ok=True)
+
+    def _prune(self):
+        """条目超过 max_entries 时按最近使用时间淘汰到 90%"""
+        entries = []
+        for file in self.cache_dir.glob("*.arrow"):
+            try:
+                entries.append((file.stat().st_mtime, file))
+            except OSError:
+                pass
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort()
+        for _, file in entries[:len(entries) - int(self.max_entries * 0.9)]:
+            file.unlink(missing_ok=True)
+
+    def _remove_other_versions(self):
+        """删除其他引擎版本写入的条目（它们不会再被命中）"""
+        for file in self.cache_dir.glob("*.arrow"):
+            if not file.name.startswith(f"{self._version}-"):
+                file.unlink(missing_ok=True)
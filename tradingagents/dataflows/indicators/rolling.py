@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+向量化滚动窗口内核
+基于 sliding_window_view 的跨步窗口，替代 rolling(...).apply(python_callback)
+
+输入可以是一维 (时间,) 或二维 (时间, 股票) 数组，窗口沿第 0 轴滑动
+"""
+
+from typing import Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sliding_windows(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    返回形状为 ([股票数,] n - window + 1, window) 的只读窗口视图
+
+    二维输入先转为 (股票数, 时间) 的连续数组：每只股票的窗口在内存中连续，
+    归约顺序与一维输入相同，所以每列结果与单独计算该列逐位一致。
+    数据长度不足一个窗口时返回窗口数为 0 的空数组
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim > 1:
+        values = np.ascontiguousarray(np.moveaxis(values, 0, -1))
+    if values.shape[-1] < window:
+        return np.empty(values.shape[:-1] + (0, window))
+    return sliding_window_view(values, window, axis=-1)
+
+
+def _pad(values: np.ndarray, window: int, n: int) -> np.ndarray:
+    """时间轴移回第 0 轴，前 window - 1 行补 NaN，与 rolling(window) 的对齐方式一致"""
+    values = np.moveaxis(values, -1, 0)
+    out = np.full((n,) + values.shape[1:], np.nan)
+    out[window - 1:] = values
+    return out
+
+
+def rolling_linear_fit(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    每个窗口对 x = 0..window-1 做最小二乘直线拟合
+
+    slope = Σ(x - x̄)·y / Σ(x - x̄)²，intercept = ȳ - slope·x̄。
+    使用中心化 x 的窗口点积而不是 x、y、xy 的累计和：累计和在长序列上
+    相减会损失精度（5000 根 K 线时误差可达 1e-8），点积与 np.polyfit 的差异在 1e-12 量级。
+
+    Args:
+        values: 价格数组
+        window: 窗口长度（>= 2）
+
+    Returns:
+        (slope, intercept)，长度与 values 相同，前 window - 1 行为 NaN；
+        含 NaN 的窗口结果为 NaN
+    """
+    n = len(values)
+    windows = sliding_windows(values, window)
+    x = np.arange(window, dtype=float)
+    x_mean = x.mean()
+    x_centered = x - x_mean
+
+    slope = windows @ x_centered / (x_centered @ x_centered)
+    intercept = windows.mean(axis=-1) - slope * x_mean
+    return _pad(slope, window, n), _pad(intercept, window, n)
+
+
+def rolling_mean_abs_dev(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    滚动均值与平均绝对偏差 mean(|x - mean(x)|)
+
+    Args:
+        values: 数值数组
+        window: 窗口长度
+
+    Returns:
+        (mean, mad)，长度与 values 相同，前 window - 1 行为 NaN
+    """
+    n = len(values)
+    windows = sliding_windows(values, window)
+    mean = windows.mean(axis=-1)
+    # 偏差矩阵原地取绝对值，只分配一次 ([股票数,] n, window) 的临时数组
+    deviations = windows - mean[..., None]
+    np.abs(deviations, out=deviations)
+    return _pad(mean, window, n), _pad(deviations.sum(axis=-1) / window, window, n)
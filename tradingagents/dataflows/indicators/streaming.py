@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+流式指标
+========
+每个对象持有可 JSON 序列化的状态（to_state / from_state），update() 每次消费一根 K 线，
+时间复杂度 O(1)。用于实盘/每日更新：按股票持久化状态后，新的一根 K 线只需几十微秒，
+不再回看历史窗口重算。
+
+逐位一致性：输出与 kernels.py 的批量计算完全相同（不是近似）。
+- RollingMean / RollingStd 复现 pandas rolling 的在线算法（Kahan 补偿求和、Welford 方差、
+  连续相同值修正），窗口用环形缓冲区保存
+- EMA 复现 pandas ewm(adjust=False) 的递推公式（含 NaN 处理和 min_periods）
+- 其余指标按与内核相同的运算顺序组合以上原语
+
+前提是状态从序列的第一根 K 线开始累积；数据被供应商修订时需要丢弃状态重新计算。
+"""
+
+import math
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import pandas as pd
+
+NAN = float("nan")
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    """与 NumPy 一致的除法：除零返回 ±inf / NaN 而不是抛异常"""
+    try:
+        return float(numerator) / float(denominator)
+    except ZeroDivisionError:
+        if numerator != numerator or numerator == 0:
+            return NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+
+
+def _fmax(a: float, b: float) -> float:
+    """同 np.fmax：忽略 NaN"""
+    if a != a:
+        return b
+    if b != b:
+        return a
+    return a if a >= b else b
+
+
+def _maximum(a: float, b: float) -> float:
+    """同 np.maximum：传播 NaN"""
+    if a != a or b != b:
+        return NAN
+    return a if a >= b else b
+
+
+class StreamingIndicator:
+    """
+    流式指标基类
+
+    子类声明:
+        _params: 构造参数（随状态保存，用于重建对象）
+        _fields: 可变状态字段（仅含 float/int/list/None）
+        _children: 嵌套的流式指标
+    """
+
+    _params: Tuple[str, ...] = ()
+    _fields: Tuple[str, ...] = ()
+    _children: Tuple[str, ...] = ()
+
+    def to_state(self) -> Dict[str, Any]:
+        """导出可 JSON 序列化的状态"""
+        state: Dict[str, Any] = {}
+        for name in self._params + self._fields:
+            value = getattr(self, name)
+            state[name] = list(value) if isinstance(value, list) else value
+        for name in self._children:
+            state[name] = getattr(self, name).to_state()
+        return state
+
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any]) -> "StreamingIndicator":
+        """从 to_state() 的结果恢复"""
+        obj = cls(**{name: state[name] for name in cls._params})
+        for name in cls._fields:
+            value = state[name]
+            setattr(obj, name, list(value) if isinstance(value, list) else value)
+        for name in cls._children:
+            child = getattr(obj, name)
+            setattr(obj, name, type(child).from_state(state[name]))
+        return obj
+
+
+# ==================== 滚动窗口（环形缓冲区） ====================
+
+class _RollingWindow(StreamingIndicator):
+    """固定窗口的环形缓冲区；push() 返回被挤出窗口的值"""
+
+    _params = ("window",)
+
+    def __init__(self, window: int):
+        self.window = window
+        self.buffer: List[float] = [NAN] * window
+        self.pos = 0
+        self.count = 0
+
+    def _push(self, value: float) -> Optional[float]:
+        evicted = self.buffer[self.pos] if self.count >= self.window else None
+        self.buffer[self.pos] = value
+        self.pos = (self.pos + 1) % self.window
+        self.count += 1
+        return evicted
+
+
+class RollingMean(_RollingWindow):
+    """简单移动平均，与 Series.rolling(window).mean() 逐位一致"""
+
+    _fields = (
+        "buffer", "pos", "count", "nobs", "sum_x", "compensation_add",
+        "compensation_remove", "neg_ct", "num_consecutive_same_value", "prev_value",
+    )
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self.nobs = 0
+        self.sum_x = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.neg_ct = 0
+        self.num_consecutive_same_value = 0
+        self.prev_value: Optional[float] = None
+
+    def update(self, value: float) -> float:
+        if self.count == 0:
+            self.prev_value = value
+        evicted = self._push(value)
+        if evicted is not None and evicted == evicted:
+            self.nobs -= 1
+            y = -evicted - self.compensation_remove
+            t = self.sum_x + y
+            self.compensation_remove = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, evicted) < 0:
+                self.neg_ct -= 1
+        if value == value:
+            self.nobs += 1
+            y = value - self.compensation_add
+            t = self.sum_x + y
+            self.compensation_add = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, value) < 0:
+                self.neg_ct += 1
+            if value == self.prev_value:
+                self.num_consecutive_same_value += 1
+            else:
+                self.num_consecutive_same_value = 1
+            self.prev_value = value
+
+        if self.nobs < self.window or self.nobs == 0:
+            return NAN
+        if self.num_consecutive_same_value >= self.nobs:
+            return self.prev_value
+        result = self.sum_x / self.nobs
+        if self.neg_ct == 0 and result < 0:
+            return 0.0
+        if self.neg_ct == self.nobs and result > 0:
+            return 0.0
+        return result
+
+
+class RollingStd(_RollingWindow):
+    """样本标准差（ddof=1），与 Series.rolling(window).std() 逐位一致"""
+
+    _fields = (
+        "buffer", "pos", "count", "nobs", "mean_x", "ssqdm_x", "compensation_add",
+        "compensation_remove", "num_consecutive_same_value", "prev_value",
+    )
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self.nobs = 0
+        self.mean_x = 0.0
+        self.ssqdm_x = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.num_consecutive_same_value = 0
+        self.prev_value: Optional[float] = None
+
+    def update(self, value: float) -> float:
+        if self.count == 0:
+            self.prev_value = value
+        evicted = self._push(value)
+        if evicted is not None and evicted == evicted:
+            self.nobs -= 1
+            if self.nobs:
+                prev_mean = self.mean_x - self.compensation_remove
+                y = evicted - self.compensation_remove
+                t = y - self.mean_x
+                self.compensation_remove = t + self.mean_x - y
+                self.mean_x = self.mean_x - t / self.nobs
+                self.ssqdm_x = self.ssqdm_x - (evicted - prev_mean) * (evicted - self.mean_x)
+            else:
+                self.mean_x = 0.0
+                self.ssqdm_x = 0.0
+        if value == value:
+            self.nobs += 1
+            if value == self.prev_value:
+                self.num_consecutive_same_value += 1
+            else:
+                self.num_consecutive_same_value = 1
+            self.prev_value = value
+            prev_mean = self.mean_x - self.compensation_add
+            y = value - self.compensation_add
+            t = y - self.mean_x
+            self.compensation_add = t + self.mean_x - y
+            self.mean_x = self.mean_x + t / self.nobs
+            self.ssqdm_x = self.ssqdm_x + (value - prev_mean) * (value - self.mean_x)
+
+        if self.nobs < self.window or self.nobs <= 1:
+            return NAN
+        if self.num_consecutive_same_value >= self.nobs:
+            return 0.0
+        variance = self.ssqdm_x / (self.nobs - 1)
+        return math.sqrt(variance) if variance > 0 else (variance if variance != variance else 0.0)
+
+
+# ==================== 指数平滑 ====================
+
+class EMA(StreamingIndicator):
+    """
+    指数移动平均，与 Series.ewm(adjust=False).mean() 逐位一致
+
+    Args:
+        span: 跨度（alpha = 2 / (span + 1)）
+        alpha: 直接指定平滑系数（Wilder 平滑为 1/period）
+        min_periods: 至少多少个有效观测才输出
+    """
+
+    _params = ("span", "alpha", "min_periods")
+    _fields = ("weighted", "old_wt", "nobs", "started")
+
+    def __init__(self, span: Optional[int] = None, alpha: Optional[float] = None, min_periods: int = 0):
+        if (span is None) == (alpha is None):
+            raise ValueError("必须且只能指定 span 或 alpha 之一")
+        self.span = span
+        self.alpha = alpha
+        self.min_periods = min_periods
+        # 与 pandas 相同：先换算成质心 com，再由 com 得到 alpha（保证末位一致）
+        com = (span - 1) / 2.0 if span is not None else 1.0 / alpha - 1.0
+        self._alpha = 1.0 / (1.0 + com)
+        self._min_periods = max(min_periods, 1)
+        self.weighted = NAN
+        self.old_wt = 1.0
+        self.nobs = 0
+        self.started = False
+
+    def update(self, value: float) -> float:
+        is_observation = value == value
+        self.nobs += is_observation
+        if not self.started:
+            self.started = True
+            self.weighted = value
+            self.old_wt = 1.0
+        elif self.weighted == self.weighted:
+            self.old_wt *= 1.0 - self._alpha
+            if is_observation:
+                if self.weighted != value:
+                    self.weighted = ((self.old_wt * self.weighted) + (self._alpha * value)) / (
+                        self.old_wt + self._alpha
+                    )
+                self.old_wt = 1.0
+        elif is_observation:
+            self.weighted = value
+        return self.weighted if self.nobs >= self._min_periods else NAN
+
+
+def wilder(period: int) -> EMA:
+    """Wilder 平滑（对应 kernels.wilder_mean）"""
+    return EMA(alpha=1.0 / period, min_periods=period)
+
+
+def _smoother(period: int, use_wilder: bool) -> StreamingIndicator:
+    return wilder(period) if use_wilder else RollingMean(period)
+
+
+# ==================== 指标 ====================
+
+class MACD(StreamingIndicator):
+    """MACD，update(close) -> (MACD线, 信号线, 柱状图)"""
+
+    _params = ("fast", "slow", "signal")
+    _children = ("fast_ema", "slow_ema", "signal_ema")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+        self.fast_ema = EMA(span=fast)
+        self.slow_ema = EMA(span=slow)
+        self.signal_ema = EMA(span=signal)
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        line = self.fast_ema.update(close) - self.slow_ema.update(close)
+        signal_line = self.signal_ema.update(line)
+        return line, signal_line, line - signal_line
+
+
+class RSI(StreamingIndicator):
+    """
+    相对强弱指数，与 kernels.rsi 逐位一致
+
+    Args:
+        wilder: False 为简单滑动平均版本（与 rsi 列一致）；True 为 Wilder 平滑
+    """
+
+    _params = ("period", "wilder")
+    _fields = ("prev_close",)
+    _children = ("avg_gain", "avg_loss")
+
+    def __init__(self, period: int = 14, wilder: bool = False):
+        self.period = period
+        self.wilder = wilder
+        self.prev_close: Optional[float] = None
+        self.avg_gain = _smoother(period, wilder)
+        self.avg_loss = _smoother(period, wilder)
+
+    def update(self, close: float) -> float:
+        delta = NAN if self.prev_close is None else close - self.prev_close
+        self.prev_close = close
+        gain = delta if delta > 0 else 0.0
+        loss = -(delta if delta < 0 else 0.0)
+        rs = _divide(self.avg_gain.update(gain), self.avg_loss.update(loss))
+        return 100 - _divide(100, 1 + rs)
+
+
+class ATR(StreamingIndicator):
+    """平均真实波幅（真实波幅的简单滑动平均），与 atr 列一致"""
+
+    _params = ("period",)
+    _fields = ("prev_close",)
+    _children = ("average",)
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.average = RollingMean(period)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        prev_close = NAN if self.prev_close is None else self.prev_close
+        self.prev_close = close
+        true_range = _fmax(_fmax(high - low, abs(high - prev_close)), abs(low - prev_close))
+        return self.average.update(true_range)
+
+
+class OBV(StreamingIndicator):
+    """能量潮，与 kernels.obv 逐位一致"""
+
+    _fields = ("prev_close", "total")
+
+    def __init__(self):
+        self.prev_close: Optional[float] = None
+        self.total = 0.0
+
+    def update(self, close: float, volume: float) -> float:
+        if self.prev_close is not None:
+            delta = close - self.prev_close
+            if delta > 0:
+                flow = volume
+            elif delta < 0:
+                flow = -volume
+            else:
+                flow = delta * volume  # 0 或 NaN，与 np.sign(delta) * volume 相同
+            if flow == flow:
+                self.total = self.total + flow
+        self.prev_close = close
+        return self.total
+
+
+class ADX(StreamingIndicator):
+    """平均趋向指数，update(high, low, close) -> (ADX, +DI, -DI)，与 kernels.adx 逐位一致"""
+
+    _params = ("period", "wilder")
+    _fields = ("prev_high", "prev_low", "prev_close")
+    _children = ("atr", "plus_dm", "minus_dm", "dx")
+
+    def __init__(self, period: int = 14, wilder: bool = False):
+        self.period = period
+        self.wilder = wilder
+        self.prev_high: Optional[float] = None
+        self.prev_low: Optional[float] = None
+        self.prev_close: Optional[float] = None
+        self.atr = _smoother(period, wilder)
+        self.plus_dm = _smoother(period, wilder)
+        self.minus_dm = _smoother(period, wilder)
+        self.dx = _smoother(period, wilder)
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float, float]:
+        if self.prev_close is None:
+            high_diff = low_diff = NAN
+            high_close = low_close = 0.0
+        else:
+            high_diff = high - self.prev_high
+            low_diff = -(low - self.prev_low)
+            high_close = abs(high - self.prev_close)
+            low_close = abs(low - self.prev_close)
+            high_close = 0.0 if high_close != high_close else high_close
+            low_close = 0.0 if low_close != low_close else low_close
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+
+        plus_dm = high_diff if (high_diff > low_diff and high_diff > 0) else 0.0
+        minus_dm = low_diff if (low_diff > high_diff and low_diff > 0) else 0.0
+        true_range = _maximum(_maximum(high - low, high_close), low_close)
+
+        atr = self.atr.update(true_range)
+        plus_di = 100 * _divide(self.plus_dm.update(plus_dm), atr)
+        minus_di = 100 * _divide(self.minus_dm.update(minus_dm), atr)
+        dx = _divide(100 * abs(plus_di - minus_di), plus_di + minus_di)
+        return self.dx.update(dx), plus_di, minus_di
+
+
+# ==================== 指标集合 ====================
+
+SMA_PERIODS = [5, 10, 20, 50, 100, 200]
+EMA_PERIODS = [5, 10, 20, 50, 100, 200]
+VOLUME_SMA_PERIODS = [5, 10, 20, 50]
+
+# 可以流式计算的 IndicatorEngine 列（列名与批量计算一致）
+STREAMING_COLUMNS: List[str] = (
+    [f"close_{p}_sma" for p in SMA_PERIODS]
+    + [f"close_{p}_ema" for p in EMA_PERIODS]
+    + ["boll", "boll_ub", "boll_lb", "boll_width", "atr", "atr_pct", "rsi",
+       "macd", "macds", "macdh", "adx", "plus_di", "minus_di", "obv"]
+    + [f"volume_sma_{p}" for p in VOLUME_SMA_PERIODS]
+)
+
+
+class StreamingIndicatorSet:
+    """
+    一只股票的全部流式指标
+
+    使用示例:
+        >>> indicators = StreamingIndicatorSet()
+        >>> history = indicators.update_frame(df)       # 首次：逐根喂入历史
+        >>> state = indicators.to_state()               # 持久化
+        >>> indicators = StreamingIndicatorSet.from_state(state)
+        >>> row = indicators.update(new_bar)             # 之后每根 K 线 O(1)
+    """
+
+    def __init__(self):
+        self.sma = {p: RollingMean(p) for p in SMA_PERIODS}
+        self.ema = {p: EMA(span=p) for p in EMA_PERIODS}
+        self.boll_std = RollingStd(20)
+        self.atr = ATR(14)
+        self.rsi = RSI(14)
+        self.macd = MACD()
+        self.adx = ADX(14)
+        self.obv = OBV()
+        self.volume_sma = {p: RollingMean(p) for p in VOLUME_SMA_PERIODS}
+        self.n_bars = 0
+        self.last_timestamp: Optional[str] = None
+
+    def update(self, bar: Mapping[str, Any]) -> Dict[str, float]:
+        """
+        消费一根 K 线
+
+        Args:
+            bar: 至少包含 high, low, close, volume；可选 timestamp
+
+        Returns:
+            {列名: 值}，键顺序同 STREAMING_COLUMNS
+        """
+        high = float(bar["high"])
+        low = float(bar["low"])
+        close = float(bar["close"])
+        volume = float(bar["volume"])
+
+        row: Dict[str, float] = {}
+        for period, indicator in self.sma.items():
+            row[f"close_{period}_sma"] = indicator.update(close)
+        for period, indicator in self.ema.items():
+            row[f"close_{period}_ema"] = indicator.update(close)
+
+        mid = row["close_20_sma"]
+        std = self.boll_std.update(close)
+        upper = mid + (std * 2.0)
+        lower = mid - (std * 2.0)
+        row["boll"] = mid
+        row["boll_ub"] = upper
+        row["boll_lb"] = lower
+        row["boll_width"] = _divide(upper - lower, mid)
+
+        atr = self.atr.update(high, low, close)
+        row["atr"] = atr
+        row["atr_pct"] = _divide(atr, close) * 100
+        row["rsi"] = self.rsi.update(close)
+        row["macd"], row["macds"], row["macdh"] = self.macd.update(close)
+        row["adx"], row["plus_di"], row["minus_di"] = self.adx.update(high, low, close)
+        row["obv"] = self.obv.update(close, volume)
+        for period, indicator in self.volume_sma.items():
+            row[f"volume_sma_{period}"] = indicator.update(volume)
+
+        self.n_bars += 1
+        if "timestamp" in bar:
+            self.last_timestamp = str(bar["timestamp"])
+        return row
+
+    def update_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """逐行喂入 df，返回与 df 同索引的指标 DataFrame"""
+        columns = ["high", "low", "close", "volume"]
+        if "timestamp" in df.columns:
+            columns.append("timestamp")
+        rows = [self.update(bar) for bar in df[columns].to_dict("records")]
+        return pd.DataFrame(rows, index=df.index, columns=STREAMING_COLUMNS, dtype=float)
+
+    def to_state(self) -> Dict[str, Any]:
+        """导出可 JSON 序列化的状态"""
+        return {
+            "sma": {str(p): ind.to_state() for p, ind in self.sma.items()},
+            "ema": {str(p): ind.to_state() for p, ind in self.ema.items()},
+            "boll_std": self.boll_std.to_state(),
+            "atr": self.atr.to_state(),
+            "rsi": self.rsi.to_state(),
+            "macd": self.macd.to_state(),
+            "adx": self.adx.to_state(),
+            "obv": self.obv.to_state(),
+            "volume_sma": {str(p): ind.to_state() for p, ind in self.volume_sma.items()},
+            "n_bars": self.n_bars,
+            "last_timestamp": self.last_timestamp,
+        }
+
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any]) -> "StreamingIndicatorSet":
+        """从 to_state() 的结果恢复"""
+        obj = cls()
+        obj.sma = {int(p): RollingMean.from_state(s) for p, s in state["sma"].items()}
+        obj.ema = {int(p): EMA.from_state(s) for p, s in state["ema"].items()}
+        obj.boll_std = RollingStd.from_state(state["boll_std"])
+        obj.atr = ATR.from_state(state["atr"])
+        obj.rsi = RSI.from_state(state["rsi"])
+        obj.macd = MACD.from_state(state["macd"])
+        obj.adx = ADX.from_state(state["adx"])
+        obj.obv = OBV.from_state(state["obv"])
+        obj.volume_sma = {int(p): RollingMean.from_state(s) for p, s in state["volume_sma"].items()}
+        obj.n_bars = state["n_bars"]
+        obj.last_timestamp = state["last_timestamp"]
+        return obj
@@ -7,10 +7,40 @@
 import numpy as np
 import pandas as pd
 
+from . import kernels
+
 
 class TrendIndicators:
     """趋势指标计算器"""
     
+    @staticmethod
+    def rolling_slope(prices: pd.Series, window: int) -> pd.Series:
+        """
+        滚动线性回归斜率
+        
+        Args:
+            prices: 价格序列
+            window: 窗口长度
+            
+        Returns:
+            斜率序列
+        """
+        return pd.Series(kernels.linear_slope(kernels.as_float_array(prices), window), index=prices.index)
+    
+    @staticmethod
+    def rolling_lr_pred(prices: pd.Series, window: int) -> pd.Series:
+        """
+        滚动线性回归对下一期的预测值
+        
+        Args:
+            prices: 价格序列
+            window: 窗口长度
+            
+        Returns:
+            预测值序列
+        """
+        return pd.Series(kernels.linear_prediction(kernels.as_float_array(prices), window), index=prices.index)
+    
     @staticmethod
     def calculate_support_resistance(df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
         """
@@ -26,19 +56,24 @@ class TrendIndicators:
         if not inplace:
             df = df.copy()
         
+        high = kernels.as_float_array(df["high"])
+        low = kernels.as_float_array(df["low"])
+        
         # 20日压力支撑
-        window = 20
-        df["resistance_20"] = df["high"].rolling(window=window).max()
-        df["support_20"] = df["low"].rolling(window=window).min()
-        df["mid_range_20"] = (df["resistance_20"] + df["support_20"]) / 2
+        resistance_20 = kernels.rolling_max(high, 20)
+        support_20 = kernels.rolling_min(low, 20)
+        df["resistance_20"] = resistance_20
+        df["support_20"] = support_20
+        df["mid_range_20"] = (resistance_20 + support_20) / 2
         
         # 50日压力支撑
-        window = 50
-        df["resistance_50"] = df["high"].rolling(window=window).max()
-        df["support_50"] = df["low"].rolling(window=window).min()
+        df["resistance_50"] = kernels.rolling_max(high, 50)
+        df["support_50"] = kernels.rolling_min(low, 50)
         
         # 当前价格相对位置
-        df["position_in_range_20"] = (df["close"] - df["support_20"]) / (df["resistance_20"] - df["support_20"])
+        df["position_in_range_20"] = kernels.range_position(
+            kernels.as_float_array(df["close"]), resistance_20, support_20
+        )
         
         return df
     
@@ -57,21 +92,8 @@ class TrendIndicators:
         if not inplace:
             df = df.copy()
         
-        def calculate_slope(x):
-            if len(x) < 2:
-                return np.nan
-            try:
-                slope, _ = np.polyfit(range(len(x)), x, 1)
-                return slope
-            except (ValueError, TypeError, np.linalg.LinAlgError):
-                return np.nan
-        
-        df["trend_slope_10"] = df["close"].rolling(window=10).apply(
-            calculate_slope, raw=True
-        )
-        df["trend_slope_20"] = df["close"].rolling(window=20).apply(
-            calculate_slope, raw=True
-        )
+        df["trend_slope_10"] = TrendIndicators.rolling_slope(df["close"], 10)
+        df["trend_slope_20"] = TrendIndicators.rolling_slope(df["close"], 20)
         
         return df
     
@@ -90,18 +112,7 @@ class TrendIndicators:
         if not inplace:
             df = df.copy()
         
-        def linear_regression_pred(x):
-            if len(x) < 2:
-                return np.nan
-            try:
-                slope, intercept = np.polyfit(range(len(x)), x, 1)
-                return intercept + slope * len(x)
-            except (ValueError, TypeError, np.linalg.LinAlgError):
-                return np.nan
-        
-        df["lr_pred_20"] = df["close"].rolling(window=20).apply(
-            linear_regression_pred, raw=True
-        )
+        df["lr_pred_20"] = TrendIndicators.rolling_lr_pred(df["close"], 20)
         
         return df
     
@@ -7,6 +7,8 @@
 import numpy as np
 import pandas as pd
 
+from . import kernels
+
 
 class VolumeIndicators:
     """成交量指标计算器"""
@@ -23,7 +25,10 @@ class VolumeIndicators:
         Returns:
             VWMA 序列
         """
-        vwma = (df["close"] * df["volume"]).rolling(window=period).sum() / df["volume"].rolling(window=period).sum()
+        vwma = pd.Series(
+            kernels.vwma(kernels.as_float_array(df["close"]), kernels.as_float_array(df["volume"]), period),
+            index=df.index,
+        )
         return vwma
     
     @staticmethod
@@ -37,7 +42,10 @@ class VolumeIndicators:
         Returns:
             OBV 序列
         """
-        obv = (np.sign(df["close"].diff()) * df["volume"]).fillna(0).cumsum()
+        obv = pd.Series(
+            kernels.obv(kernels.as_float_array(df["close"]), kernels.as_float_array(df["volume"])),
+            index=df.index,
+        )
         return obv
     
     @staticmethod
@@ -55,8 +63,9 @@ class VolumeIndicators:
         if not inplace:
             df = df.copy()
         
+        volume = kernels.as_float_array(df["volume"])
         for period in [5, 10, 20, 50]:
-            df[f"volume_sma_{period}"] = df["volume"].rolling(window=period).mean()
+            df[f"volume_sma_{period}"] = kernels.rolling_mean(volume, period)
         
         return df
     
@@ -75,11 +84,12 @@ class VolumeIndicators:
         if not inplace:
             df = df.copy()
         
+        volume = kernels.as_float_array(df["volume"])
         if "volume_sma_5" in df.columns:
-            df["volume_ratio_5"] = df["volume"] / df["volume_sma_5"]
+            df["volume_ratio_5"] = kernels.safe_divide(volume, kernels.as_float_array(df["volume_sma_5"]))
         
         if "volume_sma_20" in df.columns:
-            df["volume_ratio_20"] = df["volume"] / df["volume_sma_20"]
+            df["volume_ratio_20"] = kernels.safe_divide(volume, kernels.as_float_array(df["volume_sma_20"]))
         
         return df
     
@@ -98,8 +108,9 @@ class VolumeIndicators:
         if not inplace:
             df = df.copy()
         
-        df["volume_change_pct"] = df["volume"].pct_change() * 100
-        df["volume_acceleration"] = df["volume_change_pct"].diff()
+        change_pct = kernels.pct_change(kernels.as_float_array(df["volume"])) * 100
+        df["volume_change_pct"] = change_pct
+        df["volume_acceleration"] = kernels.diff(change_pct)
         
         return df
     
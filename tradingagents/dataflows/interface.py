@@ -1,8 +1,9 @@
+import os
 import pandas as pd
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from tradingagents.utils.logger import get_logger
-from tradingagents.constants import MIN_STOCK_DATA_DAYS
+from tradingagents.constants import ALPHA_VANTAGE_REQUESTS_PER_MINUTE, MIN_STOCK_DATA_DAYS
 
 logger = get_logger(__name__)
 
@@ -27,6 +28,14 @@ from .alpha_vantage import (
     get_insider_transactions as get_alpha_vantage_insider_transactions,
     get_news as get_alpha_vantage_news,
     get_global_news as get_alpha_vantage_global_news,
+    get_stock_async as get_alpha_vantage_stock_async,
+    get_fundamentals_async as get_alpha_vantage_fundamentals_async,
+    get_balance_sheet_async as get_alpha_vantage_balance_sheet_async,
+    get_cashflow_async as get_alpha_vantage_cashflow_async,
+    get_income_statement_async as get_alpha_vantage_income_statement_async,
+    get_insider_transactions_async as get_alpha_vantage_insider_transactions_async,
+    get_news_async as get_alpha_vantage_news_async,
+    get_global_news_async as get_alpha_vantage_global_news_async,
 )
 
 # 长桥API模块（默认选项）
@@ -50,7 +59,11 @@ from .complete_indicators import (
     ChartPatterns
 )
 
+from .indicators.result_cache import HAS_PYARROW, IndicatorResultCache
+from .compute_service import ComputeService
+
 # 导入统一数据管理器
+from .bar_store import BarStore
 from .unified_data_manager import (
     UnifiedDataManager,
     VendorPriority,
@@ -80,7 +93,7 @@ def _local_get_indicators(symbol, indicator, curr_date, look_back_days, *args, *
     """本地计算技术指标（使用惰性计算优化）"""
     from datetime import datetime, timedelta
     from .lazy_indicators import get_lazy_calculator
-    from .indicator_groups import get_indicator_columns
+    from .indicator_groups import BASE_COLUMNS, get_indicator_columns
     
     stock_data = kwargs.get('stock_data', '')
     manager = get_data_manager()
@@ -100,13 +113,13 @@ def _local_get_indicators(symbol, indicator, curr_date, look_back_days, *args, *
     # 使用惰性计算器 - 只计算需要的指标
     lazy_calc = get_lazy_calculator(df_clean)
     
-    # 获取该指标组需要的列
+    # 获取该指标组需要的列（不附带公共基础指标，macd 组不会计算 ADX/MFI/200日均线）
     all_columns = BASE_COLUMNS + lazy_calc.get_available_indicators()
-    needed_indicators = get_indicator_columns(indicator, all_columns)
+    needed_indicators = get_indicator_columns(indicator, all_columns, include_common=False)
     
     # 只计算需要的指标（不是全部100+个）
     needed_indicators = [col for col in needed_indicators if col not in BASE_COLUMNS]
-    result_df = lazy_calc.get_indicators(needed_indicators)
+    result_df = _compute_indicators(df_clean, needed_indicators)
     
     # 只返回最近需要的天数
     result_df = result_df.tail(look_back_days + 10)
@@ -114,6 +127,19 @@ def _local_get_indicators(symbol, indicator, curr_date, look_back_days, *args, *
     return result_df.to_csv(index=False)
 
 
+def _compute_indicators(df_clean: pd.DataFrame, columns) -> pd.DataFrame:
+    """计算指标列；启用结果缓存时按输入内容命中缓存，未命中才交给计算服务"""
+    result_cache = get_indicator_result_cache()
+    if result_cache is None:
+        return get_compute_service().compute_indicators(df_clean, columns)
+    
+    result_df = result_cache.get(df_clean, columns)
+    if result_df is None:
+        result_df = get_compute_service().compute_indicators(df_clean, columns)
+        result_cache.set(df_clean, result_df, columns)
+    return result_df
+
+
 def _ensure_stock_data(symbol: str, curr_date: str, look_back_days: int, stock_data: str = '') -> str:
     """确保有股票数据，如果没有则获取"""
     if stock_data:
@@ -159,9 +185,18 @@ def _build_grouped_results(df_with_indicators: pd.DataFrame, look_back_days: int
     return _core_build_grouped_results(df_with_indicators, look_back_days)
 
 
+def _all_indicators_report(df_clean: pd.DataFrame, look_back_days: int) -> str:
+    """由已解析的K线计算所有分组的指标（get_all_indicators 与运行数据预取共用）"""
+    all_needed_indicators = _collect_all_needed_indicators()
+    logger.debug("calculating %d unique indicators...", len(all_needed_indicators))
+    
+    # 批量计算指标（相同数据命中内容寻址缓存）
+    df_with_indicators = _compute_indicators(df_clean, sorted(all_needed_indicators))
+    return _build_grouped_results(df_with_indicators, look_back_days)
+
+
 def _local_get_all_indicators(symbol: str, curr_date: str, look_back_days: int, stock_data: str = '', *args, **kwargs) -> str:
     """本地计算所有技术指标，一次性返回所有分组（使用惰性计算优化）"""
-    from .lazy_indicators import get_lazy_calculator
     import traceback
     
     try:
@@ -181,17 +216,8 @@ def _local_get_all_indicators(symbol: str, curr_date: str, look_back_days: int,
         df_clean = _prepare_clean_dataframe(df)
         logger.debug("_local_get_all_indicators: df_clean shape=%s", df_clean.shape)
         
-        # 4. 收集所有需要的指标
-        all_needed_indicators = _collect_all_needed_indicators()
-        logger.debug("_local_get_all_indicators: calculating %d unique indicators...", len(all_needed_indicators))
-        
-        # 5. 批量计算指标
-        lazy_calc = get_lazy_calculator(df_clean)
-        df_with_indicators = lazy_calc.get_indicators(list(all_needed_indicators))
-        
-        # 6. 构建分组结果
-        logger.debug("_local_get_all_indicators: building result groups...")
-        result = _build_grouped_results(df_with_indicators, look_back_days)
+        # 4. 计算所有分组需要的指标并构建分组结果
+        result = _all_indicators_report(df_clean, look_back_days)
         
         logger.debug("_local_get_all_indicators: done, result has %d groups", len(result))
         return result
@@ -216,41 +242,29 @@ def _local_get_candlestick_patterns(symbol, start_date, end_date, *args, **kwarg
     if df is None:
         raise DataFetchError("Failed to parse stock data")
     
-    df.reset_index(inplace=True)
-    
-    df_clean = pd.DataFrame()
-    df_clean['timestamp'] = df['timestamp']
-    df_clean['open'] = df['Open']
-    df_clean['high'] = df['High']
-    df_clean['low'] = df['Low']
-    df_clean['close'] = df['Close']
-    df_clean['volume'] = df['Volume']
-    
-    result_df = CompleteCandlestickPatterns.identify_patterns(df_clean)
+    df_clean = _prepare_clean_dataframe(df)
+    return _candlestick_patterns_report(symbol, start_date, end_date, df_clean)
+
+def _candlestick_patterns_report(symbol, start_date, end_date, df_clean: pd.DataFrame) -> str:
+    """由已解析的K线生成蜡烛图形态报告"""
+    patterns = get_compute_service().candlestick_patterns(df_clean)
     
-    if len(result_df) == 0:
+    if not patterns:
         return f"No candlestick patterns identified for {symbol} in the date range {start_date} to {end_date}"
     
     patterns_result = []
-    for _, row in result_df.iterrows():
-        date_str = row.get('timestamp', '')
-        patterns_str = row.get('patterns', '')
-        volume_confirmed = row.get('volume_confirmed', False)
-        
-        if volume_confirmed and patterns_str:
-            patterns_list = patterns_str.split('|')
-            patterns_with_confirmation = [f"{p}(VOL_CONFIRMED)" for p in patterns_list]
-            patterns_str = '|'.join(patterns_with_confirmation)
-        elif volume_confirmed:
-            patterns_str = "(VOL_CONFIRMED)"
+    for pattern in patterns:
+        names = pattern['patterns']
+        if pattern['volume_confirmed']:
+            names = [f"{name}(VOL_CONFIRMED)" for name in names]
         
         patterns_result.append({
-            'Date': date_str,
-            'Patterns': patterns_str.replace('|', ', '),
-            'Open': round(row.get('open', 0), 2),
-            'High': round(row.get('high', 0), 2),
-            'Low': round(row.get('low', 0), 2),
-            'Close': round(row.get('close', 0), 2)
+            'Date': pattern['timestamp'],
+            'Patterns': ', '.join(names),
+            'Open': round(pattern['open'], 2),
+            'High': round(pattern['high'], 2),
+            'Low': round(pattern['low'], 2),
+            'Close': round(pattern['close'], 2)
         })
     
     result = f"# Candlestick Patterns for {symbol} ({start_date} to {end_date})\n\n"
@@ -304,41 +318,81 @@ def _local_get_chart_patterns(symbol, start_date, end_date, lookback=60, *args,
         logger.debug("_local_get_chart_patterns: df columns=%s", list(df.columns))
         
         df_clean = _prepare_clean_dataframe(df)
-        
-        logger.debug("_local_get_chart_patterns: calling identify_all_patterns...")
-        patterns = ChartPatterns.identify_all_patterns(df_clean, lookback)
-        logger.debug("_local_get_chart_patterns: identify_all_patterns done")
-        
-        result_lines = [
-            f"# Chart Patterns for {symbol}",
-            "",
-            "| Pattern Type | Detected | Confidence | Volume Confirmed | Breakout Confirmed | Description |",
-            "|--------------|----------|------------|------------------|-------------------|-------------|"
-        ]
-        
-        for pattern_name, pattern_info in patterns.items():
-            detected = "✅" if pattern_info.get("detected", False) else "❌"
-            confidence = f"{pattern_info.get('confidence', 0):.2%}"
-            volume_confirmed = "✅" if pattern_info.get("volume_confirmed", False) else "❌"
-            breakout_confirmed = "✅" if pattern_info.get("breakout_confirmed", False) else "❌"
-            description = pattern_info.get("description", "")
-            result_lines.append(f"| {pattern_name:<12} | {detected:<8} | {confidence:<10} | {volume_confirmed:<16} | {breakout_confirmed:<17} | {description} |")
-        
-        result_lines.extend(["", "## Detailed Pattern Information", ""])
-        for pattern_name, pattern_info in patterns.items():
-            if pattern_info.get("detected", False):
-                result_lines.append(f"### {pattern_name}")
-                for key, value in pattern_info.items():
-                    if key not in ["detected", "description"]:
-                        result_lines.append(f"- {key}: {value}")
-                result_lines.append("")
-        
-        return "\n".join(result_lines)
+        return _chart_patterns_report(symbol, df_clean, lookback)
     except Exception as e:
         logger.error("_local_get_chart_patterns ERROR: %s", e)
         logger.debug("_local_get_chart_patterns Traceback:\n%s", traceback.format_exc())
         raise DataFetchError(f"_local_get_chart_patterns failed: {e}")
 
+def _chart_patterns_report(symbol, df_clean: pd.DataFrame, lookback: int = 60) -> str:
+    """由已解析的K线生成图表形态报告"""
+    logger.debug("_chart_patterns_report: calling identify_all_patterns...")
+    # identify_all_patterns 返回 {"patterns_found": ..., "patterns": {形态名: 信息}}
+    patterns = get_compute_service().chart_patterns(df_clean, lookback).get("patterns", {})
+    logger.debug("_chart_patterns_report: identify_all_patterns done")
+    
+    result_lines = [
+        f"# Chart Patterns for {symbol}",
+        "",
+        "| Pattern Type | Detected | Confidence | Volume Confirmed | Breakout Confirmed | Description |",
+        "|--------------|----------|------------|------------------|-------------------|-------------|"
+    ]
+    
+    for pattern_name, pattern_info in patterns.items():
+        detected = "✅" if pattern_info.get("detected", False) else "❌"
+        confidence = f"{pattern_info.get('confidence', 0):.2%}"
+        volume_confirmed = "✅" if pattern_info.get("volume_confirmed", False) else "❌"
+        breakout_confirmed = "✅" if pattern_info.get("breakout_confirmed", False) else "❌"
+        description = pattern_info.get("description", "")
+        result_lines.append(f"| {pattern_name:<12} | {detected:<8} | {confidence:<10} | {volume_confirmed:<16} | {breakout_confirmed:<17} | {description} |")
+    
+    result_lines.extend(["", "## Detailed Pattern Information", ""])
+    for pattern_name, pattern_info in patterns.items():
+        if pattern_info.get("detected", False):
+            result_lines.append(f"### {pattern_name}")
+            for key, value in pattern_info.items():
+                if key not in ["detected", "description"]:
+                    result_lines.append(f"- {key}: {value}")
+            result_lines.append("")
+    
+    return "\n".join(result_lines)
+
+# ========== 指标结果缓存 ==========
+def get_indicator_result_cache() -> Optional[IndicatorResultCache]:
+    """获取指标结果缓存（通过依赖注入容器；配置关闭或未安装 pyarrow 时返回 None）"""
+    container = get_container()
+    
+    if not container.has('indicator_result_cache'):
+        container.register('indicator_result_cache', _init_indicator_result_cache, singleton=True)
+    
+    return container.get('indicator_result_cache')
+
+def _init_indicator_result_cache() -> Optional[IndicatorResultCache]:
+    """初始化指标结果缓存"""
+    config = get_config()
+    if not config.get("cache", {}).get("indicator_result_cache_enabled", True) or not HAS_PYARROW:
+        return None
+    return IndicatorResultCache(os.path.join(config["data_cache_dir"], "indicators"))
+
+# ========== 计算服务 ==========
+def get_compute_service() -> ComputeService:
+    """获取指标/形态计算服务（通过依赖注入容器，CLI、run_trading.py 和批量任务共用）"""
+    container = get_container()
+    
+    if not container.has('compute_service'):
+        container.register('compute_service', _init_compute_service, singleton=True)
+    
+    return container.get('compute_service')
+
+def _init_compute_service() -> ComputeService:
+    """按 config["compute_pool"] 初始化计算服务（workers=0 时在调用线程计算）"""
+    pool_config = get_config().get("compute_pool", {})
+    return ComputeService(
+        workers=pool_config.get("workers", 0),
+        warm=pool_config.get("warm", True),
+        start_method=pool_config.get("start_method", "spawn"),
+    )
+
 # ========== 数据管理器初始化 ==========
 def get_data_manager() -> UnifiedDataManager:
     """
@@ -356,21 +410,31 @@ def get_data_manager() -> UnifiedDataManager:
 
 def _init_data_manager() -> UnifiedDataManager:
     """初始化数据管理器"""
+    config = get_config()
+    cache_config = config.get("cache", {})
+
+    # 区间感知K线存储：get_stock_data 只请求缺失的日期区间
+    bar_store = None
+    if cache_config.get("bar_store_enabled", True):
+        bar_store = BarStore(os.path.join(config["data_cache_dir"], "bars"))
+
     manager = UnifiedDataManager(
         default_max_retries=3,
         default_retry_delay_base=1.0,
         default_retry_delay_max=10.0,
         default_rate_limit_wait=5.0,
         default_rate_limit_max_retries=5,
+        bar_store=bar_store,
+        hedge_requests=config.get("hedge_vendor_requests", False),
     )
     
-    config = get_config()
-    
+    # 进程内计算：失败只可能来自输入（如无法解析的 stock_data），不参与熔断
     manager.register_vendor(
         "local",
         priority=VendorPriority.PRIMARY,
         max_retries=1,
         rate_limit_wait=0.0,
+        circuit_breaker_enabled=False,
     )
     
     manager.register_vendor(
@@ -392,6 +456,7 @@ def _init_data_manager() -> UnifiedDataManager:
         priority=VendorPriority.FALLBACK,
         max_retries=2,
         rate_limit_wait=12.0,
+        requests_per_minute=ALPHA_VANTAGE_REQUESTS_PER_MINUTE,
     )
     
     # ========== 声明式方法注册表 ==========
@@ -463,28 +528,31 @@ def _init_data_manager() -> UnifiedDataManager:
         }, ["local"]),
     ]
 
+    # 原生异步实现（fetch_async 使用，共享 httpx.AsyncClient）
+    # 长桥 SDK 与 yfinance 只提供阻塞接口，异步路径中在有界线程池里调用
+    async_registry = {
+        "get_stock_data": {"alpha_vantage": get_alpha_vantage_stock_async},
+        "get_fundamentals": {"alpha_vantage": get_alpha_vantage_fundamentals_async},
+        "get_balance_sheet": {"alpha_vantage": get_alpha_vantage_balance_sheet_async},
+        "get_cashflow": {"alpha_vantage": get_alpha_vantage_cashflow_async},
+        "get_income_statement": {"alpha_vantage": get_alpha_vantage_income_statement_async},
+        "get_news": {"alpha_vantage": get_alpha_vantage_news_async},
+        "get_global_news": {"alpha_vantage": get_alpha_vantage_global_news_async},
+        "get_insider_transactions": {"alpha_vantage": get_alpha_vantage_insider_transactions_async},
+    }
+
     for method_name, impls, priority_order in method_registry:
-        manager.register_method(method_name, impls, priority_order)
+        manager.register_method(
+            method_name, impls, priority_order,
+            async_implementations=async_registry.get(method_name),
+        )
     
     return manager
 
-def route_to_vendor(method: str, *args, **kwargs) -> str:
-    """路由方法调用到统一数据管理器
-    
-    这是兼容旧代码的接口，新代码应该直接使用 get_data_manager()
-    
-    Args:
-        method: 方法名称
-        *args: 位置参数
-        **kwargs: 关键字参数
-    
-    Returns:
-        获取的数据
-    """
+def _normalize_route_args(method: str, args: tuple) -> tuple:
+    """get_stock_data 的日期范围不足 MIN_STOCK_DATA_DAYS 天时向前扩展起始日期"""
     from datetime import datetime, timedelta
     
-    manager = get_data_manager()
-    
     if method == "get_stock_data":
         args_list = list(args)
         if len(args_list) >= 3:
@@ -501,8 +569,37 @@ def route_to_vendor(method: str, *args, **kwargs) -> str:
                     args = tuple(args_list)
             except (ValueError, TypeError):
                 pass
+    return args
+
+def route_to_vendor(method: str, *args, **kwargs) -> str:
+    """路由方法调用到统一数据管理器
+    
+    这是兼容旧代码的接口，新代码应该直接使用 get_data_manager()
     
-    return manager.fetch(method, *args, **kwargs)
+    Args:
+        method: 方法名称
+        *args: 位置参数
+        **kwargs: 关键字参数
+    
+    Returns:
+        获取的数据
+    """
+    manager = get_data_manager()
+    return manager.fetch(method, *_normalize_route_args(method, args), **kwargs)
+
+async def aroute_to_vendor(method: str, *args, **kwargs) -> str:
+    """route_to_vendor 的异步版本（原生异步数据路径，不为每个请求占用线程）
+    
+    Args:
+        method: 方法名称
+        *args: 位置参数
+        **kwargs: 关键字参数
+    
+    Returns:
+        获取的数据
+    """
+    manager = get_data_manager()
+    return await manager.fetch_async(method, *_normalize_route_args(method, args), **kwargs)
 
 def get_fetch_stats() -> Dict:
     """获取数据获取统计信息"""
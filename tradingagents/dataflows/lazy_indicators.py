@@ -1,16 +1,41 @@
 #!/usr/bin/env python3
 """
 惰性技术指标计算器
-使用cached_property实现按需计算和缓存
+- LazyIndicatorCalculator: 按列依赖图（indicators/engine.py）只计算请求的列，中间结果共享
+- LazyIndicators: 按指标组（移动平均/动量/成交量）取数，底层共用同一个计算器
 """
 
 import pandas as pd
 from functools import cached_property
-from typing import List, Optional, Dict, Any
-from .complete_indicators import CompleteTechnicalIndicators
-from .indicators.moving_averages import MovingAverageIndicators
-from .indicators.momentum_indicators import MomentumIndicators
-from .indicators.volume_indicators import VolumeIndicators
+from typing import List, Optional, Dict
+
+from .indicators.engine import INDICATOR_NODES, IndicatorEngine, IndicatorNode
+
+# LazyIndicators 各指标组包含的列
+MOVING_AVERAGE_COLUMNS = (
+    [f"close_{period}_sma" for period in [5, 10, 20, 50, 100, 200]]
+    + [f"close_{period}_ema" for period in [5, 10, 20, 50, 100, 200]]
+    + ["boll", "boll_ub", "boll_lb", "boll_width", "atr", "atr_pct"]
+)
+MOMENTUM_COLUMNS = ["rsi", "macd", "macds", "macdh", "adx", "plus_di", "minus_di"]
+VOLUME_COLUMNS = [
+    "vwma", "obv",
+    "volume_sma_5", "volume_sma_10", "volume_sma_20", "volume_sma_50",
+    "volume_ratio_5", "volume_ratio_20", "volume_change_pct", "volume_acceleration",
+]
+
+
+class LazyIndicatorCalculator(IndicatorEngine):
+    """
+    列级惰性指标计算器
+
+    按依赖图只计算请求的列及其依赖，每个中间结果只计算一次
+    （例如 boll、price_to_sma_20、sma_5_20_cross 共用同一个 close_20_sma）。
+
+    Examples:
+        >>> calc = get_lazy_calculator(df)
+        >>> calc.get_indicators(['macd', 'macds', 'macdh'])  # 不会计算 ADX/MFI/200日均线
+    """
 
 
 class LazyIndicators:
@@ -25,57 +50,46 @@ class LazyIndicators:
         初始化
         
         Args:
-            df: 包含OHLCV数据的DataFrame
+            df: 包含OHLCV数据的DataFrame（不会被复制或修改）
         """
-        self._df = df.copy()
+        self._df = df
+        self._calculator = LazyIndicatorCalculator(df)
         self._calculated_groups: Dict[str, bool] = {}
     
+    def _with_columns(self, columns: List[str]) -> pd.DataFrame:
+        """输入列 + 指定指标列，一次性构建"""
+        indicators = pd.DataFrame(
+            {col: self._calculator.get_indicator(col) for col in columns},
+            index=self._df.index,
+        )
+        base = self._df.drop(columns=[col for col in columns if col in self._df.columns])
+        return pd.concat([base, indicators], axis=1)
+    
     @cached_property
     def moving_averages(self) -> pd.DataFrame:
         """计算移动平均线指标（SMA, EMA, BOLL, ATR）"""
-        result = self._df.copy()
-        result = MovingAverageIndicators.calculate_sma(result)
-        result = MovingAverageIndicators.calculate_ema(result)
-        result = MovingAverageIndicators.calculate_bollinger_bands(result)
-        result = MovingAverageIndicators.calculate_atr(result)
+        result = self._with_columns(MOVING_AVERAGE_COLUMNS)
         self._calculated_groups['moving_averages'] = True
         return result
     
     @cached_property
     def momentum(self) -> pd.DataFrame:
         """计算动量指标（RSI, MACD, ADX）"""
-        result = self._df.copy()
-        
-        # RSI
-        result["rsi"] = MomentumIndicators.calculate_rsi(result["close"])
-        
-        # MACD
-        macd, signal, hist = MomentumIndicators.calculate_macd(result["close"])
-        result["macd"] = macd
-        result["macds"] = signal
-        result["macdh"] = hist
-        
-        # ADX
-        adx, plus_di, minus_di = MomentumIndicators.calculate_adx(result)
-        result["adx"] = adx
-        result["plus_di"] = plus_di
-        result["minus_di"] = minus_di
-        
+        result = self._with_columns(MOMENTUM_COLUMNS)
         self._calculated_groups['momentum'] = True
         return result
     
     @cached_property
     def volume(self) -> pd.DataFrame:
         """计算成交量指标（OBV, VWMA, 成交量均线等）"""
-        result = self._df.copy()
-        result = VolumeIndicators.calculate_all_volume_indicators(result)
+        result = self._with_columns(VOLUME_COLUMNS)
         self._calculated_groups['volume'] = True
         return result
     
     @cached_property
     def all_indicators(self) -> pd.DataFrame:
-        """计算所有指标"""
-        return CompleteTechnicalIndicators.calculate_all_indicators(self._df)
+        """计算所有指标（复用已计算的列）"""
+        return self._calculator.compute_all()
     
     def calculate_only(self, groups: List[str]) -> pd.DataFrame:
         """
@@ -102,26 +116,18 @@ class LazyIndicators:
         if 'all' in groups:
             return self.all_indicators
         
-        result = self._df.copy()
+        group_columns = {
+            'moving_averages': MOVING_AVERAGE_COLUMNS,
+            'momentum': MOMENTUM_COLUMNS,
+            'volume': VOLUME_COLUMNS,
+        }
+        columns: List[str] = []
+        for group, cols in group_columns.items():
+            if group in groups:
+                columns.extend(cols)
+                self._calculated_groups[group] = True
         
-        # 按需合并指标
-        if 'moving_averages' in groups:
-            ma_df = self.moving_averages
-            # 只添加新列
-            new_cols = [col for col in ma_df.columns if col not in result.columns]
-            result = result.join(ma_df[new_cols])
-        
-        if 'momentum' in groups:
-            mom_df = self.momentum
-            new_cols = [col for col in mom_df.columns if col not in result.columns]
-            result = result.join(mom_df[new_cols])
-        
-        if 'volume' in groups:
-            vol_df = self.volume
-            new_cols = [col for col in vol_df.columns if col not in result.columns]
-            result = result.join(vol_df[new_cols])
-        
-        return result
+        return self._with_columns(columns)
     
     def get_calculated_groups(self) -> List[str]:
         """获取已计算的指标组"""
@@ -133,6 +139,7 @@ class LazyIndicators:
         for attr in ['moving_averages', 'momentum', 'volume', 'all_indicators']:
             if attr in self.__dict__:
                 del self.__dict__[attr]
+        self._calculator = LazyIndicatorCalculator(self._df)
         self._calculated_groups.clear()
 
 
@@ -170,3 +177,16 @@ def calculate_indicators_lazy(
         return lazy.all_indicators
     
     return lazy.calculate_only(groups)
+
+
+def get_lazy_calculator(df: pd.DataFrame) -> LazyIndicatorCalculator:
+    """
+    创建列级惰性指标计算器
+
+    Args:
+        df: 包含OHLCV数据的DataFrame
+
+    Returns:
+        LazyIndicatorCalculator实例
+    """
+    return LazyIndicatorCalculator(df)
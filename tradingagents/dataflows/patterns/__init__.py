@@ -4,10 +4,10 @@
 
 包含：
 - candlestick_patterns: 蜡烛图形态（DOJI、锤子线、吞没形态等）
-- chart_patterns: 图表形态（头肩顶/底、双顶/底、三角形等）
+- chart_patterns: 图表形态（头肩顶/底、双顶/底、三角形等），含逐根K线的滚动识别
 """
 
 from .candlestick_patterns import CandlestickPatternRecognizer
-from .chart_patterns import ChartPatterns
+from .chart_patterns import ChartPatterns, RollingChartPatterns
 
-__all__ = ["CandlestickPatternRecognizer", "ChartPatterns"]
+__all__ = ["CandlestickPatternRecognizer", "ChartPatterns", "RollingChartPatterns"]
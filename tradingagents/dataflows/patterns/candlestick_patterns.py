@@ -2,217 +2,271 @@
 """
 蜡烛图形态识别模块
 包含常见的单根、两根、三根K线形态识别
+
+所有规则都是平移后 NumPy 数组（实体、振幅、上下影线、阴阳线标志）上的布尔掩码，
+一次识别整段数据。每根K线的结果是一个形态位集合（int64，第 i 位对应 CANDLESTICK_PATTERNS[i]），
+只在格式化输出时才解码为形态名称。
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
+
+from ..indicators.kernels import as_float_array, shift
+
+# 形态名称（按位编号；同一根K线的多个形态按此顺序列出）
+CANDLESTICK_PATTERNS: List[str] = [
+    # 单根K线
+    "DOJI_LONG_LEGGED",
+    "DOJI_GRAVESTONE",
+    "DOJI_DRAGONFLY",
+    "DOJI",
+    "HAMMER",
+    "HANGING_MAN",
+    "INVERTED_HAMMER",
+    "SHOOTING_STAR",
+    "SPINNING_TOP",
+    "MARUBOZU_BULLISH",
+    "MARUBOZU_BEARISH",
+    # 两根K线
+    "BULLISH_ENGULFING",
+    "BEARISH_ENGULFING",
+    "BEARISH_HARAMI",
+    "BULLISH_HARAMI",
+    "DARK_CLOUD_COVER",
+    "PIERCING_PATTERN",
+    # 三根K线
+    "MORNING_STAR",
+    "EVENING_STAR",
+    "THREE_WHITE_SOLDIERS",
+    "THREE_BLACK_CROWS",
+]
+PATTERN_BITS: Dict[str, int] = {name: 1 << i for i, name in enumerate(CANDLESTICK_PATTERNS)}
+
+# 前几根K线没有完整的前序K线，不参与识别
+MIN_HISTORY = 3
+
+
+class _Bars:
+    """一段K线及其平移后的特征数组"""
+
+    def __init__(self, open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray):
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.body = np.abs(close - open_)
+        self.range = high - low
+        # 同 Python 内置 max/min(open, close)（NaN 时取第一个参数）
+        self.upper_shadow = high - np.where(close > open_, close, open_)
+        self.lower_shadow = np.where(close < open_, close, open_) - low
+        self.is_bullish = close > open_
+        self.is_bearish = close < open_
+
+    def shifted(self, periods: int) -> "_Bars":
+        return _Bars(*(shift(values, periods) for values in (self.open, self.high, self.low, self.close, self.volume)))
 
 
 class CandlestickPatternRecognizer:
     """蜡烛图形态识别器"""
-    
+
     @staticmethod
-    def identify_patterns(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def detect(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
         """
-        识别蜡烛图形态
-        
+        识别每根K线的形态位集合
+
         Args:
             df: 包含 OHLCV 数据的 DataFrame
-            
+
         Returns:
-            识别到的形态列表
+            (形态位集合 int64 数组, 成交量确认 bool 数组)，与 df 等长；前 MIN_HISTORY 根K线为 0
         """
-        patterns = []
         avg_volume = df['volume'].mean() if 'volume' in df.columns else 0
-        
-        for i in range(3, len(df)):
-            prev3 = df.iloc[i-3] if i >= 3 else None
-            prev2 = df.iloc[i-2]
-            prev1 = df.iloc[i-1]
-            curr = df.iloc[i]
-            
-            pattern_info = {
-                "timestamp": curr.get("timestamp", curr.get("date", i)),
-                "open": curr["open"],
-                "high": curr["high"],
-                "low": curr["low"],
-                "close": curr["close"],
-                "volume": curr.get("volume", 0),
-                "volume_confirmed": False,
-                "patterns": []
-            }
-            
-            # 计算当前K线特征
-            curr_body = abs(curr["close"] - curr["open"])
-            curr_range = curr["high"] - curr["low"]
-            curr_upper_shadow = curr["high"] - max(curr["open"], curr["close"])
-            curr_lower_shadow = min(curr["open"], curr["close"]) - curr["low"]
-            curr_is_bullish = curr["close"] > curr["open"]
-            curr_is_bearish = curr["close"] < curr["open"]
-            curr_vol = curr.get("volume", avg_volume)
-            
-            # 计算前一根K线特征
-            prev1_body = abs(prev1["close"] - prev1["open"])
-            prev1_range = prev1["high"] - prev1["low"]
-            prev1_is_bullish = prev1["close"] > prev1["open"]
-            prev1_is_bearish = prev1["close"] < prev1["open"]
-            prev1_vol = prev1.get("volume", avg_volume)
-            
-            prev2_body = abs(prev2["close"] - prev2["open"])
-            prev2_is_bullish = prev2["close"] > prev2["open"]
-            prev2_is_bearish = prev2["close"] < prev2["open"]
-            prev2_vol = prev2.get("volume", avg_volume)
-            
+        volume = as_float_array(df['volume']) if 'volume' in df.columns else np.zeros(len(df))
+        curr = _Bars(*(as_float_array(df[col]) for col in ('open', 'high', 'low', 'close')), volume)
+        prev1 = curr.shifted(1)
+        prev2 = curr.shifted(2)
+        body = curr.body
+
+        with np.errstate(invalid="ignore"):
             # ==================== 单根K线形态 ====================
-            # DOJI系列
-            if curr_body < curr_range * 0.1:
-                if curr_upper_shadow > curr_body * 3 and curr_lower_shadow > curr_body * 3:
-                    pattern_info["patterns"].append("DOJI_LONG_LEGGED")
-                elif curr_upper_shadow > curr_lower_shadow * 2:
-                    pattern_info["patterns"].append("DOJI_GRAVESTONE")
-                elif curr_lower_shadow > curr_upper_shadow * 2:
-                    pattern_info["patterns"].append("DOJI_DRAGONFLY")
-                else:
-                    pattern_info["patterns"].append("DOJI")
-            
-            # 锤子线/上吊线
-            if (curr_body < curr_range * 0.35 and
-                curr_lower_shadow > curr_body * 2 and
-                curr_upper_shadow < curr_body * 0.5):
-                if curr_is_bullish:
-                    pattern_info["patterns"].append("HAMMER")
-                    if curr_vol > avg_volume * 1.2:
-                        pattern_info["volume_confirmed"] = True
-                else:
-                    pattern_info["patterns"].append("HANGING_MAN")
-                    if curr_vol > avg_volume * 1.2:
-                        pattern_info["volume_confirmed"] = True
-            
-            # 倒锤子/流星线
-            if (curr_body < curr_range * 0.35 and
-                curr_upper_shadow > curr_body * 2 and
-                curr_lower_shadow < curr_body * 0.5):
-                if curr_is_bearish:
-                    pattern_info["patterns"].append("INVERTED_HAMMER")
-                    if curr_vol > avg_volume * 1.2:
-                        pattern_info["volume_confirmed"] = True
-                else:
-                    pattern_info["patterns"].append("SHOOTING_STAR")
-                    if curr_vol > avg_volume * 1.2:
-                        pattern_info["volume_confirmed"] = True
-            
+            # DOJI系列（按长腿、墓碑、蜻蜓、普通的顺序，只取第一个满足的）
+            doji = body < curr.range * 0.1
+            long_legged = (curr.upper_shadow > body * 3) & (curr.lower_shadow > body * 3)
+            gravestone = curr.upper_shadow > curr.lower_shadow * 2
+            dragonfly = curr.lower_shadow > curr.upper_shadow * 2
+
+            # 锤子线/上吊线、倒锤子/流星线
+            hammer = ((body < curr.range * 0.35) & (curr.lower_shadow > body * 2)
+                      & (curr.upper_shadow < body * 0.5))
+            inverted = ((body < curr.range * 0.35) & (curr.upper_shadow > body * 2)
+                        & (curr.lower_shadow < body * 0.5))
+
             # 陀螺线
-            if (curr_body < curr_range * 0.5 and
-                curr_body > curr_range * 0.2 and
-                curr_upper_shadow > curr_body * 0.5 and
-                curr_lower_shadow > curr_body * 0.5):
-                pattern_info["patterns"].append("SPINNING_TOP")
-            
+            spinning_top = ((body < curr.range * 0.5) & (body > curr.range * 0.2)
+                            & (curr.upper_shadow > body * 0.5) & (curr.lower_shadow > body * 0.5))
+
             # 光头光脚阳线/阴线
-            if curr_body > curr_range * 0.8:
-                if curr_is_bullish:
-                    pattern_info["patterns"].append("MARUBOZU_BULLISH")
-                    if curr_vol > avg_volume * 1.5:
-                        pattern_info["volume_confirmed"] = True
-                else:
-                    pattern_info["patterns"].append("MARUBOZU_BEARISH")
-                    if curr_vol > avg_volume * 1.5:
-                        pattern_info["volume_confirmed"] = True
-            
+            marubozu = body > curr.range * 0.8
+
             # ==================== 两根K线形态 ====================
             # 吞没形态
-            if curr_body > prev1_body * 1.5:
-                if curr_is_bullish and prev1_is_bearish and curr["close"] > prev1["open"] and curr["open"] < prev1["close"]:
-                    pattern_info["patterns"].append("BULLISH_ENGULFING")
-                    if curr_vol > prev1_vol * 1.2:
-                        pattern_info["volume_confirmed"] = True
-                elif curr_is_bearish and prev1_is_bullish and curr["close"] < prev1["open"] and curr["open"] > prev1["close"]:
-                    pattern_info["patterns"].append("BEARISH_ENGULFING")
-                    if curr_vol > prev1_vol * 1.2:
-                        pattern_info["volume_confirmed"] = True
-            
+            engulfing = body > prev1.body * 1.5
+            bullish_engulfing = (engulfing & curr.is_bullish & prev1.is_bearish
+                                 & (curr.close > prev1.open) & (curr.open < prev1.close))
+            bearish_engulfing = (engulfing & ~bullish_engulfing & curr.is_bearish & prev1.is_bullish
+                                 & (curr.close < prev1.open) & (curr.open > prev1.close))
+
             # 孕线形态
-            if curr_body < prev1_body * 0.7:
-                if curr["high"] < prev1["high"] and curr["low"] > prev1["low"]:
-                    if prev1_is_bullish and curr_is_bearish:
-                        pattern_info["patterns"].append("BEARISH_HARAMI")
-                    elif prev1_is_bearish and curr_is_bullish:
-                        pattern_info["patterns"].append("BULLISH_HARAMI")
-            
+            harami = (body < prev1.body * 0.7) & (curr.high < prev1.high) & (curr.low > prev1.low)
+            bearish_harami = harami & prev1.is_bullish & curr.is_bearish
+            bullish_harami = harami & ~bearish_harami & prev1.is_bearish & curr.is_bullish
+
             # 乌云盖顶/曙光初现
-            if curr_body > prev1_body * 0.5 and prev1_body > 0:
-                if prev1_is_bullish and curr_is_bearish:
-                    if curr["open"] > prev1["high"] and curr["close"] < (prev1["open"] + prev1["close"]) / 2:
-                        pattern_info["patterns"].append("DARK_CLOUD_COVER")
-                        if curr_vol > prev1_vol * 1.2:
-                            pattern_info["volume_confirmed"] = True
-                elif prev1_is_bearish and curr_is_bullish:
-                    if curr["open"] < prev1["low"] and curr["close"] > (prev1["open"] + prev1["close"]) / 2:
-                        pattern_info["patterns"].append("PIERCING_PATTERN")
-                        if curr_vol > prev1_vol * 1.2:
-                            pattern_info["volume_confirmed"] = True
-            
+            reversal = (body > prev1.body * 0.5) & (prev1.body > 0)
+            prev1_mid = (prev1.open + prev1.close) / 2
+            dark_cloud = reversal & prev1.is_bullish & curr.is_bearish
+            piercing = (reversal & ~dark_cloud & prev1.is_bearish & curr.is_bullish
+                        & (curr.open < prev1.low) & (curr.close > prev1_mid))
+            dark_cloud &= (curr.open > prev1.high) & (curr.close < prev1_mid)
+
             # ==================== 三根K线形态 ====================
             # 晨星/暮星
-            if i >= 2:
-                if prev2_body > 0 and prev1_body < prev2_body * 0.3 and curr_body > prev2_body * 0.5:
-                    # 晨星形态
-                    if prev2_is_bearish and curr_is_bullish and prev1["high"] < prev2["low"]:
-                        pattern_info["patterns"].append("MORNING_STAR")
-                        if curr_vol > (prev1_vol + prev2_vol) / 2 * 1.2:
-                            pattern_info["volume_confirmed"] = True
-                    # 暮星形态
-                    elif prev2_is_bullish and curr_is_bearish and prev1["low"] > prev2["high"]:
-                        pattern_info["patterns"].append("EVENING_STAR")
-                        if curr_vol > (prev1_vol + prev2_vol) / 2 * 1.2:
-                            pattern_info["volume_confirmed"] = True
-                
-                # 三白兵/三黑鸦
-                if prev2_is_bullish and prev1_is_bullish and curr_is_bullish:
-                    if (curr["close"] > prev1["close"] > prev2["close"] and
-                        curr_body > prev2_body * 0.5 and prev1_body > prev2_body * 0.5):
-                        pattern_info["patterns"].append("THREE_WHITE_SOLDIERS")
-                        if curr_vol > avg_volume * 1.3:
-                            pattern_info["volume_confirmed"] = True
-                elif prev2_is_bearish and prev1_is_bearish and curr_is_bearish:
-                    if (curr["close"] < prev1["close"] < prev2["close"] and
-                        curr_body > prev2_body * 0.5 and prev1_body > prev2_body * 0.5):
-                        pattern_info["patterns"].append("THREE_BLACK_CROWS")
-                        if curr_vol > avg_volume * 1.3:
-                            pattern_info["volume_confirmed"] = True
-            
-            # 只保留有识别到形态的记录
-            if pattern_info["patterns"]:
-                patterns.append(pattern_info)
-        
-        return patterns
-    
+            star = (prev2.body > 0) & (prev1.body < prev2.body * 0.3) & (body > prev2.body * 0.5)
+            morning_star = star & prev2.is_bearish & curr.is_bullish & (prev1.high < prev2.low)
+            evening_star = star & ~morning_star & prev2.is_bullish & curr.is_bearish & (prev1.low > prev2.high)
+
+            # 三白兵/三黑鸦
+            soldiers = (body > prev2.body * 0.5) & (prev1.body > prev2.body * 0.5)
+            all_bullish = prev2.is_bullish & prev1.is_bullish & curr.is_bullish
+            three_white_soldiers = (all_bullish & soldiers
+                                    & (curr.close > prev1.close) & (prev1.close > prev2.close))
+            three_black_crows = (~all_bullish & prev2.is_bearish & prev1.is_bearish & curr.is_bearish & soldiers
+                                 & (curr.close < prev1.close) & (prev1.close < prev2.close))
+
+            masks = {
+                "DOJI_LONG_LEGGED": doji & long_legged,
+                "DOJI_GRAVESTONE": doji & ~long_legged & gravestone,
+                "DOJI_DRAGONFLY": doji & ~long_legged & ~gravestone & dragonfly,
+                "DOJI": doji & ~long_legged & ~gravestone & ~dragonfly,
+                "HAMMER": hammer & curr.is_bullish,
+                "HANGING_MAN": hammer & ~curr.is_bullish,
+                "INVERTED_HAMMER": inverted & curr.is_bearish,
+                "SHOOTING_STAR": inverted & ~curr.is_bearish,
+                "SPINNING_TOP": spinning_top,
+                "MARUBOZU_BULLISH": marubozu & curr.is_bullish,
+                "MARUBOZU_BEARISH": marubozu & ~curr.is_bullish,
+                "BULLISH_ENGULFING": bullish_engulfing,
+                "BEARISH_ENGULFING": bearish_engulfing,
+                "BEARISH_HARAMI": bearish_harami,
+                "BULLISH_HARAMI": bullish_harami,
+                "DARK_CLOUD_COVER": dark_cloud,
+                "PIERCING_PATTERN": piercing,
+                "MORNING_STAR": morning_star,
+                "EVENING_STAR": evening_star,
+                "THREE_WHITE_SOLDIERS": three_white_soldiers,
+                "THREE_BLACK_CROWS": three_black_crows,
+            }
+
+            # 成交量确认
+            volume_confirmed = (
+                ((hammer | inverted) & (volume > avg_volume * 1.2))
+                | (marubozu & (volume > avg_volume * 1.5))
+                | ((bullish_engulfing | bearish_engulfing | dark_cloud | piercing)
+                   & (volume > prev1.volume * 1.2))
+                | ((morning_star | evening_star) & (volume > (prev1.volume + prev2.volume) / 2 * 1.2))
+                | ((three_white_soldiers | three_black_crows) & (volume > avg_volume * 1.3))
+            )
+
+        bits = np.zeros(len(df), dtype=np.int64)
+        for name, mask in masks.items():
+            bits[mask] |= PATTERN_BITS[name]
+        bits[:MIN_HISTORY] = 0
+        volume_confirmed[:MIN_HISTORY] = False
+        return bits, volume_confirmed
+
+    @staticmethod
+    def decode(bits: int) -> List[str]:
+        """把形态位集合解码为形态名称列表"""
+        return [name for name, bit in PATTERN_BITS.items() if bits & bit]
+
+    @staticmethod
+    def to_records(df: pd.DataFrame, bits: np.ndarray, volume_confirmed: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        把识别到形态的K线转换为记录列表
+
+        Args:
+            df: 识别时使用的 DataFrame
+            bits / volume_confirmed: detect() 的结果
+
+        Returns:
+            每条记录包含 timestamp（没有 timestamp/date 列时为行号）、OHLCV、volume_confirmed、patterns
+        """
+        rows = np.flatnonzero(bits)
+        # 不同的形态组合很少，每种只解码一次
+        names = {int(value): CandlestickPatternRecognizer.decode(int(value)) for value in np.unique(bits[rows])}
+        time_col = next((col for col in ("timestamp", "date") if col in df.columns), None)
+        timestamps = df[time_col].iloc[rows].tolist() if time_col else rows.tolist()
+        values = {
+            col: df[col].iloc[rows].tolist() if col in df.columns else [0] * len(rows)
+            for col in ("open", "high", "low", "close", "volume")
+        }
+
+        return [
+            {
+                "timestamp": timestamps[i],
+                "open": values["open"][i],
+                "high": values["high"][i],
+                "low": values["low"][i],
+                "close": values["close"][i],
+                "volume": values["volume"][i],
+                "volume_confirmed": bool(volume_confirmed[row]),
+                "patterns": list(names[int(bits[row])]),
+            }
+            for i, row in enumerate(rows)
+        ]
+
+    @staticmethod
+    def identify_patterns(df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        识别蜡烛图形态
+
+        Args:
+            df: 包含 OHLCV 数据的 DataFrame
+
+        Returns:
+            识别到的形态列表（只包含有形态的K线）
+        """
+        bits, volume_confirmed = CandlestickPatternRecognizer.detect(df)
+        return CandlestickPatternRecognizer.to_records(df, bits, volume_confirmed)
+
     @staticmethod
     def format_patterns(patterns: List[Dict[str, Any]], max_count: int = 5) -> str:
         """
         格式化形态识别结果
-        
+
         Args:
             patterns: 识别到的形态列表
             max_count: 最多显示的形态数量
-            
+
         Returns:
             格式化的字符串
         """
         if not patterns:
             return "未识别到明显的蜡烛图形态"
-        
+
         result = []
         result.append("## 蜡烛图形态识别\n")
-        
+
         # 只显示最近的几个形态
         recent_patterns = patterns[-max_count:]
-        
+
         for i, pattern in enumerate(recent_patterns, 1):
             result.append(f"### {i}. {pattern['timestamp']}")
             result.append(f"- 识别形态: {', '.join(pattern['patterns'])}")
             result.append(f"- 价格: Open=${pattern['open']:.2f}, Close=${pattern['close']:.2f}")
             result.append(f"- 成交量确认: {'✅' if pattern['volume_confirmed'] else '❌'}")
             result.append("")
-        
+
         return "\n".join(result)
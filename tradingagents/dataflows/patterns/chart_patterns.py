@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 """图表形态识别模块
 包含头肩顶/底、双顶/底、三角形等西方技术分析形态
+
+峰谷（pivots）每段数据只计算一次（滑动窗口极值比较），传给所有依赖峰谷的检测器；
+RollingChartPatterns 逐根追加K线时只判断新确认的一个候选点，复用上一窗口的峰谷。
 """
 
+from collections import deque
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple
+
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Tuple
 
 from tradingagents.constants import (
     PEAK_TROUGH_WINDOW,
@@ -15,24 +20,7 @@ from tradingagents.constants import (
     FLAG_TREND_THRESHOLD,
     FLAG_RANGE_THRESHOLD,
 )
-
-
-def _find_peaks_and_troughs(df: pd.DataFrame, window: int = PEAK_TROUGH_WINDOW) -> Tuple[List[int], List[int]]:
-    """找出价格的峰值和谷值索引"""
-    highs = df["high"].values
-    lows = df["low"].values
-    peaks: List[int] = []
-    troughs: List[int] = []
-
-    for i in range(window, len(df) - window):
-        if all(highs[i] > highs[i - j] for j in range(1, window + 1)) and \
-           all(highs[i] > highs[i + j] for j in range(1, window + 1)):
-            peaks.append(i)
-        if all(lows[i] < lows[i - j] for j in range(1, window + 1)) and \
-           all(lows[i] < lows[i + j] for j in range(1, window + 1)):
-            troughs.append(i)
-
-    return peaks, troughs
+from .detectors.utils import Pivots, find_pivots, is_peak, is_trough
 
 
 class ChartPatterns:
@@ -42,12 +30,23 @@ class ChartPatterns:
     """
 
     @staticmethod
-    def identify_all_patterns(df: pd.DataFrame, lookback: int = 60) -> Dict[str, Any]:
-        """识别所有图表形态"""
+    def identify_all_patterns(
+        df: pd.DataFrame, lookback: int = 60, pivots: Optional[Pivots] = None
+    ) -> Dict[str, Any]:
+        """
+        识别所有图表形态
+
+        Args:
+            df: 价格数据
+            lookback: 只看最后 lookback 根K线
+            pivots: 最后 lookback 根K线中的峰谷（相对行号）；None 时计算一次，供所有检测器共用
+        """
         if df is None or len(df) < lookback:
             return {"patterns_found": False, "patterns": {}}
 
         df_slice = df.tail(lookback).copy()
+        if pivots is None:
+            pivots = find_pivots(df_slice["high"].values, df_slice["low"].values, PEAK_TROUGH_WINDOW)
         patterns: Dict[str, Any] = {}
 
         for name, func in [
@@ -64,7 +63,7 @@ class ChartPatterns:
             ("rectangle", ChartPatterns._identify_rectangle),
         ]:
             try:
-                result = func(df_slice)
+                result = func(df_slice, pivots)
                 if result.get("detected"):
                     patterns[name] = result
             except (ValueError, TypeError, KeyError, IndexError):
@@ -77,17 +76,24 @@ class ChartPatterns:
 
     @staticmethod
     def _find_peaks_and_troughs(df: pd.DataFrame, window: int = PEAK_TROUGH_WINDOW) -> Tuple[List[int], List[int]]:
-        return _find_peaks_and_troughs(df, window)
+        return find_pivots(df["high"].values, df["low"].values, window)
+
+    @staticmethod
+    def _pivots(df: pd.DataFrame, pivots: Optional[Pivots]) -> Pivots:
+        """检测器使用传入的峰谷，单独调用检测器时才计算"""
+        if pivots is None:
+            pivots = find_pivots(df["high"].values, df["low"].values, PEAK_TROUGH_WINDOW)
+        return pivots
 
     # =====================================================================
     # 各形态检测方法
     # =====================================================================
 
     @staticmethod
-    def _identify_head_and_shoulders(df: pd.DataFrame) -> Dict[str, Any]:
+    def _identify_head_and_shoulders(df: pd.DataFrame, pivots: Optional[Pivots] = None) -> Dict[str, Any]:
         """检测头肩顶/底"""
         result: Dict[str, Any] = {"detected": False}
-        peaks, troughs = _find_peaks_and_troughs(df)
+        peaks, troughs = ChartPatterns._pivots(df, pivots)
 
         # 头肩顶：需要至少3个峰值，中间最高
         if len(peaks) >= 3:
@@ -124,7 +130,7 @@ class ChartPatterns:
 
     @staticmethod
     def _identify_double_extreme(
-        df: pd.DataFrame, use_peaks: bool = True
+        df: pd.DataFrame, use_peaks: bool = True, pivots: Optional[Pivots] = None
     ) -> Dict[str, Any]:
         """检测双顶或双底（参数化方法）
         
@@ -132,7 +138,7 @@ class ChartPatterns:
             df: 价格数据
             use_peaks: True=检测双顶(peaks/highs/bearish), False=检测双底(troughs/lows/bullish)
         """
-        peaks, troughs = _find_peaks_and_troughs(df)
+        peaks, troughs = ChartPatterns._pivots(df, pivots)
         points = peaks if use_peaks else troughs
         values = df["high"].values if use_peaks else df["low"].values
         pattern_type = "double_top" if use_peaks else "double_bottom"
@@ -154,19 +160,19 @@ class ChartPatterns:
         return {"detected": False}
 
     @staticmethod
-    def _identify_double_top(df: pd.DataFrame) -> Dict[str, Any]:
+    def _identify_double_top(df: pd.DataFrame, pivots: Optional[Pivots] = None) -> Dict[str, Any]:
         """检测双顶"""
-        return ChartPatterns._identify_double_extreme(df, use_peaks=True)
+        return ChartPatterns._identify_double_extreme(df, use_peaks=True, pivots=pivots)
 
     @staticmethod
-    def _identify_double_bottom(df: pd.DataFrame) -> Dict[str, Any]:
+    def _identify_double_bottom(df: pd.DataFrame, pivots: Optional[Pivots] = None) -> Dict[str, Any]:
         """检测双底"""
-        return ChartPatterns._identify_double_extreme(df, use_peaks=False)
+        return ChartPatterns._identify_double_extreme(df, use_peaks=False, pivots=pivots)
 
     @staticmethod
-    def _identify_ascending_triangle(df: pd.DataFrame) -> Dict[str, Any]:
+    def _identify_ascending_triangle(df: pd.DataFrame, pivots: Optional[Pivots] = None) -> Dict[str, Any]:
         """检测上升三角形：水平阻力线 + 上升支撑线"""
-        peaks, troughs = _find_peaks_and_troughs(df)
+        peaks, troughs = ChartPatterns._pivots(df, pivots)
         if len(peaks) >= 2 and len(troughs) >= 2:
             highs = df["high"].values
             lows = df["low"].values
@@ -177,9 +183,9 @@ class ChartPatterns:
         return {"detected": False}
 
     @staticmethod
-    def _identify_descending_triangle(df: pd.DataFrame) -> Dict[str, Any]:
+    def _identify_descending_triangle(df: pd.DataFrame, pivots: Optional[Pivots] = None) -> Dict[str, Any]:
         """检测下降三角形：水平支撑线 + 下降阻力线"""
-        peaks, troughs = _find_peaks_and_troughs(df)
+        peaks, troughs = ChartPatterns._pivots(df, pivots)
         if len(peaks) >= 2 and len(troughs) >= 2:
             highs = df["high"].values
             lows = df["low"].values
@@ -190,9 +196,9 @@ class ChartPatterns:
         return {"detected": False}
 
     @staticmethod
-    def _identify_symmetrical_triangle(df: pd.DataFrame) -> Dict[str, Any]:
+    def _identify_symmetrical_triangle(df: pd.DataFrame, pivots: Optional[Pivots] = None) -> Dict[str, Any]:
         """检测对称三角形：阻力下降 + 支撑上升"""
-        peaks, troughs = _find_peaks_and_troughs(df)
+        peaks, troughs = ChartPatterns._pivots(df, pivots)
         if len(peaks) >= 2 and len(troughs) >= 2:
             highs = df["high"].values
             lows = df["low"].values
@@ -203,7 +209,7 @@ class ChartPatterns:
         return {"detected": False}
 
     @staticmethod
-    def _identify_flag(df: pd.DataFrame) -> Dict[str, Any]:
+    def _identify_flag(df: pd.DataFrame, pivots: Optional[Pivots] = None) -> Dict[str, Any]:
         """检测旗形：强趋势后的平行通道整理"""
         closes = df["close"].values
         if len(closes) < 20:
@@ -222,9 +228,9 @@ class ChartPatterns:
         return {"detected": False}
 
     @staticmethod
-    def _identify_wedge(df: pd.DataFrame) -> Dict[str, Any]:
+    def _identify_wedge(df: pd.DataFrame, pivots: Optional[Pivots] = None) -> Dict[str, Any]:
         """检测楔形：收敛趋势线（均向上或均向下）"""
-        peaks, troughs = _find_peaks_and_troughs(df)
+        peaks, troughs = ChartPatterns._pivots(df, pivots)
         if len(peaks) >= 2 and len(troughs) >= 2:
             highs = df["high"].values
             lows = df["low"].values
@@ -262,19 +268,19 @@ class ChartPatterns:
         return {"detected": False}
 
     @staticmethod
-    def _identify_rounding_top(df: pd.DataFrame) -> Dict[str, Any]:
+    def _identify_rounding_top(df: pd.DataFrame, pivots: Optional[Pivots] = None) -> Dict[str, Any]:
         """检测圆弧顶"""
         return ChartPatterns._identify_rounding(df, is_top=True)
 
     @staticmethod
-    def _identify_rounding_bottom(df: pd.DataFrame) -> Dict[str, Any]:
+    def _identify_rounding_bottom(df: pd.DataFrame, pivots: Optional[Pivots] = None) -> Dict[str, Any]:
         """检测圆弧底"""
         return ChartPatterns._identify_rounding(df, is_top=False)
 
     @staticmethod
-    def _identify_rectangle(df: pd.DataFrame) -> Dict[str, Any]:
+    def _identify_rectangle(df: pd.DataFrame, pivots: Optional[Pivots] = None) -> Dict[str, Any]:
         """检测矩形整理：水平阻力 + 水平支撑"""
-        peaks, troughs = _find_peaks_and_troughs(df)
+        peaks, troughs = ChartPatterns._pivots(df, pivots)
         if len(peaks) >= 2 and len(troughs) >= 2:
             highs = df["high"].values
             lows = df["low"].values
@@ -283,3 +289,91 @@ class ChartPatterns:
             if resistance_flat and support_flat:
                 return {"detected": True, "type": "rectangle", "signal": "neutral", "confidence": 0.50}
         return {"detected": False}
+
+
+class RollingChartPatterns:
+    """
+    滚动图表形态识别：每追加一根K线，返回最后 lookback 根K线上的识别结果
+
+    峰谷只在被确认时判断一次（第 t 根K线到达时，t - window 的前后窗口才完整），
+    之后随窗口滑动复用，不再每根K线重新扫描整个窗口。
+    每次 update() 的结果与 ChartPatterns.identify_all_patterns(截至当前的数据, lookback) 相同。
+
+    Examples:
+        >>> rolling = RollingChartPatterns(lookback=60)
+        >>> for bar in bars:
+        ...     result = rolling.update(bar)
+    """
+
+    COLUMNS = ("open", "high", "low", "close", "volume")
+
+    def __init__(self, lookback: int = 60, window: int = PEAK_TROUGH_WINDOW):
+        """
+        Args:
+            lookback: 识别窗口（K线数）
+            window: 峰谷确认窗口
+        """
+        self.lookback = lookback
+        self.window = window
+        # 只保留最近 capacity 根K线；缓冲区留出同样多的空位，写满时整体前移一次（均摊 O(1)）
+        self._capacity = max(lookback, 2 * window + 1)
+        self._buffer = np.full((2 * self._capacity, len(self.COLUMNS)), np.nan)
+        self._end = 0
+        self._peaks: Deque[int] = deque()
+        self._troughs: Deque[int] = deque()
+        self._count = 0
+
+    def update(self, bar: Mapping[str, float]) -> Dict[str, Any]:
+        """
+        追加一根K线
+
+        Args:
+            bar: 至少包含 high、low、close（open、volume 缺省为 NaN）
+
+        Returns:
+            同 ChartPatterns.identify_all_patterns()
+        """
+        if self._end == len(self._buffer):
+            keep = self._capacity - 1
+            self._buffer[:keep] = self._buffer[self._end - keep:self._end]
+            self._end = keep
+        self._buffer[self._end] = [bar.get(col, np.nan) for col in self.COLUMNS]
+        self._end += 1
+        t = self._count
+        self._count += 1
+
+        # 新确认的候选点：前后各 window 根K线都已到达（行号为绝对位置）
+        w = self.window
+        candidate = t - w
+        if candidate >= w:
+            recent = self._buffer[self._end - (2 * w + 1):self._end]
+            if is_peak(recent[:, 1], w, w):
+                self._peaks.append(candidate)
+            if is_trough(recent[:, 2], w, w):
+                self._troughs.append(candidate)
+
+        if self._count < self.lookback:
+            return {"patterns_found": False, "patterns": {}}
+
+        # 窗口起点左侧不足 window 根K线的点在整段计算中不是峰谷，丢弃
+        start = self._count - self.lookback
+        for pivots in (self._peaks, self._troughs):
+            while pivots and pivots[0] < start + w:
+                pivots.popleft()
+
+        df = pd.DataFrame(self._buffer[self._end - self.lookback:self._end], columns=list(self.COLUMNS))
+        pivots = Pivots([p - start for p in self._peaks], [p - start for p in self._troughs])
+        return ChartPatterns.identify_all_patterns(df, self.lookback, pivots)
+
+    def update_frame(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        依次追加 df 中的所有K线
+
+        Returns:
+            最后一根K线对应的识别结果（df 为空时为未识别）
+        """
+        result: Dict[str, Any] = {"patterns_found": False, "patterns": {}}
+        columns = {col: df[col].to_numpy(dtype=float) for col in self.COLUMNS if col in df.columns}
+        for i in range(len(df)):
+            result = self.update({col: values[i] for col, values in columns.items()})
+        return result
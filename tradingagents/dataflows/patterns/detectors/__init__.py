@@ -1,7 +1,11 @@
 """图表形态检测器模块"""
 
-from .utils import find_peaks_and_troughs
+from .utils import Pivots, find_peaks_and_troughs, find_pivots, is_peak, is_trough
 
 __all__ = [
+    "Pivots",
     "find_peaks_and_troughs",
+    "find_pivots",
+    "is_peak",
+    "is_trough",
 ]
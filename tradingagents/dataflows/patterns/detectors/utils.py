@@ -1,34 +1,84 @@
 """形态识别工具函数"""
 
+from typing import List, NamedTuple, Optional
+
+import numpy as np
 import pandas as pd
 
+from tradingagents.constants import PEAK_TROUGH_WINDOW
+from ...indicators.rolling import sliding_windows
+
+
+class Pivots(NamedTuple):
+    """峰值和谷值的行号（升序）"""
+    peaks: List[int]
+    troughs: List[int]
+
+
+def _strict_extremes(values: np.ndarray, window: int, is_peak: bool) -> np.ndarray:
+    """严格大于（或小于）前后各 window 个数据点的行号"""
+    n = len(values)
+    if n < 2 * window + 1:
+        return np.empty(0, dtype=np.int64)
+
+    windows = sliding_windows(values, window)
+    # 第 k 个窗口覆盖 [k, k + window)：i 左侧的窗口是 i - window，右侧的窗口是 i + 1
+    if is_peak:
+        bound = windows.max(axis=-1)
+    else:
+        bound = windows.min(axis=-1)
+    center = values[window:n - window]
+    left = bound[:n - 2 * window]
+    right = bound[window + 1:]
+    # NaN 参与比较的结果为 False（与逐点比较一致）
+    with np.errstate(invalid="ignore"):
+        mask = (center > left) & (center > right) if is_peak else (center < left) & (center < right)
+    return np.flatnonzero(mask) + window
+
+
+def find_pivots(high: np.ndarray, low: np.ndarray, window: int = PEAK_TROUGH_WINDOW) -> Pivots:
+    """
+    找出价格的峰值和谷值（滑动窗口极值比较，一次计算）
+
+    Args:
+        high / low: 最高价、最低价数组
+        window: 窗口大小用于确认峰值/谷值
+
+    Returns:
+        Pivots(peaks, troughs)
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    return Pivots(
+        _strict_extremes(high, window, is_peak=True).tolist(),
+        _strict_extremes(low, window, is_peak=False).tolist(),
+    )
+
+
+def is_peak(high: np.ndarray, i: int, window: int = PEAK_TROUGH_WINDOW) -> bool:
+    """第 i 个点是否为峰值（需要前后各 window 个数据点）"""
+    center = high[i]
+    return bool(center > np.max(high[i - window:i]) and center > np.max(high[i + 1:i + window + 1]))
+
 
-def find_peaks_and_troughs(df: pd.DataFrame, window: int = 5) -> tuple:
+def is_trough(low: np.ndarray, i: int, window: int = PEAK_TROUGH_WINDOW) -> bool:
+    """第 i 个点是否为谷值（需要前后各 window 个数据点）"""
+    center = low[i]
+    return bool(center < np.min(low[i - window:i]) and center < np.min(low[i + 1:i + window + 1]))
+
+
+def find_peaks_and_troughs(df: pd.DataFrame, window: int = PEAK_TROUGH_WINDOW, pivots: Optional[Pivots] = None) -> tuple:
     """
     找出价格的峰值和谷值
     
     Args:
         df: DataFrame with 'high' and 'low' columns
         window: 窗口大小用于确认峰值/谷值
+        pivots: 已计算好的峰谷（直接返回，不重复计算）
         
     Returns:
         (peaks, troughs) - 峰值和谷值的索引列表
     """
-    highs = df['high'].values
-    lows = df['low'].values
-    
-    peaks = []
-    troughs = []
-    
-    for i in range(window, len(df) - window):
-        # 峰值：比前后window个数据点都高
-        if all(highs[i] > highs[i-j] for j in range(1, window+1)) and \
-           all(highs[i] > highs[i+j] for j in range(1, window+1)):
-            peaks.append(i)
-        
-        # 谷值：比前后window个数据点都低
-        if all(lows[i] < lows[i-j] for j in range(1, window+1)) and \
-           all(lows[i] < lows[i+j] for j in range(1, window+1)):
-            troughs.append(i)
-    
-    return peaks, troughs
+    if pivots is None:
+        pivots = find_pivots(df['high'].values, df['low'].values, window)
+    return pivots.peaks, pivots.troughs
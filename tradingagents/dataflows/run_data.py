@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+运行数据旁路存储
+================
+一次 propagate 需要的数据在图开始时（Data Prefetch 节点）并发获取一次，只取选中的分析师
+会用到的数据（见 PREFETCH_BY_ANALYST）：K线、基本面、三张财务报表、新闻、全球新闻、内幕交易。
+K线只解析一次，并在同一个 DataFrame 上预先计算指标分组、图表形态和蜡烛图形态报告。
+
+结果按运行 ID 存在进程内的旁路存储中，AgentState 只携带运行 ID（DataFrame 和大段文本
+不进入图状态）。分析师和工具通过 RunData.fetch(method, *args) 取数：
+
+- 与预取参数相同的请求直接返回预取结果
+- 其他请求（如 LLM 自选日期的新闻）获取一次后记入本次运行，同一次运行内不会重复获取
+
+使用示例:
+    >>> run_data = create_run_data(run_id, "AAPL", "2025-01-15")
+    >>> prefetch_run_data_sync(run_data, ["market", "fundamentals"])
+    >>> run_data.fetch("get_fundamentals", "AAPL", "2025-01-15")  # 命中预取结果
+    >>> release_run_data(run_id)
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Dict, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+
+from tradingagents.constants import (
+    ANALYST_CHART_PATTERN_LOOKBACK,
+    ANALYST_GLOBAL_NEWS_LIMIT,
+    ANALYST_INDICATOR_LOOKBACK_DAYS,
+    ANALYST_NEWS_LOOKBACK_DAYS,
+    ANALYST_STOCK_DATA_DAYS,
+    RUN_PREFETCH_MAX_CONCURRENCY,
+)
+from tradingagents.utils.logger import get_logger
+from .async_http import gather_structured, run_sync
+from .core.arg_digest import digest_args
+from .interface import (
+    DataFetchError,
+    _all_indicators_report,
+    _candlestick_patterns_report,
+    _chart_patterns_report,
+    _parse_stock_data,
+    _prepare_clean_dataframe,
+    get_data_manager,
+)
+
+logger = get_logger(__name__)
+
+# 预取失败只记录日志：对应的数据在分析师/工具首次请求时再获取
+PREFETCH_ERRORS = (DataFetchError, ConnectionError, ValueError, KeyError, TimeoutError, OSError)
+
+# 分析师类型 -> 需要预取的数据方法（get_stock_data 包含指标和形态报告）
+PREFETCH_BY_ANALYST: Dict[str, Tuple[str, ...]] = {
+    "market": ("get_stock_data",),
+    "candlestick": ("get_stock_data",),
+    "fundamentals": ("get_fundamentals", "get_balance_sheet", "get_cashflow", "get_income_statement"),
+    "news": ("get_news", "get_global_news", "get_insider_transactions"),
+    "social": ("get_news",),
+}
+
+
+def days_before(date: str, days: int) -> str:
+    """date 之前 days 个自然日的日期（yyyy-mm-dd）"""
+    return (datetime.strptime(date, "%Y-%m-%d") - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def analyst_stock_window(trade_date: str) -> Tuple[str, str]:
+    """市场/蜡烛图分析师使用的K线区间 (start_date, end_date)"""
+    return days_before(trade_date, ANALYST_STOCK_DATA_DAYS), trade_date
+
+
+class RunData:
+    """一次运行的数据：预取结果 + 运行内取过的数据"""
+
+    def __init__(self, run_id: str, symbol: str, trade_date: str):
+        """
+        Args:
+            run_id: 运行 ID
+            symbol: 股票代码
+            trade_date: 交易日期
+        """
+        self.run_id = run_id
+        self.symbol = symbol
+        self.trade_date = trade_date
+        # 解析后的 OHLCV（timestamp, open, high, low, close, volume），预取成功后可用
+        self.frame: Optional[pd.DataFrame] = None
+        self.hits = 0
+        self.misses = 0
+        self._results: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(method: str, args: tuple) -> tuple:
+        # 大参数（如 stock_data CSV）按摘要参与键
+        return (method,) + digest_args(tuple(args), {})[0]
+
+    def get(self, method: str, *args) -> Optional[Any]:
+        """已取过的结果，没有时返回 None"""
+        with self._lock:
+            return self._results.get(self._key(method, args))
+
+    def put(self, method: str, args: tuple, result: Any) -> None:
+        """记入一项结果"""
+        with self._lock:
+            self._results[self._key(method, args)] = result
+
+    def fetch(self, method: str, *args, **kwargs) -> Any:
+        """
+        取数：本次运行取过（或预取过）直接返回，否则经数据管理器获取一次并记入
+
+        Args:
+            method: 数据方法名（同 UnifiedDataManager.fetch）
+            *args: 位置参数，参与键
+            **kwargs: 关键字参数，原样传给数据管理器，不参与键
+        """
+        key = self._key(method, args)
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                return self._results[key]
+            self.misses += 1
+
+        result = get_data_manager().fetch(method, *args, **kwargs)
+        with self._lock:
+            self._results[key] = result
+        return result
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
+
+
+# ==================== 旁路存储 ====================
+_runs: Dict[str, RunData] = {}
+_runs_lock = threading.Lock()
+
+
+def create_run_data(run_id: str, symbol: str, trade_date: str) -> RunData:
+    """登记一次运行（同一个运行 ID 重复登记时返回已有的数据）"""
+    with _runs_lock:
+        run_data = _runs.get(run_id)
+        if run_data is None:
+            run_data = _runs[run_id] = RunData(run_id, symbol, trade_date)
+        return run_data
+
+
+def get_run_data(run_id: Optional[str]) -> Optional[RunData]:
+    """按运行 ID 获取运行数据，未登记时返回 None"""
+    if not run_id:
+        return None
+    with _runs_lock:
+        return _runs.get(run_id)
+
+
+def release_run_data(run_id: str) -> None:
+    """运行结束后释放运行数据"""
+    with _runs_lock:
+        _runs.pop(run_id, None)
+
+
+# ==================== 预取 ====================
+def prefetch_methods(selected_analysts: Optional[Sequence[str]] = None) -> Set[str]:
+    """
+    选中的分析师需要预取的数据方法
+
+    Args:
+        selected_analysts: 分析师类型列表，None 表示全部分析师
+    """
+    if selected_analysts is None:
+        selected_analysts = list(PREFETCH_BY_ANALYST)
+    return {method for analyst in selected_analysts for method in PREFETCH_BY_ANALYST.get(analyst, ())}
+
+
+def prefetch_requests(
+    symbol: str, trade_date: str, selected_analysts: Optional[Sequence[str]] = None
+) -> Dict[str, tuple]:
+    """
+    需要预取的数据请求（参数与分析师和工具的默认请求一致）
+
+    Args:
+        symbol: 股票代码
+        trade_date: 交易日期
+        selected_analysts: 分析师类型列表，只保留这些分析师会用到的请求；None 表示全部
+
+    Returns:
+        {方法名: 位置参数}，不含 K 线（K 线单独获取后还要计算指标和形态）
+    """
+    methods = prefetch_methods(selected_analysts)
+    requests = {
+        "get_fundamentals": (symbol, trade_date),
+        "get_balance_sheet": (symbol, "quarterly", trade_date),
+        "get_cashflow": (symbol, "quarterly", trade_date),
+        "get_income_statement": (symbol, "quarterly", trade_date),
+        "get_news": (symbol, days_before(trade_date, ANALYST_NEWS_LOOKBACK_DAYS), trade_date),
+        "get_global_news": (trade_date, ANALYST_NEWS_LOOKBACK_DAYS, ANALYST_GLOBAL_NEWS_LIMIT),
+        "get_insider_transactions": (symbol,),
+    }
+    return {method: args for method, args in requests.items() if method in methods}
+
+
+def compute_reports(run_data: RunData, stock_data: str) -> None:
+    """解析一次K线，计算指标分组、图表形态和蜡烛图形态报告并记入运行数据"""
+    symbol, trade_date = run_data.symbol, run_data.trade_date
+    start_date, end_date = analyst_stock_window(trade_date)
+
+    df = _parse_stock_data(stock_data)
+    if df is None:
+        raise DataFetchError("Failed to parse stock data")
+    frame = _prepare_clean_dataframe(df)
+    run_data.frame = frame
+
+    run_data.put(
+        "get_all_indicators",
+        (symbol, trade_date, ANALYST_INDICATOR_LOOKBACK_DAYS, stock_data),
+        _all_indicators_report(frame, ANALYST_INDICATOR_LOOKBACK_DAYS),
+    )
+    run_data.put(
+        "get_chart_patterns",
+        (symbol, start_date, end_date, ANALYST_CHART_PATTERN_LOOKBACK),
+        _chart_patterns_report(symbol, frame, ANALYST_CHART_PATTERN_LOOKBACK),
+    )
+    run_data.put(
+        "get_candlestick_patterns",
+        (symbol, start_date, end_date),
+        _candlestick_patterns_report(symbol, start_date, end_date, frame),
+    )
+
+
+async def _limited(semaphore: asyncio.Semaphore, aw: Awaitable[Any]) -> Any:
+    """在信号量限制下等待 aw"""
+    async with semaphore:
+        return await aw
+
+
+async def _prefetch_one(run_data: RunData, method: str, args: tuple) -> None:
+    """预取一项数据（与工具一样直接调用数据管理器，缓存键和参数规范化一致）"""
+    try:
+        run_data.put(method, args, await get_data_manager().fetch_async(method, *args))
+    except PREFETCH_ERRORS as e:
+        logger.warning("预取 %s 失败 (%s): %s", method, run_data.symbol, e)
+
+
+async def _prefetch_stock(run_data: RunData, semaphore: asyncio.Semaphore) -> None:
+    """预取K线，随后在线程中计算指标和形态（CPU 密集，不占用请求名额、不阻塞事件循环）"""
+    args = (run_data.symbol, *analyst_stock_window(run_data.trade_date))
+    try:
+        async with semaphore:
+            stock_data = await get_data_manager().fetch_async("get_stock_data", *args)
+        run_data.put("get_stock_data", args, stock_data)
+        await asyncio.to_thread(compute_reports, run_data, stock_data)
+    except PREFETCH_ERRORS as e:
+        logger.warning("预取K线/指标失败 (%s): %s", run_data.symbol, e)
+
+
+async def prefetch_run_data(
+    run_data: RunData,
+    selected_analysts: Optional[Sequence[str]] = None,
+    max_concurrency: int = RUN_PREFETCH_MAX_CONCURRENCY,
+) -> RunData:
+    """
+    并发预取一次运行中选中的分析师需要的数据
+
+    Args:
+        run_data: 运行数据
+        selected_analysts: 分析师类型列表，None 表示全部分析师
+        max_concurrency: 同时在途的数据请求数上限
+
+    Returns:
+        run_data（单项失败只记录日志，不抛出）
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    requests = prefetch_requests(run_data.symbol, run_data.trade_date, selected_analysts)
+    tasks = [
+        _limited(semaphore, _prefetch_one(run_data, method, args))
+        for method, args in requests.items()
+    ]
+    if "get_stock_data" in prefetch_methods(selected_analysts):
+        tasks.append(_prefetch_stock(run_data, semaphore))
+    await gather_structured(*tasks)
+    return run_data
+
+
+def prefetch_run_data_sync(
+    run_data: RunData,
+    selected_analysts: Optional[Sequence[str]] = None,
+    max_concurrency: int = RUN_PREFETCH_MAX_CONCURRENCY,
+) -> RunData:
+    """prefetch_run_data 的同步版本（经 run_sync 在新的事件循环中运行，已在事件循环中时改到工作线程）"""
+    return run_sync(lambda: prefetch_run_data(run_data, selected_analysts, max_concurrency))
@@ -0,0 +1,258 @@
+"""
+工具调用日志后台写入器
+======================
+fetch 热路径只把记录放入有界队列，由单个后台线程批量写入 SQLite：
+
+- 一个长连接，WAL 模式 + synchronous=NORMAL，每批一次事务（executemany），
+  fetch 延迟不再包含 SQLite 的 fsync
+- full_result 按内容哈希只存一份（tool_call_results 表），tool_calls 只保存哈希
+- flush() 等待已入队的记录落盘（propagate 结束时和进程退出时调用）
+"""
+
+import atexit
+import hashlib
+import json
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from tradingagents.constants import (
+    TOOL_CALL_LOG_BATCH_SIZE,
+    TOOL_CALL_LOG_ENQUEUE_TIMEOUT_SECONDS,
+    TOOL_CALL_LOG_QUEUE_SIZE,
+)
+from tradingagents.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RESULT_PREVIEW_CHARS = 500
+
+# 队列中的停止标记
+_STOP = object()
+
+
+@dataclass
+class ToolCallRecord:
+    """一条待写入的工具调用记录"""
+    symbol: str
+    trade_date: str
+    tool_name: str
+    vendor_used: str
+    input_params: Dict[str, Any]
+    result: str
+    created_at: str
+
+
+def result_hash(result: str) -> str:
+    """full_result 的内容哈希（去重键）"""
+    return hashlib.sha256(result.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class ToolCallWriter:
+    """工具调用日志的后台批量写入器（线程安全）
+
+    用法:
+        writer = ToolCallWriter("tradingagents/db/trading_analysis.db")
+        writer.submit(record)      # 非阻塞（队列满时最多等待 enqueue_timeout 秒）
+        writer.flush(timeout=10)   # 等待已入队记录写入完成
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_queue: int = TOOL_CALL_LOG_QUEUE_SIZE,
+        batch_size: int = TOOL_CALL_LOG_BATCH_SIZE,
+        enqueue_timeout: float = TOOL_CALL_LOG_ENQUEUE_TIMEOUT_SECONDS,
+    ):
+        """
+        Args:
+            db_path: SQLite 数据库路径（表结构由 TradingDatabase 创建）
+            max_queue: 队列容量，写入跟不上时调用方最多等待 enqueue_timeout 秒后丢弃记录
+            batch_size: 每个事务最多写入的记录数
+            enqueue_timeout: 队列满时的最长等待秒数
+        """
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.enqueue_timeout = enqueue_timeout
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, max_queue))
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "deduplicated": 0,
+            "dropped": 0,
+            "batches": 0,
+            "errors": 0,
+        }
+        atexit.register(self.close)
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="tool-call-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, record: ToolCallRecord) -> bool:
+        """
+        提交一条记录
+
+        Returns:
+            是否已入队（写入器已关闭或队列持续已满时返回 False）
+        """
+        if self._closed:
+            return False
+        self._ensure_thread()
+        try:
+            self._queue.put(record, timeout=self.enqueue_timeout)
+        except queue.Full:
+            with self._lock:
+                self._stats["dropped"] += 1
+            logger.warning("工具调用日志队列已满，丢弃记录: %s", record.tool_name)
+            return False
+        with self._lock:
+            self._stats["enqueued"] += 1
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待此前提交的记录全部写入
+
+        Args:
+            timeout: 最长等待秒数（入队和等待写入合计），None 表示一直等待
+
+        Returns:
+            是否在超时前完成
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """写完剩余记录并停止后台线程（注册为 atexit，可重复调用；timeout 为入队和等待合计）"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("工具调用日志队列已满，退出时未能写完")
+            return
+        thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取写入统计"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    # ---------- 后台线程 ----------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _run(self) -> None:
+        conn = None
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            logger.error("❌ 工具调用日志连接数据库失败: %s", e)
+
+        stop = False
+        while not stop:
+            batch: List[ToolCallRecord] = []
+            waiters: List[threading.Event] = []
+            item = self._queue.get()
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write(conn, batch)
+            for waiter in waiters:
+                waiter.set()
+
+        if conn is not None:
+            conn.close()
+
+    def _write(self, conn: Optional[sqlite3.Connection], batch: List[ToolCallRecord]) -> None:
+        """一个事务写入一批记录；相同 full_result 只保存一份"""
+        results: Dict[str, tuple] = {}
+        rows = []
+        for record in batch:
+            digest = result_hash(record.result)
+            results.setdefault(digest, (digest, record.result, record.created_at))
+            rows.append((
+                record.symbol,
+                record.trade_date,
+                record.tool_name,
+                record.vendor_used,
+                json.dumps(record.input_params, ensure_ascii=False, default=str),
+                record.result[:RESULT_PREVIEW_CHARS],
+                digest,
+                record.created_at,
+            ))
+
+        if conn is None:
+            with self._lock:
+                self._stats["errors"] += len(batch)
+            return
+
+        try:
+            with conn:
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO tool_call_results "
+                    "(result_hash, full_result, created_at) VALUES (?, ?, ?)",
+                    list(results.values()),
+                )
+                inserted = conn.total_changes - before
+                conn.executemany(
+                    "INSERT INTO tool_calls ("
+                    "symbol, trade_date, tool_name, vendor_used, "
+                    "input_params, result_preview, result_hash, created_at"
+                    ") VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error as e:
+            logger.error("❌ 批量保存工具调用失败: %s", e)
+            with self._lock:
+                self._stats["errors"] += len(batch)
+            return
+
+        with self._lock:
+            self._stats["written"] += len(rows)
+            self._stats["deduplicated"] += len(rows) - inserted
+            self._stats["batches"] += 1
@@ -0,0 +1,294 @@
+"""
+交易日历
+========
+基于规则的交易所日历（无需网络、无需额外依赖），用于：
+
+- 判断某天是否为交易日（替代拉取 5 天K线的 is_market_open 探测）
+- 判断某个交易日是否已收盘（K线定稿后可以永久缓存）
+- 计算下一次开盘 / 收盘时间（决定缓存应在何时过期）
+
+美股按纽交所规则计算节假日与提前收盘；港股 / A股目前只排除周末（has_holiday_rule 为 False），
+节假日当天没有K线，不影响缓存正确性；判断是否开市时需要再检查当天是否有K线（见 is_market_open）。
+"""
+
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Dict, FrozenSet, Optional, Union
+from zoneinfo import ZoneInfo
+
+from dateutil.easter import easter
+
+DateLike = Union[str, date, datetime, None]
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """某月第 n 个星期 weekday（0=周一）"""
+    first = date(year, month, 1)
+    offset = (weekday - first.weekday()) % 7
+    return first + timedelta(days=offset + 7 * (n - 1))
+
+
+def _last_weekday(year: int, month: int, weekday: int) -> date:
+    """某月最后一个星期 weekday"""
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day: date) -> date:
+    """周六的节假日提前到周五，周日顺延到周一"""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+# 纽交所临时休市（国丧、飓风等）
+NYSE_SPECIAL_CLOSURES = frozenset({
+    date(2012, 10, 29),
+    date(2012, 10, 30),
+    date(2018, 12, 5),
+    date(2025, 1, 9),
+})
+
+
+@lru_cache(maxsize=64)
+def nyse_holidays(year: int) -> FrozenSet[date]:
+    """纽交所某年的全天休市日"""
+    days = set()
+
+    # 元旦：落在周六时不在前一年 12/31 补休
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        days.add(_observed(new_year))
+
+    days.add(_nth_weekday(year, 1, 0, 3))        # 马丁·路德·金纪念日
+    days.add(_nth_weekday(year, 2, 0, 3))        # 总统日
+    days.add(easter(year) - timedelta(days=2))   # 耶稣受难日
+    days.add(_last_weekday(year, 5, 0))          # 阵亡将士纪念日
+    if year >= 2022:
+        days.add(_observed(date(year, 6, 19)))   # 六月节
+    days.add(_observed(date(year, 7, 4)))        # 独立日
+    days.add(_nth_weekday(year, 9, 0, 1))        # 劳动节
+    days.add(_nth_weekday(year, 11, 3, 4))       # 感恩节
+    days.add(_observed(date(year, 12, 25)))      # 圣诞节
+
+    days.update(d for d in NYSE_SPECIAL_CLOSURES if d.year == year)
+    return frozenset(days)
+
+
+@lru_cache(maxsize=64)
+def nyse_early_closes(year: int) -> FrozenSet[date]:
+    """纽交所某年 13:00 提前收盘的交易日"""
+    candidates = [
+        date(year, 7, 3),
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1),  # 感恩节次日
+        date(year, 12, 24),
+    ]
+    holidays = nyse_holidays(year)
+    return frozenset(d for d in candidates if d.weekday() < 5 and d not in holidays)
+
+
+def to_date(value: DateLike) -> Optional[date]:
+    """把 yyyy-mm-dd 字符串 / date / datetime 转为 date，无法解析时返回 None"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and len(value) >= 10:
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    return None
+
+
+class TradingCalendar:
+    """单个交易所的交易日历
+
+    用法:
+        cal = get_calendar_for_symbol("NVDA")
+        cal.is_session("2025-12-25")           # False
+        cal.is_session_closed("2025-12-24")    # 提前收盘日 13:00 之后为 True
+        cal.next_close()                       # 下一次收盘时间（带时区）
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timezone: str,
+        open_time: time,
+        close_time: time,
+        early_close_time: Optional[time] = None,
+        holiday_rule=None,
+        early_close_rule=None,
+    ):
+        """
+        Args:
+            name: 交易所名称
+            timezone: 交易所时区（IANA 名称）
+            open_time: 开盘时间（当地时间）
+            close_time: 收盘时间（当地时间）
+            early_close_time: 提前收盘时间
+            holiday_rule: year -> 全天休市日集合，为 None 时只排除周末
+            early_close_rule: year -> 提前收盘日集合
+        """
+        self.name = name
+        self.tz = ZoneInfo(timezone)
+        self.open_time = open_time
+        self.close_time = close_time
+        self.early_close_time = early_close_time or close_time
+        self._holiday_rule = holiday_rule
+        self._early_close_rule = early_close_rule
+
+    @property
+    def has_holiday_rule(self) -> bool:
+        """是否有节假日规则（没有时 is_session 只排除周末，节假日会被当作交易日）"""
+        return self._holiday_rule is not None
+
+    # ---------- 交易日 ----------
+
+    def now(self) -> datetime:
+        """交易所当地的当前时间"""
+        return datetime.now(self.tz)
+
+    def today(self) -> date:
+        """交易所当地的今天"""
+        return self.now().date()
+
+    def is_session(self, day: DateLike = None) -> bool:
+        """
+        是否为交易日
+
+        Args:
+            day: 日期（字符串 / date / datetime），为 None 时使用交易所当地的今天
+
+        Returns:
+            是否为交易日
+        """
+        day = to_date(day) or self.today()
+        if day.weekday() >= 5:
+            return False
+        if self._holiday_rule is not None and day in self._holiday_rule(day.year):
+            return False
+        return True
+
+    def previous_session(self, day: DateLike = None, inclusive: bool = True) -> date:
+        """day 当天（inclusive）或之前的最近一个交易日"""
+        day = to_date(day) or self.today()
+        if not inclusive:
+            day -= timedelta(days=1)
+        while not self.is_session(day):
+            day -= timedelta(days=1)
+        return day
+
+    def next_session(self, day: DateLike = None, inclusive: bool = False) -> date:
+        """day 当天（inclusive）或之后的最近一个交易日"""
+        day = to_date(day) or self.today()
+        if not inclusive:
+            day += timedelta(days=1)
+        while not self.is_session(day):
+            day += timedelta(days=1)
+        return day
+
+    def has_session(self, start: DateLike, end: DateLike) -> bool:
+        """[start, end] 内是否包含交易日（全是周末/节假日的缺口无需请求）"""
+        start, end = to_date(start), to_date(end)
+        if start is None or end is None or start > end:
+            return False
+        return self.next_session(start, inclusive=True) <= end
+
+    # ---------- 开盘 / 收盘时间 ----------
+
+    def session_open(self, day: DateLike) -> datetime:
+        """交易日开盘时间（带时区）"""
+        day = to_date(day)
+        return datetime.combine(day, self.open_time, tzinfo=self.tz)
+
+    def session_close(self, day: DateLike) -> datetime:
+        """交易日收盘时间（带时区，考虑提前收盘）"""
+        day = to_date(day)
+        close = self.close_time
+        if self._early_close_rule is not None and day in self._early_close_rule(day.year):
+            close = self.early_close_time
+        return datetime.combine(day, close, tzinfo=self.tz)
+
+    def is_session_closed(
+        self, day: DateLike, now: Optional[datetime] = None, settle: timedelta = timedelta(0)
+    ) -> bool:
+        """
+        day 所属的最近交易日是否已收盘（再加 settle 的定稿缓冲）
+
+        非交易日按其之前最近的交易日判断，例如周六 -> 周五。
+        """
+        now = now or self.now()
+        session = self.previous_session(day)
+        return now >= self.session_close(session) + settle
+
+    def last_closed_session(self, now: Optional[datetime] = None) -> date:
+        """当前时间点最近一个已收盘的交易日"""
+        now = (now or self.now()).astimezone(self.tz)
+        session = self.previous_session(now.date())
+        if now < self.session_close(session):
+            session = self.previous_session(session, inclusive=False)
+        return session
+
+    def next_open(self, now: Optional[datetime] = None) -> datetime:
+        """当前时间之后的下一次开盘时间"""
+        now = (now or self.now()).astimezone(self.tz)
+        session = self.next_session(now.date(), inclusive=True)
+        if now >= self.session_open(session):
+            session = self.next_session(session)
+        return self.session_open(session)
+
+    def next_close(self, now: Optional[datetime] = None) -> datetime:
+        """当前时间之后的下一次收盘时间"""
+        now = (now or self.now()).astimezone(self.tz)
+        session = self.next_session(now.date(), inclusive=True)
+        if now >= self.session_close(session):
+            session = self.next_session(session)
+        return self.session_close(session)
+
+
+NYSE = TradingCalendar(
+    "NYSE", "America/New_York", time(9, 30), time(16, 0),
+    early_close_time=time(13, 0),
+    holiday_rule=nyse_holidays,
+    early_close_rule=nyse_early_closes,
+)
+HKEX = TradingCalendar("HKEX", "Asia/Hong_Kong", time(9, 30), time(16, 0))
+SSE = TradingCalendar("SSE", "Asia/Shanghai", time(9, 30), time(15, 0))
+
+# 代码后缀 -> 交易所日历（无后缀按美股处理，与长桥代码转换一致）
+_SUFFIX_CALENDARS: Dict[str, TradingCalendar] = {
+    ".US": NYSE,
+    ".HK": HKEX,
+    ".SH": SSE,
+    ".SZ": SSE,
+}
+
+
+def get_calendar_for_symbol(symbol: Optional[str] = None) -> TradingCalendar:
+    """
+    根据股票代码后缀选择交易日历
+
+    Args:
+        symbol: 股票代码，如 NVDA / NVDA.US / 0700.HK；为 None 时返回美股日历
+
+    Returns:
+        TradingCalendar 实例
+    """
+    if isinstance(symbol, str):
+        upper = symbol.upper()
+        for suffix, calendar in _SUFFIX_CALENDARS.items():
+            if upper.endswith(suffix):
+                return calendar
+    return NYSE
+
+
+def is_trading_day(symbol: Optional[str] = None, day: DateLike = None) -> bool:
+    """symbol 所在交易所在 day（默认今天）是否开市（没有节假日规则的交易所只排除周末）"""
+    return get_calendar_for_symbol(symbol).is_session(day)
@@ -1,13 +1,31 @@
+import asyncio
 import time
 import random
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 import pandas as pd
 import numpy as np
 from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 from .data_cache import get_data_cache
+from .bar_store import BarStore
+from .core.single_flight import SingleFlight
+from .core.arg_digest import digest_args, get_digest_stats
+from .core.ttl_policy import CacheTTLPolicy, get_ttl_policy
+from .core.latency_histogram import LatencyTracker
+from .core.error_detector import ErrorDetector
 from tradingagents.utils.logger import get_logger
-from tradingagents.constants import MIN_STOCK_DATA_DAYS
+from tradingagents.constants import (
+    MIN_STOCK_DATA_DAYS,
+    VENDOR_CIRCUIT_FAILURE_THRESHOLD,
+    VENDOR_CIRCUIT_RECOVERY_SECONDS,
+    VENDOR_THREAD_POOL_MAX_WORKERS,
+    VENDOR_HEDGE_MIN_DELAY_SECONDS,
+    VENDOR_HEDGE_MIN_SAMPLES,
+    VENDOR_HEDGE_PERCENTILE,
+    VENDOR_MAX_PACING_WAIT_SECONDS,
+)
 
 logger = get_logger(__name__)
 
@@ -19,6 +37,7 @@ from .vendor_models import (
     VendorConfig,
     FetchStats,
     VendorStats,
+    FetchRequest,
 )
 
 # 向后兼容：保留VendorNotFoundError导出（从vendor_models中导入）
@@ -32,7 +51,12 @@ class UnifiedDataManager:
     - 多数据源优先级支持
     - 自动降级和重试
     - 限流检测和等待
+    - 按数据源的令牌桶主动限速、按 (数据源, 方法) 的熔断器跳过持续不可用的数据源
+      （只有传输、超时、5xx、限流错误计入熔断；进程内计算的 "local" 不参与熔断）
+    - 可选的对冲请求：主数据源超过其 p95 延迟未返回时并行请求下一个数据源
     - 最大访问次数限制
+    - 在途请求合并（single-flight），同步/异步入口共享
+    - 原生异步路径：fetch_async 优先使用数据源的异步实现（共享 httpx 连接池）
     - 详细的统计信息
     """
     
@@ -43,6 +67,10 @@ class UnifiedDataManager:
         default_retry_delay_max: float = 10.0,
         default_rate_limit_wait: float = 5.0,
         default_rate_limit_max_retries: int = 5,
+        bar_store: Optional[BarStore] = None,
+        ttl_policy: Optional[CacheTTLPolicy] = None,
+        hedge_requests: bool = False,
+        hedge_min_samples: int = VENDOR_HEDGE_MIN_SAMPLES,
     ):
         """
         初始化统一数据管理器
@@ -53,6 +81,10 @@ class UnifiedDataManager:
             default_retry_delay_max: 默认最大重试延迟
             default_rate_limit_wait: 默认限流等待时间
             default_rate_limit_max_retries: 默认限流最大重试次数
+            bar_store: 可选的区间感知K线存储，启用后 get_stock_data 只请求缺失区间
+            ttl_policy: 缓存有效期策略（按方法和交易日历决定每条缓存的 TTL）
+            hedge_requests: 是否启用对冲请求
+            hedge_min_samples: 数据源在某方法上的延迟样本达到该数量后才会被对冲
         """
         self.default_max_retries = default_max_retries
         self.default_retry_delay_base = default_retry_delay_base
@@ -66,9 +98,22 @@ class UnifiedDataManager:
         
         self.method_vendors: Dict[str, List[str]] = {}
         self.method_implementations: Dict[str, Dict[str, Callable]] = {}
+        self.async_method_implementations: Dict[str, Dict[str, Callable]] = {}
         
         self.cache = get_data_cache()
+        self.bar_store = bar_store
+        self.ttl_policy = ttl_policy or get_ttl_policy()
         self.last_vendor_used: Optional[str] = None
+
+        # 在途请求合并表（fetch / fetch_async 共享）
+        self._single_flight = SingleFlight()
+        self._stats_lock = threading.Lock()
+
+        # 按 (数据源, 方法) 的延迟直方图，对冲请求据此决定启动下一个数据源的时机
+        self.latency = LatencyTracker()
+        self.hedge_requests = hedge_requests
+        self.hedge_min_samples = hedge_min_samples
+        self._vendor_executor: Optional[ThreadPoolExecutor] = None
         
     def register_vendor(
         self,
@@ -82,7 +127,9 @@ class UnifiedDataManager:
         Args:
             name: 数据源名称
             priority: 优先级
-            **kwargs: 其他配置参数
+            **kwargs: 其他配置参数（max_retries / rate_limit_wait / requests_per_minute /
+                burst / max_pacing_wait / circuit_failure_threshold / circuit_recovery_seconds /
+                circuit_breaker_enabled 等）
         
         Returns:
             self，支持链式调用
@@ -96,6 +143,16 @@ class UnifiedDataManager:
             rate_limit_wait=kwargs.get("rate_limit_wait", self.default_rate_limit_wait),
             rate_limit_max_retries=kwargs.get("rate_limit_max_retries", self.default_rate_limit_max_retries),
             enabled=kwargs.get("enabled", True),
+            requests_per_minute=kwargs.get("requests_per_minute"),
+            burst=kwargs.get("burst", 1),
+            max_pacing_wait=kwargs.get("max_pacing_wait", VENDOR_MAX_PACING_WAIT_SECONDS),
+            circuit_failure_threshold=kwargs.get(
+                "circuit_failure_threshold", VENDOR_CIRCUIT_FAILURE_THRESHOLD
+            ),
+            circuit_recovery_seconds=kwargs.get(
+                "circuit_recovery_seconds", VENDOR_CIRCUIT_RECOVERY_SECONDS
+            ),
+            circuit_breaker_enabled=kwargs.get("circuit_breaker_enabled", True),
         )
         self.vendor_configs[name] = config
         self.vendor_stats[name] = VendorStats(name=name)
@@ -105,7 +162,8 @@ class UnifiedDataManager:
         self,
         method_name: str,
         vendor_implementations: Dict[str, Callable],
-        vendor_priority_order: Optional[List[str]] = None
+        vendor_priority_order: Optional[List[str]] = None,
+        async_implementations: Optional[Dict[str, Callable]] = None,
     ) -> "UnifiedDataManager":
         """
         注册方法
@@ -114,11 +172,14 @@ class UnifiedDataManager:
             method_name: 方法名称
             vendor_implementations: 数据源实现字典 {vendor_name: implementation}
             vendor_priority_order: 可选的数据源优先级顺序
+            async_implementations: 可选的原生异步实现 {vendor_name: async implementation}，
+                fetch_async 优先使用；没有异步实现的数据源在有界线程池中调用同步实现
         
         Returns:
             self，支持链式调用
         """
         self.method_implementations[method_name] = vendor_implementations
+        self.async_method_implementations[method_name] = dict(async_implementations or {})
         
         if vendor_priority_order:
             self.method_vendors[method_name] = vendor_priority_order
@@ -129,6 +190,14 @@ class UnifiedDataManager:
         
         return self
     
+    def _vendor_config(self, vendor: str) -> VendorConfig:
+        """获取数据源配置；未注册的数据源使用默认配置并登记，保证熔断状态跨调用保留"""
+        config = self.vendor_configs.get(vendor)
+        if config is None:
+            with self._stats_lock:
+                config = self.vendor_configs.setdefault(vendor, VendorConfig(name=vendor))
+        return config
+    
     def _get_sorted_vendors(self, method_name: str) -> List[str]:
         """
         获取排序后的数据源列表
@@ -249,7 +318,12 @@ class UnifiedDataManager:
         kwargs: dict,
         result: str,
     ) -> None:
-        """记录工具调用信息到数据库（统一日志逻辑）"""
+        """记录工具调用信息到数据库（统一日志逻辑）
+
+        只放入后台写入队列，由写入线程批量落盘，不在 fetch 路径上等待 SQLite。
+        args / kwargs 应为摘要后的参数（见 FetchRequest.log_args），
+        避免把整份 stock_data CSV 序列化进 input_params。
+        """
         try:
             from tradingagents.dataflows.database import get_db
             db = get_db()
@@ -267,10 +341,122 @@ class UnifiedDataManager:
                 input_params=input_params,
                 result=str(result)
             )
-            logger.debug("%s工具调用已记录到数据库", "缓存" if vendor == "cache" else "")
+            logger.debug("%s工具调用已提交写入队列", "缓存" if vendor == "cache" else "")
         except Exception as e:
             logger.warning("记录%s工具调用失败: %s", "缓存" if vendor == "cache" else "", e)
     
+    def _normalize_args(self, method_name: str, args: tuple) -> tuple:
+        """
+        规范化参数（get_stock_data 的起始日期至少向前扩展 MIN_STOCK_DATA_DAYS 天）
+
+        Args:
+            method_name: 方法名称
+            args: 原始位置参数
+
+        Returns:
+            规范化后的位置参数
+        """
+        if method_name != "get_stock_data" or len(args) < 3:
+            return args
+
+        args_list = list(args)
+        try:
+            symbol, start_date, end_date = args_list[:3]
+            end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+            days_diff = (end_dt - start_dt).days
+
+            if days_diff < MIN_STOCK_DATA_DAYS:
+                new_start_dt = end_dt - timedelta(days=MIN_STOCK_DATA_DAYS)
+                new_start_date = new_start_dt.strftime("%Y-%m-%d")
+                args_list[1] = new_start_date
+                logger.debug("调整日期范围: %s -> %s", start_date, new_start_date)
+                return tuple(args_list)
+        except (ValueError, TypeError):
+            pass
+        return args
+
+    def _build_request(
+        self, method_name: str, args: tuple, kwargs: dict, no_cache: bool
+    ) -> FetchRequest:
+        """
+        构造请求上下文：规范化参数，并把大参数摘要一次
+
+        摘要结果同时用于缓存键、在途合并 key、工具调用日志和调试输出。
+        """
+        processed_args = self._normalize_args(method_name, args)
+        key_args, key_kwargs = digest_args(processed_args, kwargs)
+        log_args, log_kwargs = digest_args(args, kwargs)
+        return FetchRequest(
+            method_name=method_name,
+            args=args,
+            processed_args=processed_args,
+            kwargs=kwargs,
+            cache_key=self.cache.make_key(method_name, key_args, key_kwargs),
+            log_args=log_args,
+            log_kwargs=log_kwargs,
+            no_cache=no_cache,
+        )
+
+    def _log_result_preview(self, result: Any, label: str) -> None:
+        """按日期倒序输出结果预览（调试日志）"""
+        result_lines = str(result).split('\n')
+        if len(result_lines) > 2:
+            header = result_lines[0]
+            data_lines = result_lines[1:]
+            data_lines.reverse()
+            sorted_result = header + '\n' + '\n'.join(data_lines[:20])
+            logger.debug("%s (最新20条):\n%s", label, sorted_result)
+        else:
+            logger.debug("%s (前500字符):\n%s", label, str(result)[:500])
+
+        if len(str(result)) > 500:
+            logger.debug("... (截断，总长度: %d)", len(str(result)))
+
+    def _get_cached(self, request: FetchRequest) -> Optional[Any]:
+        """查询缓存，命中时记录统计和工具调用"""
+        cached_result = self.cache.get_by_key(request.cache_key)
+        if cached_result is None:
+            return None
+        return self._record_cache_hit(request, cached_result)
+
+    async def _get_cached_async(self, request: FetchRequest) -> Optional[Any]:
+        """_get_cached 的异步版本：内存层直接查询，只有读磁盘层时在线程中执行"""
+        cached_result = await self.cache.get_by_key_async(request.cache_key)
+        if cached_result is None:
+            return None
+        return self._record_cache_hit(request, cached_result)
+
+    def _record_cache_hit(self, request: FetchRequest, cached_result: Any) -> Any:
+        """记录缓存命中的统计和工具调用"""
+        logger.debug("使用缓存数据")
+        with self._stats_lock:
+            self.global_stats.successful_calls += 1
+            self.global_stats.cache_hits += 1
+        self._log_result_preview(cached_result, "缓存数据输出")
+
+        # 记录工具调用信息（缓存数据）
+        self._log_tool_call(
+            request.method_name, "cache", request.log_args, request.log_kwargs, cached_result
+        )
+        return cached_result
+
+    def _record_coalesced(
+        self, request: FetchRequest, result: Any = None, failed: bool = False,
+    ) -> None:
+        """记录一次被合并的调用（复用了其他调用方的在途结果）"""
+        with self._stats_lock:
+            self.global_stats.coalesced_hits += 1
+            if failed:
+                self.global_stats.failed_calls += 1
+            else:
+                self.global_stats.successful_calls += 1
+        if not failed:
+            logger.debug("复用在途请求结果: %s", request.method_name)
+            self._log_tool_call(
+                request.method_name, "coalesced", request.log_args, request.log_kwargs, result
+            )
+
     def fetch(
         self,
         method_name: str,
@@ -280,10 +466,14 @@ class UnifiedDataManager:
     ) -> Any:
         """
         获取数据
-        
+
+        相同 (method, 规范化参数) 的并发未命中会合并为一次数据源调用，
+        其余调用方等待同一个结果。
+
         Args:
             method_name: 方法名称
             *args: 位置参数
+            no_cache: 是否跳过缓存读写
             **kwargs: 关键字参数
         
         Returns:
@@ -292,66 +482,263 @@ class UnifiedDataManager:
         Raises:
             DataFetchError: 所有数据源都失败时抛出
         """
-        from datetime import datetime, timedelta
-        
+        request = self._build_request(method_name, args, kwargs, no_cache)
         logger.debug("调用方法: %s", method_name)
-        logger.debug("参数: args=%s, kwargs=%s", args, kwargs)
-
-        self.global_stats.total_calls += 1
-        
-        processed_args = args
-        if method_name == "get_stock_data":
-            args_list = list(args)
-            if len(args_list) >= 3:
-                try:
-                    symbol, start_date, end_date = args_list[:3]
-                    end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-                    start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-                    days_diff = (end_dt - start_dt).days
-                    
-                    if days_diff < MIN_STOCK_DATA_DAYS:
-                        new_start_dt = end_dt - timedelta(days=MIN_STOCK_DATA_DAYS)
-                        new_start_date = new_start_dt.strftime("%Y-%m-%d")
-                        args_list[1] = new_start_date
-                        processed_args = tuple(args_list)
-                        logger.debug("调整日期范围: %s -> %s", start_date, new_start_date)
-                except (ValueError, TypeError):
-                    pass
-        
-        cached_result = self.cache.get(method_name, *processed_args, **kwargs)
-        if cached_result is not None:
-            logger.debug("使用缓存数据")
+        logger.debug("参数: args=%s, kwargs=%s", request.log_args, request.log_kwargs)
+
+        with self._stats_lock:
+            self.global_stats.total_calls += 1
+
+        if not self._uses_bar_store(request):
+            cached_result = self._get_cached(request)
+            if cached_result is not None:
+                return cached_result
+
+        is_leader = False
+
+        def run():
+            nonlocal is_leader
+            is_leader = True
+            return self._load_fresh(request)
+
+        try:
+            result, shared = self._single_flight.do(request.cache_key, run)
+        except DataFetchError:
+            if not is_leader:
+                self._record_coalesced(request, failed=True)
+            raise
+
+        if shared:
+            self._record_coalesced(request, result)
+        return result
+
+    async def fetch_async(
+        self,
+        method_name: str,
+        *args,
+        no_cache: bool = False,
+        **kwargs
+    ) -> Any:
+        """
+        fetch() 的异步入口
+
+        与同步 fetch 共享同一张在途表：无论请求来自线程还是协程，
+        相同 key 同一时刻只会有一次数据源调用。
+        注册了原生异步实现的数据源直接在事件循环中请求（共享 httpx.AsyncClient），
+        其余数据源在有界线程池中调用同步实现。
+
+        Args:
+            method_name: 方法名称
+            *args: 位置参数
+            no_cache: 是否跳过缓存读写
+            **kwargs: 关键字参数
+
+        Returns:
+            获取的数据
+
+        Raises:
+            DataFetchError: 所有数据源都失败时抛出
+        """
+        request = self._build_request(method_name, args, kwargs, no_cache)
+        logger.debug("异步调用方法: %s", method_name)
+
+        with self._stats_lock:
+            self.global_stats.total_calls += 1
+
+        if not self._uses_bar_store(request):
+            cached_result = await self._get_cached_async(request)
+            if cached_result is not None:
+                return cached_result
+
+        is_leader = False
+
+        def run():
+            nonlocal is_leader
+            is_leader = True
+            return self._load_fresh_async(request)
+
+        try:
+            result, shared = await self._single_flight.do_async(request.cache_key, run)
+        except DataFetchError:
+            if not is_leader:
+                self._record_coalesced(request, failed=True)
+            raise
+
+        if shared:
+            self._record_coalesced(request, result)
+        return result
+
+    def _uses_bar_store(self, request: FetchRequest) -> bool:
+        """get_stock_data 且启用了K线存储时，走区间感知的K线存储而不是 DataCache"""
+        return (
+            self.bar_store is not None
+            and not request.no_cache
+            and request.method_name == "get_stock_data"
+            and len(request.processed_args) >= 3
+        )
+
+    def _load_fresh(self, request: FetchRequest) -> Any:
+        """缓存未命中时的加载入口（由在途请求的首个调用方执行）"""
+        if self._uses_bar_store(request):
+            return self._load_stock_bars(request)
+        return self._fetch_from_vendors(request)
+
+    async def _load_fresh_async(self, request: FetchRequest) -> Any:
+        """_load_fresh 的异步版本"""
+        if self._uses_bar_store(request):
+            return await self._load_stock_bars_async(request)
+        return await self._fetch_from_vendors_async(request)
+
+    def _gap_request(self, request: FetchRequest, gap_args: tuple) -> FetchRequest:
+        """K线缺口的请求上下文（不经过 _normalize_args，按原区间请求）"""
+        gap_args = gap_args + tuple(request.processed_args[3:])
+        gap_request = self._build_request(
+            "get_stock_data", gap_args, request.kwargs, no_cache=True
+        )
+        gap_request.processed_args = gap_args
+        return gap_request
+
+    def _record_stock_bars(self, request: FetchRequest, result: str, gaps_fetched: int) -> None:
+        """记录K线存储请求的统计；完全命中时记录缓存工具调用"""
+        with self._stats_lock:
             self.global_stats.successful_calls += 1
-            # 按日期逆序排列输出
-            cached_lines = str(cached_result).split('\n')
-            if len(cached_lines) > 2:
-                header = cached_lines[0]
-                data_lines = cached_lines[1:]
-                data_lines.reverse()
-                sorted_data = header + '\n' + '\n'.join(data_lines[:20])
-                logger.debug("缓存数据输出 (最新20条):\n%s", sorted_data)
-            else:
-                logger.debug("缓存数据输出:\n%s", str(cached_result)[:500])
-            if len(str(cached_result)) > 500:
-                logger.debug("... (截断，总长度: %d)", len(str(cached_result)))
+            if gaps_fetched == 0:
+                self.global_stats.cache_hits += 1
+
+        if gaps_fetched == 0:
+            logger.debug("K线存储完全命中: %s %s~%s", *request.processed_args[:3])
+            self._log_tool_call(
+                "get_stock_data", "cache", request.log_args, request.log_kwargs, result
+            )
+
+    async def _load_stock_bars_async(self, request: FetchRequest) -> str:
+        """_load_stock_bars 的异步版本（缺口并发请求）"""
+        symbol, start_date, end_date = request.processed_args[:3]
+
+        async def fetch_gap(*gap_args: str) -> str:
+            return await self._fetch_from_vendors_async(
+                self._gap_request(request, gap_args), record=False
+            )
+
+        try:
+            result, gaps_fetched = await self.bar_store.get_range_async(
+                symbol, start_date, end_date, fetch_gap
+            )
+        except DataFetchError:
+            with self._stats_lock:
+                self.global_stats.failed_calls += 1
+            raise
+
+        self._record_stock_bars(request, result, gaps_fetched)
+        return result
+
+    def _load_stock_bars(self, request: FetchRequest) -> str:
+        """
+        通过K线存储获取日线数据，只向数据源请求缺失的日期区间
+
+        Args:
+            request: 请求上下文，processed_args 为 (symbol, start_date, end_date, ...)
+
+        Returns:
+            统一格式的 CSV 字符串
+
+        Raises:
+            DataFetchError: 缺口数据获取失败时抛出
+        """
+        symbol, start_date, end_date = request.processed_args[:3]
+
+        def fetch_gap(*gap_args: str) -> str:
+            return self._fetch_from_vendors(self._gap_request(request, gap_args), record=False)
+
+        try:
+            result, gaps_fetched = self.bar_store.get_range(
+                symbol, start_date, end_date, fetch_gap
+            )
+        except DataFetchError:
+            with self._stats_lock:
+                self.global_stats.failed_calls += 1
+            raise
+
+        self._record_stock_bars(request, result, gaps_fetched)
+        return result
+
+    def _fetch_from_vendors(self, request: FetchRequest, record: bool = True) -> Any:
+        """
+        按优先级依次尝试数据源（缓存未命中时由在途请求的首个调用方执行）
+
+        Args:
+            request: 请求上下文
+            record: 是否计入全局成功/失败统计（K线缺口请求由上层统一计数）
+
+        Returns:
+            获取的数据
+
+        Raises:
+            DataFetchError: 所有数据源都失败时抛出
+        """
+        candidates = self._candidate_vendors(request.method_name)
+        
+        if self.hedge_requests and len(candidates) > 1:
+            vendor, result, last_error = self._run_hedged(request, candidates)
+        else:
+            vendor, result, last_error = self._run_serial(request, candidates)
+        
+        if result is None:
+            raise self._all_vendors_failed(request, last_error, record)
+        if not request.no_cache:
+            self.cache.set_by_key(
+                request.cache_key, request.method_name, result,
+                ttl_seconds=self._result_ttl(request),
+            )
+        self._on_fetch_success(request, vendor, result, record)
+        return result
+    
+    async def _fetch_from_vendors_async(self, request: FetchRequest, record: bool = True) -> Any:
+        """
+        _fetch_from_vendors 的异步版本：按优先级串行尝试数据源
+        （对冲请求只用于同步路径）
+
+        Raises:
+            DataFetchError: 所有数据源都失败时抛出
+        """
+        last_error = None
+        for vendor in self._candidate_vendors(request.method_name):
+            if not self._circuit_allows(vendor, request.method_name):
+                last_error = self._last_error(vendor)
+                continue
             
-            # 记录工具调用信息（缓存数据）
-            self._log_tool_call(method_name, "cache", args, kwargs, cached_result)
+            result = await self._call_vendor_async(request, vendor)
+            if result is not None:
+                if not request.no_cache:
+                    # 写缓存的 SQLite 磁盘层在线程中执行，不阻塞事件循环
+                    await self.cache.set_by_key_async(
+                        request.cache_key, request.method_name, result,
+                        ttl_seconds=self._result_ttl(request),
+                    )
+                self._on_fetch_success(request, vendor, result, record)
+                return result
             
-            return cached_result
+            logger.warning("数据源 %s 失败", vendor)
+            last_error = self._last_error(vendor)
         
+        raise self._all_vendors_failed(request, last_error, record)
+    
+    def _candidate_vendors(self, method_name: str) -> List[str]:
+        """
+        可用于该方法的数据源（已启用且有实现），按优先级排序
+
+        Raises:
+            DataFetchError: 该方法没有注册任何数据源时抛出
+        """
         vendors = self._get_sorted_vendors(method_name)
         logger.debug("可用数据源: %s", vendors)
         
         if not vendors:
             raise DataFetchError(f"No vendors available for method '{method_name}'")
         
-        last_error = None
-        
+        candidates = []
         for vendor in vendors:
-            logger.debug("尝试使用数据源: %s", vendor)
-            config = self.vendor_configs.get(vendor, VendorConfig(name=vendor))
-            stats = self.vendor_stats.get(vendor, VendorStats(name=vendor))
+            config = self._vendor_config(vendor)
             
             if not config.enabled:
                 logger.debug("数据源 %s 已禁用", vendor)
@@ -361,65 +748,291 @@ class UnifiedDataManager:
                 logger.debug("数据源 %s 不支持方法 %s", vendor, method_name)
                 continue
             
-            impl = self.method_implementations[method_name][vendor]
-            
-            result = self._try_vendor(
-                vendor=vendor,
-                config=config,
-                stats=stats,
-                impl=impl,
-                args=processed_args,
-                kwargs=kwargs
+            candidates.append(vendor)
+        return candidates
+    
+    def _result_ttl(self, request: FetchRequest) -> Optional[float]:
+        """按方法和数据时效决定缓存有效期（已收盘交易日永久，盘中几分钟）"""
+        return self.ttl_policy.ttl_seconds(
+            request.method_name, request.processed_args, request.kwargs
+        )
+    
+    def _on_fetch_success(
+        self, request: FetchRequest, vendor: str, result: Any, record: bool
+    ) -> None:
+        """数据源返回结果后：记录统计和工具调用（缓存由调用方写入）"""
+        method_name = request.method_name
+        if record:
+            with self._stats_lock:
+                self.global_stats.successful_calls += 1
+        self.last_vendor_used = vendor
+        
+        self._log_result_preview(result, "数据输出")
+        
+        # 记录工具调用信息
+        self._log_tool_call(
+            method_name, vendor, request.log_args, request.log_kwargs, result
+        )
+    
+    def _all_vendors_failed(
+        self, request: FetchRequest, last_error: Optional[str], record: bool
+    ) -> DataFetchError:
+        """所有数据源都失败：记录统计并构造异常（由调用方抛出）"""
+        if record:
+            with self._stats_lock:
+                self.global_stats.failed_calls += 1
+        logger.error("所有数据源都失败, method=%s", request.method_name)
+        return DataFetchError(
+            f"All vendors failed for method '{request.method_name}'. Last error: {last_error}")
+    
+    def _call_vendor(self, request: FetchRequest, vendor: str) -> Any:
+        """调用单个数据源（含重试、限速和熔断记录），失败返回 None"""
+        logger.debug("尝试使用数据源: %s", vendor)
+        return self._try_vendor(
+            vendor=vendor,
+            config=self._vendor_config(vendor),
+            stats=self.vendor_stats.get(vendor, VendorStats(name=vendor)),
+            impl=self.method_implementations[request.method_name][vendor],
+            args=request.processed_args,
+            kwargs=request.kwargs,
+            method_name=request.method_name,
+        )
+    
+    async def _call_vendor_async(self, request: FetchRequest, vendor: str) -> Any:
+        """
+        异步调用单个数据源，失败返回 None
+
+        有原生异步实现时在事件循环中执行；否则把同步实现（含重试）交给有界线程池，
+        而不是为每个请求占用默认线程池
+        """
+        impl = self.async_method_implementations.get(request.method_name, {}).get(vendor)
+        if impl is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_vendor_executor(), self._call_vendor, request, vendor
             )
+        
+        logger.debug("尝试使用数据源: %s (async)", vendor)
+        return await self._try_vendor_async(
+            vendor=vendor,
+            config=self._vendor_config(vendor),
+            stats=self.vendor_stats.get(vendor, VendorStats(name=vendor)),
+            impl=impl,
+            args=request.processed_args,
+            kwargs=request.kwargs,
+            method_name=request.method_name,
+        )
+    
+    def _circuit_allows(self, vendor: str, method_name: str) -> bool:
+        """(数据源, 方法) 的熔断器是否放行本次请求；不参与熔断的数据源总是放行"""
+        breaker = self._vendor_config(vendor).circuit_breaker(method_name)
+        if breaker is None or breaker.allow_request():
+            return True
+        logger.debug("数据源 %s 的 %s 熔断中，跳过", vendor, method_name)
+        return False
+
+    def _last_error(self, vendor: str) -> Optional[str]:
+        stats = self.vendor_stats.get(vendor)
+        return stats.last_error if stats else None
+    
+    def _run_serial(
+        self, request: FetchRequest, candidates: List[str]
+    ) -> Tuple[Optional[str], Any, Optional[str]]:
+        """
+        按优先级串行尝试数据源
+
+        Returns:
+            (成功的数据源, 结果, 最后一个错误)；全部失败时结果为 None
+        """
+        last_error = None
+        for vendor in candidates:
+            if not self._circuit_allows(vendor, request.method_name):
+                last_error = self._last_error(vendor)
+                continue
             
+            result = self._call_vendor(request, vendor)
             if result is not None:
-                self.global_stats.successful_calls += 1
-                self.last_vendor_used = vendor
-                
-                # 检查是否写入缓存
-                should_cache = not no_cache
-                if should_cache and method_name == "get_stock_data" and len(args) >= 3:
-                    try:
-                        from datetime import datetime
-                        end_date = args[2]
-                        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-                        # 简单判断：周末不缓存 (5=周六, 6=周日)
-                        if end_dt.weekday() >= 5:
-                            logger.debug("结束日期 %s 是周末，不写入缓存", end_date)
-                            should_cache = False
-                    except (ValueError, TypeError):
-                        pass
-                
-                if should_cache:
-                    self.cache.set(method_name, result, *processed_args, **kwargs)
-                
-                # 按日期倒序输出
-                result_lines = str(result).split('\n')
-                if len(result_lines) > 2:
-                    header = result_lines[0]
-                    data_lines = result_lines[1:]
-                    data_lines.reverse()
-                    sorted_result = header + '\n' + '\n'.join(data_lines[:20])
-                    logger.debug("数据输出 (最新20条):\n%s", sorted_result)
-                else:
-                    logger.debug("数据输出 (前500字符):\n%s", str(result)[:500])
+                return vendor, result, last_error
+            
+            logger.warning("数据源 %s 失败", vendor)
+            last_error = self._last_error(vendor)
+        return None, None, last_error
+    
+    def _hedge_delay(self, vendor: str, method_name: str) -> Optional[float]:
+        """数据源在该方法上的 p95 延迟；样本不足时返回 None（不对冲，等待其结束）"""
+        p95 = self.latency.percentile(
+            vendor, method_name, VENDOR_HEDGE_PERCENTILE, min_samples=self.hedge_min_samples
+        )
+        if p95 is None:
+            return None
+        return max(p95, VENDOR_HEDGE_MIN_DELAY_SECONDS)
+    
+    def _get_vendor_executor(self) -> ThreadPoolExecutor:
+        """对冲请求与异步路径中同步数据源共用的有界线程池"""
+        with self._stats_lock:
+            if self._vendor_executor is None:
+                self._vendor_executor = ThreadPoolExecutor(
+                    max_workers=VENDOR_THREAD_POOL_MAX_WORKERS, thread_name_prefix="vendor"
+                )
+            return self._vendor_executor
+    
+    def _run_hedged(
+        self, request: FetchRequest, candidates: List[str]
+    ) -> Tuple[Optional[str], Any, Optional[str]]:
+        """
+        对冲请求：当前数据源超过其 p95 延迟仍未返回时，并行启动下一个数据源，
+        取最先返回的有效结果，较慢的请求结果被忽略（未开始的会被取消）
+
+        Returns:
+            (成功的数据源, 结果, 最后一个错误)；全部失败时结果为 None
+        """
+        method_name = request.method_name
+        executor = self._get_vendor_executor()
+        remaining = list(candidates)
+        pending: Dict[Future, str] = {}
+        last_error = None
+        hedged = False
+        
+        def launch_next(hedge: bool = False) -> Optional[str]:
+            nonlocal last_error, hedged
+            while remaining:
+                vendor = remaining.pop(0)
+                if not self._circuit_allows(vendor, method_name):
+                    last_error = self._last_error(vendor)
+                    continue
+                pending[executor.submit(self._call_vendor, request, vendor)] = vendor
+                if hedge:
+                    hedged = True
+                    logger.debug("对冲请求: 启动数据源 %s (%s)", vendor, method_name)
+                    with self._stats_lock:
+                        self.global_stats.hedged_calls += 1
+                return vendor
+            return None
+        
+        primary = newest = launch_next()
+        try:
+            while pending:
+                timeout = self._hedge_delay(newest, method_name) if remaining else None
+                done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
                 
-                if len(str(result)) > 500:
-                    logger.debug("... (截断，总长度: %d)", len(str(result)))
+                if not done:
+                    # 超过 p95 仍未返回：并行启动下一个数据源
+                    newest = launch_next(hedge=True) or newest
+                    continue
                 
-                # 记录工具调用信息
-                self._log_tool_call(method_name, vendor, args, kwargs, result)
+                for future in done:
+                    vendor = pending.pop(future)
+                    result = future.result()
+                    if result is not None:
+                        if hedged and vendor != primary:
+                            with self._stats_lock:
+                                self.global_stats.hedge_wins += 1
+                        return vendor, result, last_error
+                    logger.warning("数据源 %s 失败", vendor)
+                    last_error = self._last_error(vendor)
                 
-                return result
-            else:
-                logger.warning("数据源 %s 失败", vendor)
+                if not pending:
+                    newest = launch_next()
+        finally:
+            for future in pending:
+                future.cancel()
+        
+        return None, None, last_error
+    
+    def _record_pacing(
+        self, vendor: str, config: VendorConfig, stats: VendorStats, waited: Optional[float]
+    ) -> bool:
+        """记录令牌桶排队结果；排队过久（waited 为 None）时返回 False，降级到下一个数据源"""
+        if waited is None:
+            logger.debug("数据源 %s 限速排队超过 %.0f 秒，跳过", vendor, config.max_pacing_wait)
+            with self._stats_lock:
+                stats.stats.paced_skips += 1
+            return False
+        if waited > 0:
+            with self._stats_lock:
+                stats.stats.total_wait_time += waited
+                self.global_stats.total_wait_time += waited
+        return True
+    
+    def _record_attempt_success(
+        self, vendor: str, method_name: str, config: VendorConfig, stats: VendorStats,
+        elapsed: float,
+    ) -> None:
+        """记录一次成功调用（延迟、统计、熔断器）"""
+        self.latency.record(vendor, method_name, elapsed)
+        with self._stats_lock:
+            stats.stats.successful_calls += 1
+        stats.last_success = datetime.now()
+        breaker = config.circuit_breaker(method_name)
+        if breaker is not None:
+            breaker.record_success()
+    
+    def _retry_delay(
+        self,
+        error: Exception,
+        attempt: int,
+        rate_limit_retries: int,
+        config: VendorConfig,
+        stats: VendorStats,
+    ) -> Tuple[int, Optional[float]]:
+        """
+        记录一次失败调用并决定如何重试（同步/异步路径共用）
+
+        Returns:
+            (更新后的限流重试次数, 重试前需要等待的秒数)；秒数为 None 表示放弃该数据源
+        """
+        with self._stats_lock:
+            stats.stats.failed_calls += 1
+        stats.last_error = str(error)
+        
+        if self._is_rate_limit_error(error):
+            rate_limit_retries += 1
+            with self._stats_lock:
+                stats.stats.rate_limit_hits += 1
+                self.global_stats.rate_limit_hits += 1
             
-            last_error = result
+            if rate_limit_retries > config.rate_limit_max_retries:
+                return rate_limit_retries, None
+            
+            wait_time = config.rate_limit_wait * rate_limit_retries
+            if config.rate_limiter is not None:
+                # 所有共享该数据源的调用方一起退避，由下一次 acquire 排队等待
+                config.rate_limiter.defer(wait_time)
+                return rate_limit_retries, 0.0
+            
+            with self._stats_lock:
+                stats.stats.total_wait_time += wait_time
+                self.global_stats.total_wait_time += wait_time
+            return rate_limit_retries, wait_time
         
-        self.global_stats.failed_calls += 1
-        logger.error("所有数据源都失败, method=%s", method_name)
-        raise DataFetchError(
-            f"All vendors failed for method '{method_name}'. Last error: {last_error}")
+        if attempt < config.max_retries - 1:
+            delay = self._exponential_backoff(
+                attempt,
+                config.retry_delay_base,
+                config.retry_delay_max
+            )
+            with self._stats_lock:
+                stats.stats.total_wait_time += delay
+                self.global_stats.total_wait_time += delay
+            return rate_limit_retries, delay
+        return rate_limit_retries, None
+    
+    @staticmethod
+    def _counts_as_outage(error: Exception) -> bool:
+        """该错误是否说明数据源暂时不可用（传输、超时、5xx、限流），只有这类错误计入熔断；
+        参数校验、数据解析等由输入引起的错误换一个输入就会成功，不应让其他调用被跳过"""
+        return ErrorDetector.is_transient_error(error)
+
+    @staticmethod
+    def _record_vendor_exhausted(config: VendorConfig, method_name: str, outage: bool) -> None:
+        """数据源放弃后更新熔断器：不可用计入失败，其他情况（输入错误、未发出请求）归还探测名额"""
+        breaker = config.circuit_breaker(method_name)
+        if breaker is None:
+            return
+        if outage:
+            breaker.record_failure()
+        else:
+            breaker.record_skipped()
     
     def _try_vendor(
         self,
@@ -428,7 +1041,8 @@ class UnifiedDataManager:
         stats: VendorStats,
         impl: Callable,
         args: tuple,
-        kwargs: dict
+        kwargs: dict,
+        method_name: str = "",
     ) -> Any:
         """
         尝试使用某个数据源获取数据
@@ -440,54 +1054,90 @@ class UnifiedDataManager:
             impl: 实现函数
             args: 位置参数
             kwargs: 关键字参数
+            method_name: 方法名称（用于按方法记录延迟）
         
         Returns:
             成功返回数据，失败返回None
         """
         rate_limit_retries = 0
+        outage = False
         
         for attempt in range(config.max_retries):
-            try:
+            # 令牌桶主动限速：排队过久时不再等待，降级到下一个数据源
+            if config.rate_limiter is not None:
+                waited = config.rate_limiter.acquire(max_wait=config.max_pacing_wait)
+                if not self._record_pacing(vendor, config, stats, waited):
+                    break
+            
+            with self._stats_lock:
                 stats.stats.total_calls += 1
-                
+            try:
+                started = time.monotonic()
                 result = impl(*args, **kwargs)
-                
-                stats.stats.successful_calls += 1
-                stats.last_success = datetime.now()
-                
-                return result
-                
             except Exception as e:
-                stats.stats.failed_calls += 1
-                stats.last_error = str(e)
-                
-                if self._is_rate_limit_error(e):
-                    stats.stats.rate_limit_hits += 1
-                    self.global_stats.rate_limit_hits += 1
-                    rate_limit_retries += 1
-                    
-                    if rate_limit_retries > config.rate_limit_max_retries:
-                        break
-                    
-                    wait_time = config.rate_limit_wait * rate_limit_retries
-                    stats.stats.total_wait_time += wait_time
-                    self.global_stats.total_wait_time += wait_time
-                    
-                    time.sleep(wait_time)
-                    continue
-                
-                if attempt < config.max_retries - 1:
-                    delay = self._exponential_backoff(
-                        attempt,
-                        config.retry_delay_base,
-                        config.retry_delay_max
-                    )
-                    stats.stats.total_wait_time += delay
-                    self.global_stats.total_wait_time += delay
-                    
+                outage = outage or self._counts_as_outage(e)
+                rate_limit_retries, delay = self._retry_delay(
+                    e, attempt, rate_limit_retries, config, stats
+                )
+                if delay is None:
+                    break
+                if delay > 0:
                     time.sleep(delay)
-                    continue
+                continue
+            
+            self._record_attempt_success(
+                vendor, method_name, config, stats, time.monotonic() - started
+            )
+            return result
         
+        self._record_vendor_exhausted(config, method_name, outage)
+        return None
+    
+    async def _try_vendor_async(
+        self,
+        vendor: str,
+        config: VendorConfig,
+        stats: VendorStats,
+        impl: Callable,
+        args: tuple,
+        kwargs: dict,
+        method_name: str = "",
+    ) -> Any:
+        """_try_vendor 的异步版本（impl 为协程函数，限速和退避期间让出事件循环）"""
+        rate_limit_retries = 0
+        outage = False
+        
+        for attempt in range(config.max_retries):
+            if config.rate_limiter is not None:
+                waited = await config.rate_limiter.acquire_async(max_wait=config.max_pacing_wait)
+                if not self._record_pacing(vendor, config, stats, waited):
+                    break
+            
+            with self._stats_lock:
+                stats.stats.total_calls += 1
+            try:
+                started = time.monotonic()
+                result = await impl(*args, **kwargs)
+            except asyncio.CancelledError:
+                self._record_vendor_exhausted(config, method_name, outage=False)
+                raise
+            except Exception as e:
+                outage = outage or self._counts_as_outage(e)
+                rate_limit_retries, delay = self._retry_delay(
+                    e, attempt, rate_limit_retries, config, stats
+                )
+                if delay is None:
+                    break
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                continue
+            
+            self._record_attempt_success(
+                vendor, method_name, config, stats, time.monotonic() - started
+            )
+            return result
+        
+        self._record_vendor_exhausted(config, method_name, outage)
         return None
     
     def get_stats(self) -> Dict[str, Any]:
@@ -505,21 +1155,37 @@ class UnifiedDataManager:
                 "failed_calls": self.global_stats.failed_calls,
                 "rate_limit_hits": self.global_stats.rate_limit_hits,
                 "total_wait_time": self.global_stats.total_wait_time,
+                "cache_hits": self.global_stats.cache_hits,
+                "coalesced_hits": self.global_stats.coalesced_hits,
+                "hedged_calls": self.global_stats.hedged_calls,
+                "hedge_wins": self.global_stats.hedge_wins,
+                "in_flight": self._single_flight.in_flight(),
             },
+            "bar_store": self.bar_store.get_stats() if self.bar_store else None,
+            "arg_digest": get_digest_stats(),
+            "latency": self.latency.get_stats(),
             "vendors": {
-                name: {
-                    "total_calls": v.stats.total_calls,
-                    "successful_calls": v.stats.successful_calls,
-                    "failed_calls": v.stats.failed_calls,
-                    "rate_limit_hits": v.stats.rate_limit_hits,
-                    "total_wait_time": v.stats.total_wait_time,
-                    "last_success": v.last_success.isoformat() if v.last_success else None,
-                    "last_error": v.last_error,
-                }
+                name: self._vendor_stats_entry(name, v)
                 for name, v in self.vendor_stats.items()
             }
         }
     
+    def _vendor_stats_entry(self, name: str, v: VendorStats) -> Dict[str, Any]:
+        """单个数据源的统计（含熔断器与令牌桶状态）"""
+        config = self._vendor_config(name)
+        return {
+            "total_calls": v.stats.total_calls,
+            "successful_calls": v.stats.successful_calls,
+            "failed_calls": v.stats.failed_calls,
+            "rate_limit_hits": v.stats.rate_limit_hits,
+            "total_wait_time": v.stats.total_wait_time,
+            "paced_skips": v.stats.paced_skips,
+            "last_success": v.last_success.isoformat() if v.last_success else None,
+            "last_error": v.last_error,
+            "circuit": config.circuit_stats(),
+            "rate_limiter": config.rate_limiter.get_stats() if config.rate_limiter else None,
+        }
+    
     def reset_stats(self):
         """重置统计信息"""
         self.global_stats = FetchStats()
@@ -5,11 +5,20 @@
 从 unified_data_manager.py 中拆分出来以实现单一职责。
 """
 
+import threading
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, Optional
 from datetime import datetime
 
+from tradingagents.constants import (
+    VENDOR_CIRCUIT_FAILURE_THRESHOLD,
+    VENDOR_CIRCUIT_RECOVERY_SECONDS,
+    VENDOR_MAX_PACING_WAIT_SECONDS,
+)
+from .core.circuit_breaker import CircuitBreaker
+from .core.token_bucket import TokenBucket
+
 
 # =============================================================================
 # 异常类
@@ -47,7 +56,12 @@ class VendorPriority(Enum):
 
 @dataclass
 class VendorConfig:
-    """数据源配置"""
+    """数据源配置
+
+    每个数据源持有自己的令牌桶（requests_per_minute 为 None 时不限速）和按方法划分的熔断器
+    （某个方法持续失败不会连带跳过该数据源的其他方法），二者在所有线程间共享。
+    circuit_breaker_enabled=False 的数据源（如进程内计算的 "local"）不参与熔断。
+    """
     name: str
     priority: VendorPriority = VendorPriority.SECONDARY
     max_retries: int = 3
@@ -56,6 +70,43 @@ class VendorConfig:
     rate_limit_wait: float = 5.0
     rate_limit_max_retries: int = 5
     enabled: bool = True
+    requests_per_minute: Optional[float] = None
+    burst: int = 1
+    max_pacing_wait: float = VENDOR_MAX_PACING_WAIT_SECONDS
+    circuit_failure_threshold: int = VENDOR_CIRCUIT_FAILURE_THRESHOLD
+    circuit_recovery_seconds: float = VENDOR_CIRCUIT_RECOVERY_SECONDS
+    circuit_breaker_enabled: bool = True
+    rate_limiter: Optional[TokenBucket] = field(default=None, init=False, repr=False, compare=False)
+    _circuit_breakers: Dict[str, CircuitBreaker] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _breaker_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        if self.requests_per_minute:
+            self.rate_limiter = TokenBucket(self.requests_per_minute, self.burst)
+
+    def circuit_breaker(self, method_name: str) -> Optional[CircuitBreaker]:
+        """(数据源, 方法) 的熔断器，首次使用时创建；不参与熔断的数据源返回 None"""
+        if not self.circuit_breaker_enabled:
+            return None
+        with self._breaker_lock:
+            breaker = self._circuit_breakers.get(method_name)
+            if breaker is None:
+                breaker = self._circuit_breakers[method_name] = CircuitBreaker(
+                    f"{self.name}.{method_name}",
+                    failure_threshold=self.circuit_failure_threshold,
+                    recovery_seconds=self.circuit_recovery_seconds,
+                )
+            return breaker
+
+    def circuit_stats(self) -> Dict[str, Any]:
+        """各方法熔断器的统计 {method_name: stats}"""
+        with self._breaker_lock:
+            breakers = dict(self._circuit_breakers)
+        return {method: breaker.get_stats() for method, breaker in breakers.items()}
 
 
 @dataclass
@@ -66,6 +117,11 @@ class FetchStats:
     failed_calls: int = 0
     rate_limit_hits: int = 0
     total_wait_time: float = 0.0
+    cache_hits: int = 0
+    coalesced_hits: int = 0  # 复用其他调用方在途结果的次数（不含缓存命中）
+    paced_skips: int = 0     # 令牌桶排队过久而跳过该数据源的次数
+    hedged_calls: int = 0    # 因主数据源超过 p95 未返回而并行启动的请求数
+    hedge_wins: int = 0      # 对冲启动的数据源先于主数据源返回的次数
 
 
 @dataclass
@@ -75,3 +131,20 @@ class VendorStats:
     stats: FetchStats = field(default_factory=FetchStats)
     last_error: Optional[str] = None
     last_success: Optional[datetime] = None
+
+
+@dataclass
+class FetchRequest:
+    """一次 fetch 调用的上下文
+
+    大参数（如 stock_data CSV）只在构造时摘要一次，
+    cache_key / log_args 在缓存、在途合并和工具调用日志中复用。
+    """
+    method_name: str
+    args: tuple                     # 原始位置参数
+    processed_args: tuple           # 规范化后的位置参数（实际传给数据源）
+    kwargs: Dict[str, Any]
+    cache_key: str                  # 基于摘要参数的缓存键（同时用作在途合并 key）
+    log_args: tuple                 # 摘要后的原始位置参数（日志用）
+    log_kwargs: Dict[str, Any]      # 摘要后的关键字参数（日志用）
+    no_cache: bool = False
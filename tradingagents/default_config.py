@@ -5,6 +5,9 @@ from .constants import (
     MAX_RECUR_LIMIT,
     DEFAULT_OUTPUT_LANGUAGE,
     CACHE_TTL_HOURS,
+    LLM_MAX_CONCURRENCY,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
     DEFAULT_SELECTED_RESEARCHERS,
 )
 
@@ -27,6 +30,29 @@ DEFAULT_CONFIG = {
     "max_debate_rounds": MAX_DEBATE_ROUNDS,
     "max_risk_discuss_rounds": MAX_RISK_DISCUSS_ROUNDS,
     "max_recur_limit": MAX_RECUR_LIMIT,
+    # 辩论发言模式 - True: 每轮所有发言者同时读取上一轮状态并发发言，汇合后进入下一轮
+    # （风险辩论耗时约为轮流发言的 1/3）；False: 按顺序轮流发言，每人读取上一位的输出
+    "simultaneous_debate_rounds": False,
+    "simultaneous_risk_rounds": False,
+    # Analyst execution - 分析师执行模式
+    # True: 各分析师在独立分支中并行运行，汇合后再进入研究员辩论
+    # False: 按 selected_analysts 顺序串行运行
+    "parallel_analysts": False,
+    # 数据预取：图开始时并发获取本次运行的全部数据（K线、指标、形态、基本面、新闻），
+    # 分析师和工具直接读取预取结果，同一次运行内每项数据只获取一次
+    "prefetch_data": True,
+    # 每个 LLM 提供商的最大并发请求数，提供商专属配置优先于 default
+    # 示例: {"default": 4, "anthropic": 2}
+    "llm_max_concurrency": {"default": LLM_MAX_CONCURRENCY},
+    # 每个 LLM 提供商每分钟的请求数 / token 数预算（None 表示不限），提供商专属配置逐项覆盖 default
+    # 预算充足时不等待，接近用完时排队，收到 429 时同一提供商的所有调用一起退避
+    # 示例: {"default": {...}, "anthropic": {"requests_per_minute": 50, "tokens_per_minute": 40000}}
+    "llm_rate_limits": {
+        "default": {
+            "requests_per_minute": LLM_REQUESTS_PER_MINUTE,
+            "tokens_per_minute": LLM_TOKENS_PER_MINUTE,
+        },
+    },
     # Researcher selection - 选择参与辩论的研究员
     # 初阶（Junior）: "bull", "bear" — 预设立场，快速多空筛选
     # 高级（Senior）: "buffett", "cathie_wood", "peter_lynch",
@@ -51,6 +77,16 @@ DEFAULT_CONFIG = {
         # Example: "get_stock_data": "alpha_vantage",  # Override category default
         # Example: "get_stock_data": "longbridge",      # 使用长桥API
     },
+    # 对冲请求：主数据源超过其 p95 延迟仍未返回时，并行请求下一个数据源并取先返回的结果
+    "hedge_vendor_requests": False,
+    # 指标/形态计算进程池（interface.get_compute_service）
+    # workers: 工作进程数，0 表示在调用线程计算，None 为 CPU 核数（CLI 通过环境变量 TRADINGAGENTS_COMPUTE_WORKERS 设置）
+    # warm: 创建时预先启动全部工作进程；start_method: spawn / forkserver / fork
+    "compute_pool": {
+        "workers": int(os.getenv("TRADINGAGENTS_COMPUTE_WORKERS", "0")),
+        "warm": True,
+        "start_method": "spawn",
+    },
     # Debug settings
     "debug": {
         "enabled": True,  # 调试模式开关
@@ -65,5 +101,7 @@ DEFAULT_CONFIG = {
     # Cache settings
     "cache": {
         "ttl_hours": CACHE_TTL_HOURS,  # 默认缓存时长（小时）
+        "bar_store_enabled": True,  # get_stock_data 使用区间感知K线存储，只请求缺失区间
+        "indicator_result_cache_enabled": True,  # 指标结果按输入内容缓存（需要 pyarrow）
     },
 }
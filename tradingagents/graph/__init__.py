@@ -6,6 +6,7 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .batch_runner import BatchRunner, load_symbols
 
 __all__ = [
     "TradingAgentsGraph",
@@ -14,4 +15,6 @@ __all__ = [
     "Propagator",
     "Reflector",
     "SignalProcessor",
+    "BatchRunner",
+    "load_symbols",
 ]
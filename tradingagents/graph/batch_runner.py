@@ -0,0 +1,221 @@
+"""
+多股票批量运行
+==============
+一个进程内用 N 个工作线程分析一批股票，避免每只股票一个进程的启动开销
+（创建 LLM 客户端、编译图、从 SQLite 加载 BM25 记忆、数据缓存冷启动）：
+
+- 每个工作线程首次取到任务时创建一个 TradingAgentsGraph，之后的股票复用同一个实例
+- 股票经有界队列按需下发给空闲的工作线程
+- 数据缓存、single-flight、提供商并发限制器和 LLMPacer 都是进程内共享的，
+  所有工作线程共用（数据管理器和计算服务由调用方在 run 之前创建，见 run_trading.run_batch_analysis）；
+  批量运行的吞吐由 LLM 预算决定，而不是进程启动
+- 每只股票记录状态、决策和耗时，汇总可写入 JSON
+
+使用示例:
+    >>> runner = BatchRunner(lambda: TradingAgentsGraph(config=config), workers=4)
+    >>> summary = runner.run(load_symbols("watchlist.txt"), "2026-02-20")
+    >>> print(summary.format_table())
+    >>> summary.write("results/batch/2026-02-20.json")
+"""
+
+import json
+import os
+import queue
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from tradingagents.constants import BATCH_QUEUE_SIZE_PER_WORKER, BATCH_WORKERS
+from tradingagents.exceptions import ValidationError
+from tradingagents.utils.logger import get_logger
+from tradingagents.utils.validators import InputValidator
+
+logger = get_logger(__name__)
+
+# 工作线程退出信号
+_STOP = object()
+
+
+def load_symbols(path: str) -> List[str]:
+    """
+    读取股票列表文件
+
+    每行一个或多个代码（逗号或空白分隔），# 之后为注释；
+    代码统一规范化为大写并按首次出现的顺序去重，无效代码记录警告后跳过。
+    """
+    symbols: List[str] = []
+    seen = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            for token in re.split(r"[,\s]+", line.split("#", 1)[0]):
+                if not token:
+                    continue
+                try:
+                    symbol = InputValidator.validate_symbol(token)
+                except ValidationError as e:
+                    logger.warning("跳过无效股票代码 %s: %s", token, e)
+                    continue
+                if symbol not in seen:
+                    seen.add(symbol)
+                    symbols.append(symbol)
+    return symbols
+
+
+@dataclass
+class TickerResult:
+    """单只股票的运行结果"""
+
+    symbol: str
+    status: str  # "ok" / "error"
+    seconds: float  # 分析耗时（不含工作线程创建图的时间）
+    worker: int
+    decision: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchSummary:
+    """一次批量运行的汇总"""
+
+    trade_date: str
+    workers: int
+    total_seconds: float
+    results: List[TickerResult] = field(default_factory=list)
+    graph_build_seconds: Dict[int, float] = field(default_factory=dict)  # 工作线程 -> 创建图耗时
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for r in self.results if r.status == "ok")
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trade_date": self.trade_date,
+            "workers": self.workers,
+            "total_seconds": round(self.total_seconds, 3),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "graph_build_seconds": {str(k): round(v, 3) for k, v in self.graph_build_seconds.items()},
+            "results": [asdict(r) for r in self.results],
+        }
+
+    def write(self, path: str) -> str:
+        """把汇总写入 JSON 文件，返回路径"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def format_table(self) -> str:
+        """每只股票一行的耗时表"""
+        lines = [f"{'股票':<10}{'状态':<8}{'耗时(秒)':>10}  决策"]
+        for r in self.results:
+            detail = r.decision if r.status == "ok" else f"错误: {r.error}"
+            lines.append(f"{r.symbol:<10}{r.status:<8}{r.seconds:>10.1f}  {detail}")
+        build = sum(self.graph_build_seconds.values())
+        lines.append(
+            f"共 {len(self.results)} 只，成功 {self.succeeded}，失败 {self.failed}；"
+            f"总耗时 {self.total_seconds:.1f} 秒（{self.workers} 个工作线程，创建图共 {build:.1f} 秒）"
+        )
+        return "\n".join(lines)
+
+
+class BatchRunner:
+    """多股票批量运行器（工作线程池，每个线程持有一个图实例）"""
+
+    def __init__(
+        self,
+        graph_factory: Callable[[], Any],
+        workers: int = BATCH_WORKERS,
+        queue_size: Optional[int] = None,
+    ):
+        """
+        Args:
+            graph_factory: 创建图的无参函数，返回的对象需提供 propagate(symbol, trade_date)
+            workers: 工作线程数
+            queue_size: 待处理队列长度，默认 workers × BATCH_QUEUE_SIZE_PER_WORKER
+        """
+        if workers < 1:
+            raise ValueError(f"workers must be >= 1, got {workers}")
+        self.graph_factory = graph_factory
+        self.workers = workers
+        self.queue_size = queue_size or workers * BATCH_QUEUE_SIZE_PER_WORKER
+
+    def run(
+        self,
+        symbols: List[str],
+        trade_date: str,
+        on_result: Optional[Callable[[TickerResult], None]] = None,
+    ) -> BatchSummary:
+        """
+        分析一批股票，返回按输入顺序排列的结果汇总
+
+        单只股票失败（包括 CancelledError 等 BaseException）只记录错误，工作线程继续处理后续股票，
+        不会因为线程退出而让主线程阻塞在有界队列上。
+
+        Args:
+            symbols: 股票代码列表
+            trade_date: 分析日期
+            on_result: 每只股票完成时的回调（在工作线程中调用）
+        """
+        tasks: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        results: List[Optional[TickerResult]] = [None] * len(symbols)
+        build_seconds: Dict[int, float] = {}
+        worker_count = max(1, min(self.workers, len(symbols)))
+
+        def worker(index: int) -> None:
+            graph = None
+            while True:
+                item = tasks.get()
+                if item is _STOP:
+                    return
+                position, symbol = item
+                start = None
+                try:
+                    if graph is None:
+                        build_start = time.perf_counter()
+                        graph = self.graph_factory()
+                        build_seconds[index] = time.perf_counter() - build_start
+                    start = time.perf_counter()
+                    _, decision = graph.propagate(symbol, trade_date)
+                    result = TickerResult(symbol, "ok", time.perf_counter() - start, index,
+                                          decision=str(decision))
+                except BaseException as e:
+                    # BaseException（如 CancelledError）也只记为本只股票失败，工作线程必须存活
+                    logger.error("批量分析 %s 失败: %r", symbol, e, exc_info=True)
+                    seconds = time.perf_counter() - start if start is not None else 0.0
+                    result = TickerResult(symbol, "error", seconds, index, error=str(e) or type(e).__name__)
+                results[position] = result
+                logger.info("批量分析 %s 完成: %s (%.1f 秒)", symbol, result.status, result.seconds)
+                if on_result is not None:
+                    try:
+                        on_result(result)
+                    except BaseException as e:
+                        logger.error("批量结果回调失败 (%s): %r", symbol, e, exc_info=True)
+
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(target=worker, args=(i,), name=f"batch-worker-{i}")
+            for i in range(worker_count)
+        ]
+        for t in threads:
+            t.start()
+        for item in enumerate(symbols):
+            tasks.put(item)  # 队列满时阻塞，等待工作线程取走
+        for _ in threads:
+            tasks.put(_STOP)
+        for t in threads:
+            t.join()
+
+        return BatchSummary(
+            trade_date=trade_date,
+            workers=worker_count,
+            total_seconds=time.perf_counter() - started,
+            results=[r for r in results if r is not None],
+            graph_build_seconds=build_seconds,
+        )
@@ -1,9 +1,12 @@
 # TradingAgents/graph/conditional_logic.py
 
-from typing import Dict, List
-from tradingagents.agents.utils.agent_states import AgentState
+from typing import Dict, List, Union
+from tradingagents.agents.utils.agent_states import AgentState, analyst_channel
 from tradingagents.constants import RESEARCHER_REGISTRY, DEFAULT_SELECTED_RESEARCHERS
 
+# 风险辩论发言顺序（轮流发言模式的轮询顺序，同时发言模式的合并顺序）
+RISK_DEBATE_ORDER: List[str] = ["Aggressive Analyst", "Conservative Analyst", "Neutral Analyst"]
+
 
 class ConditionalLogic:
     """Handles conditional logic for determining graph flow."""
@@ -13,6 +16,8 @@ class ConditionalLogic:
         max_debate_rounds: int = 2,
         max_risk_discuss_rounds: int = 2,
         selected_researchers: List[str] = None,
+        simultaneous_debate_rounds: bool = False,
+        simultaneous_risk_rounds: bool = False,
     ) -> None:
         """Initialize with configuration parameters.
         
@@ -20,9 +25,13 @@ class ConditionalLogic:
             max_debate_rounds: 每个 researcher 的最大辩论轮次
             max_risk_discuss_rounds: 风险讨论最大轮次
             selected_researchers: 选中的 researcher 简称列表（如 ["bull", "bear", "buffett"]）
+            simultaneous_debate_rounds: researcher 辩论每轮所有人同时发言，经汇合节点合并后进入下一轮
+            simultaneous_risk_rounds: 风险辩论每轮三位分析师同时发言，经汇合节点合并后进入下一轮
         """
         self.max_debate_rounds: int = max_debate_rounds
         self.max_risk_discuss_rounds: int = max_risk_discuss_rounds
+        self.simultaneous_debate_rounds = simultaneous_debate_rounds
+        self.simultaneous_risk_rounds = simultaneous_risk_rounds
         
         # 构建辩论者轮询顺序
         self.selected_researchers = selected_researchers or DEFAULT_SELECTED_RESEARCHERS
@@ -48,14 +57,17 @@ class ConditionalLogic:
 
         # 动态注册 should_continue_{analyst_type} 方法
         # 使外部 getattr(self, f"should_continue_{t}") 调用正常工作
+        # 并行模式使用 should_continue_{t}_parallel，读取分析师私有消息通道
         for analyst_type in ("market", "social", "news", "fundamentals", "candlestick"):
             setattr(self, f"should_continue_{analyst_type}",
                     self._make_analyst_continue(analyst_type))
+            setattr(self, f"should_continue_{analyst_type}_parallel",
+                    self._make_analyst_continue(analyst_type, analyst_channel(analyst_type)))
 
     # ---- 分析师 tool-call 继续判断（泛型实现） ----
 
     @staticmethod
-    def _make_analyst_continue(analyst_type: str):
+    def _make_analyst_continue(analyst_type: str, messages_key: str = "messages"):
         """工厂方法：为指定 analyst_type 生成 should_continue 闭包。
 
         返回的闭包逻辑:
@@ -64,6 +76,7 @@ class ConditionalLogic:
 
         Args:
             analyst_type: 分析师类型，如 "market", "social", "news", "fundamentals", "candlestick"
+            messages_key: 读取的消息通道，并行模式下为分析师私有通道
         """
         # 映射 analyst_type -> 标题格式（保持与原始路由名一致）
         title_map = {
@@ -79,24 +92,28 @@ class ConditionalLogic:
 
         def should_continue(state: AgentState) -> str:
             """Determine if {analyst_type} analysis should continue."""
-            last_message = state["messages"][-1]
+            last_message = state[messages_key][-1]
             return tools_name if last_message.tool_calls else clear_name
 
         should_continue.__doc__ = f"Determine if {analyst_type} analysis should continue."
         should_continue.__name__ = f"should_continue_{analyst_type}"
         return should_continue
 
-    def should_continue_debate(self, state: AgentState) -> str:
+    def should_continue_debate(self, state: AgentState) -> Union[str, List[str]]:
         """Determine if debate should continue.
         
         支持 N 方轮询辩论：按 debate_order 列表顺序循环。
         每个 researcher 发言一次算一轮，total_count >= researcher_count * max_debate_rounds 时结束。
+        同时发言模式下（从本轮汇合节点调用）返回全部 researcher，扇出下一轮。
         """
         total_count = state["investment_debate_state"]["count"]
         
         # 所有 researcher 轮询完指定轮次后，交给 Research Manager
         if total_count >= self.researcher_count * self.max_debate_rounds:
             return "Research Manager"
+
+        if self.simultaneous_debate_rounds:
+            return list(self.debate_order)
         
         # 确定下一个发言者
         latest = state["investment_debate_state"].get("latest_speaker", "")
@@ -111,12 +128,17 @@ class ConditionalLogic:
         
         return self.debate_order[next_idx]
 
-    def should_continue_risk_analysis(self, state: AgentState) -> str:
-        """Determine if risk analysis should continue."""
+    def should_continue_risk_analysis(self, state: AgentState) -> Union[str, List[str]]:
+        """Determine if risk analysis should continue.
+
+        同时发言模式下（从本轮汇合节点调用）返回全部三位分析师，扇出下一轮。
+        """
         if (
             state["risk_debate_state"]["count"] >= 3 * self.max_risk_discuss_rounds
         ):  # 3 rounds of back-and-forth between 3 agents
             return "Risk Judge"
+        if self.simultaneous_risk_rounds:
+            return list(RISK_DEBATE_ORDER)
         if state["risk_debate_state"]["latest_speaker"].startswith("Aggressive"):
             return "Conservative Analyst"
         if state["risk_debate_state"]["latest_speaker"].startswith("Conservative"):
@@ -0,0 +1,151 @@
+"""
+同时发言的辩论轮次
+==================
+默认的辩论是轮流发言（A → B → C → A ...），每位发言者读取上一位的输出，一轮的耗时是所有发言者之和。
+同时发言模式下，一轮内的所有发言者并发运行，都读取上一轮结束时的辩论状态；
+本轮全部完成后由汇合节点（屏障）把各自的更新按固定顺序合并回辩论状态，
+再由 ConditionalLogic 决定进入下一轮（再次扇出）还是交给裁判。
+
+- 每位发言者的更新写入 round_channel(debate_key) 缓冲区（按发言者合并），避免多个分支同时写同一个辩论状态
+- 汇合节点由多源边 add_edge([...], join) 触发，LangGraph 保证它等待本轮全部发言者
+- 合并规则见 merge_debate_round
+
+使用示例:
+    >>> speakers = ["Aggressive Analyst", "Conservative Analyst", "Neutral Analyst"]
+    >>> for name in speakers:
+    ...     workflow.add_node(name, wrap_round_speaker("risk_debate_state", name, nodes[name]))
+    >>> workflow.add_node("Risk Round Join", create_round_barrier("risk_debate_state", speakers))
+    >>> workflow.add_edge(speakers, "Risk Round Join")
+"""
+
+from typing import Any, Callable, Dict, List, Sequence
+
+from tradingagents.agents.utils.agent_states import round_channel
+from tradingagents.agents.utils.node_steps import GraphNode, ainvoke_node
+from tradingagents.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _empty_like(value: Any) -> Any:
+    """与 value 同类型的空值（str / 数值 / list），其他类型返回 None"""
+    return type(value)() if isinstance(value, (str, int, float, list)) else None
+
+
+def merge_debate_round(
+    base: Dict[str, Any],
+    updates: Sequence[Dict[str, Any]],
+    combine_keys: Sequence[str] = (),
+) -> Dict[str, Any]:
+    """
+    把同一轮中各发言者基于同一起点（base）产生的辩论状态合并为一个
+
+    - history: 依次拼接每位发言者在 base 之后追加的部分
+    - count: base 的 count 加上发言人数（与轮流发言时每人 +1 一致）
+    - combine_keys: 所有发言者都会写的共享字段（如 current_response），按顺序拼接
+    - latest_speaker: 最后一位发言者
+    - dict 字段（如 researcher_histories）: 逐项合并各发言者修改过的项
+    - 其他字段: 取与 base 不同的值（base 中缺失的字段按该类型的空值比较），
+      即发言者自己写入的字段（如 current_aggressive_response）
+
+    Args:
+        base: 本轮开始时的辩论状态
+        updates: 各发言者返回的辩论状态，按发言顺序排列
+        combine_keys: 需要拼接的共享字段
+
+    Returns:
+        合并后的辩论状态
+    """
+    merged = dict(base)
+    base_history = base.get("history", "")
+    history = base_history
+
+    for update in updates:
+        for key, value in update.items():
+            if key in ("count", "latest_speaker") or key in combine_keys:
+                continue
+            if key == "history":
+                history += value[len(base_history):] if value.startswith(base_history) else value
+            elif isinstance(value, dict):
+                base_items = base.get(key) or {}
+                changed = {k: v for k, v in value.items() if base_items.get(k) != v}
+                merged[key] = {**(merged.get(key) or {}), **changed}
+            elif value != base.get(key, _empty_like(value)):
+                merged[key] = value
+
+    merged["history"] = history
+    if updates and "latest_speaker" in updates[-1]:
+        merged["latest_speaker"] = updates[-1]["latest_speaker"]
+    merged["count"] = base.get("count", 0) + len(updates)
+    for key in combine_keys:
+        merged[key] = "\n\n".join(u[key] for u in updates if u.get(key))
+    return merged
+
+
+def wrap_round_speaker(debate_key: str, speaker: str, node: Callable) -> GraphNode:
+    """
+    把辩论节点改写为同时发言模式下的一路分支
+
+    节点读到的是本轮起点辩论状态的副本（原节点可能原地修改），
+    返回的辩论状态写入本轮缓冲区而不是 debate_key。
+
+    Args:
+        debate_key: 辩论状态的 state key（"investment_debate_state" / "risk_debate_state"）
+        speaker: 发言者节点名称，作为缓冲区中的 key
+        node: 原始辩论节点（GraphNode 或普通节点函数）
+
+    Returns:
+        分支节点（同步/异步双实现）
+    """
+    channel = round_channel(debate_key)
+
+    def view(state):
+        debate = {
+            key: dict(value) if isinstance(value, dict) else value
+            for key, value in (state.get(debate_key) or {}).items()
+        }
+        return {**state, debate_key: debate}
+
+    def to_update(result):
+        update = dict(result)
+        update[channel] = {speaker: update.pop(debate_key)}
+        return update
+
+    def round_speaker(state):
+        return to_update(node(view(state)))
+
+    async def around_speaker(state):
+        return to_update(await ainvoke_node(node, view(state)))
+
+    return GraphNode(round_speaker, afunc=around_speaker, name=f"{speaker} (round)")
+
+
+def create_round_barrier(
+    debate_key: str,
+    speakers: List[str],
+    combine_keys: Sequence[str] = (),
+) -> Callable:
+    """
+    创建本轮的汇合节点：把缓冲区中各发言者的更新按 speakers 顺序合并回辩论状态
+
+    Args:
+        debate_key: 辩论状态的 state key
+        speakers: 发言者节点名称，决定合并顺序
+        combine_keys: 需要拼接的共享字段，见 merge_debate_round
+    """
+    channel = round_channel(debate_key)
+
+    def round_barrier(state):
+        updates = state.get(channel) or {}
+        missing = [s for s in speakers if s not in updates]
+        if missing:
+            logger.warning("辩论轮次汇合时以下发言者没有输出: %s", missing)
+        merged = merge_debate_round(
+            state.get(debate_key) or {},
+            [updates[s] for s in speakers if s in updates],
+            combine_keys,
+        )
+        logger.debug("%s 第 %d 次发言后汇合", debate_key, merged["count"])
+        return {debate_key: merged}
+
+    return round_barrier
@@ -15,16 +15,18 @@ class Propagator:
         self.max_recur_limit: int = max_recur_limit
 
     def create_initial_state(
-        self, company_name: str, trade_date: str
+        self, company_name: str, trade_date: str, run_id: str = ""
     ) -> Dict[str, Any]:
         """Create the initial state for the agent graph.
         
         使用 researcher_histories Dict 初始化，所有 researcher 的历史自动为空字符串。
+        run_id 为本次运行预取数据的 ID（见 dataflows.run_data），为空表示不使用预取数据。
         """
         return {
             "messages": [("human", company_name)],
             "company_of_interest": company_name,
             "trade_date": str(trade_date),
+            "run_id": run_id,
             "investment_debate_state": InvestDebateState(
                 {
                     "researcher_histories": {},  # 动态填充，各 researcher 的历史
@@ -50,16 +52,21 @@ class Propagator:
             "candlestick_report": "",
         }
 
-    def get_graph_args(self, callbacks: Optional[List] = None) -> Dict[str, Any]:
+    def get_graph_args(
+        self, callbacks: Optional[List] = None, run_id: str = ""
+    ) -> Dict[str, Any]:
         """Get arguments for the graph invocation.
 
         Args:
             callbacks: Optional list of callback handlers for tool execution tracking.
                        Note: LLM callbacks are handled separately via LLM constructor.
+            run_id: 本次运行的 ID，放入 configurable 供 ToolNode 中的工具读取预取数据
         """
         config = {"recursion_limit": self.max_recur_limit}
         if callbacks:
             config["callbacks"] = callbacks
+        if run_id:
+            config["configurable"] = {"run_id": run_id}
         return {
             "stream_mode": "values",
             "config": config,
@@ -4,6 +4,7 @@ from typing import Dict, Any
 from langchain_openai import ChatOpenAI
 
 from tradingagents.agents.utils.logging_utils import build_situation_string
+from tradingagents.agents.utils.node_steps import current_llm_pacer
 
 
 class Reflector:
@@ -64,7 +65,7 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
             ),
         ]
 
-        result = self.quick_thinking_llm.invoke(messages).content
+        result = current_llm_pacer().invoke(self.quick_thinking_llm, messages).content
         return result
 
     def reflect_researcher(self, current_state, returns_losses, memory, researcher_type: str):
@@ -12,6 +12,7 @@ from tradingagents.agents import (
     create_news_analyst,
     create_fundamentals_analyst,
     create_candlestick_analyst,
+    create_data_prefetch,
     create_msg_delete,
     create_research_manager,
     create_trader,
@@ -20,10 +21,29 @@ from tradingagents.agents import (
     create_conservative_debator,
     create_risk_manager,
 )
-from tradingagents.agents.utils.agent_states import AgentState
+from tradingagents.agents.utils.agent_states import AgentState, analyst_channel
+from tradingagents.agents.utils.node_steps import GraphNode, ainvoke_node
 from tradingagents.constants import RESEARCHER_REGISTRY, DEFAULT_SELECTED_RESEARCHERS
+from tradingagents.utils.logger import get_logger
 
-from .conditional_logic import ConditionalLogic
+from .conditional_logic import RISK_DEBATE_ORDER, ConditionalLogic
+from .debate_rounds import create_round_barrier, wrap_round_speaker
+
+logger = get_logger(__name__)
+
+# 分析师类型 -> 对应的报告字段
+ANALYST_REPORT_FIELDS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+    "candlestick": "candlestick_report",
+}
+
+ANALYST_JOIN_NODE = "Analyst Join"
+DATA_PREFETCH_NODE = "Data Prefetch"
+DEBATE_ROUND_JOIN_NODE = "Debate Round Join"
+RISK_ROUND_JOIN_NODE = "Risk Round Join"
 
 
 class GraphSetup:
@@ -40,6 +60,8 @@ class GraphSetup:
         risk_manager_memory,
         conditional_logic: ConditionalLogic,
         selected_researchers: List[str] = None,
+        parallel_analysts: bool = False,
+        prefetch_data: bool = True,
     ):
         """Initialize with required components.
         
@@ -53,6 +75,8 @@ class GraphSetup:
             risk_manager_memory: 风险管理 memory
             conditional_logic: 条件逻辑控制器
             selected_researchers: 选中的 researcher 列表
+            parallel_analysts: 是否并行运行分析师（每个分析师独立分支 + 汇合节点）
+            prefetch_data: 是否在 START 之后加入 "Data Prefetch" 节点，一次并发获取选中的分析师需要的数据
         """
         self.quick_thinking_llm = quick_thinking_llm
         self.deep_thinking_llm = deep_thinking_llm
@@ -63,6 +87,8 @@ class GraphSetup:
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
         self.selected_researchers = selected_researchers or DEFAULT_SELECTED_RESEARCHERS
+        self.parallel_analysts = parallel_analysts
+        self.prefetch_data = prefetch_data
 
     def _create_researcher_node(self, researcher_key: str):
         """通过注册表动态创建 researcher 节点.
@@ -79,6 +105,66 @@ class GraphSetup:
         memory = self.researcher_memories.get(info["type"])
         return factory_fn(self.quick_thinking_llm, memory)
 
+    def _wrap_parallel_analyst(self, analyst_type: str, node):
+        """把分析师节点改写为读写私有消息通道的并行分支节点.
+
+        分析师节点本身只认识 state["messages"]：这里把私有通道映射成
+        messages 传入，再把返回的 messages 写回私有通道。私有通道为空时
+        （分支首次运行）以主通道的初始消息作为种子。
+
+        并发上限不在这里控制：分支内的每次 LLM 调用都经 LLMPacer 占用提供商的并发名额，
+        在节点外层再占用同一个限制器会形成嵌套占用，分支数超过上限时会死锁。
+
+        Args:
+            analyst_type: 分析师类型
+            node: 原始分析师节点（GraphNode 或普通节点函数）
+
+        Returns:
+            并行分支节点（同步/异步双实现）
+        """
+        channel = analyst_channel(analyst_type)
+
+        def split(state):
+            own_messages = list(state.get(channel) or [])
+            seed = [] if own_messages else list(state["messages"])
+            return seed, {**state, "messages": seed + own_messages}
+
+        def to_update(seed, result):
+            update = dict(result)
+            update[channel] = seed + list(update.pop("messages", []))
+            return update
+
+        def parallel_analyst_node(state):
+            seed, view = split(state)
+            return to_update(seed, node(view))
+
+        async def aparallel_analyst_node(state):
+            seed, view = split(state)
+            return to_update(seed, await ainvoke_node(node, view))
+
+        return GraphNode(
+            parallel_analyst_node, afunc=aparallel_analyst_node,
+            name=f"{analyst_type}_analyst_parallel",
+        )
+
+    def _create_analyst_join(self, selected_analysts: List[str]):
+        """创建汇合节点：所有分析师分支完成后才会被触发.
+
+        LangGraph 的多源边 add_edge([...], join) 保证 join 等待全部分支，
+        这里只负责检查报告字段并记录缺失项。
+        """
+        report_fields = [ANALYST_REPORT_FIELDS[t] for t in selected_analysts]
+
+        def analyst_join(state):
+            missing = [f for f in report_fields if not state.get(f)]
+            if missing:
+                logger.warning("分析师汇合时以下报告为空: %s", missing)
+            else:
+                logger.debug("所有分析师报告已就绪: %s", report_fields)
+            return {}
+
+        return analyst_join
+
     def setup_graph(
         self, selected_analysts=["market", "social", "news", "fundamentals", "candlestick"]
     ):
@@ -91,6 +177,17 @@ class GraphSetup:
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
                 - "candlestick": Candlestick analyst
+
+        并行模式（parallel_analysts=True）下，START 扇出到每个分析师分支，
+        各分支使用私有消息通道和独立的 ToolNode，全部完成后经
+        "Analyst Join" 汇合，再进入 debate_order 中的第一个 researcher。
+
+        prefetch_data=True 时分析师（串行的第一个或并行的全部分支）改由
+        "Data Prefetch" 节点之后开始，预取只获取 selected_analysts 用到的数据。
+
+        conditional_logic.simultaneous_debate_rounds / simultaneous_risk_rounds 为 True 时，
+        对应辩论每轮所有发言者同时运行，经 "Debate Round Join" / "Risk Round Join"
+        合并后再进入下一轮或裁判（见 debate_rounds）。
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -112,9 +209,20 @@ class GraphSetup:
             factory = analyst_factory_map.get(analyst_type)
             if factory is None:
                 raise ValueError(f"Unknown analyst type: {analyst_type}")
-            analyst_nodes[analyst_type] = factory(self.quick_thinking_llm)
-            delete_nodes[analyst_type] = create_msg_delete()
-            tool_nodes[analyst_type] = self.tool_nodes[analyst_type]
+            if self.parallel_analysts:
+                channel = analyst_channel(analyst_type)
+                analyst_nodes[analyst_type] = self._wrap_parallel_analyst(
+                    analyst_type, factory(self.quick_thinking_llm)
+                )
+                delete_nodes[analyst_type] = create_msg_delete(channel)
+                tool_nodes[analyst_type] = ToolNode(
+                    list(self.tool_nodes[analyst_type].tools_by_name.values()),
+                    messages_key=channel,
+                )
+            else:
+                analyst_nodes[analyst_type] = factory(self.quick_thinking_llm)
+                delete_nodes[analyst_type] = create_msg_delete()
+                tool_nodes[analyst_type] = self.tool_nodes[analyst_type]
 
         # ========== 动态创建 researcher 节点 ==========
         researcher_nodes = {}  # display_name -> node_function
@@ -124,6 +232,12 @@ class GraphSetup:
             info = RESEARCHER_REGISTRY[key]
             display_name = info["display_name"]
             researcher_nodes[display_name] = self._create_researcher_node(key)
+        simultaneous_debate = self.conditional_logic.simultaneous_debate_rounds
+        if simultaneous_debate:
+            researcher_nodes = {
+                name: wrap_round_speaker("investment_debate_state", name, node)
+                for name, node in researcher_nodes.items()
+            }
 
         # Create manager and trader nodes
         research_manager_node = create_research_manager(
@@ -132,9 +246,17 @@ class GraphSetup:
         trader_node = create_trader(self.quick_thinking_llm, self.trader_memory)
 
         # Create risk analysis nodes
-        aggressive_analyst = create_aggressive_debator(self.quick_thinking_llm)
-        neutral_analyst = create_neutral_debator(self.quick_thinking_llm)
-        conservative_analyst = create_conservative_debator(self.quick_thinking_llm)
+        risk_nodes = {
+            "Aggressive Analyst": create_aggressive_debator(self.quick_thinking_llm),
+            "Conservative Analyst": create_conservative_debator(self.quick_thinking_llm),
+            "Neutral Analyst": create_neutral_debator(self.quick_thinking_llm),
+        }
+        simultaneous_risk = self.conditional_logic.simultaneous_risk_rounds
+        if simultaneous_risk:
+            risk_nodes = {
+                name: wrap_round_speaker("risk_debate_state", name, node)
+                for name, node in risk_nodes.items()
+            }
         risk_manager_node = create_risk_manager(
             self.deep_thinking_llm, self.risk_manager_memory
         )
@@ -157,52 +279,70 @@ class GraphSetup:
         # Add other nodes
         workflow.add_node("Research Manager", research_manager_node)
         workflow.add_node("Trader", trader_node)
-        workflow.add_node("Aggressive Analyst", aggressive_analyst)
-        workflow.add_node("Neutral Analyst", neutral_analyst)
-        workflow.add_node("Conservative Analyst", conservative_analyst)
+        for name, node in risk_nodes.items():
+            workflow.add_node(name, node)
         workflow.add_node("Risk Judge", risk_manager_node)
 
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+        # 轮流发言从 debate_order 的第一个 researcher 开始；同时发言时扇出到全部 researcher
+        debate_order = self.conditional_logic.debate_order
+        debate_entry = list(debate_order) if simultaneous_debate else debate_order[:1]
 
-        # Connect analysts in sequence
-        first_researcher_display = self.conditional_logic.debate_order[0]
-        
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
+        entry = START
+        if self.prefetch_data:
+            workflow.add_node(DATA_PREFETCH_NODE, create_data_prefetch(selected_analysts))
+            workflow.add_edge(START, DATA_PREFETCH_NODE)
+            entry = DATA_PREFETCH_NODE
 
-            # Add conditional edges for current analyst
-            workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
+        if self.parallel_analysts:
+            self._add_parallel_analyst_edges(
+                workflow, selected_analysts, debate_entry, entry
+            )
+        else:
+            self._add_sequential_analyst_edges(
+                workflow, selected_analysts, debate_entry, entry
             )
-            workflow.add_edge(current_tools, current_analyst)
-
-            # Connect to next analyst or to first researcher
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, first_researcher_display)
 
         # ========== 为每个 researcher 添加条件边 ==========
         # 每个 researcher 都走同一个 should_continue_debate，路由到下一个 researcher 或 Research Manager
         all_researcher_destinations = {name: name for name in researcher_nodes.keys()}
         all_researcher_destinations["Research Manager"] = "Research Manager"
         
-        for display_name in researcher_nodes.keys():
+        if simultaneous_debate:
+            # 本轮所有 researcher 完成后汇合，再决定下一轮（全部扇出）或 Research Manager
+            workflow.add_node(
+                DEBATE_ROUND_JOIN_NODE,
+                create_round_barrier(
+                    "investment_debate_state", debate_order, combine_keys=("current_response",)
+                ),
+            )
+            workflow.add_edge(list(researcher_nodes.keys()), DEBATE_ROUND_JOIN_NODE)
             workflow.add_conditional_edges(
-                display_name,
+                DEBATE_ROUND_JOIN_NODE,
                 self.conditional_logic.should_continue_debate,
                 all_researcher_destinations,
             )
+        else:
+            for display_name in researcher_nodes.keys():
+                workflow.add_conditional_edges(
+                    display_name,
+                    self.conditional_logic.should_continue_debate,
+                    all_researcher_destinations,
+                )
 
         workflow.add_edge("Research Manager", "Trader")
+        if simultaneous_risk:
+            self._add_simultaneous_risk_edges(workflow)
+        else:
+            self._add_sequential_risk_edges(workflow)
+
+        workflow.add_edge("Risk Judge", END)
+
+        # Compile and return
+        return workflow.compile()
+
+    def _add_sequential_risk_edges(self, workflow: StateGraph) -> None:
+        """轮流发言：Aggressive → Conservative → Neutral 循环，达到轮次后交给 Risk Judge."""
         workflow.add_edge("Trader", "Aggressive Analyst")
         workflow.add_conditional_edges(
             "Aggressive Analyst",
@@ -229,7 +369,81 @@ class GraphSetup:
             },
         )
 
-        workflow.add_edge("Risk Judge", END)
+    def _add_simultaneous_risk_edges(self, workflow: StateGraph) -> None:
+        """同时发言：每轮三位分析师并发运行，汇合后再扇出下一轮或交给 Risk Judge."""
+        workflow.add_node(
+            RISK_ROUND_JOIN_NODE, create_round_barrier("risk_debate_state", RISK_DEBATE_ORDER)
+        )
+        for name in RISK_DEBATE_ORDER:
+            workflow.add_edge("Trader", name)
+        # 多源边：本轮三位分析师都完成后才触发汇合节点
+        workflow.add_edge(list(RISK_DEBATE_ORDER), RISK_ROUND_JOIN_NODE)
+        workflow.add_conditional_edges(
+            RISK_ROUND_JOIN_NODE,
+            self.conditional_logic.should_continue_risk_analysis,
+            [*RISK_DEBATE_ORDER, "Risk Judge"],
+        )
 
-        # Compile and return
-        return workflow.compile()
+    def _add_sequential_analyst_edges(
+        self,
+        workflow: StateGraph,
+        selected_analysts: List[str],
+        debate_entry: List[str],
+        entry: str = START,
+    ) -> None:
+        """串行模式：分析师依次运行，最后一个分析师连接到辩论入口（第一个或全部 researcher）."""
+        # Start with the first analyst
+        first_analyst = selected_analysts[0]
+        workflow.add_edge(entry, f"{first_analyst.capitalize()} Analyst")
+
+        # Connect analysts in sequence
+        for i, analyst_type in enumerate(selected_analysts):
+            current_analyst = f"{analyst_type.capitalize()} Analyst"
+            current_tools = f"tools_{analyst_type}"
+            current_clear = f"Msg Clear {analyst_type.capitalize()}"
+
+            # Add conditional edges for current analyst
+            workflow.add_conditional_edges(
+                current_analyst,
+                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+                [current_tools, current_clear],
+            )
+            workflow.add_edge(current_tools, current_analyst)
+
+            # Connect to next analyst or to first researcher
+            if i < len(selected_analysts) - 1:
+                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
+                workflow.add_edge(current_clear, next_analyst)
+            else:
+                for researcher in debate_entry:
+                    workflow.add_edge(current_clear, researcher)
+
+    def _add_parallel_analyst_edges(
+        self,
+        workflow: StateGraph,
+        selected_analysts: List[str],
+        debate_entry: List[str],
+        entry: str = START,
+    ) -> None:
+        """并行模式：entry（START 或预取节点）扇出到所有分析师分支，全部完成后经汇合节点进入辩论."""
+        workflow.add_node(ANALYST_JOIN_NODE, self._create_analyst_join(selected_analysts))
+
+        clear_nodes = []
+        for analyst_type in selected_analysts:
+            current_analyst = f"{analyst_type.capitalize()} Analyst"
+            current_tools = f"tools_{analyst_type}"
+            current_clear = f"Msg Clear {analyst_type.capitalize()}"
+
+            workflow.add_edge(entry, current_analyst)
+            workflow.add_conditional_edges(
+                current_analyst,
+                getattr(self.conditional_logic, f"should_continue_{analyst_type}_parallel"),
+                [current_tools, current_clear],
+            )
+            workflow.add_edge(current_tools, current_analyst)
+            clear_nodes.append(current_clear)
+
+        # 多源边：等待所有分支的 Msg Clear 节点都完成后才触发汇合节点
+        workflow.add_edge(clear_nodes, ANALYST_JOIN_NODE)
+        for researcher in debate_entry:
+            workflow.add_edge(ANALYST_JOIN_NODE, researcher)
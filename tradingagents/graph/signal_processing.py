@@ -2,6 +2,8 @@
 
 from langchain_openai import ChatOpenAI
 
+from tradingagents.agents.utils.node_steps import current_llm_pacer
+
 
 class SignalProcessor:
     """Processes trading signals to extract actionable decisions."""
@@ -20,12 +22,18 @@ class SignalProcessor:
         Returns:
             Extracted decision (BUY, SELL, or HOLD)
         """
-        messages = [
+        return current_llm_pacer().invoke(self.quick_thinking_llm, self._messages(full_signal)).content
+
+    async def aprocess_signal(self, full_signal: str) -> str:
+        """Async variant of process_signal (uses ainvoke)."""
+        return (await current_llm_pacer().ainvoke(self.quick_thinking_llm, self._messages(full_signal))).content
+
+    @staticmethod
+    def _messages(full_signal: str) -> list:
+        return [
             (
                 "system",
                 "You are an efficient assistant designed to analyze paragraphs or financial reports provided by a group of analysts. Your task is to extract the investment decision: SELL, BUY, or HOLD. Provide only the extracted decision (SELL, BUY, or HOLD) as your output, without adding any additional text or information.",
             ),
             ("human", full_signal),
         ]
-
-        return self.quick_thinking_llm.invoke(messages).content
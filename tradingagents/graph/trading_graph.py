@@ -1,6 +1,8 @@
 # TradingAgents/graph/trading_graph.py (重构后简化版)
 
+import asyncio
 import os
+import uuid
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
@@ -20,6 +22,8 @@ from tradingagents.agents.utils.agent_states import (
     RiskDebateState,
 )
 from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.database import flush_tool_call_log
+from tradingagents.dataflows.run_data import create_run_data, release_run_data
 from tradingagents.constants import RESEARCHER_REGISTRY, DEFAULT_SELECTED_RESEARCHERS
 from .helpers import StatePersistence
 
@@ -144,6 +148,8 @@ class TradingAgentsGraph:
             max_debate_rounds=self.config.get("max_debate_rounds", 2),
             max_risk_discuss_rounds=self.config.get("max_risk_discuss_rounds", 2),
             selected_researchers=self.selected_researchers,
+            simultaneous_debate_rounds=self.config.get("simultaneous_debate_rounds", False),
+            simultaneous_risk_rounds=self.config.get("simultaneous_risk_rounds", False),
         )
         self.graph_setup = GraphSetup(
             self.quick_thinking_llm,
@@ -155,6 +161,8 @@ class TradingAgentsGraph:
             self.risk_manager_memory,
             self.conditional_logic,
             self.selected_researchers,
+            parallel_analysts=self.config.get("parallel_analysts", False),
+            prefetch_data=self.config.get("prefetch_data", True),
         )
 
         self.propagator = Propagator()
@@ -260,69 +268,16 @@ class TradingAgentsGraph:
         """
 
         self.ticker = company_name
-
-        # 回测配置
-        backtest_enabled = self.config.get("backtest", {}).get("enabled", True)
-        if backtest_enabled:
-            if self.debug:
-                logger.info("=" * 50)
-                logger.info("🔄 执行回测...")
-                logger.info("=" * 50)
-            run_backtest(symbol=company_name, target_date=trade_date, debug=self.debug)
-            if self.debug:
-                logger.info("")
-
-        # 初始化状态
-        # 创建代理的初始状态，包含公司信息和交易日期
-        init_agent_state = self.propagator.create_initial_state(
-            company_name, trade_date
-        )
-        args = self.propagator.get_graph_args()
+        self._run_backtest(company_name, trade_date)
+        run_id, init_agent_state, args = self._prepare_run(company_name, trade_date)
 
         try:
             if self.debug:
                 # 调试模式，带跟踪输出
                 # 使用stream方法逐块执行，便于调试和观察中间状态
                 trace = []
-                last_debate_state = None
-                last_risk_state = None
-                
                 for chunk in self.graph.stream(init_agent_state, **args):
-                    # 打印所有节点的消息
-                    for node_name, node_data in chunk.items():
-                        if node_name == "messages" and len(node_data) > 0:
-                            logger.info("=" * 80)
-                            logger.info("📝 Messages Output:")
-                            logger.info("=" * 80)
-                            node_data[-1].pretty_print()
-                        elif node_name == "investment_debate_state":
-                            logger.info("=" * 80)
-                            logger.info("📊 Investment Debate State:")
-                            logger.info("=" * 80)
-                            logger.info("Count: %s", node_data.get('count', 0))
-                            logger.info("Latest Speaker: %s", node_data.get('latest_speaker', 'N/A'))
-                            # 动态输出所有 researcher 的历史
-                            researcher_histories = node_data.get('researcher_histories', {})
-                            for rtype, rhist in researcher_histories.items():
-                                logger.info("--- %s History ---", rtype)
-                                logger.info("%s", (rhist[:2000] if rhist else "N/A"))
-                            logger.info("--- Current Response ---")
-                            logger.info("%s", (node_data.get('current_response', '')[:2000] if node_data.get('current_response') else "N/A"))
-                            logger.info("=" * 80)
-                        elif node_name == "risk_debate_state":
-                            logger.info("=" * 80)
-                            logger.info("⚠️ Risk Debate State:")
-                            logger.info("=" * 80)
-                            logger.info("Count: %s", node_data.get('count', 0))
-                            logger.info("Latest Speaker: %s", node_data.get('latest_speaker', 'N/A'))
-                            logger.info("=" * 80)
-                        elif node_name == "trader_investment_plan":
-                            logger.info("=" * 80)
-                            logger.info("💰 Trader Investment Plan:")
-                            logger.info("=" * 80)
-                            logger.info("%s", str(node_data)[:2000])
-                            logger.info("=" * 80)
-                    
+                    self._log_chunk(chunk)
                     trace.append(chunk)
 
                 final_state = trace[-1] if trace else init_agent_state
@@ -331,10 +286,12 @@ class TradingAgentsGraph:
                 # 使用invoke方法一次性执行完整个图
                 final_state = self.graph.invoke(init_agent_state, **args)
         except Exception as e:
-            logger.error("图执行失败 (%s @ %s): %s", company_name, trade_date, e)
-            import traceback
-            logger.debug("详细错误信息:\n%s", traceback.format_exc())
+            self._log_run_error(company_name, trade_date, e)
             raise
+        finally:
+            release_run_data(run_id)
+            # 工具调用日志由后台线程批量写入，本次运行结束前等待落盘
+            flush_tool_call_log()
 
         # 存储当前状态用于反思
         self.curr_state = final_state
@@ -345,6 +302,112 @@ class TradingAgentsGraph:
         # 返回决策和处理后的信号
         return final_state, self.process_signal(final_state["final_trade_decision"])
 
+    async def apropagate(self, company_name, trade_date):
+        """propagate 的异步版本：用 graph.astream 驱动图，节点内的 LLM 调用走 ainvoke
+
+        一个事件循环上可以并发运行多只股票（asyncio.gather 多个 apropagate），
+        不需要每次运行占用一个线程；回测、日志落盘等阻塞操作放到线程中执行。
+        同一个实例并发运行时 curr_state / ticker 记录的是最后完成的那次运行。
+
+        Args:
+            company_name: 公司股票代码 (如 "NVDA")
+            trade_date: 交易日期 (如 "2026-01-15")
+
+        Returns:
+            元组 (final_state, processed_signal)，同 propagate
+        """
+        self.ticker = company_name
+        await asyncio.to_thread(self._run_backtest, company_name, trade_date)
+        run_id, init_agent_state, args = self._prepare_run(company_name, trade_date)
+
+        try:
+            # stream_mode="values"：每个块都是完整状态，最后一块即最终状态
+            final_state = init_agent_state
+            async for chunk in self.graph.astream(init_agent_state, **args):
+                if self.debug:
+                    self._log_chunk(chunk)
+                final_state = chunk
+        except Exception as e:
+            self._log_run_error(company_name, trade_date, e)
+            raise
+        finally:
+            release_run_data(run_id)
+            await asyncio.to_thread(flush_tool_call_log)
+
+        self.curr_state = final_state
+        await asyncio.to_thread(self._log_state, trade_date, final_state)
+
+        return final_state, await self.aprocess_signal(final_state["final_trade_decision"])
+
+    def _run_backtest(self, company_name, trade_date):
+        """按配置在运行图之前执行回测"""
+        backtest_enabled = self.config.get("backtest", {}).get("enabled", True)
+        if backtest_enabled:
+            if self.debug:
+                logger.info("=" * 50)
+                logger.info("🔄 执行回测...")
+                logger.info("=" * 50)
+            run_backtest(symbol=company_name, target_date=trade_date, debug=self.debug)
+            if self.debug:
+                logger.info("")
+
+    def _prepare_run(self, company_name, trade_date):
+        """登记本次运行并创建初始状态和图参数
+
+        Returns:
+            (run_id, 初始状态, 图参数)
+        """
+        # 创建代理的初始状态，包含公司信息、交易日期和运行 ID（预取数据按运行 ID 存放）
+        run_id = uuid.uuid4().hex
+        create_run_data(run_id, company_name, str(trade_date))
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date, run_id
+        )
+        return run_id, init_agent_state, self.propagator.get_graph_args(run_id=run_id)
+
+    @staticmethod
+    def _log_run_error(company_name, trade_date, error):
+        logger.error("图执行失败 (%s @ %s): %s", company_name, trade_date, error)
+        import traceback
+        logger.debug("详细错误信息:\n%s", traceback.format_exc())
+
+    @staticmethod
+    def _log_chunk(chunk):
+        """调试模式下打印一个流式块中的消息和辩论状态"""
+        for node_name, node_data in chunk.items():
+            if node_name == "messages" and len(node_data) > 0:
+                logger.info("=" * 80)
+                logger.info("📝 Messages Output:")
+                logger.info("=" * 80)
+                node_data[-1].pretty_print()
+            elif node_name == "investment_debate_state":
+                logger.info("=" * 80)
+                logger.info("📊 Investment Debate State:")
+                logger.info("=" * 80)
+                logger.info("Count: %s", node_data.get('count', 0))
+                logger.info("Latest Speaker: %s", node_data.get('latest_speaker', 'N/A'))
+                # 动态输出所有 researcher 的历史
+                researcher_histories = node_data.get('researcher_histories', {})
+                for rtype, rhist in researcher_histories.items():
+                    logger.info("--- %s History ---", rtype)
+                    logger.info("%s", (rhist[:2000] if rhist else "N/A"))
+                logger.info("--- Current Response ---")
+                logger.info("%s", (node_data.get('current_response', '')[:2000] if node_data.get('current_response') else "N/A"))
+                logger.info("=" * 80)
+            elif node_name == "risk_debate_state":
+                logger.info("=" * 80)
+                logger.info("⚠️ Risk Debate State:")
+                logger.info("=" * 80)
+                logger.info("Count: %s", node_data.get('count', 0))
+                logger.info("Latest Speaker: %s", node_data.get('latest_speaker', 'N/A'))
+                logger.info("=" * 80)
+            elif node_name == "trader_investment_plan":
+                logger.info("=" * 80)
+                logger.info("💰 Trader Investment Plan:")
+                logger.info("=" * 80)
+                logger.info("%s", str(node_data)[:2000])
+                logger.info("=" * 80)
+
     def _log_state(self, trade_date, final_state):
         """Log the final state（委托给persistence模块）"""
         self.log_states_dict[str(trade_date)] = {
@@ -396,3 +459,7 @@ class TradingAgentsGraph:
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)
+
+    async def aprocess_signal(self, full_signal):
+        """process_signal 的异步版本"""
+        return await self.signal_processor.aprocess_signal(full_signal)
@@ -1,4 +1,23 @@
 from .base_client import BaseLLMClient
 from .factory import create_llm_client
+from .concurrency import (
+    ProviderConcurrencyLimiter,
+    get_provider_limiter,
+    resolve_concurrency_limit,
+)
+from .pacing import (
+    LLMPacer,
+    get_llm_pacer,
+    resolve_rate_limits,
+)
 
-__all__ = ["BaseLLMClient", "create_llm_client"]
+__all__ = [
+    "BaseLLMClient",
+    "create_llm_client",
+    "ProviderConcurrencyLimiter",
+    "get_provider_limiter",
+    "resolve_concurrency_limit",
+    "LLMPacer",
+    "get_llm_pacer",
+    "resolve_rate_limits",
+]
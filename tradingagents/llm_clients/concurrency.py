@@ -0,0 +1,151 @@
+"""
+LLM 提供商并发限制
+==================
+按提供商共享的并发上限（进程内单例），防止并行分支同时打满同一个
+API 而触发 429。同一提供商的所有图实例、所有线程共用一个信号量。
+异步节点用 async with limiter 获取名额，等待期间不阻塞事件循环。
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, Optional
+
+from tradingagents.constants import LLM_LIMITER_POLL_SECONDS, LLM_MAX_CONCURRENCY
+from tradingagents.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ProviderConcurrencyLimiter:
+    """单个 LLM 提供商的并发限制器（线程安全）
+
+    用法:
+        limiter = get_provider_limiter("openai", 4)
+        with limiter:
+            llm.invoke(...)
+        async with limiter:
+            await llm.ainvoke(...)
+    """
+
+    def __init__(self, provider: str, max_concurrency: int = LLM_MAX_CONCURRENCY):
+        """
+        Args:
+            provider: 提供商名称
+            max_concurrency: 最大并发请求数（>= 1）
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_acquired = 0
+
+    def acquire(self) -> None:
+        """获取一个并发名额（阻塞直到有空位）"""
+        self._semaphore.acquire()
+        self._record_acquired()
+
+    async def acquire_async(self) -> None:
+        """异步获取一个并发名额（轮询信号量，等待期间让出事件循环）"""
+        while not self._semaphore.acquire(blocking=False):
+            await asyncio.sleep(LLM_LIMITER_POLL_SECONDS)
+        self._record_acquired()
+
+    def _record_acquired(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.total_acquired += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def release(self) -> None:
+        """释放并发名额"""
+        with self._lock:
+            self.in_flight -= 1
+        self._semaphore.release()
+
+    def __enter__(self) -> "ProviderConcurrencyLimiter":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+    async def __aenter__(self) -> "ProviderConcurrencyLimiter":
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取并发统计"""
+        with self._lock:
+            return {
+                "provider": self.provider,
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "total_acquired": self.total_acquired,
+            }
+
+
+# 全局限制器注册表：provider -> limiter
+_limiters: Dict[str, ProviderConcurrencyLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def resolve_concurrency_limit(config: Dict[str, Any], provider: str) -> int:
+    """从配置中解析提供商的并发上限
+
+    config["llm_max_concurrency"] 形如 {"default": 4, "anthropic": 2}，
+    提供商专属配置优先于 default。
+
+    Args:
+        config: 全局配置字典
+        provider: 提供商名称
+
+    Returns:
+        并发上限
+    """
+    limits = config.get("llm_max_concurrency") or {}
+    provider = (provider or "").lower()
+    return int(limits.get(provider, limits.get("default", LLM_MAX_CONCURRENCY)))
+
+
+def get_provider_limiter(
+    provider: str, max_concurrency: Optional[int] = None
+) -> ProviderConcurrencyLimiter:
+    """获取（或创建）提供商的共享并发限制器
+
+    同一提供商只创建一次，后续调用返回同一实例；上限以首次创建时为准。
+
+    Args:
+        provider: 提供商名称（大小写不敏感）
+        max_concurrency: 首次创建时使用的并发上限，默认 LLM_MAX_CONCURRENCY
+
+    Returns:
+        ProviderConcurrencyLimiter 实例
+    """
+    key = (provider or "default").lower()
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = ProviderConcurrencyLimiter(
+                key, max_concurrency or LLM_MAX_CONCURRENCY
+            )
+            _limiters[key] = limiter
+        elif max_concurrency and max_concurrency != limiter.max_concurrency:
+            logger.debug(
+                "提供商 %s 的并发限制器已存在（上限 %d），忽略新上限 %d",
+                key, limiter.max_concurrency, max_concurrency,
+            )
+        return limiter
+
+
+def reset_provider_limiters() -> None:
+    """清空限制器注册表（主要用于测试）"""
+    with _limiters_lock:
+        _limiters.clear()
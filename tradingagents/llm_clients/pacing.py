@@ -0,0 +1,246 @@
+"""
+LLM 调用节奏控制
+================
+按提供商共享的每分钟请求数 / token 数预算（进程内单例），替代辩论中每轮固定的 sleep：
+
+- 请求前从两个令牌桶预约：请求数 1 个，token 数按输入估算。桶满（预算充足）时不等待，
+  只有预算接近用完时才按补充速度排队
+- 响应后按实际用量（usage_metadata）修正 token 桶，估算偏差不会累积
+- 收到 429 / 限流错误时两个桶整体推迟（同一提供商的所有调用一起退避），指数退避后重试
+- 每次调用期间占用提供商共享的并发名额（ProviderConcurrencyLimiter），同时在途的请求数
+  不超过 llm_max_concurrency；只在请求期间占用，等待预算时不占用
+
+同步（invoke）和异步（ainvoke）调用方共用同一组令牌桶和并发限制器。
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from tradingagents.constants import (
+    LLM_CHARS_PER_TOKEN,
+    LLM_RATE_LIMIT_BACKOFF_SECONDS,
+    LLM_RATE_LIMIT_MAX_RETRIES,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+)
+from tradingagents.dataflows.core.error_detector import ErrorDetector
+from tradingagents.dataflows.core.token_bucket import TokenBucket
+from tradingagents.utils.logger import get_logger
+
+from .concurrency import ProviderConcurrencyLimiter, get_provider_limiter
+
+logger = get_logger(__name__)
+
+
+def estimate_tokens(value: Any) -> int:
+    """粗略估算输入的 token 数（字符串、消息、消息列表、(role, content) 元组或 dict）"""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value) // LLM_CHARS_PER_TOKEN + 1
+    if isinstance(value, dict):
+        return estimate_tokens(value.get("content"))
+    if isinstance(value, tuple) and len(value) == 2 and isinstance(value[0], str):
+        return estimate_tokens(value[1])
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_tokens(item) for item in value)
+    content = getattr(value, "content", None)
+    return estimate_tokens(content if content is not None else str(value))
+
+
+def usage_tokens(result: Any) -> Optional[int]:
+    """LLM 响应的实际 token 用量（没有用量信息时返回 None）"""
+    usage = getattr(result, "usage_metadata", None)
+    if usage and usage.get("total_tokens"):
+        return int(usage["total_tokens"])
+    return None
+
+
+class LLMPacer:
+    """单个 LLM 提供商的调用节奏控制器（线程安全）
+
+    用法:
+        pacer = get_llm_pacer("openai", requests_per_minute=500, tokens_per_minute=200_000, max_concurrency=4)
+        result = pacer.invoke(llm, messages)
+        result = await pacer.ainvoke(llm, messages)
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        requests_per_minute: Optional[float] = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: Optional[float] = LLM_TOKENS_PER_MINUTE,
+        max_retries: int = LLM_RATE_LIMIT_MAX_RETRIES,
+        backoff_seconds: float = LLM_RATE_LIMIT_BACKOFF_SECONDS,
+        limiter: Optional[ProviderConcurrencyLimiter] = None,
+    ):
+        """
+        Args:
+            provider: 提供商名称
+            requests_per_minute: 每分钟请求数预算，None 表示不限
+            tokens_per_minute: 每分钟 token 数预算，None 表示不限
+            max_retries: 收到限流错误后的最大重试次数
+            backoff_seconds: 首次退避秒数，之后每次翻倍
+            limiter: 并发限制器，默认使用该提供商共享的限制器
+        """
+        self.provider = provider
+        self.limiter = limiter or get_provider_limiter(provider)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        # 容量为一分钟的预算：预算充足时请求不等待
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute) if tokens_per_minute else None
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "rate_limited": 0, "retries": 0, "paced_wait": 0.0, "tokens_used": 0}
+
+    # ==================== 预算 ====================
+    def _token_amount(self, input: Any) -> float:
+        # 单次预约不超过桶容量，否则永远等不到
+        return min(estimate_tokens(input), self.tokens.capacity)
+
+    def _record_wait(self, waits) -> None:
+        with self._lock:
+            self._stats["paced_wait"] += sum(w or 0.0 for w in waits)
+
+    def _acquire(self, amount: float) -> None:
+        waits = []
+        if self.requests:
+            waits.append(self.requests.acquire())
+        if self.tokens:
+            waits.append(self.tokens.acquire(amount=amount))
+        self._record_wait(waits)
+
+    async def _acquire_async(self, amount: float) -> None:
+        waits = []
+        if self.requests:
+            waits.append(await self.requests.acquire_async())
+        if self.tokens:
+            waits.append(await self.tokens.acquire_async(amount=amount))
+        self._record_wait(waits)
+
+    def _settle(self, result: Any, amount: float) -> Any:
+        """按实际用量修正 token 桶"""
+        used = usage_tokens(result)
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["tokens_used"] += used or 0
+        if self.tokens and used is not None:
+            self.tokens.charge(used - amount)
+        return result
+
+    def _backoff(self, error: Exception, attempt: int) -> Optional[float]:
+        """限流错误时推迟两个桶并返回退避秒数；其他错误或重试次数用完时返回 None"""
+        if not ErrorDetector.is_rate_limit_error(error) or attempt >= self.max_retries:
+            return None
+        delay = self.backoff_seconds * (2 ** attempt)
+        for bucket in (self.requests, self.tokens):
+            if bucket:
+                bucket.defer(delay)
+        with self._lock:
+            self._stats["rate_limited"] += 1
+            self._stats["retries"] += 1
+        logger.warning(
+            "LLM 提供商 %s 限流 (%s)，%.1f 秒后重试 (%d/%d)",
+            self.provider, error, delay, attempt + 1, self.max_retries,
+        )
+        return delay
+
+    # ==================== 调用 ====================
+    def invoke(self, runnable: Any, input: Any, config: Optional[Dict[str, Any]] = None) -> Any:
+        """在预算内调用 runnable.invoke，限流时退避重试"""
+        amount = self._token_amount(input) if self.tokens else 0
+        attempt = 0
+        while True:
+            self._acquire(amount)
+            try:
+                with self.limiter:
+                    result = runnable.invoke(input, config)
+                return self._settle(result, amount)
+            except Exception as e:
+                delay = self._backoff(e, attempt)
+                if delay is None:
+                    raise
+                # 推迟后的桶会让下一次 _acquire 等待；两个预算都不限时直接 sleep
+                if not (self.requests or self.tokens):
+                    time.sleep(delay)
+                attempt += 1
+
+    async def ainvoke(self, runnable: Any, input: Any, config: Optional[Dict[str, Any]] = None) -> Any:
+        """invoke() 的异步版本"""
+        amount = self._token_amount(input) if self.tokens else 0
+        attempt = 0
+        while True:
+            await self._acquire_async(amount)
+            try:
+                async with self.limiter:
+                    result = await runnable.ainvoke(input, config)
+                return self._settle(result, amount)
+            except Exception as e:
+                delay = self._backoff(e, attempt)
+                if delay is None:
+                    raise
+                if not (self.requests or self.tokens):
+                    await asyncio.sleep(delay)
+                attempt += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取节奏控制统计"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["provider"] = self.provider
+        stats["requests"] = self.requests.get_stats() if self.requests else None
+        stats["tokens"] = self.tokens.get_stats() if self.tokens else None
+        stats["concurrency"] = self.limiter.get_stats()
+        return stats
+
+
+# 全局注册表：provider -> pacer
+_pacers: Dict[str, LLMPacer] = {}
+_pacers_lock = threading.Lock()
+
+
+def resolve_rate_limits(config: Dict[str, Any], provider: str) -> Dict[str, Optional[float]]:
+    """从配置中解析提供商的每分钟预算
+
+    config["llm_rate_limits"] 形如
+    {"default": {"requests_per_minute": 500, "tokens_per_minute": 200000}, "anthropic": {"requests_per_minute": 50}}，
+    提供商专属配置逐项覆盖 default。
+
+    Returns:
+        {"requests_per_minute": ..., "tokens_per_minute": ...}
+    """
+    limits = config.get("llm_rate_limits") or {}
+    resolved = {"requests_per_minute": LLM_REQUESTS_PER_MINUTE, "tokens_per_minute": LLM_TOKENS_PER_MINUTE}
+    resolved.update(limits.get("default") or {})
+    resolved.update(limits.get((provider or "").lower()) or {})
+    return resolved
+
+
+def get_llm_pacer(
+    provider: str,
+    requests_per_minute: Optional[float] = LLM_REQUESTS_PER_MINUTE,
+    tokens_per_minute: Optional[float] = LLM_TOKENS_PER_MINUTE,
+    max_concurrency: Optional[int] = None,
+) -> LLMPacer:
+    """获取（或创建）提供商的共享节奏控制器
+
+    同一提供商只创建一次，后续调用返回同一实例；预算以首次创建时为准。
+    并发限制使用 get_provider_limiter 的共享限制器，上限同样以首次创建时为准。
+    """
+    key = (provider or "default").lower()
+    with _pacers_lock:
+        pacer = _pacers.get(key)
+        if pacer is None:
+            pacer = _pacers[key] = LLMPacer(
+                key, requests_per_minute, tokens_per_minute,
+                limiter=get_provider_limiter(key, max_concurrency),
+            )
+        return pacer
+
+
+def reset_llm_pacers() -> None:
+    """清空节奏控制器注册表（主要用于测试）"""
+    with _pacers_lock:
+        _pacers.clear()